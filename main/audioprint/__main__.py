@@ -9,17 +9,34 @@ import argparse
 import gc
 from pathlib import Path
 import logging
-from typing import Any, List, Tuple
-import essentia.standard as es
+from typing import Any, Dict, List, Tuple
 
 from src.audioprint.audioprint_generator import AudioprintGenerator
+from src.utils.compact_audioprint import CompactAudioprint
 from src.utils.file_db import FileDB
+from src.utils.host_profile import configure_host
+from src.utils.profiler import Profiler
+from src.utils.song_store import SongStore
+from src.utils.worldcup_index import WorldcupIndex
 from src.youtube_download.audio import AudioDownloader
+from src.youtube_download.video_id import normalize_video_id
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# 노래 지문 구간
+CLIP_START = "00:00:00"
+CLIP_END = "00:00:30"
+# 노래 전체 길이 지문 구간 끝 (48kHz에서도 프레임 인덱스가 uint16 범위 안에 들어가는 길이)
+FULL_LENGTH_END = "00:14:00"
+
+
+def set_clip_range(start: str, end: str):
+    """노래 지문 구간 설정 (구간이 저장소 버전 파라미터에 포함되므로 구간별로 지문이 따로 저장됨)"""
+    global CLIP_START, CLIP_END
+    CLIP_START, CLIP_END = start, end
+
 
 # YouTube URL 유효성 검증 함수
 def is_valid_youtube_url(url: str) -> bool:
@@ -69,17 +86,86 @@ def read_youtube_urls(file_path: Path) -> dict:
     return urls
 
 
+def get_store_version() -> Tuple[str, dict]:
+    """현재 지문 파라미터와 노래 구간에 해당하는 저장소 버전"""
+    params = {**AudioprintGenerator.get_params(), "clip": [CLIP_START, CLIP_END]}
+    return SongStore.get_version(params), params
+
+
+def get_video_ids(urls: dict) -> Dict[str, str]:
+    """노래 이름별 정규화된 유튜브 영상 ID"""
+    video_ids = {}
+    for name, url in urls.items():
+        try:
+            video_ids[name] = normalize_video_id(url)
+        except ValueError as e:
+            logger.warning(f"{e}")
+    return video_ids
+
+
+def find_missing_songs(urls: dict, video_ids: Dict[str, str], version: str) -> Dict[str, str]:
+    """저장소에 없는 노래만 골라서 영상 ID -> URL로 반환 (중복 영상은 한 번만)"""
+    missing = {}
+    for name, video_id in video_ids.items():
+        if SongStore.contains(version, video_id):
+            logger.info(f"\t저장소에 있음: {name} ({video_id})")
+            continue
+        missing.setdefault(video_id, urls[name])
+
+    logger.info(f"저장소에 있는 노래: {len(set(video_ids.values())) - len(missing)}개")
+    logger.info(f"새로 처리할 노래: {len(missing)}개")
+    return missing
+
+
 def download_youtube_audios(
     urls: dict,
 ) -> Path:
     # YouTube URL에서 오디오 다운로드
-    AudioDownloader.set_config(start="00:00:00", end="00:00:30")
+    AudioDownloader.set_config(start=CLIP_START, end=CLIP_END)
 
     for name, url in urls.items():
         AudioDownloader.download_audio(name, url)
 
 
+def fingerprint_audio(audio_data, sample_rate: int) -> CompactAudioprint:
+    """디코딩한 오디오의 압축 지문 생성"""
+    with Profiler.stage("fingerprint"):
+        hashes, times = AudioprintGenerator.get_spectrogram_hashes(audio_data, sample_rate)
+        audioprint = CompactAudioprint.from_hash_arrays(
+            hashes, times, AudioprintGenerator.hop_size / sample_rate
+        )
+    print(f" => 해시 수: {len(audioprint)}")
+    return audioprint
+
+
+def decode_audioprints(urls: dict) -> List[Tuple[str, Any]]:
+    """
+    노래 구간을 WAV 파일로 내려받지 않고 스트림에서 바로 디코딩하여 지문 생성
+    (영상 ID -> URL, 디코딩/지문 생성에 실패한 노래는 건너뜀)
+    """
+    AudioDownloader.set_config(start=CLIP_START, end=CLIP_END)
+    logger.info(f"노래 구간을 바로 디코딩하여 오디오 지문으로 변환 중...")
+
+    audioprints = []
+    for video_id, url in urls.items():
+        try:
+            with Profiler.stage("decode_audio"):
+                audio_data, (_, _, sample_rate) = AudioDownloader.decode_audio(url)
+            audioprints.append((video_id, fingerprint_audio(audio_data, sample_rate)))
+        except Exception:
+            logger.error(f"지문 생성 실패: {video_id}")
+            traceback.print_exc()
+
+    if not audioprints:
+        raise Exception("아무 지문도 생성하지 못했습니다.")
+
+    logger.info(f"지문 생성 완료: 성공 {len(audioprints)}개 실패 {len(urls) - len(audioprints)}개")
+    return audioprints
+
+
 def generate_audioprints() -> List[Tuple[str, Any]]:
+    import essentia.standard as es
+
     logger.info(f"다운로드한 오디오를 오디오 지문으로 변환 중...")
 
     processed_count = 0  # 지문 변환 성공 횟수
@@ -88,16 +174,17 @@ def generate_audioprints() -> List[Tuple[str, Any]]:
 
     # 디렉토리에서 오디오 파일들을 읽어서 오디오 지문 변환
     for audio_path in AudioDownloader.get_downloads_path():
-        # 오디오의 노래 제목 가져오기
+        # 오디오 파일 이름(영상 ID) 가져오기
         audio_name = re.sub(r"(.*?)\s+\[[^\]]*\]$", r"\1", Path(audio_path).stem)
 
         try:
             # 오디오 파일 로드 및 지문 생성
-            _, _, sample_rate = AudioDownloader.get_audio_metadata(audio_path)
-            audio_path = es.MonoLoader(filename=str(audio_path), sampleRate=sample_rate)()
+            with Profiler.stage("decode_audio"):
+                _, _, sample_rate = AudioDownloader.get_audio_metadata(audio_path)
+                audio_path = es.MonoLoader(filename=str(audio_path), sampleRate=sample_rate)()
 
-            # 오디오 지문 생성
-            audioprint = AudioprintGenerator.get_spectrogram_fingerprint(audio_path, sample_rate)
+            # 오디오 지문 생성 (압축 지문 형식)
+            audioprint = fingerprint_audio(audio_path, sample_rate)
         except Exception as e:
             # 지문 생성 실패 시
             failed_count += 1
@@ -120,16 +207,48 @@ def generate_audioprints() -> List[Tuple[str, Any]]:
 
 def save_audioprints(
     audioprints: List[Tuple[str, Any]],
-    worldcup_name: str,
+    version: str,
+    encoding: str = None,
 ) -> tuple:
     """
-    다운로드된 오디오 파일에서 지문을 생성하고 데이터베이스에 저장합니다.
+    생성한 오디오 지문을 영상 ID 기준으로 전역 노래 저장소에 저장합니다.
     """
-    logger.info(f"오디오 지문 데이터베이스에 저장 중...")
+    logger.info(f"오디오 지문 저장소에 저장 중...")
+
+    for video_id, audioprint in audioprints:
+        SongStore.save(version, video_id, audioprint, encoding)
+        logger.info(f"지문 저장 완료: {video_id}")
+
+
+def save_worldcup_manifest(video_ids: Dict[str, str], version: str, worldcup_name: str):
+    """저장소에 있는 노래만 월드컵 매니페스트에 기록합니다."""
+    songs = {}
+    for name, video_id in video_ids.items():
+        if not SongStore.contains(version, video_id):
+            logger.warning(f"지문이 없어 월드컵에서 제외: {name} ({video_id})")
+            continue
+        songs[name] = video_id
+
+    manifest_path = FileDB.save_manifest(worldcup_name, version, songs)
+    logger.info(f"월드컵 매니페스트 저장 완료: {manifest_path} ({len(songs)}곡)")
 
-    for name, audioprint in audioprints:
-        FileDB.save_audioprint(name, audioprint, worldcup_name)
-        logger.info(f"지문 저장 완료: {name}")
+    # 역색인이 있으면 바뀐 노래만 반영
+    FileDB.sync_index(worldcup_name)
+
+
+def build_worldcup_index(worldcup_name: str, max_hash_postings: int = None):
+    """
+    월드컵 역색인이 없으면 새로 구축합니다.
+    전체 길이 지문은 노래당 포스팅이 많아 타임라인 생성 시 역색인(메모리 매핑 세그먼트)으로 매칭합니다.
+    """
+    worldcup_path = FileDB.get_worldcup_path(worldcup_name)
+    if WorldcupIndex.exists(worldcup_path):
+        return
+
+    generation = WorldcupIndex.build(
+        worldcup_path, FileDB.load_audioprints(worldcup_name), max_hash_postings=max_hash_postings
+    )
+    logger.info(f"월드컵 역색인 구축 완료: {worldcup_name} (세대 {generation})")
 
 
 # 메임 함수 인자
@@ -137,6 +256,17 @@ def save_audioprints(
 class TypedArgs:
     url_file: Path
     worldcup_name: str
+    encoding: str
+    peak_picker: str
+    peaks_per_second: int
+    direct_decode: bool
+    full_length: bool
+    max_hash_postings: int
+    workers: int
+    use_host_profile: bool
+    profile: bool
+    profile_sample: bool
+    profile_output: str
 
 
 def get_parameters():
@@ -152,13 +282,80 @@ def get_parameters():
         help="YouTube URL이 포함된 텍스트 파일 경로",
     )
     parser.add_argument("-n", "--name", help="지문 컬렉션 이름 (지문 생성 시 필수)")
+    parser.add_argument(
+        "-e",
+        "--encoding",
+        choices=SongStore.ENCODINGS,
+        default=SongStore.default_encoding,
+        help="지문 저장 형식 (compact: 메모리 매핑 가능한 압축 지문, compact_z: zlib 압축 지문)",
+    )
+    parser.add_argument(
+        "-p",
+        "--peak-picker",
+        choices=AudioprintGenerator.PEAK_PICKERS,
+        default=AudioprintGenerator.peak_picker,
+        help="피크 선택 방식 (band: 프레임별 대역 피크, constellation: 시간-주파수 지역 최대값)",
+    )
+    parser.add_argument(
+        "--peaks-per-second",
+        type=int,
+        default=None,
+        help="constellation 방식의 초당 목표 피크 수",
+    )
+    parser.add_argument(
+        "--direct-decode",
+        action="store_true",
+        help="WAV 파일로 내려받지 않고 가장 작은 충분한 오디오 형식에서 바로 노래 구간을 디코딩",
+    )
+    parser.add_argument(
+        "--full-length",
+        action="store_true",
+        help=(
+            f"앞부분 30초 대신 노래 전체로 지문을 만들고 월드컵 역색인을 구축 "
+            f"({FULL_LENGTH_END}보다 긴 노래는 뒷부분이 잘림, 지문 프레임 인덱스 범위 제한)"
+        ),
+    )
+    parser.add_argument(
+        "--max-hash-postings",
+        type=int,
+        default=None,
+        help="--full-length 역색인 전체에서 포스팅이 이 수보다 많은 흔한 해시 제외 (기본값: 제외하지 않음)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="지문 파일 로드 작업자 수 (기본값: 호스트 프로필 또는 CPU 수)",
+    )
+    parser.add_argument(
+        "--no-host-profile",
+        action="store_true",
+        help="python -m main.tune으로 저장한 호스트 프로필을 사용하지 않음",
+    )
+    Profiler.add_arguments(parser)
     args = parser.parse_args()
 
     # 모듈 실행 파라미터 출력
     logger.info(f"URL 파일: {args.urls}")
     logger.info(f"월드컵 지문 이름: {args.name}")
-
-    return TypedArgs(Path(args.urls), args.name)
+    logger.info(f"지문 저장 형식: {args.encoding}")
+    logger.info(f"피크 선택 방식: {args.peak_picker}")
+
+    return TypedArgs(
+        Path(args.urls),
+        args.name,
+        args.encoding,
+        args.peak_picker,
+        args.peaks_per_second,
+        args.direct_decode,
+        args.full_length,
+        args.max_hash_postings,
+        args.workers,
+        not args.no_host_profile,
+        args.profile,
+        args.profile_sample,
+        args.profile_output,
+    )
 
 
 def main():
@@ -166,26 +363,61 @@ def main():
     # 메인 함수 인자 가져오기
     print()
     args = get_parameters()
+    configure_host(workers=args.workers, use_profile=args.use_host_profile)
 
     # 유튜브 url 리스트 읽기
     print()
     youtube_urls = read_youtube_urls(args.url_file)
 
-    # 유튜브 오디오 배치 다운로드 수행
+    # 저장소에 없는 노래 찾기
     print()
-    download_youtube_audios(youtube_urls)
+    AudioprintGenerator.set_peak_picker(args.peak_picker, args.peaks_per_second)
+    if args.full_length:
+        set_clip_range(CLIP_START, FULL_LENGTH_END)
+    version, params = get_store_version()
+    SongStore.register_version(version, params)
+    video_ids = get_video_ids(youtube_urls)
+    missing_urls = find_missing_songs(youtube_urls, video_ids, version)
+
+    if args.profile:
+        Profiler.enable(sample=args.profile_sample)
 
-    # 오디오 지문 생성
     try:
-        print()
-        audioprints = generate_audioprints()
+        if missing_urls and args.direct_decode:
+            # 노래 구간을 바로 디코딩하여 지문 생성 (영상 ID 기준)
+            print()
+            with Profiler.stage("generate_audioprints"):
+                audioprints = decode_audioprints(missing_urls)
+        elif missing_urls:
+            # 유튜브 오디오 배치 다운로드 수행 (파일 이름 = 영상 ID)
+            print()
+            with Profiler.stage("download"):
+                download_youtube_audios(missing_urls)
 
-        # 오디오 지문 저장
+            # 오디오 지문 생성
+            print()
+            with Profiler.stage("generate_audioprints"):
+                audioprints = generate_audioprints()
+
+        if missing_urls:
+            # 오디오 지문 저장
+            print()
+            with Profiler.stage("save_audioprints"):
+                save_audioprints(audioprints, version, args.encoding)
+
+        # 월드컵 매니페스트 저장
         print()
-        save_audioprints(audioprints, args.worldcup_name)
+        with Profiler.stage("save_worldcup_manifest"):
+            save_worldcup_manifest(video_ids, version, args.worldcup_name)
+
+        if args.full_length:
+            print()
+            with Profiler.stage("build_worldcup_index"):
+                build_worldcup_index(args.worldcup_name, args.max_hash_postings)
     finally:
         # 다운로드한 오디오 삭제
         AudioDownloader.clean_out()
+        Profiler.report(args.profile_output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,236 @@
+"""
+성능 벤치마크 메인 모듈
+"""
+
+import argparse
+import sys
+import traceback
+from pathlib import Path
+
+
+def startup(args):
+    from src.benchmark.startup import print_startup_results, run_startup_benchmark
+
+    print_startup_results(run_startup_benchmark())
+
+
+def peaks(args):
+    from src.benchmark.peak_picker import print_peak_picker_results, run_peak_picker_benchmark
+
+    print_peak_picker_results(run_peak_picker_benchmark())
+
+
+def download(args):
+    from src.benchmark.segmented_download import (
+        print_segmented_download_results,
+        run_segmented_download_benchmark,
+    )
+
+    print_segmented_download_results(run_segmented_download_benchmark())
+
+
+def direct_download(args):
+    from src.benchmark.direct_download import (
+        print_direct_download_results,
+        run_direct_download_benchmark,
+    )
+
+    print_direct_download_results(run_direct_download_benchmark())
+
+
+def incremental(args):
+    from src.benchmark.incremental import print_incremental_results, run_incremental_benchmark
+
+    print_incremental_results(run_incremental_benchmark())
+
+
+def batch(args):
+    from src.benchmark.batch_matching import print_batch_matching_results, run_batch_matching_benchmark
+
+    print_batch_matching_results(run_batch_matching_benchmark())
+
+
+def global_voting(args):
+    from src.benchmark.global_voting import print_global_voting_results, run_global_voting_benchmark
+
+    print_global_voting_results(run_global_voting_benchmark())
+
+
+def live(args):
+    from src.benchmark.live import print_live_results, run_live_benchmark
+
+    print_live_results(run_live_benchmark(args.songs, args.speed, args.latency))
+
+
+def add_live_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--songs", type=int, default=3, help="합성 노래 수")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (1이면 실시간)")
+    parser.add_argument("--latency", type=float, default=15.0, help="보고 지연 상한 (초)")
+
+
+def library(args):
+    from src.benchmark.library import print_library_results, run_library_benchmark
+
+    print_library_results(run_library_benchmark(args.songs, args.decoys, args.workers))
+
+
+def add_library_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--songs", type=int, default=10, help="합성 노래 수")
+    parser.add_argument("--decoys", type=int, default=200, help="라이브러리에 추가할 가짜 노래 수")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2], help="비교할 작업 프로세스 수 목록"
+    )
+
+
+def index_build(args):
+    from src.benchmark.index_build import print_index_build_results, run_index_build_benchmark
+
+    print_index_build_results(run_index_build_benchmark(args.songs, args.workers))
+
+
+def add_index_build_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--songs", type=int, nargs="+", default=[32, 128, 512, 1024], help="역색인을 구축할 노래 수 목록"
+    )
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=None, help="비교할 작업자 수 목록 (기본값: CPU 수)"
+    )
+
+
+def full_length(args):
+    from src.benchmark.full_length import print_full_length_results, run_full_length_benchmark
+
+    print_full_length_results(run_full_length_benchmark(args.songs, args.max_hash_postings))
+
+
+def add_full_length_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--songs", type=int, default=6, help="합성 노래 수")
+    parser.add_argument(
+        "--max-hash-postings",
+        type=int,
+        default=None,
+        help="흔한 해시 제외 상한 (기본값: 포스팅 기준 해시 빈도 99% 분위수)",
+    )
+
+
+def fingerprint_pool(args):
+    from src.benchmark.fingerprint_pool import (
+        print_fingerprint_pool_results,
+        run_fingerprint_pool_benchmark,
+    )
+
+    print_fingerprint_pool_results(run_fingerprint_pool_benchmark(args.clips, args.workers))
+
+
+def add_fingerprint_pool_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--clips", type=int, default=16, help="짧은 노래 구간 수")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=None, help="비교할 작업자 수 목록 (기본값: CPU 수)"
+    )
+
+
+def replay(args):
+    from src.benchmark.replay import print_replay_results, run_replay_benchmark
+
+    print_replay_results(run_replay_benchmark(args.recording, args.repeat))
+
+
+def add_replay_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--recording",
+        type=Path,
+        default=None,
+        help="python -m main.timeline --record로 녹화한 디렉토리 (없으면 합성 스트림 녹화)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="방식별 반복 횟수 (최소 시간 사용)")
+
+
+def kernels(args):
+    from src.benchmark.kernels import (
+        compare_results,
+        load_baseline,
+        print_comparisons,
+        print_kernel_results,
+        run_kernel_benchmarks,
+        save_baseline,
+    )
+
+    results = run_kernel_benchmarks(args.sizes, args.kernels)
+    print_kernel_results(results)
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"기준값 저장: {args.save}")
+    if args.compare:
+        comparisons = compare_results(results, load_baseline(args.compare))
+        if print_comparisons(comparisons, args.tolerance):
+            sys.exit(1)
+
+
+def add_kernel_arguments(parser: argparse.ArgumentParser):
+    from src.benchmark.kernels import DEFAULT_TOLERANCE, SIZES
+
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), help="측정할 입력 크기 (기본값: 전체)")
+    parser.add_argument("--kernels", nargs="+", help="이름에 포함된 함수만 측정")
+    parser.add_argument("--save", type=Path, help="측정 결과를 저장할 JSON 기준값 파일")
+    parser.add_argument("--compare", type=Path, help="비교할 JSON 기준값 파일 (느려진 항목이 있으면 종료 코드 1)")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"느려짐으로 표시할 기준값 대비 증가 비율 (기본값: {DEFAULT_TOLERANCE})",
+    )
+
+
+COMMANDS = {
+    "startup": (startup, "CLI 시작 시간(time-to-first-chunk) 측정"),
+    "peaks": (peaks, "피크 선택 방식별 지문 크기/매칭 시간/정확도 비교"),
+    "download": (download, "로컬 HTTP 원본으로 구간 분할 병렬 디코딩 시간 측정"),
+    "direct": (direct_download, "WAV 다운로드/변환 경로와 스트림 직접 PCM 디코딩의 시간/디스크 기록량 비교"),
+    "incremental": (incremental, "윈도우별 매칭과 증분 슬라이딩 윈도우 매칭 시간/결과 비교"),
+    "batch": (batch, "윈도우별 매칭과 (윈도우 × 노래) 일괄 매칭 시간/결과 비교"),
+    "kernels": (kernels, "핫 함수별 마이크로 벤치마크 (JSON 기준값 저장/비교)"),
+    "global": (global_voting, "윈도우별 매칭과 윈도우 없는 전역 오프셋 투표 시간/타임라인 비교"),
+    "library": (library, "모든 월드컵 노래의 샤드 역색인 구축/분산 매칭 시간과 결과 비교"),
+    "index": (index_build, "노래 수별 월드컵 역색인 구축(지문 로드, 포스팅 병렬 정렬) 시간 측정"),
+    "full": (full_length, "노래 앞부분 30초/전체 길이 지문 역색인의 크기/매칭 시간/노래 중간 재생 감지 비교"),
+    "fingerprint": (fingerprint_pool, "순차/스레드 풀/프로세스 풀 지문 생성 시간과 결과 비교 (작업자 수별, GIL 비율)"),
+    "replay": (replay, "녹화한 매칭 작업(윈도우 지문, 노래 지문 스냅샷)을 오디오 없이 재생하여 매칭 시간/결과 측정"),
+    "live": (live, "합성 스트림을 실시간으로 기록하며 라이브 감지 지연/CPU 사용률/정확도 측정"),
+}
+
+
+# 명령별 추가 인수
+COMMAND_ARGUMENTS = {
+    "fingerprint": add_fingerprint_pool_arguments,
+    "full": add_full_length_arguments,
+    "index": add_index_build_arguments,
+    "kernels": add_kernel_arguments,
+    "library": add_library_arguments,
+    "live": add_live_arguments,
+    "replay": add_replay_arguments,
+}
+
+
+def parse_arguments():
+    """명령줄 인수를 파싱합니다."""
+    parser = argparse.ArgumentParser(description="성능 벤치마크")
+    subparsers = parser.add_subparsers(dest="command", required=True, help="실행할 벤치마크")
+    for command_name, (_, help_text) in COMMANDS.items():
+        subparser = subparsers.add_parser(command_name, help=help_text)
+        if command_name in COMMAND_ARGUMENTS:
+            COMMAND_ARGUMENTS[command_name](subparser)
+    return parser.parse_args()
+
+
+def main():
+    """메인 실행 함수"""
+    args = parse_arguments()
+    COMMANDS[args.command][0](args)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"벤치마크 실패: {e}")
+        traceback.print_exc()
@@ -0,0 +1,243 @@
+"""
+월드컵 역색인 구축 및 증분 갱신(추가/삭제/교체/병합) 메인 모듈
+"""
+
+from dataclasses import dataclass
+import argparse
+import logging
+import subprocess
+import sys
+import time
+import traceback
+from typing import Tuple
+
+from src.utils.compact_audioprint import MAX_FRAME_INDEX
+from src.utils.file_db import FileDB
+from src.utils.song_store import SongStore
+from src.utils.worldcup_index import WorldcupIndex
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def fingerprint_song(worldcup_name: str, name: str, url: str) -> Tuple[str, str]:
+    """노래 하나의 지문을 저장소에서 가져오거나 새로 생성하고 (저장소 버전, 영상 ID)를 반환합니다."""
+    # 지문 생성 모듈은 필요할 때만 로드 (essentia, yt_dlp)
+    from main.audioprint.__main__ import (
+        download_youtube_audios,
+        set_clip_range,
+        find_missing_songs,
+        generate_audioprints,
+        get_store_version,
+        get_video_ids,
+        save_audioprints,
+    )
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.youtube_download.audio import AudioDownloader
+
+    # 월드컵과 같은 피크 선택 방식/노래 구간으로 지문 생성
+    manifest = FileDB.load_manifest(worldcup_name)
+    if manifest:
+        params = SongStore.load_params(manifest["version"])
+        if params is not None:
+            AudioprintGenerator.apply_params(params)
+            if "clip" in params:
+                set_clip_range(*params["clip"])
+
+    version, params = get_store_version()
+    if manifest and manifest["version"] != version:
+        raise ValueError(
+            f"월드컵 지문 버전({manifest['version']})이 현재 버전({version})과 다릅니다. 월드컵을 다시 생성하세요."
+        )
+    SongStore.register_version(version, params)
+
+    urls = {name: url}
+    video_ids = get_video_ids(urls)
+    if name not in video_ids:
+        raise ValueError(f"유튜브 영상 ID를 추출할 수 없습니다: {url}")
+
+    missing_urls = find_missing_songs(urls, video_ids, version)
+    try:
+        if missing_urls:
+            download_youtube_audios(missing_urls)
+            save_audioprints(generate_audioprints(), version)
+    finally:
+        AudioDownloader.clean_out()
+
+    return version, video_ids[name]
+
+
+def update_manifest(worldcup_name: str, version: str, added: dict = None, removed: list = None):
+    """월드컵 매니페스트에 추가/삭제 반영"""
+    manifest = FileDB.load_manifest(worldcup_name)
+    if manifest is None:
+        if not added:
+            return
+        manifest = {"version": version, "songs": {}}
+
+    songs = manifest["songs"]
+    for name in removed or []:
+        songs.pop(name, None)
+    songs.update(added or {})
+    FileDB.save_manifest(worldcup_name, manifest["version"], songs)
+
+
+def merge_if_needed(worldcup_name: str):
+    """
+    델타 세그먼트가 많거나 상한을 넘은 해시의 포스팅이 남아 있으면 별도 프로세스에서 백그라운드 병합 시작
+    (이미 병합 중이면 시작하지 않음, 병합은 병합 잠금으로 하나씩 실행)
+    """
+    worldcup_path = FileDB.get_worldcup_path(worldcup_name)
+    index = WorldcupIndex.open(worldcup_path)
+    if not index.needs_merge:
+        return
+    if WorldcupIndex.is_merging(worldcup_path):
+        logger.info("이미 백그라운드 병합이 진행 중입니다.")
+        return
+
+    logger.info(
+        f"델타 세그먼트 {index.delta_segment_count}개, 상한 초과 포스팅이 남은 세그먼트 "
+        f"{index.stale_segment_count}개: 백그라운드 병합 시작"
+    )
+    subprocess.Popen(
+        [sys.executable, "-m", "main.index", "merge", "--worldcup", worldcup_name],
+        start_new_session=True,
+    )
+
+
+def build(args):
+    audioprints = FileDB.load_audioprints(args.worldcup, args.workers)
+    if not audioprints:
+        raise ValueError(f"해당 worldcup id({args.worldcup})가 존재하지 않습니다.")
+    return WorldcupIndex.build(
+        FileDB.get_worldcup_path(args.worldcup), audioprints, args.workers, args.max_hash_postings
+    )
+
+
+def add(args):
+    version, video_id = fingerprint_song(args.worldcup, args.name, args.url)
+    generation = WorldcupIndex.update(
+        FileDB.get_worldcup_path(args.worldcup),
+        added={args.name: SongStore.load(version, video_id)},
+    )
+    update_manifest(args.worldcup, version, added={args.name: video_id})
+    return generation
+
+
+def remove(args):
+    generation = WorldcupIndex.update(
+        FileDB.get_worldcup_path(args.worldcup), removed=[args.name]
+    )
+    update_manifest(args.worldcup, None, removed=[args.name])
+    return generation
+
+
+def replace(args):
+    version, video_id = fingerprint_song(args.worldcup, args.name, args.url)
+    generation = WorldcupIndex.update(
+        FileDB.get_worldcup_path(args.worldcup),
+        added={args.name: SongStore.load(version, video_id)},
+        removed=[args.name],
+    )
+    update_manifest(args.worldcup, version, added={args.name: video_id})
+    return generation
+
+
+def merge(args):
+    return WorldcupIndex.merge(FileDB.get_worldcup_path(args.worldcup))
+
+
+def status(args):
+    index = FileDB.load_index(args.worldcup)
+    if index is None:
+        raise ValueError(f"월드컵 역색인이 없습니다: {args.worldcup}")
+
+    print(f"세대: {index.generation}")
+    print(f"노래 수: {len(index)}")
+    print(f"세그먼트: {len(index.segments)}개 (델타 {index.delta_segment_count}개)")
+    if index.max_hash_postings:
+        print(
+            f"해시당 최대 포스팅: {index.max_hash_postings}개 "
+            f"(역색인 전체 기준, 초과 해시 {len(index.capped_hashes)}개 제외)"
+        )
+        if index.stale_segment_count:
+            print(f"\t상한 초과 포스팅이 남은 세그먼트: {index.stale_segment_count}개 (조회 시 제외, merge로 정리)")
+    if index.live_songs.any():
+        max_minutes = MAX_FRAME_INDEX * index.frame_durations[index.live_songs].max() / 60
+        print(f"노래 지문 최대 길이: 약 {max_minutes:.1f}분 (더 긴 노래는 뒷부분이 잘림)")
+    for segment in index.segments:
+        print(f"\t{segment.name}: 포스팅 {len(segment)}개")
+    return index.generation
+
+
+@dataclass
+class Command:
+    func: callable
+    help: str
+    needs_name: bool = False
+    needs_url: bool = False
+    needs_workers: bool = False
+
+
+COMMANDS = {
+    "build": Command(build, "월드컵 지문으로 역색인 전체 구축", needs_workers=True),
+    "add": Command(add, "노래 추가 (델타 세그먼트)", needs_name=True, needs_url=True),
+    "remove": Command(remove, "노래 삭제", needs_name=True),
+    "replace": Command(replace, "노래 교체 (삭제 + 추가)", needs_name=True, needs_url=True),
+    "merge": Command(merge, "세그먼트 병합 및 삭제된 포스팅 정리"),
+    "status": Command(status, "역색인 상태 출력"),
+}
+
+
+def parse_arguments():
+    """명령줄 인수를 파싱합니다."""
+    parser = argparse.ArgumentParser(description="월드컵 역색인 구축 및 증분 갱신")
+    subparsers = parser.add_subparsers(dest="command", required=True, help="실행할 명령")
+
+    for command_name, command in COMMANDS.items():
+        command_parser = subparsers.add_parser(command_name, help=command.help)
+        command_parser.add_argument("-w", "--worldcup", required=True, help="월드컵 이름")
+        if command.needs_name:
+            command_parser.add_argument("-n", "--name", required=True, help="노래 이름")
+        if command.needs_url:
+            command_parser.add_argument("-u", "--url", required=True, help="노래 YouTube URL")
+        if command.needs_workers:
+            command_parser.add_argument(
+                "--workers",
+                type=int,
+                default=None,
+                help="지문 파일 로드/포스팅 정렬 작업자 수 (기본값: CPU 수, 1이면 순차 처리)",
+            )
+            command_parser.add_argument(
+                "--max-hash-postings",
+                type=int,
+                default=None,
+                help=(
+                    "역색인 전체에서 포스팅이 이 수보다 많은 흔한 해시 제외, 이후 갱신/병합에도 적용 "
+                    "(기본값: 제외하지 않음). 노래 지문은 프레임 인덱스 범위 때문에 약 14분까지만 담깁니다"
+                ),
+            )
+
+    return parser.parse_args()
+
+
+def main():
+    """메인 실행 함수"""
+    args = parse_arguments()
+
+    start = time.perf_counter()
+    generation = COMMANDS[args.command].func(args)
+    elapsed = time.perf_counter() - start
+    logger.info(f"{args.command} 완료: 세대 {generation} ({elapsed:.2f}초)")
+
+    if args.command in ("add", "remove", "replace"):
+        merge_if_needed(args.worldcup)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        logger.error(f"월드컵 역색인 작업 실패: {e}")
+        traceback.print_exc()
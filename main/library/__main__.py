@@ -0,0 +1,81 @@
+"""
+전체 라이브러리(모든 월드컵 노래) 역색인 구축 메인 모듈
+"""
+
+import argparse
+import logging
+import time
+import traceback
+
+from src.utils.file_db import FileDB
+from src.utils.library_index import LibraryIndex
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def build(args):
+    version, songs = FileDB.collect_library_songs(args.version)
+    if not songs:
+        raise ValueError(f"라이브러리에 넣을 노래가 없습니다: {FileDB.base_path}")
+    logger.info(f"라이브러리 노래 {len(songs)}곡 (지문 버전 {version})")
+    library = LibraryIndex.build(FileDB.get_library_path(), songs, version, args.shards)
+    return library
+
+
+def status(args):
+    library = FileDB.load_library()
+    if library is None:
+        raise ValueError("라이브러리 역색인이 없습니다. 먼저 build를 실행하세요.")
+
+    print(f"지문 버전: {library.version}")
+    print(f"노래 수: {len(library)}")
+    print(f"샤드: {library.shard_count}개")
+    for i in range(library.shard_count):
+        lo, hi = library.bounds[i], library.bounds[i + 1]
+        print(f"\t{library.shard_names[i]}: 해시 {lo:#010x} ~ {hi:#010x}, 포스팅 {len(library.shard(i))}개")
+    return library
+
+
+COMMANDS = {
+    "build": (build, "모든 월드컵 노래로 라이브러리 역색인 구축"),
+    "status": (status, "라이브러리 역색인 상태 출력"),
+}
+
+
+def parse_arguments():
+    """명령줄 인수를 파싱합니다."""
+    parser = argparse.ArgumentParser(description="전체 라이브러리 역색인 구축")
+    subparsers = parser.add_subparsers(dest="command", required=True, help="실행할 명령")
+
+    build_parser = subparsers.add_parser("build", help=COMMANDS["build"][1])
+    build_parser.add_argument(
+        "--version", default=None, help="라이브러리에 넣을 지문 버전 (기본값: 노래가 가장 많은 버전)"
+    )
+    build_parser.add_argument(
+        "--shards",
+        type=int,
+        default=LibraryIndex.DEFAULT_SHARDS,
+        help=f"해시 범위 샤드 수 (기본값: {LibraryIndex.DEFAULT_SHARDS})",
+    )
+    subparsers.add_parser("status", help=COMMANDS["status"][1])
+    return parser.parse_args()
+
+
+def main():
+    """메인 실행 함수"""
+    args = parse_arguments()
+
+    start = time.perf_counter()
+    library = COMMANDS[args.command][0](args)
+    elapsed = time.perf_counter() - start
+    logger.info(f"{args.command} 완료: {len(library)}곡, 샤드 {library.shard_count}개 ({elapsed:.2f}초)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        logger.error(f"라이브러리 역색인 작업 실패: {e}")
+        traceback.print_exc()
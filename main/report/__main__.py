@@ -0,0 +1,152 @@
+"""
+월드컵 오디오 지문 저장 형식별 크기/속도 리포트 모듈
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import argparse
+import gc
+import multiprocessing
+import pickle
+import shutil
+import tempfile
+import time
+import traceback
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import psutil
+
+from src.utils.compact_audioprint import CompactAudioprint
+from src.utils.file_db import FileDB
+from src.utils.types import TypeConverter
+
+
+@dataclass
+class EncodingReport:
+    encoding: str
+    song_count: int
+    disk_bytes: int  # 전체 파일 크기
+    load_seconds: float  # 전체 로드 시간
+    resident_bytes: int  # 로드 후 증가한 RSS
+    array_bytes: int  # 지문 배열 크기 (압축 지문만 측정 가능)
+
+
+def load_for_matching(file_path: Path):
+    """저장 형식별로 매칭에 사용하는 메모리 표현으로 로드"""
+    if file_path.suffix == ".pkl":
+        # 레거시 경로: float16 pickle -> int32/float32 nb.typed.Dict
+        with open(file_path, "rb") as f:
+            return TypeConverter.convert_numba_dict(pickle.load(f))
+    return CompactAudioprint.load(file_path)
+
+
+def measure_loading(file_paths: List[Path]):
+    """지문 파일을 모두 로드하며 시간과 RSS 증가량 측정 (새 프로세스에서 실행)"""
+    # JIT 컴파일 비용 제외 (작은 지문으로 미리 실행하여 해제된 힙 재사용 방지)
+    TypeConverter.convert_numba_dict({1: np.zeros(2, dtype=np.float16)})
+    gc.collect()
+
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    start = time.perf_counter()
+    loaded = [load_for_matching(path) for path in file_paths]
+    load_seconds = time.perf_counter() - start
+    gc.collect()
+    resident_bytes = process.memory_info().rss - rss_before
+
+    array_bytes = sum(a.nbytes for a in loaded if isinstance(a, CompactAudioprint))
+    return load_seconds, resident_bytes, array_bytes
+
+
+def build_report(worldcup_name: str, encodings: List[str]) -> List[EncodingReport]:
+    """월드컵 지문을 형식별로 다시 저장하여 크기/로드 시간/메모리 측정"""
+    audioprints = FileDB.load_audioprints(worldcup_name)
+    if not audioprints:
+        raise ValueError(f"해당 worldcup id({worldcup_name})가 존재하지 않습니다.")
+
+    print(f"지문 {len(audioprints)}개 로드 완료: {worldcup_name}")
+
+    reports = []
+    work_dir = Path(tempfile.mkdtemp())
+    # 형식마다 새 프로세스에서 측정하여 메모리 재사용 영향을 제거
+    context = multiprocessing.get_context("spawn")
+    try:
+        for encoding in encodings:
+            encoding_dir = work_dir / encoding
+            encoding_dir.mkdir()
+
+            file_paths = []
+            for name, audioprint in audioprints.items():
+                file_path = encoding_dir / f"{name}{FileDB.get_suffix(encoding)}"
+                FileDB.write_audioprint(file_path, audioprint, encoding)
+                file_paths.append(file_path)
+            disk_bytes = sum(path.stat().st_size for path in file_paths)
+
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                load_seconds, resident_bytes, array_bytes = executor.submit(
+                    measure_loading, file_paths
+                ).result()
+
+            reports.append(
+                EncodingReport(
+                    encoding,
+                    len(file_paths),
+                    disk_bytes,
+                    load_seconds,
+                    resident_bytes,
+                    array_bytes,
+                )
+            )
+    finally:
+        shutil.rmtree(work_dir)
+
+    return reports
+
+
+def print_report(reports: List[EncodingReport]):
+    """형식별 측정 결과 출력"""
+    print("-" * 80)
+    print(
+        f"{'형식':<10} {'곡 수':>6} {'디스크/곡(KB)':>14} {'로드/곡(ms)':>12} "
+        f"{'RSS 증가(MB)':>13} {'RSS/곡(KB)':>11} {'배열/곡(KB)':>12}"
+    )
+    for r in reports:
+        n = max(r.song_count, 1)
+        array_per_song = f"{r.array_bytes / n / 1024:.1f}" if r.array_bytes else "-"
+        print(
+            f"{r.encoding:<10} {r.song_count:>6} {r.disk_bytes / n / 1024:>14.1f} "
+            f"{r.load_seconds / n * 1000:>12.2f} {r.resident_bytes / (1024 * 1024):>13.1f} "
+            f"{r.resident_bytes / n / 1024:>11.1f} {array_per_song:>12}"
+        )
+
+
+def parse_arguments():
+    """명령줄 인수를 파싱합니다."""
+    parser = argparse.ArgumentParser(description="오디오 지문 저장 형식별 크기/속도 리포트")
+    parser.add_argument("-w", "--worldcup", required=True, help="측정할 월드컵 이름")
+    parser.add_argument(
+        "-e",
+        "--encodings",
+        nargs="+",
+        choices=FileDB.ENCODINGS,
+        default=list(FileDB.ENCODINGS),
+        help="측정할 지문 저장 형식",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """메인 실행 함수"""
+    args = parse_arguments()
+    reports = build_report(args.worldcup, args.encodings)
+    print_report(reports)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"지문 리포트 생성 실패: {e}")
+        traceback.print_exc()
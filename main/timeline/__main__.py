@@ -7,17 +7,39 @@ import sys
 import traceback
 import argparse
 import gc
+from typing import List
 
+from src.audioprint.audioprint_generator import AudioprintGenerator
+from src.timeline.audio_gate import AudioGate
+from src.timeline.live_detector import LiveReport, LiveTimelineDetector, run_live
 from src.timeline.read_audio import read_audio
+from src.timeline.scan_checkpoint import ScanCheckpoint
+from src.timeline.stream_matcher import StreamMatcher
 from src.timeline.timeline_detector import TimelineDetector
-from src.timeline.timeline_manager import print_not_detected, print_timelines
+from src.timeline.timeline_manager import (
+    print_not_detected,
+    print_timelines,
+    print_worldcup_coverage,
+    split_worldcup_timelines,
+)
+from src.timeline.workload_recording import WorkloadRecorder
 from src.utils.file_db import FileDB
+from src.utils.library_index import LibraryIndex
 from src.utils.formatter import TimeFormatter
-from src.utils.memory_manager import MemoryMonitor
+from src.utils.host_profile import configure_host
+from src.utils.memory_manager import MemoryBudget, MemoryMonitor
+from src.utils.profiler import Profiler
+from src.utils.song_store import SongStore
 from src.youtube_download.audio import AudioDownloader
+from src.youtube_download.live_source import LiveSource
+from src.youtube_download.segmented_audio import SegmentedAudioLoader
 
 IF_TRACE = False
 
+# 호스트 프로필(python -m main.tune)이 없을 때의 청크/홉 크기 (초)
+DEFAULT_CHUNK_SIZE = 60
+DEFAULT_HOP_SIZE = 30
+
 
 # 각 작업 예외 처리 데코레이터 패턴
 def handle_exception(msg):
@@ -46,9 +68,33 @@ class AudioMetadata:
 
 
 @handle_exception(msg="유튜브 오디오 파일을 받아오는 작업을 실패하였습니다")
-def download_youtube(url, start, end):
+def download_youtube(
+    url, start, end, budget: MemoryBudget = None, segments: int = 1, direct_decode: bool = False
+):
     AudioDownloader.set_config(start=start, end=end)
-    audio_data, audio_path = AudioDownloader.load_audio(url)
+    max_decoded_bytes = budget.decode_buffer_limit() if budget is not None else None
+    if direct_decode and segments <= 1:
+        # WAV 파일 변환 없이 가장 작은 충분한 오디오 형식에서 바로 한 번 디코딩
+        audio_data, metadata = AudioDownloader.decode_audio(url, max_decoded_bytes)
+        if audio_data.size == 0:
+            raise ValueError("오디오 다운로드 실패")
+        return audio_data, AudioMetadata(*metadata)
+
+    if segments > 1:
+        # 요청 구간만 구간별로 병렬 디코딩 (전체 영상 다운로드 없음)
+        SegmentedAudioLoader.set_config(segment_count=segments)
+        audio_data, metadata = SegmentedAudioLoader.load_audio(
+            url,
+            TimeFormatter.format_time_to_int(start),
+            TimeFormatter.format_time_to_int(end),
+            max_decoded_bytes,
+            AudioDownloader.download_dir,
+        )
+        if audio_data.size == 0:
+            raise ValueError("오디오 다운로드 실패")
+        return audio_data, AudioMetadata(*metadata)
+
+    audio_data, audio_path = AudioDownloader.load_audio(url, max_decoded_bytes)
     if audio_data.size == 0:
         raise ValueError("오디오 다운로드 실패")
     name, duration, sample_rate = AudioDownloader.get_audio_metadata(audio_path)
@@ -56,8 +102,37 @@ def download_youtube(url, start, end):
     return audio_data, AudioMetadata(name, duration, sample_rate)
 
 
+def apply_worldcup_params(worldcup_name: str):
+    """월드컵 지문과 같은 방식으로 청크 지문을 생성하도록 저장소 버전 파라미터 적용"""
+    manifest = FileDB.load_manifest(worldcup_name)
+    if manifest is None:
+        return
+    params = SongStore.load_params(manifest["version"])
+    if params is not None:
+        AudioprintGenerator.apply_params(params)
+    print(f"피크 선택 방식: {AudioprintGenerator.peak_picker}")
+
+
+@handle_exception(msg="라이브러리 역색인을 가져오는데 실패하였습니다")
+def get_library():
+    library = FileDB.load_library()
+    if library is None:
+        raise ValueError("라이브러리 역색인이 없습니다. python -m main.library build를 먼저 실행하세요.")
+    # 라이브러리 노래 지문과 같은 방식으로 청크 지문 생성
+    params = SongStore.load_params(library.version) if library.version else None
+    if params is not None:
+        AudioprintGenerator.apply_params(params)
+    print(f"피크 선택 방식: {AudioprintGenerator.peak_picker}")
+    return library
+
+
 @handle_exception(msg="DB에서 월드컵 오디오 지문을 가져오는데 실패하였습니다")
 def get_audioprints(worldcup_name: str):
+    # 월드컵 역색인이 있으면 최신 세대 스냅샷 사용 (실행 중에는 세대 고정)
+    index = FileDB.load_index(worldcup_name)
+    if index is not None:
+        return index
+
     # DB 데이터 불러오기
     fingerprints = FileDB.load_audioprints(worldcup_name)
     if not fingerprints:
@@ -66,22 +141,152 @@ def get_audioprints(worldcup_name: str):
     return fingerprints
 
 
+@handle_exception(msg="DB에서 여러 월드컵 오디오 지문을 가져오는데 실패하였습니다")
+def get_worldcups_audioprints(worldcup_names: List[str]):
+    # 공유 노래는 한 번만 매칭하도록 합친 노래 목록과 월드컵별 노래 이름 대응
+    return FileDB.load_worldcups(worldcup_names)
+
+
 @handle_exception(msg="오디오 분석 및 타임라인 생성 작업을 실패하였습니다")
 def generate_timelines(
-    audio_data, metadata: AudioMetadata, fingerprints, chunk_size, hop_size, threshold
+    audio_data,
+    metadata: AudioMetadata,
+    fingerprints,
+    chunk_size,
+    hop_size,
+    threshold,
+    gate: AudioGate = None,
+    budget: MemoryBudget = None,
+    incremental: bool = False,
+    global_voting: bool = False,
+    recorder: WorkloadRecorder = None,
+    checkpoint: ScanCheckpoint = None,
 ):
-    # 오디오 지연 로딩
+    frame_duration = AudioprintGenerator.hop_size / metadata.sample_rate
+    if global_voting:
+        # 윈도우 없이 영상 전체를 한 번만 매칭하여 (노래, 시작 시간) 투표 피크로 타임라인 생성
+        if StreamMatcher.supports(fingerprints, frame_duration):
+            return TimelineDetector.detect_timeline_global(
+                audio_data,
+                metadata.duration,
+                metadata.sample_rate,
+                fingerprints,
+                threshold,
+                gate,
+                budget,
+            )
+        print("전역 투표 조건(노래 지문 프레임 길이 일치)이 맞지 않아 윈도우별 매칭을 사용합니다.")
+
+    if incremental:
+        # 블록별로 한 번만 지문 생성/매칭하고 윈도우 투표 상태를 갱신
+        if chunk_size % hop_size == 0 and StreamMatcher.supports(fingerprints, frame_duration):
+            timeline_chunks = TimelineDetector.detect_timeline_incremental(
+                audio_data,
+                metadata.duration,
+                metadata.sample_rate,
+                fingerprints,
+                chunk_size,
+                hop_size,
+                threshold,
+                gate,
+                budget,
+            )
+            return TimelineDetector.analyze_timeline(timeline_chunks)
+        print("증분 매칭 조건(청크 크기가 홉 크기의 배수, 노래 지문 프레임 길이 일치)이 맞지 않아 윈도우별 매칭을 사용합니다.")
+
+    # 오디오 지연 로딩 (체크포인트가 있으면 다음 청크부터)
+    start_chunk = checkpoint.state.next_chunk if checkpoint is not None else 0
     audio_chunks = read_audio(
-        audio_data, metadata.duration, metadata.sample_rate, chunk_size, hop_size
+        audio_data, metadata.duration, metadata.sample_rate, chunk_size, hop_size, budget, start_chunk
     )
+    if recorder is not None:
+        # 윈도우 지문과 게이트 판정을 녹화하고 감지에는 녹화한 지문/판정 사용
+        audio_chunks = recorder.record(audio_chunks, gate)
+        gate = recorder.gate
 
     # 오디오에서 타임라인 탐지
     timeline_chunks = TimelineDetector.detect_timeline(
-        audio_chunks, fingerprints, hop_size, threshold
+        audio_chunks, fingerprints, hop_size, threshold, gate, budget, checkpoint
     )
 
     # 최종 타인라인 데이터 정리
-    timelines = TimelineDetector.analyze_timeline(timeline_chunks)
+    try:
+        timelines = TimelineDetector.analyze_timeline(timeline_chunks, checkpoint)
+    except BaseException:
+        # 중단되면 마지막으로 처리를 마친 위치까지 기록
+        if checkpoint is not None:
+            checkpoint.save()
+        raise
+    if recorder is not None:
+        recorder.finish(timelines)
+    if checkpoint is not None:
+        checkpoint.finish(timelines)
+    return timelines
+
+
+def checkpoint_settings(args: "TypedArgs") -> dict:
+    """이어서 실행할 때 같아야 하는 검사 설정"""
+    return {
+        "url": args.youtube_url,
+        "worldcup": ",".join(args.worldcups) if args.worldcups else None,
+        "library": args.library,
+        "start_time": args.start_time,
+        "end_time": args.end_time,
+        "chunk_size": args.chunk_size,
+        "hop_size": args.hop_size,
+        "threshold": args.threshold,
+    }
+
+
+@handle_exception(msg="체크포인트를 불러오는데 실패하였습니다")
+def open_checkpoint(args: "TypedArgs"):
+    checkpoint = ScanCheckpoint.open(args.checkpoint, checkpoint_settings(args))
+    state = checkpoint.state
+    return checkpoint, checkpoint.load_audio(), AudioMetadata(state.name, state.duration, state.sample_rate)
+
+
+@handle_exception(msg="체크포인트를 만드는데 실패하였습니다")
+def create_checkpoint(args: "TypedArgs", audio_data, metadata: AudioMetadata):
+    return ScanCheckpoint.create(
+        args.checkpoint,
+        checkpoint_settings(args),
+        audio_data,
+        metadata.name,
+        metadata.duration,
+        metadata.sample_rate,
+    )
+
+
+def print_live_report(report: LiveReport):
+    """라이브 감지 보고 출력"""
+    timeline = report.timeline
+    label = "수정" if report.updated else "감지"
+    print(
+        f"[{TimeFormatter.format_time_to_str(int(report.stream_seconds))}] {label}: "
+        f"{timeline.name} {TimeFormatter.format_time_to_str(timeline.start_time)} "
+        f"{timeline.similarity:.3f}"
+    )
+
+
+@handle_exception(msg="라이브 오디오 타임라인 감지 작업을 실패하였습니다")
+def detect_live(source_spec: str, sample_rate: int, fingerprints, threshold, latency, gate=None):
+    # WAV 파일 소스는 헤더의 샘플레이트를 사용
+    source = LiveSource.open(source_spec, sample_rate)
+    frame_duration = AudioprintGenerator.hop_size / source.sample_rate
+    if not StreamMatcher.supports(fingerprints, frame_duration):
+        source.close()
+        raise ValueError("라이브 모드는 노래 지문 프레임 길이가 스트림 프레임 길이와 같아야 합니다.")
+
+    detector = LiveTimelineDetector(fingerprints, source.sample_rate, latency, threshold, gate)
+    print(f"\t 블록 크기: {detector.block_seconds:.1f}초 (지연 상한 {latency:.0f}초)")
+    timelines = run_live(source, detector, print_live_report)
+
+    used = detector.block_seconds_used
+    if used:
+        print(
+            f"\t 블록 처리 시간: 평균 {sum(used) / len(used):.2f}초, 최대 {max(used):.2f}초 "
+            f"(실시간보다 느린 블록 {detector.slow_blocks}/{len(used)}개)"
+        )
     return timelines
 
 
@@ -89,12 +294,29 @@ def generate_timelines(
 @dataclass
 class TypedArgs:
     youtube_url: str
-    worldcup: str
+    worldcup: str  # 첫 번째 월드컵 (지문 파라미터 기준)
+    worldcups: List[str]
+    library: bool
     start_time: str
     end_time: str
     chunk_size: int
     hop_size: int
     threshold: float
+    use_gate: bool
+    memory_budget: int
+    segments: int
+    direct_decode: bool
+    incremental: bool
+    global_voting: bool
+    record: str
+    checkpoint: str
+    resume: bool
+    live: str
+    latency: float
+    live_sample_rate: int
+    profile: bool
+    profile_sample: bool
+    profile_output: str
 
 
 def parse_arguments():
@@ -103,7 +325,18 @@ def parse_arguments():
         description="유튜브 영상에서 노래 목록의 타임라인 감지"
     )
     parser.add_argument("-u", "--url", type=str, help="월드컵 영상 YouTube URL")
-    parser.add_argument("-w", "--worldcup", required=True, help="감지할 월드컵 이름")
+    songs = parser.add_mutually_exclusive_group(required=True)
+    songs.add_argument(
+        "-w",
+        "--worldcup",
+        nargs="+",
+        help="감지할 월드컵 이름 (여러 개면 영상을 한 번만 지문 생성/매칭하여 월드컵별 타임라인과 커버리지 출력)",
+    )
+    songs.add_argument(
+        "--library",
+        action="store_true",
+        help="월드컵 대신 모든 월드컵 노래(라이브러리 역색인)에서 감지",
+    )
     parser.add_argument(
         "-st", "--start", type=str, default="00:00:00", help="시작 시간 (HH:MM:SS)"
     )
@@ -111,10 +344,18 @@ def parse_arguments():
         "-ed", "--end", type=str, default="00:10:00", help="종료 시간 (HH:MM:SS)"
     )
     parser.add_argument(
-        "-ch", "--chunk", default=60, type=int, help="각 오디오 청크의 감지 크기 (초)"
+        "-ch",
+        "--chunk",
+        default=None,
+        type=int,
+        help=f"각 오디오 청크의 감지 크기 (초, 기본값: 호스트 프로필 또는 {DEFAULT_CHUNK_SIZE})",
     )
     parser.add_argument(
-        "-hp", "--hop", default=30, type=int, help="다음 청크 진행 크기"
+        "-hp",
+        "--hop",
+        default=None,
+        type=int,
+        help=f"다음 청크 진행 크기 (기본값: 호스트 프로필 또는 {DEFAULT_HOP_SIZE})",
     )
     parser.add_argument(
         "-th",
@@ -123,8 +364,125 @@ def parse_arguments():
         type=float,
         help="감지할 최소 유사도 임계값",
     )
+    parser.add_argument(
+        "--gate",
+        action="store_true",
+        help="무음/비음악 구간 건너뛰기 (음악 비율이 낮은 청크는 지문 생성/매칭 생략, 건너뛴 구간 출력)",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=MemoryBudget.parse_size,
+        default=None,
+        help="프로세스 메모리 예산 (예: 2G, 1500M) - 예산에 맞춰 버퍼를 줄이고 처리를 늦춤",
+    )
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=1,
+        help="요청 구간을 나누어 동시에 받아 디코딩할 구간 수 (1이면 전체 다운로드 후 디코딩)",
+    )
+    parser.add_argument(
+        "--direct-decode",
+        action="store_true",
+        help="WAV 파일로 내려받지 않고 가장 작은 충분한 오디오 형식에서 바로 float32 모노 PCM으로 디코딩",
+    )
+    matching = parser.add_mutually_exclusive_group()
+    matching.add_argument(
+        "--incremental",
+        action="store_true",
+        help="홉 크기 블록별로 한 번만 지문 생성/매칭하고 윈도우 투표를 증분 갱신",
+    )
+    matching.add_argument(
+        "--global-voting",
+        action="store_true",
+        help="윈도우 없이 영상 전체를 한 번만 매칭하고 (노래, 시작 시간) 투표 피크로 타임라인 생성",
+    )
+    matching.add_argument(
+        "--live",
+        type=str,
+        default=None,
+        metavar="SOURCE",
+        help="계속 길어지는 오디오 소스를 실시간으로 감지 (- 표준 입력 f32le, 기록 중인 파일, 세그먼트 디렉토리, 라이브 URL)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=15.0,
+        help="라이브 모드에서 노래 구간이 끝난 뒤 보고까지의 지연 상한 (초)",
+    )
+    parser.add_argument(
+        "--live-sample-rate",
+        type=int,
+        default=44100,
+        help="라이브 모드 디코딩 샘플레이트 (WAV 파일 소스는 헤더 값 사용)",
+    )
+    parser.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="윈도우 지문과 노래 지문 스냅샷을 디렉토리에 녹화 (python -m main.benchmark replay로 재생)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="검사 위치/감지 상태/다운로드한 오디오를 디렉토리에 주기적으로 기록하고 확정된 타임라인을 바로 저장",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="--checkpoint 디렉토리의 마지막 체크포인트에서 다운로드 없이 이어서 검사",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=ScanCheckpoint.interval,
+        help="체크포인트 기록 주기 (초)",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="윈도우 지문 여러 개를 모아 (윈도우 × 노래) 행렬로 한 번에 매칭 (감지 후 건너뛸 윈도우도 지문을 만듦)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="numba 병렬 커널 스레드 수 (기본값: 호스트 프로필 또는 CPU 수)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="라이브러리 매칭/지문 파일 로드 작업자 수 (기본값: 호스트 프로필 또는 CPU 수)",
+    )
+    parser.add_argument(
+        "--no-host-profile",
+        action="store_true",
+        help="python -m main.tune으로 저장한 호스트 프로필을 사용하지 않음",
+    )
+    Profiler.add_arguments(parser)
     parser.add_argument("--trace", action="store_true", help="오류 로그 반환 설정")
     args = parser.parse_args()
+    if args.library and (args.incremental or args.global_voting or args.live):
+        parser.error("--library는 윈도우별 매칭에서만 사용할 수 있습니다.")
+    if args.record and (args.library or args.incremental or args.global_voting or args.live):
+        parser.error("--record는 월드컵 윈도우별 매칭에서만 사용할 수 있습니다.")
+    if args.checkpoint and (args.incremental or args.global_voting or args.live or args.record):
+        parser.error("--checkpoint는 윈도우별 매칭에서만 사용할 수 있습니다.")
+    if args.resume and not args.checkpoint:
+        parser.error("--resume은 --checkpoint와 함께 사용해야 합니다.")
+    if args.worldcup and len(args.worldcup) > 1 and args.live:
+        parser.error("--live는 월드컵 하나에서만 사용할 수 있습니다.")
+    ScanCheckpoint.set_config(interval=args.checkpoint_interval)
+    TimelineDetector.set_config(batch_matching=args.batch)
+
+    # 명시하지 않은 병렬 처리/버퍼/청크 설정은 호스트 프로필 값 사용
+    profile = configure_host(args.threads, args.workers, not args.no_host_profile)
+    chunk_size = args.chunk or (profile.chunk_size if profile else DEFAULT_CHUNK_SIZE)
+    hop_size = args.hop or (profile.hop_size if profile else DEFAULT_HOP_SIZE)
 
     # 오류 로그 출력 설정
     global IF_TRACE
@@ -132,29 +490,100 @@ def parse_arguments():
 
     return TypedArgs(
         youtube_url=args.url,
-        worldcup=args.worldcup,
+        worldcup=args.worldcup[0] if args.worldcup else None,
+        worldcups=args.worldcup or [],
+        library=args.library,
         start_time=args.start,
         end_time=args.end,
-        chunk_size=args.chunk,
-        hop_size=args.hop,
+        chunk_size=chunk_size,
+        hop_size=hop_size,
         threshold=args.threshold,
+        use_gate=args.gate,
+        memory_budget=args.memory_budget,
+        segments=args.segments,
+        direct_decode=args.direct_decode,
+        incremental=args.incremental,
+        global_voting=args.global_voting,
+        record=args.record,
+        checkpoint=args.checkpoint,
+        resume=args.resume,
+        live=args.live,
+        latency=args.latency,
+        live_sample_rate=args.live_sample_rate,
+        profile=args.profile,
+        profile_sample=args.profile_sample,
+        profile_output=args.profile_output,
     )
 
 
+def main_live(args: TypedArgs, budget: MemoryBudget = None):
+    """라이브 모드 실행 (다운로드 없이 소스가 끝날 때까지 감지하며 보고)"""
+    print()
+    print("DB에서 오디오 지문 불러오는 중...")
+    with Profiler.stage("load_audioprints"):
+        audioprints = get_audioprints(args.worldcup)
+        apply_worldcup_params(args.worldcup)
+    MemoryMonitor.monitor_system()
+
+    print("\n")
+    print("라이브 타임라인 감지 중...")
+    print(f"\t 소스: {args.live}")
+    print(f"\t 비음악 구간 건너뛰기: {'사용' if args.use_gate else '사용 안 함'}")
+    gate = AudioGate() if args.use_gate else None
+    with Profiler.stage("detect_live"):
+        timelines = detect_live(
+            args.live, args.live_sample_rate, audioprints, args.threshold, args.latency, gate
+        )
+    MemoryMonitor.monitor_system()
+
+    print("\n")
+    print("라이브 타임라인을 출력합니다.")
+    print_timelines(timelines, 0, True)
+    print_timelines(timelines, 0)
+    print_not_detected(audioprints, timelines)
+    if gate is not None:
+        gate.metrics.print_metrics()
+    if budget is not None:
+        budget.print_metrics()
+    Profiler.report(args.profile_output)
+
+
 def main():
     """메인 실행 함수"""
     args = parse_arguments()
 
     # 시작 메모리
     MemoryMonitor.monitor_system()
+    budget = MemoryBudget(args.memory_budget) if args.memory_budget else None
+    if args.profile:
+        Profiler.enable(sample=args.profile_sample)
+
+    if args.live is not None:
+        main_live(args, budget)
+        return
 
     print()
-    print("영상 오디오 다운로드 중...")
-    print(f"URL: {args.youtube_url}")
-    print(f"구간: {args.start_time} ~ {args.end_time}")
-    audio_data, metadata = download_youtube(
-        args.youtube_url, args.start_time, args.end_time
-    )
+    checkpoint = None
+    if args.resume:
+        # 체크포인트에 캐시한 오디오로 이어서 검사 (다운로드 없음)
+        checkpoint, audio_data, metadata = open_checkpoint(args)
+        print(f"체크포인트에서 이어서 검사: {args.checkpoint} (청크 {checkpoint.state.next_chunk}부터)")
+    else:
+        print("영상 오디오 다운로드 중...")
+        print(f"URL: {args.youtube_url}")
+        print(f"구간: {args.start_time} ~ {args.end_time}")
+        with Profiler.stage("download"):
+            audio_data, metadata = download_youtube(
+                args.youtube_url,
+                args.start_time,
+                args.end_time,
+                budget,
+                args.segments,
+                args.direct_decode,
+            )
+        if args.checkpoint:
+            checkpoint = create_checkpoint(args, audio_data, metadata)
+            print(f"체크포인트: {args.checkpoint}")
 
     print(f"- 오디오 정보:")
     print(f"\t이름: {metadata.name}")
@@ -164,29 +593,85 @@ def main():
 
     print()
     print("DB에서 오디오 지문 불러오는 중...")
-    audioprints = get_audioprints(args.worldcup)
+    worldcup_songs = None
+    with Profiler.stage("load_audioprints"):
+        if args.library:
+            audioprints = get_library()
+        elif len(args.worldcups) > 1:
+            audioprints, worldcup_songs = get_worldcups_audioprints(args.worldcups)
+            apply_worldcup_params(args.worldcup)
+            print(f"월드컵 {len(args.worldcups)}개: {', '.join(args.worldcups)} (중복 제외 {len(audioprints)}곡)")
+        else:
+            audioprints = get_audioprints(args.worldcup)
+            apply_worldcup_params(args.worldcup)
     MemoryMonitor.monitor_system()
 
     print("\n")
     print("유튜브 타임라인 생성 중...")
     print(f"\t 청크 크기: {args.chunk_size}초")
     print(f"\t 청크 진행 크기: {args.hop_size}초")
+    print(f"\t 비음악 구간 건너뛰기: {'사용' if args.use_gate else '사용 안 함'}")
     print()
-    timelines = generate_timelines(
-        audio_data,
-        metadata,
-        audioprints,
-        args.chunk_size,
-        args.hop_size,
-        args.threshold,
-    )
+    gate = AudioGate() if args.use_gate else None
+    recorder = None
+    if args.record:
+        print(f"\t 매칭 작업 녹화: {args.record}")
+        recorder = WorkloadRecorder(
+            args.record,
+            audioprints,
+            {
+                "url": args.youtube_url,
+                "worldcup": ",".join(args.worldcups),
+                "start_time": args.start_time,
+                "end_time": args.end_time,
+                "chunk_size": args.chunk_size,
+                "hop_size": args.hop_size,
+                "threshold": args.threshold,
+                "sample_rate": metadata.sample_rate,
+            },
+        )
+    with Profiler.stage("generate_timelines"):
+        timelines = generate_timelines(
+            audio_data,
+            metadata,
+            audioprints,
+            args.chunk_size,
+            args.hop_size,
+            args.threshold,
+            gate,
+            budget,
+            args.incremental,
+            args.global_voting,
+            recorder,
+            checkpoint,
+        )
     MemoryMonitor.monitor_system()
 
     print("\n")
     print("유튜브 타임라인을 출력합니다.")
-    print_timelines(timelines, TimeFormatter.format_time_to_int(args.start_time), True)
-    print_timelines(timelines, TimeFormatter.format_time_to_int(args.start_time))
-    print_not_detected(audioprints, timelines)
+    start_offset = TimeFormatter.format_time_to_int(args.start_time)
+    if worldcup_songs is not None:
+        # 합쳐서 감지한 타임라인을 월드컵별 노래 이름으로 나누어 출력
+        worldcup_timelines = split_worldcup_timelines(timelines, worldcup_songs)
+        for worldcup, worldcup_timeline in worldcup_timelines.items():
+            print()
+            print(f"[월드컵: {worldcup}]")
+            print_timelines(worldcup_timeline, start_offset, True)
+            print_timelines(worldcup_timeline, start_offset)
+            print_not_detected(
+                {name: None for name in worldcup_songs[worldcup].values()}, worldcup_timeline
+            )
+        print_worldcup_coverage(worldcup_timelines, worldcup_songs)
+    else:
+        print_timelines(timelines, start_offset, True)
+        print_timelines(timelines, start_offset)
+        if not isinstance(audioprints, LibraryIndex):
+            print_not_detected(audioprints, timelines)
+    if gate is not None:
+        gate.metrics.print_metrics()
+    if budget is not None:
+        budget.print_metrics()
+    Profiler.report(args.profile_output)
 
 
 if __name__ == "__main__":
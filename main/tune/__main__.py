@@ -0,0 +1,62 @@
+"""
+호스트 성능 자동 조정 메인 모듈
+합성 보정 작업으로 이 호스트의 병렬 처리 수/버퍼 크기/청크 크기를 측정하여 호스트 프로필로 저장
+(main.timeline, main.audioprint가 명시하지 않은 설정의 기본값으로 사용)
+"""
+
+import argparse
+import time
+import traceback
+from pathlib import Path
+
+from src.utils.auto_tuner import print_measurements, run_calibration
+from src.utils.host_profile import HostProfile
+
+
+def parse_arguments():
+    """명령줄 인수를 파싱합니다."""
+    parser = argparse.ArgumentParser(description="호스트 성능 프로필 자동 조정")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help=f"프로필 저장 경로 (기본값: {HostProfile.get_path()})",
+    )
+    parser.add_argument(
+        "--skip-processes",
+        action="store_true",
+        help="작업 프로세스 수 측정 생략 (CPU 수 사용)",
+    )
+    parser.add_argument("--show", action="store_true", help="측정하지 않고 저장된 프로필만 출력")
+    return parser.parse_args()
+
+
+def main():
+    """메인 실행 함수"""
+    args = parse_arguments()
+
+    if args.show:
+        profile = HostProfile.load(args.output)
+        if profile is None:
+            print("이 호스트의 프로필이 없습니다. python -m main.tune을 실행하세요.")
+            return
+        profile.print_profile()
+        print_measurements(profile)
+        return
+
+    start = time.perf_counter()
+    profile = run_calibration(not args.skip_processes)
+    path = profile.save(args.output)
+
+    print()
+    print_measurements(profile)
+    profile.print_profile()
+    print(f"호스트 프로필 저장: {path} ({time.perf_counter() - start:.1f}초)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"호스트 성능 자동 조정 실패: {e}")
+        traceback.print_exc()
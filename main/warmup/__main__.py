@@ -0,0 +1,27 @@
+"""
+numba 커널 워밍업 메인 모듈 (Docker 이미지 빌드 시 실행하여 컴파일 결과를 이미지에 포함)
+"""
+
+import os
+import sys
+import traceback
+
+from src.utils.kernel_warmup import warmup_kernels
+
+
+def main():
+    """메인 실행 함수"""
+    cache_dir = os.environ.get("NUMBA_CACHE_DIR", "(소스 폴더의 __pycache__)")
+    print(f"numba 커널 컴파일 중... (캐시 경로: {cache_dir})")
+    elapsed = warmup_kernels()
+    print(f"커널 워밍업 완료: {elapsed:.2f}초")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"커널 워밍업 실패: {e}")
+        traceback.print_exc()
+        # Docker 빌드가 캐시 없는 이미지를 만들지 않도록 실패 종료 코드 반환
+        sys.exit(1)
@@ -46,13 +46,38 @@ def main():
     timeline_parser.add_argument("-st", "--start", default="00:00:00", help="시작 시간 (HH:MM:SS)")
     timeline_parser.add_argument("-ed", "--end", default="00:10:00", help="종료 시간 (HH:MM:SS)")
     timeline_parser.add_argument(
-        "-ch", "--chunk", type=int, default=30, help="각 오디오 청크의 감지 크기 (초)"
+        "-ch", "--chunk", type=int, default=None, help="각 오디오 청크의 감지 크기 (초, 기본값: 호스트 프로필 또는 30)"
+    )
+    timeline_parser.add_argument(
+        "-hp", "--hop", type=int, default=None, help="다음 청크 진행 크기 (기본값: 호스트 프로필 또는 20)"
     )
-    timeline_parser.add_argument("-hp", "--hop", type=int, default=20, help="다음 청크 진행 크기")
     timeline_parser.add_argument(
         "-th", "--threshold", type=float, default=0.001, help="감지할 최소 유사도 임계값"
     )
 
+    # 지문 저장 형식 리포트 명령어
+    report_parser = subparsers.add_parser("report", help="지문 저장 형식별 크기/속도 리포트")
+    report_parser.add_argument("-w", "--worldcup", required=True, help="측정할 월드컵 이름")
+
+    # 월드컵 역색인 명령어 (main.index 인자를 그대로 전달)
+    index_parser = subparsers.add_parser("index", help="월드컵 역색인 구축 및 증분 갱신")
+    index_parser.add_argument(
+        "index_args", nargs=argparse.REMAINDER, help="build/add/remove/replace/merge/status 명령 인자"
+    )
+
+    # numba 커널 워밍업 명령어
+    subparsers.add_parser("warmup", help="numba 커널 미리 컴파일 (디스크 캐시)")
+
+    # 호스트 성능 자동 조정 명령어 (main.tune 인자를 그대로 전달)
+    tune_parser = subparsers.add_parser("tune", help="호스트 성능 프로필 자동 조정")
+    tune_parser.add_argument("tune_args", nargs=argparse.REMAINDER, help="main.tune 인자")
+
+    # 벤치마크 명령어 (main.benchmark 인자를 그대로 전달)
+    benchmark_parser = subparsers.add_parser("benchmark", help="성능 벤치마크")
+    benchmark_parser.add_argument(
+        "benchmark_args", nargs=argparse.REMAINDER, help="벤치마크 이름 및 인자"
+    )
+
     args = parser.parse_args()
 
     if args.command is None:
@@ -69,6 +94,12 @@ def main():
     elif args.command == "timeline":
         # 타임라인 생성 모듈 로드 및 실행
         from main.timeline.__main__ import main as timeline_main
+        from src.utils.host_profile import HostProfile
+
+        # 호스트 프로필이 없으면 기존 기본값 사용 (있으면 main.timeline이 프로필 값 사용)
+        if HostProfile.load() is None:
+            args.chunk = args.chunk or 30
+            args.hop = args.hop or 20
 
         sys.argv = [
             "timeline",
@@ -80,15 +111,49 @@ def main():
             args.start,
             "--end",
             args.end,
-            "--chunk",
-            str(args.chunk),
-            "--hop",
-            str(args.hop),
             "--threshold",
             str(args.threshold),
         ]
+        if args.chunk is not None:
+            sys.argv += ["--chunk", str(args.chunk)]
+        if args.hop is not None:
+            sys.argv += ["--hop", str(args.hop)]
         timeline_main()
 
+    elif args.command == "report":
+        # 지문 리포트 모듈 로드 및 실행
+        from main.report.__main__ import main as report_main
+
+        sys.argv = ["report", "--worldcup", args.worldcup]
+        report_main()
+
+    elif args.command == "index":
+        # 월드컵 역색인 모듈 로드 및 실행
+        from main.index.__main__ import main as index_main
+
+        sys.argv = ["index", *args.index_args]
+        index_main()
+
+    elif args.command == "warmup":
+        # numba 커널 워밍업 모듈 로드 및 실행
+        from main.warmup.__main__ import main as warmup_main
+
+        warmup_main()
+
+    elif args.command == "tune":
+        # 호스트 성능 자동 조정 모듈 로드 및 실행
+        from main.tune.__main__ import main as tune_main
+
+        sys.argv = ["tune", *args.tune_args]
+        tune_main()
+
+    elif args.command == "benchmark":
+        # 벤치마크 모듈 로드 및 실행
+        from main.benchmark.__main__ import main as benchmark_main
+
+        sys.argv = ["benchmark", *args.benchmark_args]
+        benchmark_main()
+
 
 if __name__ == "__main__":
     main()
@@ -1,8 +1,9 @@
-from collections import defaultdict
-import essentia.standard as es
+import threading
+
 import numpy as np
 import numba as nb
 
+from src.utils.profiler import Profiler
 from src.utils.types import TypeConverter
 
 
@@ -11,112 +12,430 @@ class AudioprintGenerator:
     frame_size = 2048  # ~42.7ms at 48kHz
     hop_size = 640  # 20ms at 48kHz
 
-    # 알고리즘 초기화 (클래스 변수)
-    window = es.Windowing(type="hann")
-    spectrum = es.Spectrum()
-    spectral_peaks = es.SpectralPeaks(
-        orderBy="magnitude",
-        magnitudeThreshold=0.0001,  # 낮은 에너지 피크 무시
-        maxPeaks=30,  # 각 프레임당 최대 피크 수
-        minFrequency=100,  # 최소 주파수 (Hz)
-        maxFrequency=4095,  # 최대 주파수 (Hz)
-    )
+    # 스펙트럼 피크 추출 설정 (클래스 변수)
+    SPECTRAL_PEAKS_PARAMS = {
+        "orderBy": "magnitude",
+        "magnitudeThreshold": 0.0001,  # 낮은 에너지 피크 무시
+        "maxPeaks": 30,  # 각 프레임당 최대 피크 수
+        "minFrequency": 100,  # 최소 주파수 (Hz)
+        "maxFrequency": 4095,  # 최대 주파수 (Hz)
+    }
+
+    # 대역별 피크 선택 설정 (클래스 변수)
+    NUM_BANDS = 5
+    PEAKS_PER_BAND = 6
 
     # 해시 키 생성을 위한 비트 연산 관련 상수 (클래스 변수)
     FREQ_BITS = 12  # 주파수 값을 위한 비트 수 (최대 4096Hz 범위 표현)
     DELTA_MASK = (1 << 12) - 1  # 주파수 차이를 위한 마스크 (12비트)
 
+    # 피크 선택 방식 (band: 프레임별 대역 피크, constellation: 시간-주파수 지역 최대값)
+    PEAK_PICKERS = ("band", "constellation")
+    peak_picker = "band"
+
+    # 2D 성좌(constellation) 피크 선택 설정
+    CONSTELLATION_PARAMS = {
+        "peaks_per_second": 30,  # 초당 목표 피크 수 (1초 블록별 상위 피크만 유지)
+        "neighborhood_frames": 10,  # 지역 최대값 시간 반경 (프레임)
+        "neighborhood_hz": 150,  # 지역 최대값 주파수 반경 (Hz)
+        "min_frequency": 100,  # 최소 주파수 (Hz)
+        "max_frequency": 4095,  # 최대 주파수 (Hz)
+        "min_magnitude": 1e-4,  # 낮은 에너지 피크 무시
+        "fan_out": 10,  # 앵커 피크당 타겟 피크 수
+        "target_frames": 63,  # 타겟 영역 최대 시간 차 (프레임, 6비트)
+        "freq_quant_hz": 16,  # 해시 주파수 양자화 단위 (Hz, 8비트)
+    }
+
+    # 스레드별 기본 생성기 (클래스 메서드 API용)
+    _local = threading.local()
+
+    def __init__(self, verbose: bool = True):
+        """
+        생성기마다 essentia 알고리즘과 피크 행렬 버퍼를 따로 가지므로 스레드마다 하나씩 쓰면 동시에 지문을 만들 수 있습니다.
+        (essentia 프레임 루프는 GIL을 잡으므로 스레드 사이에서 동시에 실행되는 것은 numba 피크 선택/해시 커널뿐)
+        verbose=False면 프레임별 진행 출력과 단계 프로파일링(전역 상태)을 하지 않습니다. (작업 스레드용)
+        """
+        # essentia는 실제로 지문을 만들 때만 로드
+        import essentia.standard as es
+
+        self.verbose = verbose
+        self.window = es.Windowing(type="hann")
+        self.spectrum = es.Spectrum()
+        self.spectral_peaks = es.SpectralPeaks(**self.SPECTRAL_PEAKS_PARAMS)
+        self._peak_matrix = np.zeros((0, 0), dtype=np.float32)
+        self._peak_counts = np.zeros(0, dtype=np.int32)
+
+    @classmethod
+    def default(cls) -> "AudioprintGenerator":
+        """현재 스레드의 기본 생성기 (처음 호출할 때 생성)"""
+        generator = getattr(cls._local, "generator", None)
+        if generator is None:
+            generator = cls._local.generator = cls()
+        return generator
+
+    def _stage(self, name: str):
+        return Profiler.stage(name) if self.verbose else Profiler._null_context
+
+    def _peak_buffers(self, n_frames: int):
+        """(프레임 × 선택 피크) 행렬과 프레임별 피크 수 버퍼 (지문마다 새로 할당하지 않고 늘려서 재사용)"""
+        max_peaks = self.NUM_BANDS * self.PEAKS_PER_BAND
+        if self._peak_matrix.shape[0] < n_frames or self._peak_matrix.shape[1] != max_peaks:
+            capacity = max(n_frames, self._peak_matrix.shape[0])
+            self._peak_matrix = np.zeros((capacity, max_peaks), dtype=np.float32)
+            self._peak_counts = np.zeros(capacity, dtype=np.int32)
+        return self._peak_matrix[:n_frames], self._peak_counts[:n_frames]
+
+    @classmethod
+    def set_peak_picker(cls, peak_picker: str, peaks_per_second: int = None):
+        """피크 선택 방식 설정 (지문 생성과 매칭에 같은 방식을 사용해야 함)"""
+        if peak_picker not in cls.PEAK_PICKERS:
+            raise ValueError(f"지원하지 않는 피크 선택 방식입니다: {peak_picker}")
+        cls.peak_picker = peak_picker
+        if peaks_per_second:
+            cls.CONSTELLATION_PARAMS = {
+                **cls.CONSTELLATION_PARAMS,
+                "peaks_per_second": peaks_per_second,
+            }
+
+    @classmethod
+    def apply_params(cls, params: dict):
+        """저장소 버전 파라미터(get_params 결과)에 맞게 피크 선택 방식 설정"""
+        peak_picker = params.get("peak_picker", "band")
+        if peak_picker == "constellation":
+            cls.CONSTELLATION_PARAMS = dict(params["constellation"])
+        cls.set_peak_picker(peak_picker)
+
+    @classmethod
+    def get_params(cls) -> dict:
+        """지문 결과에 영향을 주는 파라미터 (저장소 버전 계산용)"""
+        params = {
+            "frame_size": cls.frame_size,
+            "hop_size": cls.hop_size,
+            "spectral_peaks": cls.SPECTRAL_PEAKS_PARAMS,
+            "num_bands": cls.NUM_BANDS,
+            "peaks_per_band": cls.PEAKS_PER_BAND,
+            "freq_bits": cls.FREQ_BITS,
+        }
+        # 기본(band) 방식은 기존 저장소 버전을 유지하기 위해 파라미터를 추가하지 않음
+        if cls.peak_picker != "band":
+            params["peak_picker"] = cls.peak_picker
+            params["constellation"] = cls.CONSTELLATION_PARAMS
+        return params
+
     @classmethod
     def get_spectrogram_fingerprint(cls, audio_data, sample_rate=44100):
         """
         스펙트로그램 피크 기반 오디오 지문 생성 (Shazam 유사 접근법)
         """
-        # 지문 데이터 저장소
-        peak_pairs = defaultdict(list)  # 피크 쌍을 이용한 해시 테이블
+        return cls.default().fingerprint(audio_data, sample_rate)
+
+    @classmethod
+    def get_spectrogram_hashes(cls, audio_data, sample_rate=44100, full_frames=False):
+        """
+        스펙트로그램 피크 쌍의 해시 배열과 시간 배열을 생성합니다.
+        full_frames=True면 0번 샘플에서 시작하는 온전한 프레임만 사용합니다.
+        (프레임 i가 샘플 i * hop_size에서 시작하므로 나눠서 만든 블록 지문을 이어 붙일 수 있음)
+        """
+        return cls.default().hashes(audio_data, sample_rate, full_frames)
 
-        # 프레임 인덱스 (시간 정보로 변환 가능)
-        frame_idx = 0
+    def fingerprint(self, audio_data, sample_rate=44100):
+        """이 생성기로 오디오 지문 생성 (get_spectrogram_fingerprint와 같은 결과)"""
+        # 해시/시간 배열 생성 후 해시 기준으로 묶어서 지문 생성
+        hashes, times = self.hashes(audio_data, sample_rate)
+        with self._stage("group_hash_arrays"):
+            audioprint = TypeConverter.group_hash_arrays(hashes, times)
+
+        # 디버깅 정보
+        if self.verbose:
+            print(f" => 해시 수: {len(audioprint)}")
+
+        return audioprint
+
+    def hashes(self, audio_data, sample_rate=44100, full_frames=False):
+        """이 생성기로 해시 배열과 시간 배열 생성 (get_spectrogram_hashes와 같은 결과)"""
+        if self.peak_picker == "constellation":
+            return self.constellation_hashes(audio_data, sample_rate)
+
+        import essentia.standard as es
+
+        # 프레임별 스펙트럼 피크 (프레임 경계는 peak_starts)
+        frequencies = []
+        magnitudes = []
+        peak_starts = [0]
 
         # 각 프레임 처리
-        for frame in es.FrameGenerator(audio_data, frameSize=cls.frame_size, hopSize=cls.hop_size):
-            # 윈도우 적용 및 스펙트럼 계산
-            windowed_frame = cls.window(frame)
-            spectrum_values = cls.spectrum(windowed_frame)
-
-            # 스펙트럼 피크 추출
-            frequencies, magnitudes = cls.spectral_peaks(spectrum_values)
-            # 최적의 피크만 선택 (대역별 선택 방식)
-            frequencies, magnitudes = cls._select_optimal_peaks(frequencies, magnitudes)
-            # 개별 피크 정보 저장 (시간, 주파수, 진폭)
-            time_sec = frame_idx * cls.hop_size / float(sample_rate)
-
-            # Shazam 스타일의 해싱 - 앵커 포인트와 타겟 포인트 쌍 형성
-            pairs = cls._create_peak_pairs_fast(
-                frequencies, time_sec, cls.FREQ_BITS, cls.DELTA_MASK
+        frame_options = {"startFromZero": True, "validFrameThresholdRatio": 1} if full_frames else {}
+        with self._stage("essentia_framing"):
+            for frame in es.FrameGenerator(
+                audio_data, frameSize=self.frame_size, hopSize=self.hop_size, **frame_options
+            ):
+                # 윈도우 적용, 스펙트럼 계산 후 스펙트럼 피크 추출
+                frame_freqs, frame_mags = self.spectral_peaks(self.spectrum(self.window(frame)))
+                frequencies.append(frame_freqs)
+                magnitudes.append(frame_mags)
+                peak_starts.append(peak_starts[-1] + len(frame_freqs))
+
+                if self.verbose:
+                    print(f"\r지문 인식 중: {len(peak_starts) - 1}", end="")
+
+        # 대역별 최적 피크만 골라 피크 행렬 구성 (프레임 × 선택 피크)
+        n_frames = len(peak_starts) - 1
+        peak_matrix, peak_counts = self._peak_buffers(n_frames)
+        with self._stage("_select_band_peaks"):
+            self._select_band_peaks(
+                np.concatenate(frequencies) if n_frames else np.empty(0, dtype=np.float32),
+                np.concatenate(magnitudes) if n_frames else np.empty(0, dtype=np.float32),
+                np.array(peak_starts, dtype=np.int64),
+                self.NUM_BANDS,
+                self.PEAKS_PER_BAND,
+                peak_matrix,
+                peak_counts,
+            )
+        # 프레임 인덱스를 시간(초)으로 변환
+        frame_times = np.arange(n_frames) * self.hop_size / float(sample_rate)
+
+        # Shazam 스타일의 해싱 - 앵커 포인트와 타겟 포인트 쌍 형성
+        with self._stage("_create_peak_pairs_fast"):
+            return self._create_peak_pairs_fast(
+                peak_matrix, peak_counts, frame_times, self.FREQ_BITS, self.DELTA_MASK
+            )
+
+    @classmethod
+    def get_constellation_hashes(cls, audio_data, sample_rate=44100):
+        """
+        2D 성좌 피크 기반 해시 배열과 시간 배열을 생성합니다.
+        스펙트로그램의 시간-주파수 지역 최대값 중 1초 블록별 상위 피크만 남겨 초당 피크 수를 제한하고,
+        앵커 피크와 이후 타겟 영역의 피크를 쌍으로 묶습니다.
+        """
+        return cls.default().constellation_hashes(audio_data, sample_rate)
+
+    def constellation_hashes(self, audio_data, sample_rate=44100):
+        """이 생성기로 성좌 피크 해시 배열과 시간 배열 생성 (get_constellation_hashes와 같은 결과)"""
+        params = self.CONSTELLATION_PARAMS
+
+        with self._stage("spectrogram"):
+            spectrogram, min_bin, bin_hz = self._compute_spectrogram(
+                audio_data, sample_rate, params["min_frequency"], params["max_frequency"]
             )
 
-            # 피크 쌍 사전에 저장
-            for hash_key, time in pairs:
-                peak_pairs[hash_key].append(time)
+        with self._stage("_find_constellation_peaks"):
+            peak_frames, peak_bins, peak_mags = self._find_constellation_peaks(
+                spectrogram,
+                params["neighborhood_frames"],
+                max(int(round(params["neighborhood_hz"] / bin_hz)), 1),
+                params["min_magnitude"],
+            )
 
-            frame_idx += 1
-            print(f"\r지문 인식 중: {frame_idx}", end="")
+        # 1초 블록별 크기 상위 peaks_per_second개만 유지
+        frames_per_second = sample_rate / self.hop_size
+        blocks = (peak_frames / frames_per_second).astype(np.int64)
+        order = np.lexsort((-peak_mags, blocks))
+        block_starts = np.searchsorted(blocks[order], blocks[order], side="left")
+        ranks = np.arange(len(order)) - block_starts
+        keep = np.sort(order[ranks < params["peaks_per_second"]])
 
-        audioprint = TypeConverter.convert_numba_dict(dict(peak_pairs))
+        # 양자화한 주파수 (Hz 기준이라 샘플레이트와 무관)
+        peak_freqs = (peak_bins[keep] + min_bin) * bin_hz
+        quantized = np.minimum(peak_freqs / params["freq_quant_hz"], 255).astype(np.int32)
 
-        # 디버깅 정보
-        print(f" => 해시 수: {len(audioprint)}")
+        frame_times = np.arange(spectrogram.shape[0]) * self.hop_size / float(sample_rate)
+        with self._stage("_create_constellation_pairs"):
+            return self._create_constellation_pairs(
+                peak_frames[keep],
+                quantized,
+                frame_times,
+                params["fan_out"],
+                params["target_frames"],
+            )
 
-        return audioprint
+    @classmethod
+    def _compute_spectrogram(cls, audio_data, sample_rate, min_frequency, max_frequency):
+        """
+        hann 윈도우 크기 스펙트로그램 (프레임 × 주파수 빈, 지정 대역만)
+        프레임 위치는 대역 피크 방식과 같은 hop_size 간격입니다.
+        """
+        audio = np.asarray(audio_data, dtype=np.float32)
+        frame_count = max((len(audio) - cls.frame_size) // cls.hop_size + 1, 0)
+        bin_hz = sample_rate / cls.frame_size
+        min_bin = int(np.ceil(min_frequency / bin_hz))
+        max_bin = min(int(max_frequency / bin_hz), cls.frame_size // 2)
+
+        spectrogram = np.empty((frame_count, max_bin - min_bin + 1), dtype=np.float32)
+        window = np.hanning(cls.frame_size).astype(np.float32)
+        frames = np.lib.stride_tricks.sliding_window_view(audio, cls.frame_size)[:: cls.hop_size]
+
+        # 프레임 블록 단위로 FFT (메모리 제한)
+        block = 2048
+        for start in range(0, frame_count, block):
+            spectrum = np.fft.rfft(frames[start : start + block] * window, axis=1)
+            spectrogram[start : start + block] = np.abs(spectrum[:, min_bin : max_bin + 1])
+        return spectrogram, min_bin, bin_hz
 
     @staticmethod
-    def _select_optimal_peaks(frequencies, magnitudes, num_bands=5, peaks_per_band=6):
-        """주파수 대역별로 최적의 피크만 선택"""
-        if len(frequencies) == 0:
-            return np.array([]), np.array([])
+    @nb.njit(cache=True, nogil=True)
+    def _find_constellation_peaks(spectrogram, neighborhood_frames, neighborhood_bins, min_magnitude):
+        """
+        (2 * 반경 + 1) 크기의 시간-주파수 이웃에서 최대값인 점을 피크로 찾습니다. (분리 가능 최대값 필터)
 
-        min_freq, max_freq = 100, 5000
-        band_width = (max_freq - min_freq) / num_bands
+        Returns:
+            (프레임 인덱스, 주파수 빈 인덱스, 크기) 배열 (프레임 -> 빈 순 정렬)
+        """
+        n_frames, n_bins = spectrogram.shape
 
-        # 최적 피크 데이터 변수
-        selected_freqs = []
-        selected_mags = []
+        # 1. 주파수 방향 최대값
+        freq_max = np.empty_like(spectrogram)
+        for t in range(n_frames):
+            for k in range(n_bins):
+                lo = max(k - neighborhood_bins, 0)
+                hi = min(k + neighborhood_bins + 1, n_bins)
+                value = spectrogram[t, lo]
+                for kk in range(lo + 1, hi):
+                    if spectrogram[t, kk] > value:
+                        value = spectrogram[t, kk]
+                freq_max[t, k] = value
 
-        for band in range(num_bands):
-            band_min = min_freq + band * band_width
-            band_max = band_min + band_width
+        # 2. 시간 방향 최대값과 비교하여 지역 최대값 선택
+        frames = []
+        bins = []
+        mags = []
+        for t in range(n_frames):
+            lo = max(t - neighborhood_frames, 0)
+            hi = min(t + neighborhood_frames + 1, n_frames)
+            for k in range(n_bins):
+                value = spectrogram[t, k]
+                if value < min_magnitude or value < freq_max[t, k]:
+                    continue
+                is_peak = True
+                for tt in range(lo, hi):
+                    if freq_max[tt, k] > value:
+                        is_peak = False
+                        break
+                if is_peak:
+                    frames.append(t)
+                    bins.append(k)
+                    mags.append(value)
 
-            # 현재 대역에 속하는 피크 인덱스 찾기
-            indices = [i for i, f in enumerate(frequencies) if band_min <= f < band_max]
+        return (
+            np.array(frames, dtype=np.int64),
+            np.array(bins, dtype=np.int64),
+            np.array(mags, dtype=np.float32),
+        )
 
-            if indices:
-                # 진폭 기준 정렬
-                sorted_indices = sorted(indices, key=lambda i: magnitudes[i], reverse=True)
-                # 상위 피크만 선택
-                for idx in sorted_indices[:peaks_per_band]:
-                    selected_freqs.append(frequencies[idx])
-                    selected_mags.append(magnitudes[idx])
+    @staticmethod
+    @nb.njit(cache=True, nogil=True)
+    def _create_constellation_pairs(peak_frames, quantized_freqs, frame_times, fan_out, target_frames):
+        """
+        앵커 피크와 이후 target_frames 이내의 피크 fan_out개를 쌍으로 묶어 해시 생성
+        해시 = 앵커 주파수(8비트) | 타겟 주파수(8비트) | 프레임 차이(6비트)
+        """
+        n_peaks = len(peak_frames)
+        hashes = np.empty(n_peaks * fan_out, dtype=np.int32)
+        times = np.empty(n_peaks * fan_out, dtype=np.float32)
+        pos = 0
+        for i in range(n_peaks):
+            paired = 0
+            for j in range(i + 1, n_peaks):
+                delta = peak_frames[j] - peak_frames[i]
+                if delta > target_frames:
+                    break
+                if delta == 0:
+                    continue
+                hashes[pos] = (quantized_freqs[i] << 14) | (quantized_freqs[j] << 6) | delta
+                times[pos] = frame_times[peak_frames[i]]
+                pos += 1
+                paired += 1
+                if paired == fan_out:
+                    break
+        return hashes[:pos], times[:pos]
+
+    @staticmethod
+    @nb.njit(cache=True, nogil=True)
+    def _select_band_peaks(
+        frequencies, magnitudes, peak_starts, num_bands, peaks_per_band, peak_matrix, peak_counts
+    ):
+        """
+        프레임별 스펙트럼 피크 중 주파수 대역별로 진폭 상위 피크만 골라 피크 행렬에 기록
+        (대역 순, 대역 안에서는 진폭 내림차순이며 진폭이 같으면 먼저 나온 피크 우선)
+        """
+        min_freq, max_freq = 100.0, 5000.0
+        band_width = (max_freq - min_freq) / num_bands
+        max_peaks = peak_matrix.shape[1]
+
+        for f in range(len(peak_starts) - 1):
+            lo = peak_starts[f]
+            hi = peak_starts[f + 1]
+            count = 0
+            for band in range(num_bands):
+                band_min = min_freq + band * band_width
+                band_max = band_min + band_width
 
-        return np.array(selected_freqs), np.array(selected_mags)
+                # 이전에 고른 피크보다 작은 진폭 중 최대값을 차례로 선택
+                last_mag = np.inf
+                last_index = -1
+                for _ in range(peaks_per_band):
+                    best = -1
+                    for i in range(lo, hi):
+                        freq = frequencies[i]
+                        if freq < band_min or freq >= band_max:
+                            continue
+                        mag = magnitudes[i]
+                        if mag > last_mag or (mag == last_mag and i <= last_index):
+                            continue
+                        if best < 0 or mag > magnitudes[best]:
+                            best = i
+                    if best < 0:
+                        break
+                    if count < max_peaks:
+                        peak_matrix[f, count] = frequencies[best]
+                        count += 1
+                    last_mag = magnitudes[best]
+                    last_index = best
+            peak_counts[f] = count
 
     @staticmethod
-    @nb.njit(fastmath=True)
-    def _create_peak_pairs_fast(frequencies, time_sec, freq_bits, delta_mask):
-        """Numba로 최적화된 피크 쌍 처리 함수"""
-        pairs = []
-        for i in range(len(frequencies)):
-            freq1 = frequencies[i]
-            for j in range(i + 1, min(i + 10, len(frequencies))):
-                freq2 = frequencies[j]
-
-                # 주파수 차이가 너무 작거나 큰 경우 무시
-                if 30 < freq2 - freq1 < 1000:
-                    freq_delta = freq2 - freq1
-
-                    # 정수 해시 키 생성 (비트 연산 사용)
-                    # freq1을 상위 비트에, freq_delta를 하위 비트에 배치
-                    hash_key = (int(freq1) << freq_bits) | (int(freq_delta) & delta_mask)
-
-                    # 해시 테이블에 시간 정보와 함께 저장
-                    pairs.append((hash_key, time_sec))
-        return pairs
+    @nb.njit(fastmath=True, cache=True, nogil=True)
+    def _create_peak_pairs_fast(peak_matrix, peak_counts, frame_times, freq_bits, delta_mask):
+        """
+        Numba로 최적화된 피크 쌍 처리 함수
+
+        피크 행렬 전체에서 해시를 한 번에 생성하여 미리 할당한 배열에 저장합니다.
+        (GIL을 놓고 실행되므로 스레드 풀에서 다른 스레드의 essentia 프레임 루프와 겹쳐 실행됨)
+        """
+        n_frames = peak_matrix.shape[0]
+
+        # 1. 프레임별 피크 쌍 개수 계산
+        pair_counts = np.zeros(n_frames + 1, dtype=np.int64)
+        for f in range(n_frames):
+            count = 0
+            n_peaks = peak_counts[f]
+            for i in range(n_peaks):
+                freq1 = peak_matrix[f, i]
+                for j in range(i + 1, min(i + 10, n_peaks)):
+                    if 30 < peak_matrix[f, j] - freq1 < 1000:
+                        count += 1
+            pair_counts[f + 1] = count
+
+        # 2. 프레임별 쓰기 위치 계산 후 결과 배열 할당
+        write_offsets = np.cumsum(pair_counts)
+        hashes = np.empty(write_offsets[-1], dtype=np.int32)
+        times = np.empty(write_offsets[-1], dtype=np.float32)
+
+        # 3. 해시 생성
+        for f in range(n_frames):
+            pos = write_offsets[f]
+            n_peaks = peak_counts[f]
+            for i in range(n_peaks):
+                freq1 = peak_matrix[f, i]
+                for j in range(i + 1, min(i + 10, n_peaks)):
+                    freq2 = peak_matrix[f, j]
+
+                    # 주파수 차이가 너무 작거나 큰 경우 무시
+                    if 30 < freq2 - freq1 < 1000:
+                        freq_delta = freq2 - freq1
+
+                        # 정수 해시 키 생성 (비트 연산 사용)
+                        # freq1을 상위 비트에, freq_delta를 하위 비트에 배치
+                        hashes[pos] = (int(freq1) << freq_bits) | (int(freq_delta) & delta_mask)
+                        times[pos] = frame_times[f]
+                        pos += 1
+        return hashes, times
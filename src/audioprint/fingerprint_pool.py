@@ -0,0 +1,125 @@
+"""
+스레드 풀 / 프로세스 풀 지문 생성 모듈
+작업자(스레드 또는 프로세스)마다 자기 AudioprintGenerator(essentia 알고리즘, 피크 행렬 버퍼)를 두고 여러 오디오의 지문을 동시에 만듭니다.
+- threads: 오디오/해시 배열을 복사하지 않고 시작 비용도 없지만, GIL을 놓는 numba 피크 선택/해시 커널만 동시에 실행되고
+  essentia 프레임 루프(Python에서 프레임마다 essentia 호출)는 GIL을 잡으므로 속도 향상이 그 비율로 제한됩니다.
+- processes: 모든 단계가 동시에 실행되지만 작업 프로세스 시작(essentia 로드, JIT 캐시 로드)과 오디오/해시 배열 복사 비용이 있습니다.
+단계별 GIL 비율과 방식별 시간은 python -m main.benchmark fingerprint로 측정합니다.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import os
+import threading
+from typing import List, Sequence, Tuple, Union
+
+import numba as nb
+import numpy as np
+
+from src.audioprint.audioprint_generator import AudioprintGenerator
+from src.utils.profiler import Profiler
+from src.utils.types import TypeConverter
+
+# 작업 프로세스의 생성기 (진행 출력/프로파일링 없이)
+_generator = None
+
+
+def _init_worker(params: dict):
+    """작업 프로세스 시작 시 부모와 같은 피크 선택 방식 설정 후 생성기 생성"""
+    global _generator
+    AudioprintGenerator.apply_params(params)
+    _generator = AudioprintGenerator(verbose=False)
+
+
+def _process_hashes(audio_data, sample_rate: int, full_frames: bool):
+    return _generator.hashes(audio_data, sample_rate, full_frames)
+
+
+class FingerprintPool:
+    """스레드/프로세스 풀 지문 생성기 (결과는 입력 순서, AudioprintGenerator 클래스 메서드와 같은 결과)"""
+
+    MODES = ("threads", "processes")
+    workers = None  # 작업자 수 (기본: CPU 수)
+    mode = "threads"
+
+    def __init__(self, workers: int = None, mode: str = None):
+        self.worker_count = workers or self.workers or os.cpu_count() or 1
+        self.mode = mode or self.mode
+        if self.mode not in self.MODES:
+            raise ValueError(f"지원하지 않는 작업자 방식입니다: {self.mode}")
+
+        if self.mode == "threads":
+            self._local = threading.local()
+            self.executor = ThreadPoolExecutor(self.worker_count, thread_name_prefix="fingerprint")
+        else:
+            # numba 스레드 상태를 물려받지 않도록 spawn으로 시작
+            self.executor = ProcessPoolExecutor(
+                self.worker_count,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(AudioprintGenerator.get_params(),),
+            )
+
+    @classmethod
+    def set_config(cls, workers: int = None, mode: str = None):
+        """풀 지문 생성 관련 설정"""
+        if workers is not None:
+            cls.workers = workers
+        if mode:
+            if mode not in cls.MODES:
+                raise ValueError(f"지원하지 않는 작업자 방식입니다: {mode}")
+            cls.mode = mode
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _generator(self) -> AudioprintGenerator:
+        """현재 작업 스레드의 생성기 (진행 출력/프로파일링 없이)"""
+        generator = getattr(self._local, "generator", None)
+        if generator is None:
+            generator = self._local.generator = AudioprintGenerator(verbose=False)
+        return generator
+
+    def _thread_hashes(self, audio_data, sample_rate: int, full_frames: bool):
+        return self._generator().hashes(audio_data, sample_rate, full_frames)
+
+    @staticmethod
+    def _sample_rates(audios: Sequence, sample_rate: Union[int, Sequence[int]]) -> List[int]:
+        if isinstance(sample_rate, (int, np.integer)):
+            return [int(sample_rate)] * len(audios)
+        if len(sample_rate) != len(audios):
+            raise ValueError(f"샘플레이트 수가 오디오 수와 다릅니다: {len(sample_rate)} != {len(audios)}")
+        return list(sample_rate)
+
+    def _map(self, audios: Sequence, sample_rate, full_frames: bool) -> List[Tuple[np.ndarray, np.ndarray]]:
+        sample_rates = self._sample_rates(audios, sample_rate)
+        func = self._thread_hashes if self.mode == "threads" else _process_hashes
+        return list(self.executor.map(func, audios, sample_rates, [full_frames] * len(audios)))
+
+    def map_hashes(
+        self,
+        audios: Sequence,
+        sample_rate: Union[int, Sequence[int]] = 44100,
+        full_frames: bool = False,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """오디오별 (해시 배열, 시간 배열) 목록 (get_spectrogram_hashes와 같은 결과)"""
+        with Profiler.stage("FingerprintPool.map_hashes"):
+            return self._map(audios, sample_rate, full_frames)
+
+    def map_fingerprints(
+        self, audios: Sequence, sample_rate: Union[int, Sequence[int]] = 44100
+    ) -> List[nb.typed.Dict]:
+        """오디오별 지문 목록 (get_spectrogram_fingerprint와 같은 결과, 해시 묶기는 이 스레드에서)"""
+        with Profiler.stage("FingerprintPool.map_fingerprints"):
+            return [
+                TypeConverter.group_hash_arrays(hashes, times)
+                for hashes, times in self._map(audios, sample_rate, False)
+            ]
@@ -0,0 +1,166 @@
+"""
+윈도우 일괄 매칭 벤치마크 모듈
+합성 스트림의 윈도우 지문을 윈도우마다 detect_best_match(노래 목록 / 역색인)로 매칭하는 시간과
+BatchMatcher로 한 번에 (윈도우 × 노래) 행렬을 계산하는 시간을 비교하고,
+행렬의 모든 칸이 compute_song_similarity 결과와 같은지 확인
+감지 후 건너뛰기를 포함한 전체 타임라인 감지(지문 생성 + 매칭)의 시간, 지문 생성 윈도우 수, 타임라인도 비교
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+from src.benchmark.incremental import CHUNK_SIZE, HOP_SIZE, build_references
+from src.benchmark.peak_picker import SAMPLE_RATE, build_dataset
+
+PIPELINE_THRESHOLD = 0.001  # 전체 감지 비교의 유사도 임계값 (main.timeline 기본값)
+
+
+@dataclass
+class BatchMatchingResult:
+    windows: int
+    songs: int
+    mismatches: int  # 윈도우별 매칭 결과와 다른 (윈도우, 노래) 칸 수 + 최고 노래가 다른 윈도우 수
+    per_window_seconds: float  # 노래 목록, 윈도우마다 detect_best_match
+    batch_seconds: float  # 노래 목록, BatchMatcher
+    per_window_index_seconds: float  # 역색인, 윈도우마다 detect_best_match_index
+    batch_index_seconds: float  # 역색인, BatchMatcher
+    mean_margin: float  # 윈도우별 1위/2위 유사도 차이 평균
+    pipeline_seconds: float = 0.0  # 감지 후 건너뛰기 포함 전체 감지, 윈도우별 매칭
+    batch_pipeline_seconds: float = 0.0  # 감지 후 건너뛰기 포함 전체 감지, 일괄 매칭
+    fingerprinted: int = 0  # 윈도우별 매칭에서 지문을 만든 윈도우 수
+    batch_fingerprinted: int = 0  # 일괄 매칭에서 지문을 만든 윈도우 수 (건너뛸 윈도우 포함)
+    timelines_match: bool = True  # 두 방식의 타임라인이 같은지
+
+
+def run_pipeline(stream, duration: int, references, batch_matching: bool) -> tuple:
+    """감지 후 건너뛰기를 포함한 전체 타임라인 감지의 (시간, 지문 생성 윈도우 수, 타임라인)"""
+    from src.timeline.read_audio import read_audio
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.utils.profiler import Profiler
+
+    original = TimelineDetector.BATCH_MATCHING
+    TimelineDetector.set_config(batch_matching=batch_matching)
+    Profiler.enable()
+    try:
+        start = time.perf_counter()
+        chunks = read_audio(stream, duration, SAMPLE_RATE, CHUNK_SIZE, HOP_SIZE)
+        timelines = TimelineDetector.analyze_timeline(
+            TimelineDetector.detect_timeline(chunks, references, HOP_SIZE, PIPELINE_THRESHOLD)
+        )
+        seconds = time.perf_counter() - start
+        fingerprinted = sum(
+            stat.calls for path, stat in Profiler.stats.items() if path[-1] == "fingerprint"
+        )
+    finally:
+        Profiler.enabled = False
+        TimelineDetector.set_config(batch_matching=original)
+    return seconds, fingerprinted, timelines
+
+
+def run_batch_matching_benchmark(song_count: int = 10) -> BatchMatchingResult:
+    """윈도우별/일괄 매칭 시간과 결과 일치 여부 측정"""
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.timeline.batch_matcher import BatchMatcher
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.utils.worldcup_index import WorldcupIndex
+
+    songs, stream, _ = build_dataset(song_count)
+    duration = len(stream) // SAMPLE_RATE
+    print(f"합성 노래 {song_count}개, 스트림 {duration / 60:.1f}분")
+
+    with contextlib.redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory() as temp_dir:
+        references = build_references(songs)
+        WorldcupIndex.build(Path(temp_dir), references)
+        index = WorldcupIndex.open(Path(temp_dir))
+
+        fingerprints = [
+            AudioprintGenerator.get_spectrogram_fingerprint(
+                stream[start * SAMPLE_RATE : (start + CHUNK_SIZE) * SAMPLE_RATE], SAMPLE_RATE
+            )
+            for start in range(0, duration - CHUNK_SIZE + 1, HOP_SIZE)
+        ]
+
+        # JIT 컴파일 비용 제외
+        BatchMatcher(references).match(fingerprints[:1])
+        BatchMatcher(index).match(fingerprints[:1])
+
+        start = time.perf_counter()
+        per_window = [TimelineDetector.detect_best_match(fp, references) for fp in fingerprints]
+        per_window_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        per_window_index = [
+            TimelineDetector.detect_best_match_index(fp, index) for fp in fingerprints
+        ]
+        per_window_index_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matrix = BatchMatcher(references).match(fingerprints)
+        batch_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index_matrix = BatchMatcher(index).match(fingerprints)
+        batch_index_seconds = time.perf_counter() - start
+
+        # 행렬의 모든 칸을 노래 하나씩 계산한 결과와 비교
+        mismatches = 0
+        for row, fingerprint in enumerate(fingerprints):
+            for col, song in enumerate(references.values()):
+                expected = TimelineDetector.compute_song_similarity(fingerprint, song)
+                if (matrix.similarities[row, col], matrix.offsets[row, col]) != expected:
+                    mismatches += 1
+            for detection, result in ((per_window[row], matrix), (per_window_index[row], index_matrix)):
+                if (detection.similarity, detection.song_name, detection.offset) != result.best(row):
+                    mismatches += 1
+
+        # 감지 후 건너뛰기를 포함한 전체 감지 (일괄 매칭은 건너뛸 윈도우도 지문을 만듦)
+        pipeline_seconds, fingerprinted, timelines = run_pipeline(stream, duration, references, False)
+        batch_pipeline_seconds, batch_fingerprinted, batch_timelines = run_pipeline(
+            stream, duration, references, True
+        )
+
+    return BatchMatchingResult(
+        len(fingerprints),
+        song_count,
+        mismatches,
+        per_window_seconds,
+        batch_seconds,
+        per_window_index_seconds,
+        batch_index_seconds,
+        float(matrix.margins().mean()),
+        pipeline_seconds,
+        batch_pipeline_seconds,
+        fingerprinted,
+        batch_fingerprinted,
+        timeline_keys(timelines) == timeline_keys(batch_timelines),
+    )
+
+
+def timeline_keys(timelines) -> List[tuple]:
+    return [(t.name, t.start_time) for t in timelines]
+
+
+def print_batch_matching_results(result: BatchMatchingResult):
+    """측정 결과 출력"""
+    print("-" * 80)
+    print(f"윈도우 {result.windows}개 × 노래 {result.songs}개, 결과가 다른 항목: {result.mismatches}개")
+    print(f"{'노래 지문':<10} {'윈도우별(초)':>12} {'일괄(초)':>10} {'속도':>8}")
+    for label, per_window, batch in (
+        ("노래 목록", result.per_window_seconds, result.batch_seconds),
+        ("역색인", result.per_window_index_seconds, result.batch_index_seconds),
+    ):
+        print(f"{label:<10} {per_window:>12.2f} {batch:>10.2f} {per_window / batch:>7.1f}x")
+    print(f"1위/2위 유사도 차이 평균: {result.mean_margin:.4f}")
+    print("감지 후 건너뛰기 포함 전체 감지 (지문 생성 + 매칭, 노래 목록)")
+    print(f"{'방식':<10} {'시간(초)':>10} {'지문 생성 윈도우':>16}")
+    print(f"{'윈도우별':<10} {result.pipeline_seconds:>10.2f} {result.fingerprinted:>16}")
+    print(f"{'일괄':<10} {result.batch_pipeline_seconds:>10.2f} {result.batch_fingerprinted:>16}")
+    print(
+        f"일괄 매칭 {result.pipeline_seconds / result.batch_pipeline_seconds:.2f}x, "
+        f"타임라인 {'같음' if result.timelines_match else '다름'}"
+    )
@@ -0,0 +1,171 @@
+"""
+직접 PCM 디코딩 벤치마크 모듈
+합성 오디오를 Opus로 인코딩하여 로컬 HTTP 서버(연결당 전송 속도 제한)로 제공하고,
+기존 경로(yt-dlp 다운로드 → WAV 변환 → 메타데이터 읽기 → MonoLoader 디코딩)와
+직접 디코딩 경로(스트림 → float32 모노 PCM 한 번)의 시간, 디스크 기록 바이트, 지문 해시 일치율을 측정
+"""
+
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from src.benchmark.segmented_download import RATE_LIMIT, ThrottledRangeHandler
+
+SAMPLE_RATE = 48000  # 유튜브 Opus 오디오와 같은 샘플레이트
+SOURCE_MINUTES = 10  # 원본 영상 길이
+REQUEST_MINUTES = 5  # 요청 구간 길이 (영상 앞부분)
+SOURCE_BITRATE = "64k"
+POLL_INTERVAL = 0.01  # 디스크 기록량 확인 주기 (초)
+COMPARE_SECONDS = 60  # 지문 해시를 비교할 앞부분 길이
+
+
+@dataclass
+class DirectDownloadResult:
+    path: str  # wav / direct
+    seconds: float
+    disk_bytes: int  # 작업 디렉토리에 기록된 파일 크기 합 (파일별 최대 크기)
+    peak_disk_bytes: int  # 동시에 존재한 파일 크기 합의 최대값
+    duration: int
+    sample_rate: int
+    hash_agreement: float = 1.0  # 기존 경로 지문의 (해시, 시간) 중 같이 나온 비율
+
+
+class DiskWatcher(threading.Thread):
+    """작업 디렉토리의 파일 크기를 주기적으로 확인하여 기록된 바이트 수 추정"""
+
+    def __init__(self, directory: Path):
+        super().__init__(daemon=True)
+        self.directory = directory
+        self.file_sizes: Dict[str, int] = {}
+        self.peak_bytes = 0
+        self._stop_event = threading.Event()
+
+    def _poll(self):
+        total = 0
+        for path in self.directory.rglob("*"):
+            try:
+                size = path.stat().st_size if path.is_file() else 0
+            except FileNotFoundError:
+                continue
+            total += size
+            self.file_sizes[str(path)] = max(self.file_sizes.get(str(path), 0), size)
+        self.peak_bytes = max(self.peak_bytes, total)
+
+    def run(self):
+        while not self._stop_event.wait(POLL_INTERVAL):
+            self._poll()
+
+    def stop(self) -> int:
+        self._stop_event.set()
+        self.join()
+        self._poll()
+        return sum(self.file_sizes.values())
+
+
+def write_source(file_path: Path, seconds: int):
+    """합성 오디오를 스테레오 Opus(WebM)로 인코딩 (유튜브 오디오 형식과 비슷하게)"""
+    from src.benchmark.synthetic import synthetic_audio
+
+    audio = synthetic_audio(seconds, SAMPLE_RATE) * 0.9
+    stereo = np.repeat(audio[:, None], 2, axis=1).astype("<f4")
+    command = ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-y"]
+    command += ["-f", "f32le", "-ar", str(SAMPLE_RATE), "-ac", "2", "-i", "-"]
+    command += ["-c:a", "libopus", "-b:a", SOURCE_BITRATE, str(file_path)]
+    subprocess.run(command, input=stereo.tobytes(), check=True)
+
+
+def fingerprint_pairs(audio, sample_rate: int) -> set:
+    """앞부분 지문의 (해시, 프레임) 집합"""
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+
+    audio = np.asarray(audio[: sample_rate * COMPARE_SECONDS], dtype=np.float32)
+    hashes, times = AudioprintGenerator(verbose=False).hashes(audio, sample_rate)
+    frames = np.round(times * sample_rate / AudioprintGenerator.hop_size).astype(np.int64)
+    return set(zip(hashes.tolist(), frames.tolist()))
+
+
+def run_path(path: str, url: str, work_dir: Path):
+    """한 경로로 요청 구간을 디코딩하여 (오디오, 메타데이터, 결과) 반환"""
+    from src.youtube_download.audio import AudioDownloader
+
+    AudioDownloader.set_config(
+        start="00:00:00", end=f"00:{REQUEST_MINUTES:02d}:00", download_dir=work_dir
+    )
+    watcher = DiskWatcher(work_dir)
+    watcher.start()
+    start = time.perf_counter()
+    if path == "wav":
+        audio, audio_path = AudioDownloader.load_audio(url)
+        _, duration, sample_rate = AudioDownloader.get_audio_metadata(audio_path)
+    else:
+        # 유튜브는 스트림 정보에 샘플레이트(asr)가 있지만 로컬 HTTP 파일은 없으므로 원본 값 지정
+        audio, (_, duration, sample_rate) = AudioDownloader.decode_audio(
+            url, sample_rate=SAMPLE_RATE
+        )
+    seconds = time.perf_counter() - start
+    disk_bytes = watcher.stop()
+    return audio, DirectDownloadResult(
+        path, seconds, disk_bytes, watcher.peak_bytes, duration, sample_rate
+    )
+
+
+def run_direct_download_benchmark() -> List[DirectDownloadResult]:
+    """기존 WAV 경로와 직접 디코딩 경로의 시간/디스크 기록량/결과 비교"""
+    from src.youtube_download.audio import AudioDownloader
+
+    download_dir = AudioDownloader.download_dir
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        serve_path = temp_path / "serve"
+        serve_path.mkdir()
+        write_source(serve_path / "source.webm", SOURCE_MINUTES * 60)
+        source_bytes = (serve_path / "source.webm").stat().st_size
+
+        handler = partial(ThrottledRangeHandler, directory=str(serve_path))
+        with ThreadingHTTPServer(("127.0.0.1", 0), handler) as server:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{server.server_address[1]}/source.webm"
+            print(
+                f"원본 {SOURCE_MINUTES}분 Opus {SOURCE_BITRATE} ({source_bytes / 2**20:.1f}MB), "
+                f"요청 구간 {REQUEST_MINUTES}분, 연결당 {RATE_LIMIT / 2**20:.0f}MB/s 제한"
+            )
+
+            try:
+                reference = None
+                for path in ("wav", "direct"):
+                    work_dir = temp_path / path
+                    work_dir.mkdir()
+                    audio, result = run_path(path, url, work_dir)
+                    # ffmpeg 다운믹스(-ac 1)는 MonoLoader와 크기가 달라 샘플 대신 지문으로 비교
+                    pairs = fingerprint_pairs(audio, result.sample_rate)
+                    if reference is None:
+                        reference = pairs
+                    result.hash_agreement = len(pairs & reference) / max(len(reference), 1)
+                    results.append(result)
+            finally:
+                AudioDownloader.set_config(download_dir=download_dir)
+                server.shutdown()
+    return results
+
+
+def print_direct_download_results(results: List[DirectDownloadResult]):
+    """경로별 측정 결과 출력"""
+    print("-" * 80)
+    print(
+        f"{'경로':<8} {'시간(초)':>10} {'디스크 기록(MB)':>16} {'최대 디스크(MB)':>16} "
+        f"{'길이(초)':>8} {'샘플레이트':>10} {'해시 일치율':>10}"
+    )
+    for r in results:
+        print(
+            f"{r.path:<8} {r.seconds:>10.2f} {r.disk_bytes / 2**20:>16.1f} "
+            f"{r.peak_disk_bytes / 2**20:>16.1f} {r.duration:>8} {r.sample_rate:>10} {r.hash_agreement:>10.1%}"
+        )
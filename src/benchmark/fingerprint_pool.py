@@ -0,0 +1,150 @@
+"""
+스레드 풀 / 프로세스 풀 지문 생성 벤치마크 모듈
+짧은 노래 구간 여러 개(노래 지문 생성)와 긴 영상의 슬라이딩 윈도우(타임라인 감지) 두 작업에서
+순차 생성, 작업자 수별 FingerprintPool(스레드, 프로세스)의 시간을 비교하고 결과 해시가 순차 생성과 같은지 확인
+순차 생성의 단계별 시간으로 GIL을 놓고 실행되는 비율과 스레드 풀의 속도 향상 상한(Amdahl)도 계산합니다.
+(코어가 하나뿐이면 어느 방식도 빨라지지 않으므로 상한으로 스레드 확장성을 판단)
+"""
+
+import contextlib
+import io
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.benchmark.incremental import CHUNK_SIZE, HOP_SIZE
+from src.benchmark.peak_picker import CLIP_SECONDS, SAMPLE_RATE
+from src.benchmark.synthetic import synthetic_audio
+
+VIDEO_MINUTES = 10  # 긴 영상 작업의 스트림 길이
+# GIL을 놓고 실행되는 지문 생성 단계 (nogil numba 커널)
+GIL_FREE_STAGES = (
+    "_select_band_peaks",
+    "_create_peak_pairs_fast",
+    "_find_constellation_peaks",
+    "_create_constellation_pairs",
+)
+
+
+@dataclass
+class PoolResult:
+    workload: str
+    mode: str  # sequential / threads / processes
+    workers: int
+    seconds: float
+    startup_seconds: float  # 풀 시작 + 작업자 준비(essentia 로드, JIT 캐시 로드) 시간
+    audio_seconds: float  # 처리한 오디오 길이 합
+    mismatches: int  # 순차 생성과 해시/시간이 다른 오디오 수
+    gil_free: float = 0.0  # 순차 생성 시간 중 GIL을 놓고 실행된 단계 비율
+
+    @property
+    def realtime_factor(self) -> float:
+        return self.audio_seconds / self.seconds if self.seconds else float("inf")
+
+    @property
+    def thread_bound(self) -> float:
+        """작업자 수만큼 코어가 있을 때 스레드 풀의 속도 향상 상한 (GIL을 잡는 단계는 한 번에 하나만 실행)"""
+        return 1 / ((1 - self.gil_free) + self.gil_free / self.workers)
+
+
+def build_workloads(clip_count: int) -> Dict[str, List[np.ndarray]]:
+    """짧은 노래 구간 목록과 긴 영상 윈도우 목록"""
+    clips = [synthetic_audio(CLIP_SECONDS, SAMPLE_RATE, seed=i) for i in range(clip_count)]
+    video = synthetic_audio(VIDEO_MINUTES * 60, SAMPLE_RATE, seed=clip_count)
+    windows = [
+        video[start * SAMPLE_RATE : (start + CHUNK_SIZE) * SAMPLE_RATE]
+        for start in range(0, VIDEO_MINUTES * 60 - CHUNK_SIZE + 1, HOP_SIZE)
+    ]
+    return {f"노래 구간 {clip_count}개": clips, f"영상 윈도우 {len(windows)}개": windows}
+
+
+def measure_gil_free(audios: List[np.ndarray]) -> float:
+    """순차 생성의 단계별 시간 중 GIL을 놓고 실행되는 단계 비율"""
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.utils.profiler import Profiler
+
+    generator = AudioprintGenerator()
+    Profiler.enable()
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for audio in audios:
+                generator.hashes(audio, SAMPLE_RATE)
+        seconds = time.perf_counter() - start
+        gil_free = sum(stat.total for path, stat in Profiler.stats.items() if path[-1] in GIL_FREE_STAGES)
+    finally:
+        Profiler.enabled = False
+    return gil_free / seconds
+
+
+def count_mismatches(results: List[Tuple], expected: List[Tuple]) -> int:
+    return sum(
+        not (np.array_equal(hashes, expected_hashes) and np.array_equal(times, expected_times))
+        for (hashes, times), (expected_hashes, expected_times) in zip(results, expected)
+    )
+
+
+def run_fingerprint_pool_benchmark(clip_count: int = 16, workers: List[int] = None) -> List[PoolResult]:
+    """작업별로 순차/스레드 풀/프로세스 풀 지문 생성 시간과 결과 비교"""
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.audioprint.fingerprint_pool import FingerprintPool
+
+    workers = workers or [os.cpu_count() or 1]
+    print(f"CPU {os.cpu_count()}개, 작업자 수 {workers}")
+
+    results = []
+    for workload, audios in build_workloads(clip_count).items():
+        audio_seconds = sum(len(audio) for audio in audios) / SAMPLE_RATE
+        print(f"{workload} (오디오 {audio_seconds / 60:.1f}분) 측정 중...")
+
+        generator = AudioprintGenerator(verbose=False)
+        generator.hashes(audios[0][: SAMPLE_RATE * 5], SAMPLE_RATE)  # JIT 캐시 로드 제외
+        start = time.perf_counter()
+        expected = [generator.hashes(audio, SAMPLE_RATE) for audio in audios]
+        seconds = time.perf_counter() - start
+        gil_free = measure_gil_free(audios)
+        results.append(PoolResult(workload, "sequential", 1, seconds, 0.0, audio_seconds, 0, gil_free))
+
+        for worker_count in workers:
+            for mode in FingerprintPool.MODES:
+                start = time.perf_counter()
+                with FingerprintPool(worker_count, mode) as pool:
+                    pool.map_hashes([audios[0][: SAMPLE_RATE * 5]] * worker_count, SAMPLE_RATE)
+                    startup_seconds = time.perf_counter() - start
+                    start = time.perf_counter()
+                    hashes = pool.map_hashes(audios, SAMPLE_RATE)
+                    seconds = time.perf_counter() - start
+                results.append(
+                    PoolResult(
+                        workload,
+                        mode,
+                        worker_count,
+                        seconds,
+                        startup_seconds,
+                        audio_seconds,
+                        count_mismatches(hashes, expected),
+                        gil_free,
+                    )
+                )
+    return results
+
+
+def print_fingerprint_pool_results(results: List[PoolResult]):
+    """측정 결과 출력"""
+    print("-" * 80)
+    print(
+        f"{'작업':<20} {'방식':<12} {'작업자':>6} {'시간(초)':>10} {'시작(초)':>10} "
+        f"{'실시간 배수':>10} {'불일치':>6} {'스레드 상한':>10}"
+    )
+    for r in results:
+        bound = f"{r.thread_bound:>9.2f}x" if r.mode == "threads" else f"{'':>10}"
+        print(
+            f"{r.workload:<20} {r.mode:<12} {r.workers:>6} {r.seconds:>10.2f} "
+            f"{r.startup_seconds:>10.2f} {r.realtime_factor:>10.1f} {r.mismatches:>6} {bound}"
+        )
+    for r in results:
+        if r.mode == "sequential":
+            print(f"{r.workload}: GIL을 놓고 실행되는 단계 비율 {r.gil_free * 100:.1f}%")
@@ -0,0 +1,162 @@
+"""
+노래 전체 길이 지문 벤치마크 모듈
+후렴이 반복되는 합성 노래로 앞부분 30초 지문 역색인, 전체 길이 지문 역색인, 흔한 해시를 제외한 전체 길이 역색인을 만들고
+노래 중간부터 재생되는 스트림에서 포스팅 수, 역색인 크기, 윈도우별 매칭 시간, 감지한 노래 수를 비교
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+SAMPLE_RATE = 22050
+CLIP_SECONDS = 30  # 노래 지문 구간 (main.audioprint와 동일)
+# 노래 구성 (구간 이름, 길이(초)): 후렴(C)이 네 번 반복
+SECTIONS = (("A", 40), ("C", 30), ("B", 40), ("C", 30), ("D", 20), ("C", 30), ("C", 30))
+EXCERPT_START = 80  # 스트림에 넣는 노래 구간 시작 (B 중간, 앞부분 30초 지문에는 없는 구간)
+EXCERPT_SECONDS = 60
+# 구간 사이 다른 오디오 길이 (노래 0:00 위치가 스트림 안에 들어가도록 EXCERPT_START보다 길게,
+# 노래 구간이 윈도우 하나와 정확히 겹치도록 HOP_SIZE의 배수로)
+FILLER_SECONDS = 90
+CHUNK_SIZE = 60
+HOP_SIZE = 30
+NOISE_LEVEL = 0.05
+START_TOLERANCE = 1  # 시작 시간 허용 오차 (초)
+CAP_QUANTILE = 0.99  # 흔한 해시 상한: 포스팅 기준 해시 빈도 분위수
+
+
+@dataclass
+class FullLengthResult:
+    name: str
+    postings: int
+    index_bytes: int
+    match_ms: float  # 윈도우 하나를 역색인과 매칭하는 시간
+    detected: int  # 노래 구간 윈도우에서 노래와 0:00 위치를 맞게 찾은 노래 수
+    song_count: int
+
+
+def build_song(i: int) -> np.ndarray:
+    """구간별 합성 오디오를 이어 붙인 노래 (같은 이름의 구간은 같은 오디오)"""
+    from src.benchmark.synthetic import synthetic_audio
+
+    sections = {}
+    for j, (name, seconds) in enumerate(SECTIONS):
+        if name not in sections:
+            sections[name] = synthetic_audio(seconds, SAMPLE_RATE, seed=10 * i + j)
+    return np.concatenate([sections[name] for name, _ in SECTIONS])
+
+
+def build_stream(songs):
+    """노래마다 다른 오디오 뒤에 노래 중간 구간을 넣은 스트림과 노래 0:00이 맞춰지는 스트림 위치"""
+    from src.benchmark.synthetic import synthetic_audio
+
+    rng = np.random.default_rng(0)
+    parts, starts, position = [], [], 0
+    for i, song in enumerate(songs):
+        filler = synthetic_audio(FILLER_SECONDS, SAMPLE_RATE, seed=1000 + i)
+        excerpt = song[EXCERPT_START * SAMPLE_RATE : (EXCERPT_START + EXCERPT_SECONDS) * SAMPLE_RATE]
+        parts += [filler, excerpt]
+        starts.append(position + FILLER_SECONDS - EXCERPT_START)
+        position += FILLER_SECONDS + EXCERPT_SECONDS
+
+    stream = np.concatenate(parts) * 0.7
+    stream += rng.normal(0, NOISE_LEVEL, len(stream))
+    return stream.astype(np.float32), starts
+
+
+def hash_cap(references) -> int:
+    """포스팅 기준 해시 빈도의 CAP_QUANTILE 분위수"""
+    from src.utils.worldcup_index import WorldcupIndex
+
+    hashes, _, _ = WorldcupIndex.build_postings(list(enumerate(references.values())), 1)
+    _, counts = np.unique(hashes, return_counts=True)
+    return int(np.quantile(np.repeat(counts, counts), CAP_QUANTILE))
+
+
+def run_index(name: str, references, windows, starts, max_hash_postings: int = None) -> FullLengthResult:
+    """역색인 하나를 구축하고 윈도우별로 매칭하여 노래 구간 윈도우의 감지 결과 확인"""
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.utils.worldcup_index import WorldcupIndex
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        WorldcupIndex.build(Path(temp_dir), references, 1, max_hash_postings)
+        index = WorldcupIndex.open(Path(temp_dir))
+        postings = sum(len(segment) for segment in index.segments)
+        index_bytes = sum(
+            segment.hashes.nbytes + segment.songs.nbytes + segment.frames.nbytes
+            for segment in index.segments
+        )
+
+        # JIT 컴파일 비용 제외
+        TimelineDetector.detect_best_match_index(windows[0][1], index)
+
+        # 노래 구간이 시작되는 스트림 위치 -> 노래 번호
+        excerpts = {start + EXCERPT_START: i for i, start in enumerate(starts)}
+        detected, match_seconds = 0, 0.0
+        for start_time, fingerprint in windows:
+            start = time.perf_counter()
+            detection = TimelineDetector.detect_best_match_index(fingerprint, index)
+            match_seconds += time.perf_counter() - start
+
+            i = excerpts.get(start_time)
+            if (
+                i is not None
+                and detection.similarity > 0
+                and detection.song_name == f"song{i}"
+                and abs(start_time - detection.offset - starts[i]) <= START_TOLERANCE
+            ):
+                detected += 1
+        del index
+
+    return FullLengthResult(
+        name, postings, index_bytes, match_seconds / len(windows) * 1000, detected, len(starts)
+    )
+
+
+def run_full_length_benchmark(song_count: int = 6, max_hash_postings: int = None) -> List[FullLengthResult]:
+    """앞부분 구간/전체 길이/흔한 해시 제외 전체 길이 역색인 비교"""
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.timeline.read_audio import read_audio
+    from src.utils.compact_audioprint import CompactAudioprint
+    from src.utils.types import TypeConverter
+
+    frame_duration = AudioprintGenerator.hop_size / SAMPLE_RATE
+    songs = [build_song(i) for i in range(song_count)]
+    stream, starts = build_stream(songs)
+    song_seconds = len(songs[0]) / SAMPLE_RATE
+    print(f"합성 노래 {song_count}개 ({song_seconds:.0f}초), 스트림 {len(stream) / SAMPLE_RATE / 60:.1f}분")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        clips, fulls = {}, {}
+        for i, song in enumerate(songs):
+            for references, audio in ((clips, song[: CLIP_SECONDS * SAMPLE_RATE]), (fulls, song)):
+                hashes, times = AudioprintGenerator.get_spectrogram_hashes(audio, SAMPLE_RATE)
+                references[f"song{i}"] = CompactAudioprint.from_hash_arrays(hashes, times, frame_duration)
+
+        windows = []
+        for chunk in read_audio(stream, len(stream) // SAMPLE_RATE, SAMPLE_RATE, CHUNK_SIZE, HOP_SIZE):
+            hashes, times = AudioprintGenerator.get_spectrogram_hashes(chunk.audio, chunk.samplerate)
+            windows.append((chunk.start_time, TypeConverter.group_hash_arrays(hashes, times)))
+
+        max_hash_postings = max_hash_postings or hash_cap(fulls)
+        return [
+            run_index(f"앞부분 {CLIP_SECONDS}초", clips, windows, starts),
+            run_index("전체 길이", fulls, windows, starts),
+            run_index(f"전체 길이 (상한 {max_hash_postings})", fulls, windows, starts, max_hash_postings),
+        ]
+
+
+def print_full_length_results(results: List[FullLengthResult]):
+    """측정 결과 출력"""
+    print("-" * 80)
+    print(f"{'역색인':<22} {'포스팅':>11} {'크기(MB)':>9} {'매칭(ms)':>9} {'감지':>8}")
+    for r in results:
+        print(
+            f"{r.name:<22} {r.postings:>11,} {r.index_bytes / 1024 ** 2:>9.2f} "
+            f"{r.match_ms:>9.2f} {r.detected:>4}/{r.song_count:<3}"
+        )
@@ -0,0 +1,114 @@
+"""
+전역 오프셋 투표 벤치마크 모듈
+합성 스트림에서 윈도우별 매칭(detect_timeline + analyze_timeline)과 윈도우 없는 전역 투표
+(detect_timeline_global)의 시간과 타임라인을 비교하고, 실제 시작 시간과 맞는 노래 수를 측정
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.benchmark.incremental import CHUNK_SIZE, HOP_SIZE, build_references
+from src.benchmark.peak_picker import SAMPLE_RATE, START_TOLERANCE, build_dataset
+
+
+@dataclass
+class GlobalVotingResult:
+    starts: list  # 노래별 실제 시작 시간
+    windowed_seconds: float
+    global_seconds: float  # 노래 목록 기준
+    index_seconds: float  # 월드컵 역색인 기준
+    windowed_timelines: list
+    global_timelines: list
+    index_timelines: list
+
+
+def count_correct(timelines, starts) -> int:
+    """실제 시작 시간과 허용 오차 안에서 맞는 노래 수"""
+    found = {t.name: t for t in timelines}
+    return sum(
+        1
+        for i, start in enumerate(starts)
+        if f"song{i}" in found and abs(found[f"song{i}"].start_time - start) <= START_TOLERANCE
+    )
+
+
+def run_global_voting_benchmark(song_count: int = 10) -> GlobalVotingResult:
+    """윈도우별 매칭과 전역 투표(노래 목록 / 역색인)의 시간과 타임라인 측정"""
+    from src.timeline.read_audio import read_audio
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.utils.worldcup_index import WorldcupIndex
+
+    songs, stream, starts = build_dataset(song_count)
+    duration = len(stream) // SAMPLE_RATE
+    print(f"합성 노래 {song_count}개, 스트림 {duration / 60:.1f}분")
+
+    with contextlib.redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory() as temp_dir:
+        references = build_references(songs)
+        WorldcupIndex.build(Path(temp_dir), references)
+        index = WorldcupIndex.open(Path(temp_dir))
+
+        start = time.perf_counter()
+        chunks = read_audio(stream, duration, SAMPLE_RATE, CHUNK_SIZE, HOP_SIZE)
+        windowed = TimelineDetector.analyze_timeline(
+            TimelineDetector.detect_timeline(chunks, references, HOP_SIZE)
+        )
+        windowed_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        global_timelines = TimelineDetector.detect_timeline_global(
+            stream, duration, SAMPLE_RATE, references
+        )
+        global_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index_timelines = TimelineDetector.detect_timeline_global(
+            stream, duration, SAMPLE_RATE, index
+        )
+        index_seconds = time.perf_counter() - start
+
+    return GlobalVotingResult(
+        starts,
+        windowed_seconds,
+        global_seconds,
+        index_seconds,
+        windowed,
+        global_timelines,
+        index_timelines,
+    )
+
+
+def print_global_voting_results(result: GlobalVotingResult):
+    """측정 결과 출력"""
+    song_count = len(result.starts)
+    print("-" * 80)
+    print(
+        f"윈도우 방식: {result.windowed_seconds:.2f}초, "
+        f"정답 {count_correct(result.windowed_timelines, result.starts)}/{song_count}"
+    )
+    for label, seconds, timelines in (
+        ("전역 투표(노래 목록)", result.global_seconds, result.global_timelines),
+        ("전역 투표(역색인)", result.index_seconds, result.index_timelines),
+    ):
+        print(
+            f"{label}: {seconds:.2f}초 ({result.windowed_seconds / seconds:.1f}x), "
+            f"정답 {count_correct(timelines, result.starts)}/{song_count}"
+        )
+
+    print(f"{'노래':<10} {'실제(초)':>9} {'윈도우(초)':>11} {'전역(초)':>9} {'유사도':>8} {'역색인(초)':>11}")
+    windowed = {t.name: t for t in result.windowed_timelines}
+    global_timelines = {t.name: t for t in result.global_timelines}
+    index_timelines = {t.name: t for t in result.index_timelines}
+    for i, start in enumerate(result.starts):
+        name = f"song{i}"
+        columns = []
+        for timelines in (windowed, global_timelines):
+            columns.append(f"{timelines[name].start_time}" if name in timelines else "-")
+        similarity = f"{global_timelines[name].similarity:.4f}" if name in global_timelines else "-"
+        index_start = f"{index_timelines[name].start_time}" if name in index_timelines else "-"
+        print(
+            f"{name:<10} {start:>9} {columns[0]:>11} {columns[1]:>9} {similarity:>8} {index_start:>11}"
+        )
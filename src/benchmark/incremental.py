@@ -0,0 +1,158 @@
+"""
+증분 슬라이딩 윈도우 매칭 벤치마크 모듈
+합성 스트림에서 윈도우마다 지문을 새로 만드는 기존 방식과 블록별로 한 번만 지문/매칭하는 증분 방식의
+시간을 비교하고, 같은 윈도우 지문을 detect_best_match로 계산한 결과와 증분 결과가 같은지 확인
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from src.benchmark.peak_picker import CLIP_SECONDS, SAMPLE_RATE, build_dataset
+
+CHUNK_SIZE = 60
+HOP_SIZE = 30
+
+
+@dataclass
+class IncrementalResult:
+    windows: int
+    mismatches: int  # 증분 결과와 윈도우별 재계산 결과가 다른 윈도우 수 (노래 목록 + 역색인)
+    windowed_seconds: float  # 기존 방식 전체 시간 (청크별 지문 생성 + 매칭)
+    incremental_seconds: float  # 증분 방식 전체 시간
+    windowed_timelines: list
+    incremental_timelines: list
+
+
+def build_references(songs):
+    """노래별 지문 구간으로 압축 지문 생성"""
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.utils.compact_audioprint import CompactAudioprint
+
+    frame_duration = AudioprintGenerator.hop_size / SAMPLE_RATE
+    references = {}
+    for i, song in enumerate(songs):
+        hashes, times = AudioprintGenerator.get_spectrogram_hashes(
+            song[: SAMPLE_RATE * CLIP_SECONDS], SAMPLE_RATE
+        )
+        references[f"song{i}"] = CompactAudioprint.from_hash_arrays(hashes, times, frame_duration)
+    return references
+
+
+def count_mismatches(stream, song_fingerprints) -> tuple:
+    """윈도우마다 증분 결과와 같은 블록으로 만든 윈도우 지문의 detect_best_match 결과 비교"""
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.timeline.stream_matcher import StreamMatcher
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.utils.types import TypeConverter
+    from src.utils.worldcup_index import WorldcupIndex
+
+    hop = AudioprintGenerator.hop_size
+    blocks_per_window = CHUNK_SIZE // HOP_SIZE
+    total_frames = (len(stream) - AudioprintGenerator.frame_size) // hop + 1
+
+    def block_start_frame(block: int) -> int:
+        return -(-block * HOP_SIZE * SAMPLE_RATE // hop)
+
+    matcher = StreamMatcher(song_fingerprints, hop, SAMPLE_RATE, block_start_frame(blocks_per_window) + 1)
+    windows = len(stream) // SAMPLE_RATE // HOP_SIZE - blocks_per_window + 1
+    mismatches = 0
+    for window in range(windows):
+        if matcher.blocks:
+            matcher.pop()
+        next_block = matcher.blocks[-1].index + 1 if matcher.blocks else window
+        for block in range(next_block, window + blocks_per_window):
+            matcher.push(
+                TimelineDetector.fingerprint_block(
+                    stream,
+                    SAMPLE_RATE,
+                    block,
+                    block_start_frame(block),
+                    min(block_start_frame(block + 1), total_frames),
+                )
+            )
+
+        start_frame = block_start_frame(window)
+        window_frames = block_start_frame(window + blocks_per_window) - start_frame
+        incremental = matcher.best_match(start_frame, window_frames)
+
+        # 같은 블록을 윈도우 기준 시간으로 다시 묶어서 기존 방식으로 계산
+        hashes = np.concatenate(
+            [np.repeat(b.keys, np.diff(b.key_starts)) for b in matcher.blocks]
+        ).astype(np.int32)
+        frames = np.concatenate([b.frames for b in matcher.blocks])
+        times = ((frames - start_frame) * hop / SAMPLE_RATE).astype(np.float32)
+        fingerprint = TypeConverter.group_hash_arrays(hashes, times)
+        if isinstance(song_fingerprints, WorldcupIndex):
+            detection = TimelineDetector.detect_best_match_index(fingerprint, song_fingerprints)
+        else:
+            detection = TimelineDetector.detect_best_match(fingerprint, song_fingerprints)
+
+        if (detection.similarity, detection.song_name, detection.offset) != incremental:
+            mismatches += 1
+    return windows, mismatches
+
+
+def run_incremental_benchmark(song_count: int = 10) -> IncrementalResult:
+    """기존/증분 방식 시간과 결과 일치 여부 측정"""
+    from src.timeline.read_audio import read_audio
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.utils.worldcup_index import WorldcupIndex
+
+    songs, stream, _ = build_dataset(song_count)
+    duration = len(stream) // SAMPLE_RATE
+    print(f"합성 노래 {song_count}개, 스트림 {duration / 60:.1f}분")
+
+    with contextlib.redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory() as temp_dir:
+        references = build_references(songs)
+        WorldcupIndex.build(Path(temp_dir), references)
+        index = WorldcupIndex.open(Path(temp_dir))
+
+        windows, mismatches = count_mismatches(stream, references)
+        _, index_mismatches = count_mismatches(stream, index)
+
+        start = time.perf_counter()
+        chunks = read_audio(stream, duration, SAMPLE_RATE, CHUNK_SIZE, HOP_SIZE)
+        windowed = TimelineDetector.analyze_timeline(
+            TimelineDetector.detect_timeline(chunks, references, HOP_SIZE)
+        )
+        windowed_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        incremental = TimelineDetector.analyze_timeline(
+            TimelineDetector.detect_timeline_incremental(
+                stream, duration, SAMPLE_RATE, references, CHUNK_SIZE, HOP_SIZE
+            )
+        )
+        incremental_seconds = time.perf_counter() - start
+
+    return IncrementalResult(
+        windows,
+        mismatches + index_mismatches,
+        windowed_seconds,
+        incremental_seconds,
+        windowed,
+        incremental,
+    )
+
+
+def print_incremental_results(result: IncrementalResult):
+    """측정 결과 출력"""
+    print("-" * 80)
+    print(f"윈도우 {result.windows}개 중 결과가 다른 윈도우: {result.mismatches}개")
+    print(f"기존 방식: {result.windowed_seconds:.2f}초")
+    print(
+        f"증분 방식: {result.incremental_seconds:.2f}초 "
+        f"({result.windowed_seconds / result.incremental_seconds:.1f}x)"
+    )
+    print(f"{'노래':<10} {'기존 시작(초)':>14} {'증분 시작(초)':>14}")
+    incremental = {t.name: t for t in result.incremental_timelines}
+    for timeline in result.windowed_timelines:
+        other = incremental.get(timeline.name)
+        other_start = f"{other.start_time}" if other else "-"
+        print(f"{timeline.name:<10} {timeline.start_time:>14} {other_start:>14}")
@@ -0,0 +1,119 @@
+"""
+월드컵 역색인 병렬 구축 벤치마크 모듈
+가짜 노래 지문(실제 해시 분포)을 월드컵 폴더에 저장한 뒤 노래 수별로
+지문 파일 로드(순차/작업자 풀), 포스팅 정렬(전체 안정 정렬/해시 범위 병렬 정렬), 역색인 구축 전체 시간을 측정하고
+병렬 정렬 결과가 전체 안정 정렬과 같은지 확인
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from src.benchmark.incremental import build_references
+from src.benchmark.library import build_decoys
+from src.benchmark.peak_picker import build_dataset
+
+REFERENCE_SONGS = 3  # 해시 분포를 뽑을 합성 노래 수
+WORLDCUP = "benchmark"
+
+
+@dataclass
+class IndexBuildResult:
+    songs: int
+    postings: int
+    load_seconds: Dict[int, float] = field(default_factory=dict)  # 작업자 수별 (1이면 순차)
+    sort_seconds: Dict[int, float] = field(default_factory=dict)  # 작업자 수별 (1이면 전체 안정 정렬)
+    build_seconds: Dict[int, float] = field(default_factory=dict)  # 작업자 수별 로드 + 구축
+    mismatches: int = 0  # 전체 안정 정렬과 순서가 다른 작업자 수
+
+
+def measure(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def run_index_build_benchmark(song_counts=(32, 128, 512, 1024), workers=None) -> List[IndexBuildResult]:
+    """노래 수별 역색인 구축 단계 시간 측정"""
+    from src.utils.file_db import FileDB
+    from src.utils.worldcup_index import WorldcupIndex
+
+    workers = sorted({1, *(workers or [os.cpu_count() or 1])})
+    print(f"노래 수 {list(song_counts)}, 작업자 수 {workers}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        songs, _, _ = build_dataset(REFERENCE_SONGS)
+        references = build_references(songs)
+
+    # JIT 컴파일 비용 제외
+    warmup = np.random.default_rng(0).integers(0, 1 << 32, 1 << 18, dtype=np.int64).astype(np.uint32)
+    WorldcupIndex.sort_order(warmup, 2)
+
+    results = []
+    base_path = FileDB.base_path
+    for song_count in song_counts:
+        with contextlib.redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory() as temp_dir:
+            FileDB.base_path = Path(temp_dir)
+            try:
+                for name, audioprint in build_decoys(references, song_count).items():
+                    FileDB.save_audioprint(name, audioprint, WORLDCUP)
+
+                result = IndexBuildResult(song_count, 0)
+                for worker_count in workers:
+                    result.load_seconds[worker_count], audioprints = measure(
+                        lambda: FileDB.load_audioprints(WORLDCUP, worker_count)
+                    )
+
+                hashes = np.concatenate([audioprint.hashes for audioprint in audioprints.values()])
+                hashes = np.repeat(
+                    hashes,
+                    np.concatenate(
+                        [np.diff(audioprint.offsets.astype(np.int64)) for audioprint in audioprints.values()]
+                    ),
+                )
+                result.postings = len(hashes)
+                expected = None
+                for worker_count in workers:
+                    result.sort_seconds[worker_count], order = measure(
+                        lambda: WorldcupIndex.sort_order(hashes, worker_count)
+                    )
+                    if expected is None:
+                        expected = order
+                    elif not np.array_equal(order, expected):
+                        result.mismatches += 1
+                del hashes, expected, order, audioprints
+
+                for worker_count in workers:
+                    result.build_seconds[worker_count], _ = measure(
+                        lambda: WorldcupIndex.build(
+                            FileDB.get_worldcup_path(WORLDCUP),
+                            FileDB.load_audioprints(WORLDCUP, worker_count),
+                            worker_count,
+                        )
+                    )
+            finally:
+                FileDB.base_path = base_path
+        results.append(result)
+        print(f"노래 {song_count}개 완료")
+    return results
+
+
+def print_index_build_results(results: List[IndexBuildResult]):
+    """측정 결과 출력"""
+    print("-" * 80)
+    print(f"{'노래 수':>8} {'포스팅':>13} {'작업자':>6} {'로드(초)':>10} {'정렬(초)':>10} {'구축(초)':>10}")
+    for result in results:
+        for worker_count in result.load_seconds:
+            print(
+                f"{result.songs:>8} {result.postings:>13,} {worker_count:>6} "
+                f"{result.load_seconds[worker_count]:>10.3f} {result.sort_seconds[worker_count]:>10.3f} "
+                f"{result.build_seconds[worker_count]:>10.3f}"
+            )
+    mismatches = sum(result.mismatches for result in results)
+    print(f"병렬 정렬 결과가 전체 안정 정렬과 다른 경우: {mismatches}개 (CPU {os.cpu_count()}개)")
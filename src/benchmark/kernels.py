@@ -0,0 +1,259 @@
+"""
+핫 함수별 마이크로 벤치마크 모듈
+고정된 합성 입력(여러 길이)으로 지문 생성/매칭/변환/저장 함수를 하나씩 반복 측정하고,
+결과를 JSON 기준값으로 저장하거나 기준값과 비교하여 허용 범위를 넘게 느려진 함수를 표시
+"""
+
+import contextlib
+import io
+import json
+import platform
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+SAMPLE_RATE = 44100
+SIZES = {"small": 10, "medium": 60, "large": 300}  # 입력 오디오 길이 (초)
+SONG_SECONDS = 30  # 노래 지문 길이 (main.audioprint와 동일)
+MIN_REPEAT_SECONDS = 0.5  # 함수별 최소 반복 측정 시간
+MIN_REPEATS = 3
+MAX_REPEATS = 50
+DEFAULT_TOLERANCE = 0.2  # 기준값보다 20% 넘게 느리면 표시
+
+
+@dataclass
+class KernelResult:
+    kernel: str
+    size: str
+    seconds: float  # 반복 측정 최소 시간
+    median_seconds: float
+    repeats: int
+
+
+@dataclass
+class KernelComparison:
+    kernel: str
+    size: str
+    baseline_seconds: float
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        return self.seconds / self.baseline_seconds if self.baseline_seconds else float("inf")
+
+    def is_slower(self, tolerance: float) -> bool:
+        return self.ratio > 1 + tolerance
+
+
+def build_cases(seconds: int, temp_dir: Path) -> Dict[str, Callable[[], object]]:
+    """입력 길이별 측정 함수 목록 (입력은 여기서 한 번만 만들고 측정 시간에서 제외)"""
+    import essentia.standard as es
+
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.benchmark.synthetic import synthetic_audio
+    from src.timeline.similarity_processor import (
+        compute_similarity,
+        compute_similarity_numpy,
+        compute_time_offsets,
+        compute_time_offsets_compact,
+        matched_time_range_compact,
+        offset_bin_range,
+        vote_time_offsets_compact,
+    )
+    from src.utils.compact_audioprint import CompactAudioprint
+    from src.utils.file_db import FileDB
+    from src.utils.types import TypeConverter
+
+    audio = synthetic_audio(seconds, SAMPLE_RATE)
+    song_audio = audio[: SAMPLE_RATE * min(seconds, SONG_SECONDS)]
+    frame_duration = AudioprintGenerator.hop_size / SAMPLE_RATE
+
+    # 프레임별 스펙트럼 피크 (_select_band_peaks 입력)
+    generator = AudioprintGenerator(verbose=False)
+    spectral_peaks = [
+        generator.spectral_peaks(generator.spectrum(generator.window(frame)))
+        for frame in es.FrameGenerator(
+            audio, frameSize=AudioprintGenerator.frame_size, hopSize=AudioprintGenerator.hop_size
+        )
+    ]
+    peak_freqs = np.concatenate([freqs for freqs, _ in spectral_peaks])
+    peak_mags = np.concatenate([mags for _, mags in spectral_peaks])
+    peak_starts = np.zeros(len(spectral_peaks) + 1, dtype=np.int64)
+    peak_starts[1:] = np.cumsum([len(freqs) for freqs, _ in spectral_peaks])
+    peak_matrix = np.zeros(
+        (len(spectral_peaks), AudioprintGenerator.NUM_BANDS * AudioprintGenerator.PEAKS_PER_BAND),
+        dtype=np.float32,
+    )
+    peak_counts = np.zeros(len(spectral_peaks), dtype=np.int32)
+
+    def select_peaks():
+        AudioprintGenerator._select_band_peaks(
+            peak_freqs,
+            peak_mags,
+            peak_starts,
+            AudioprintGenerator.NUM_BANDS,
+            AudioprintGenerator.PEAKS_PER_BAND,
+            peak_matrix,
+            peak_counts,
+        )
+
+    select_peaks()
+    frame_times = np.arange(len(spectral_peaks)) * AudioprintGenerator.hop_size / float(SAMPLE_RATE)
+
+    # 지문과 시간 오프셋 (매칭/변환 입력)
+    hashes, times = AudioprintGenerator._create_peak_pairs_fast(
+        peak_matrix,
+        peak_counts,
+        frame_times,
+        AudioprintGenerator.FREQ_BITS,
+        AudioprintGenerator.DELTA_MASK,
+    )
+    fingerprint = TypeConverter.group_hash_arrays(hashes, times)
+    song_hashes, song_times = AudioprintGenerator.get_spectrogram_hashes(song_audio, SAMPLE_RATE)
+    song = CompactAudioprint.from_hash_arrays(song_hashes, song_times, frame_duration)
+    song_dict = song.to_numba_dict()
+    time_offsets = np.array(compute_time_offsets(fingerprint, song_dict))
+    python_dict = TypeConverter.convert_python_dict(fingerprint)
+    compact = CompactAudioprint.from_numba_dict(fingerprint, frame_duration)
+    song_arrays = (song.hashes, song.offsets, song.frames, song.frame_duration)
+    first_bin, end_bin = offset_bin_range(*matched_time_range_compact(fingerprint, *song_arrays))
+
+    def file_case(encoding: str, load: bool):
+        path = temp_dir / f"audioprint_{encoding}{FileDB.get_suffix(encoding)}"
+        FileDB.write_audioprint(path, compact, encoding)
+        if load:
+            return lambda: FileDB.read_audioprint(path)
+        return lambda: FileDB.write_audioprint(path, compact, encoding)
+
+    cases = {
+        "get_spectrogram_fingerprint": lambda: AudioprintGenerator.get_spectrogram_fingerprint(
+            audio, SAMPLE_RATE
+        ),
+        "_select_band_peaks": select_peaks,
+        "_create_peak_pairs_fast": lambda: AudioprintGenerator._create_peak_pairs_fast(
+            peak_matrix,
+            peak_counts,
+            frame_times,
+            AudioprintGenerator.FREQ_BITS,
+            AudioprintGenerator.DELTA_MASK,
+        ),
+        "compute_time_offsets": lambda: compute_time_offsets(fingerprint, song_dict),
+        "compute_time_offsets_compact": lambda: compute_time_offsets_compact(
+            fingerprint, song.hashes, song.offsets, song.frames, song.frame_duration
+        ),
+        "vote_time_offsets_compact": lambda: vote_time_offsets_compact(
+            fingerprint, *song_arrays, first_bin, end_bin - first_bin
+        ),
+        "compute_similarity": lambda: compute_similarity(
+            time_offsets, len(fingerprint), len(song)
+        ),
+        "compute_similarity_numpy": lambda: compute_similarity_numpy(
+            time_offsets, len(fingerprint), len(song)
+        ),
+        "TypeConverter.group_hash_arrays": lambda: TypeConverter.group_hash_arrays(hashes, times),
+        "TypeConverter.convert_python_dict": lambda: TypeConverter.convert_python_dict(fingerprint),
+        "TypeConverter.convert_numba_dict": lambda: TypeConverter.convert_numba_dict(python_dict),
+    }
+    for encoding in FileDB.ENCODINGS:
+        cases[f"FileDB.save[{encoding}]"] = file_case(encoding, load=False)
+        cases[f"FileDB.load[{encoding}]"] = file_case(encoding, load=True)
+    return cases
+
+
+def measure(func: Callable[[], object]) -> tuple:
+    """한 번 실행(JIT 컴파일/캐시 로드)한 뒤 반복 측정하여 (최소, 중앙값, 반복 수) 반환"""
+    func()
+    durations = []
+    total = 0.0
+    while len(durations) < MAX_REPEATS and (
+        len(durations) < MIN_REPEATS or total < MIN_REPEAT_SECONDS
+    ):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        durations.append(elapsed)
+        total += elapsed
+    return min(durations), float(np.median(durations)), len(durations)
+
+
+def run_kernel_benchmarks(sizes: List[str] = None, kernels: List[str] = None) -> List[KernelResult]:
+    """입력 길이별로 함수마다 반복 측정 (kernels가 주어지면 이름에 포함된 함수만)"""
+    results = []
+    for size in sizes or list(SIZES):
+        print(f"입력 {size} ({SIZES[size]}초) 준비 중...")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with contextlib.redirect_stdout(io.StringIO()):
+                cases = build_cases(SIZES[size], Path(temp_dir))
+            for kernel, func in cases.items():
+                if kernels and not any(name in kernel for name in kernels):
+                    continue
+                with contextlib.redirect_stdout(io.StringIO()):
+                    seconds, median_seconds, repeats = measure(func)
+                results.append(KernelResult(kernel, size, seconds, median_seconds, repeats))
+                print(f"  {kernel:<36} {seconds * 1000:>10.3f}ms")
+    return results
+
+
+def save_baseline(results: List[KernelResult], file_path: Path):
+    """측정 결과를 JSON 기준값으로 저장"""
+    baseline = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "results": [asdict(result) for result in results],
+    }
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(json.dumps(baseline, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def load_baseline(file_path: Path) -> List[KernelResult]:
+    """JSON 기준값 로드"""
+    baseline = json.loads(file_path.read_text(encoding="utf-8"))
+    return [KernelResult(**result) for result in baseline["results"]]
+
+
+def compare_results(
+    results: List[KernelResult], baseline: List[KernelResult]
+) -> List[KernelComparison]:
+    """같은 (함수, 입력 길이)끼리 최소 시간 비교 (기준값에 없는 항목은 제외)"""
+    baseline_seconds = {(r.kernel, r.size): r.seconds for r in baseline}
+    return [
+        KernelComparison(r.kernel, r.size, baseline_seconds[(r.kernel, r.size)], r.seconds)
+        for r in results
+        if (r.kernel, r.size) in baseline_seconds
+    ]
+
+
+def print_kernel_results(results: List[KernelResult]):
+    """측정 결과 출력"""
+    print("-" * 80)
+    print(f"{'함수':<36} {'입력':>8} {'최소(ms)':>12} {'중앙값(ms)':>12} {'반복':>6}")
+    for r in results:
+        print(
+            f"{r.kernel:<36} {r.size:>8} {r.seconds * 1000:>12.3f} "
+            f"{r.median_seconds * 1000:>12.3f} {r.repeats:>6}"
+        )
+
+
+def print_comparisons(comparisons: List[KernelComparison], tolerance: float) -> int:
+    """기준값 비교 결과를 출력하고 허용 범위를 넘게 느려진 항목 수를 반환"""
+    print("-" * 80)
+    print(f"{'함수':<36} {'입력':>8} {'기준(ms)':>12} {'현재(ms)':>12} {'비율':>8}")
+    slower = 0
+    for c in comparisons:
+        flag = ""
+        if c.is_slower(tolerance):
+            flag = "  <- 느려짐"
+            slower += 1
+        print(
+            f"{c.kernel:<36} {c.size:>8} {c.baseline_seconds * 1000:>12.3f} "
+            f"{c.seconds * 1000:>12.3f} {c.ratio:>7.2f}x{flag}"
+        )
+    print(f"허용 범위 {tolerance:.0%}를 넘게 느려진 항목: {slower}개")
+    return slower
@@ -0,0 +1,165 @@
+"""
+라이브러리 식별 벤치마크 모듈
+합성 노래와 다수의 가짜 노래 지문을 여러 월드컵 폴더에 나누어 저장한 뒤 라이브러리 역색인을 구축하고,
+샤드 분산 매칭(작업 프로세스 수별) 시간과 결과가 노래 목록 일괄 매칭(BatchMatcher)과 같은지,
+라이브러리 전체에서 타임라인을 맞게 찾는지 측정
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from src.benchmark.global_voting import count_correct
+from src.benchmark.incremental import CHUNK_SIZE, HOP_SIZE, build_references
+from src.benchmark.peak_picker import CLIP_SECONDS, SAMPLE_RATE, build_dataset
+
+WORLDCUPS = 4  # 노래를 나누어 저장할 월드컵 폴더 수
+SHARDS = 8
+
+
+@dataclass
+class LibraryResult:
+    songs: int  # 라이브러리 노래 수
+    shards: int
+    build_seconds: float
+    library_bytes: int
+    max_shard_bytes: int
+    windows: int
+    batch_seconds: float  # 노래 목록 전체를 BatchMatcher로 매칭
+    library_seconds: Dict[int, float] = field(default_factory=dict)  # 작업 프로세스 수별
+    mismatches: int = 0  # BatchMatcher와 다른 (윈도우, 노래) 칸 수
+    correct: int = 0
+    song_count: int = 0
+
+
+def build_decoys(references, count: int, seed: int = 0):
+    """실제 노래 해시 분포에서 뽑은 해시로 가짜 노래 지문 생성 (해시 충돌이 실제와 비슷하도록)"""
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.utils.compact_audioprint import CompactAudioprint
+
+    rng = np.random.default_rng(seed)
+    frame_duration = AudioprintGenerator.hop_size / SAMPLE_RATE
+    pool = np.concatenate(
+        [np.repeat(fp.hashes, np.diff(fp.offsets.astype(np.int64))) for fp in references.values()]
+    )
+    sizes = [len(fp.frames) for fp in references.values()]
+    decoys = {}
+    for i in range(count):
+        size = int(rng.choice(sizes))
+        hashes = rng.choice(pool, size)
+        times = rng.integers(0, int(CLIP_SECONDS / frame_duration), size) * frame_duration
+        decoys[f"decoy{i}"] = CompactAudioprint.from_hash_arrays(hashes, times, frame_duration)
+    return decoys
+
+
+def match_batches(matcher, fingerprints):
+    """타임라인 감지와 같이 BATCH_WINDOWS개씩 매칭한 (유사도, 오프셋) 행렬"""
+    from src.timeline.timeline_detector import TimelineDetector
+
+    step = TimelineDetector.BATCH_WINDOWS
+    matrices = [matcher.match(fingerprints[i : i + step]) for i in range(0, len(fingerprints), step)]
+    return (
+        np.concatenate([m.similarities for m in matrices]),
+        np.concatenate([m.offsets for m in matrices]),
+    )
+
+
+def run_library_benchmark(
+    song_count: int = 10, decoy_count: int = 200, workers=(1, 2)
+) -> LibraryResult:
+    """라이브러리 구축 시간, 샤드 분산 매칭 시간/결과, 타임라인 정확도 측정"""
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.timeline.batch_matcher import BatchMatcher
+    from src.timeline.library_matcher import LibraryMatcher
+    from src.timeline.read_audio import read_audio
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.utils.file_db import FileDB
+    from src.utils.library_index import LibraryIndex
+
+    songs, stream, starts = build_dataset(song_count)
+    duration = len(stream) // SAMPLE_RATE
+    print(f"합성 노래 {song_count}개 + 가짜 노래 {decoy_count}개, 스트림 {duration / 60:.1f}분")
+
+    base_path = FileDB.base_path
+    with contextlib.redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory() as temp_dir:
+        references = build_references(songs)
+        audioprints = {**references, **build_decoys(references, decoy_count)}
+
+        # 노래를 여러 월드컵 폴더에 나누어 저장
+        FileDB.base_path = Path(temp_dir)
+        try:
+            for i, (name, audioprint) in enumerate(audioprints.items()):
+                FileDB.save_audioprint(name, audioprint, f"worldcup{i % WORLDCUPS}")
+
+            start = time.perf_counter()
+            version, library_songs = FileDB.collect_library_songs()
+            library = LibraryIndex.build(FileDB.get_library_path(), library_songs, version, SHARDS)
+            build_seconds = time.perf_counter() - start
+        finally:
+            FileDB.base_path = base_path
+
+        shard_bytes = [
+            (library.library_path / f"{name}.npz").stat().st_size for name in library.shard_names
+        ]
+        fingerprints = [
+            AudioprintGenerator.get_spectrogram_fingerprint(
+                stream[start * SAMPLE_RATE : (start + CHUNK_SIZE) * SAMPLE_RATE], SAMPLE_RATE
+            )
+            for start in range(0, duration - CHUNK_SIZE + 1, HOP_SIZE)
+        ]
+
+        # 같은 노래 순서의 노래 목록으로 일괄 매칭한 결과를 기준으로 사용
+        ordered = {song.name: audioprints[song.name] for song in library_songs}
+        BatchMatcher(ordered).match(fingerprints[:1])  # JIT 컴파일 비용 제외
+        start = time.perf_counter()
+        expected_similarities, expected_offsets = match_batches(BatchMatcher(ordered), fingerprints)
+        batch_seconds = time.perf_counter() - start
+
+        result = LibraryResult(
+            len(library),
+            library.shard_count,
+            build_seconds,
+            sum(shard_bytes),
+            max(shard_bytes),
+            len(fingerprints),
+            batch_seconds,
+            song_count=song_count,
+        )
+        for worker_count in workers:
+            LibraryMatcher.set_config(workers=worker_count)
+            with LibraryMatcher(library) as matcher:
+                matcher.match(fingerprints[:1])  # 작업 프로세스 시작과 JIT 캐시 로드 제외
+                start = time.perf_counter()
+                similarities, offsets = match_batches(matcher, fingerprints)
+                result.library_seconds[worker_count] = time.perf_counter() - start
+            result.mismatches += int(
+                np.sum(similarities != expected_similarities) + np.sum(offsets != expected_offsets)
+            )
+
+        chunks = read_audio(stream, duration, SAMPLE_RATE, CHUNK_SIZE, HOP_SIZE)
+        timelines = TimelineDetector.analyze_timeline(
+            TimelineDetector.detect_timeline(chunks, library, HOP_SIZE)
+        )
+        result.correct = count_correct(timelines, starts)
+    return result
+
+
+def print_library_results(result: LibraryResult):
+    """측정 결과 출력"""
+    print("-" * 80)
+    print(
+        f"라이브러리 {result.songs}곡, 샤드 {result.shards}개, 구축 {result.build_seconds:.2f}초, "
+        f"전체 {result.library_bytes / 2**20:.1f}MB (최대 샤드 {result.max_shard_bytes / 2**20:.1f}MB)"
+    )
+    print(f"윈도우 {result.windows}개, 노래 목록 일괄 매칭과 다른 칸: {result.mismatches}개")
+    print(f"{'매처':<24} {'시간(초)':>10}")
+    print(f"{'노래 목록 (BatchMatcher)':<24} {result.batch_seconds:>10.2f}")
+    for worker_count, seconds in result.library_seconds.items():
+        print(f"{f'샤드 분산 (프로세스 {worker_count}개)':<24} {seconds:>10.2f}")
+    print(f"라이브러리 타임라인 정확도: {result.correct}/{result.song_count}")
@@ -0,0 +1,149 @@
+"""
+라이브 모드 벤치마크 모듈
+합성 스트림을 실시간 속도(배속 지정 가능)로 기록 중인 WAV 파일에 쓰면서 LiveTimelineDetector로 감지하여,
+노래 지문 구간이 끝난 뒤 보고까지의 지연, 블록 처리 시간, CPU 사용률, 정확도를 측정
+"""
+
+import contextlib
+import io
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from src.benchmark.global_voting import count_correct
+from src.benchmark.incremental import build_references
+from src.benchmark.peak_picker import CLIP_SECONDS, SAMPLE_RATE, START_TOLERANCE, build_dataset
+
+WRITE_SECONDS = 0.25  # 한 번에 기록하는 오디오 길이
+IDLE_TIMEOUT = 2.0  # 기록이 끝난 뒤 소스 종료 판단 시간
+THRESHOLD = 0.001  # main.timeline 기본 유사도 임계값
+
+
+@dataclass
+class LiveResult:
+    starts: list  # 노래별 실제 시작 시간
+    speed: float
+    latency_bound: float
+    block_seconds: float
+    timelines: list
+    report_latencies: Dict[str, float] = field(default_factory=dict)  # 노래별 첫 정답 보고 지연 (스트림 초)
+    reports: List[str] = field(default_factory=list)
+    block_times: List[float] = field(default_factory=list)
+    slow_blocks: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+
+
+class RealtimeWavWriter(threading.Thread):
+    """오디오를 실시간 속도로 float32 WAV 파일 끝에 이어 쓰는 스레드"""
+
+    def __init__(self, path: Path, audio: np.ndarray, sample_rate: int, speed: float):
+        super().__init__(daemon=True)
+        from src.youtube_download.mapped_audio import MappedAudio
+
+        self.path = path
+        self.audio = audio
+        self.sample_rate = sample_rate
+        self.speed = speed
+        # 데이터 크기를 모르므로 0으로 기록 (읽는 쪽은 파일 크기로 보정)
+        path.write_bytes(MappedAudio._float_wav_header(0, sample_rate))
+        self.started = None
+
+    def written_at(self, sample: int) -> float:
+        """해당 샘플이 기록되는 벽시계 시간 (perf_counter 기준)"""
+        return self.started + sample / self.sample_rate / self.speed
+
+    def run(self):
+        step = int(WRITE_SECONDS * self.sample_rate)
+        self.started = time.perf_counter()
+        with open(self.path, "ab") as f:
+            for position in range(0, len(self.audio), step):
+                delay = self.written_at(position + step) - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                f.write(self.audio[position : position + step].astype("<f4").tobytes())
+                f.flush()
+
+
+def run_live_benchmark(song_count: int = 3, speed: float = 1.0, latency: float = 15.0) -> LiveResult:
+    """합성 스트림을 실시간으로 재생하며 라이브 감지"""
+    from src.timeline.live_detector import LiveTimelineDetector, run_live
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.youtube_download.live_source import GrowingFileSource, LiveSource
+
+    songs, stream, starts = build_dataset(song_count)
+    print(f"합성 노래 {song_count}개, 스트림 {len(stream) / SAMPLE_RATE / 60:.1f}분, {speed:g}배속 재생")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        references = build_references(songs)
+        # JIT 컴파일 비용 제외
+        TimelineDetector.detect_timeline_global(
+            stream[: SAMPLE_RATE * 60], 60, SAMPLE_RATE, references
+        )
+
+    LiveSource.set_config(idle_timeout=IDLE_TIMEOUT)
+    detector = LiveTimelineDetector(references, SAMPLE_RATE, latency, THRESHOLD)
+    result = LiveResult(starts, speed, latency, detector.block_seconds, [])
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "live.wav"
+        writer = RealtimeWavWriter(path, stream, SAMPLE_RATE, speed)
+        source = GrowingFileSource(path, SAMPLE_RATE)
+
+        def on_report(report):
+            timeline = report.timeline
+            delay = None
+            if timeline.name.startswith("song") and timeline.name not in result.report_latencies:
+                start = starts[int(timeline.name[4:])]
+                if abs(timeline.start_time - start) <= START_TOLERANCE:
+                    clip_end = (start + CLIP_SECONDS) * SAMPLE_RATE
+                    delay = (time.perf_counter() - writer.written_at(clip_end)) * speed
+                    result.report_latencies[timeline.name] = delay
+            result.reports.append(
+                f"  {'수정' if report.updated else '감지'}: {timeline.name} {timeline.start_time}초 "
+                f"(유사도 {timeline.similarity:.4f}"
+                + (f", 지연 {delay:.1f}초)" if delay is not None else ")")
+            )
+
+        cpu_start = time.process_time()
+        writer.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result.timelines = run_live(source, detector, on_report)
+        writer.join()
+        result.wall_seconds = time.perf_counter() - writer.started
+        result.cpu_seconds = time.process_time() - cpu_start
+
+    result.block_times = detector.block_seconds_used
+    result.slow_blocks = detector.slow_blocks
+    return result
+
+
+def print_live_results(result: LiveResult):
+    """측정 결과 출력"""
+    print("\n".join(result.reports))
+    print("-" * 80)
+    correct = count_correct(result.timelines, result.starts)
+    print(f"정확도: {correct}/{len(result.starts)}")
+    print(f"블록 크기: {result.block_seconds:.1f}초, 지연 상한: {result.latency_bound:.0f}초")
+    latencies = list(result.report_latencies.values())
+    if latencies:
+        exceeded = sum(latency > result.latency_bound for latency in latencies)
+        print(
+            f"정답 보고 지연 (노래 지문 구간 끝 기준, 스트림 초): 평균 {np.mean(latencies):.1f}, "
+            f"최대 {max(latencies):.1f}, 상한 초과 {exceeded}/{len(latencies)}"
+        )
+    if result.block_times:
+        print(
+            f"블록 처리 시간: 평균 {np.mean(result.block_times) * 1000:.0f}ms, "
+            f"최대 {max(result.block_times) * 1000:.0f}ms, "
+            f"실시간보다 느린 블록 {result.slow_blocks}/{len(result.block_times)}"
+        )
+    print(
+        f"CPU 사용률: {result.cpu_seconds / result.wall_seconds * 100:.0f}% "
+        f"(CPU {result.cpu_seconds:.1f}초 / 경과 {result.wall_seconds:.1f}초)"
+    )
@@ -0,0 +1,151 @@
+"""
+피크 선택 방식 비교 벤치마크 모듈
+합성 노래들로 만든 긴 스트림에서 피크 선택 방식별 지문 크기, 지문 생성/매칭 시간, 정확도를 측정
+"""
+
+import contextlib
+import io
+import time
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+SAMPLE_RATE = 44100
+SONG_SECONDS = 60
+CLIP_SECONDS = 30  # 노래 지문 구간 (main.audioprint와 동일)
+FILLER_SECONDS = 30  # 노래 사이 다른 오디오 길이
+CHUNK_SIZE = 60
+HOP_SIZE = 30
+NOISE_LEVEL = 0.05  # 스트림에 더하는 백색 잡음 크기
+START_TOLERANCE = 1  # 시작 시간 허용 오차 (초)
+
+
+@dataclass
+class PeakPickerResult:
+    peak_picker: str
+    hashes_per_second: float  # 스트림 지문의 초당 해시 수
+    song_hashes: float  # 노래 지문 평균 고유 해시 수
+    song_bytes: float  # 노래 지문 평균 배열 크기
+    fingerprint_seconds: float  # 오디오 1분당 지문 생성 시간
+    match_ms: float  # 청크 하나를 전체 노래와 매칭하는 시간
+    correct: int  # 시작 시간을 맞게 찾은 노래 수
+    song_count: int
+
+
+def build_dataset(song_count: int):
+    """합성 노래 목록과 노래 사이에 다른 오디오를 넣은 스트림, 노래별 실제 시작 시간"""
+    from src.benchmark.synthetic import synthetic_audio
+
+    rng = np.random.default_rng(0)
+    songs = [synthetic_audio(SONG_SECONDS, SAMPLE_RATE, seed=100 + i) for i in range(song_count)]
+
+    parts, starts, position = [], [], 0
+    for i, song in enumerate(songs):
+        filler = synthetic_audio(FILLER_SECONDS, SAMPLE_RATE, seed=1000 + i)
+        parts += [filler, song]
+        starts.append(position + FILLER_SECONDS)
+        position += FILLER_SECONDS + SONG_SECONDS
+
+    stream = np.concatenate(parts) * 0.7
+    stream += rng.normal(0, NOISE_LEVEL, len(stream))
+    return songs, stream.astype(np.float32), starts
+
+
+def run_picker(peak_picker: str, songs, stream, starts) -> PeakPickerResult:
+    """피크 선택 방식 하나로 노래 지문 생성, 스트림 청크 매칭, 정확도 측정"""
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.timeline.read_audio import read_audio
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.utils.compact_audioprint import CompactAudioprint
+    from src.utils.types import TimelineData, TypeConverter
+
+    AudioprintGenerator.set_peak_picker(peak_picker)
+    frame_duration = AudioprintGenerator.hop_size / SAMPLE_RATE
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        # JIT 컴파일 비용 제외
+        AudioprintGenerator.get_spectrogram_fingerprint(songs[0][: SAMPLE_RATE * 5], SAMPLE_RATE)
+
+        references = {}
+        for i, song in enumerate(songs):
+            hashes, times = AudioprintGenerator.get_spectrogram_hashes(
+                song[: SAMPLE_RATE * CLIP_SECONDS], SAMPLE_RATE
+            )
+            references[f"song{i}"] = CompactAudioprint.from_hash_arrays(hashes, times, frame_duration)
+
+        fingerprint_seconds, match_seconds, hash_count, chunk_count = 0.0, 0.0, 0, 0
+        timelines = []
+        duration = len(stream) // SAMPLE_RATE
+        for chunk in read_audio(stream, duration, SAMPLE_RATE, CHUNK_SIZE, HOP_SIZE):
+            start = time.perf_counter()
+            hashes, times = AudioprintGenerator.get_spectrogram_hashes(
+                chunk.audio, chunk.samplerate
+            )
+            fingerprint = TypeConverter.group_hash_arrays(hashes, times)
+            fingerprint_seconds += time.perf_counter() - start
+            hash_count += len(hashes)
+
+            start = time.perf_counter()
+            detection = TimelineDetector.detect_best_match(fingerprint, references)
+            match_seconds += time.perf_counter() - start
+            chunk_count += 1
+
+            audio_start_time = chunk.start_time - detection.offset
+            if detection.similarity > 0 and audio_start_time >= 0:
+                timelines.append(
+                    TimelineData(detection.song_name, detection.similarity, round(audio_start_time))
+                )
+
+    # 노래별 최고 유사도 타임라인으로 정확도 계산 (유사도 임계값은 방식마다 달라 사용하지 않음)
+    best = {}
+    for timeline in timelines:
+        if timeline.name not in best or timeline.similarity > best[timeline.name].similarity:
+            best[timeline.name] = timeline
+    correct = sum(
+        1
+        for i, start in enumerate(starts)
+        if f"song{i}" in best and abs(best[f"song{i}"].start_time - start) <= START_TOLERANCE
+    )
+
+    total_audio_seconds = chunk_count * CHUNK_SIZE
+    return PeakPickerResult(
+        peak_picker,
+        hash_count / total_audio_seconds,
+        np.mean([len(r) for r in references.values()]),
+        np.mean([r.nbytes for r in references.values()]),
+        fingerprint_seconds / total_audio_seconds * 60,
+        match_seconds / chunk_count * 1000,
+        correct,
+        len(songs),
+    )
+
+
+def run_peak_picker_benchmark(song_count: int = 10, peak_pickers=None) -> List[PeakPickerResult]:
+    """피크 선택 방식별 벤치마크 실행"""
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+
+    peak_pickers = peak_pickers or AudioprintGenerator.PEAK_PICKERS
+    songs, stream, starts = build_dataset(song_count)
+    print(f"합성 노래 {song_count}개, 스트림 {len(stream) / SAMPLE_RATE / 60:.1f}분")
+
+    original = AudioprintGenerator.peak_picker
+    try:
+        return [run_picker(picker, songs, stream, starts) for picker in peak_pickers]
+    finally:
+        AudioprintGenerator.set_peak_picker(original)
+
+
+def print_peak_picker_results(results: List[PeakPickerResult]):
+    """피크 선택 방식별 측정 결과 출력"""
+    print("-" * 80)
+    print(
+        f"{'방식':<14} {'해시/초':>9} {'노래 해시':>10} {'노래 KB':>8} "
+        f"{'지문(초/분)':>11} {'매칭(ms)':>9} {'정확도':>8}"
+    )
+    for r in results:
+        print(
+            f"{r.peak_picker:<14} {r.hashes_per_second:>9.0f} {r.song_hashes:>10.0f} "
+            f"{r.song_bytes / 1024:>8.1f} {r.fingerprint_seconds:>11.2f} {r.match_ms:>9.1f} "
+            f"{r.correct:>4}/{r.song_count:<3}"
+        )
@@ -0,0 +1,159 @@
+"""
+매칭 작업 재생 벤치마크 모듈
+python -m main.timeline --record로 녹화한 윈도우 지문과 노래 지문 스냅샷을 오디오/네트워크 없이 다시 매칭하여
+윈도우별 매칭, 일괄 매칭, 타임라인 감지 전체(지문 생성 제외) 시간을 측정하고 녹화한 결과와 비교
+녹화 디렉토리가 없으면 합성 스트림을 녹화하여 사용
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict
+
+from src.benchmark.incremental import CHUNK_SIZE, HOP_SIZE, build_references
+from src.benchmark.peak_picker import SAMPLE_RATE, build_dataset
+
+
+@dataclass
+class ReplayResult:
+    windows: int  # 녹화한 윈도우 수
+    matched_windows: int  # 게이트를 통과하여 매칭한 윈도우 수
+    postings: int  # 윈도우 지문의 (해시, 시간) 수 합
+    songs: int
+    song_format: str  # index / audioprints
+    load_seconds: float  # 윈도우 지문 복원 시간
+    seconds: Dict[str, float] = field(default_factory=dict)  # 방식별 최소 시간
+    mismatches: int = 0  # 녹화한 결과와 다른 타임라인 수
+    timelines: int = 0
+
+
+def record_synthetic(recording_path: Path, song_count: int):
+    """합성 스트림의 타임라인 감지를 녹화 (녹화 디렉토리를 지정하지 않았을 때)"""
+    from src.timeline.audio_gate import AudioGate
+    from src.timeline.read_audio import read_audio
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.timeline.workload_recording import WorkloadRecorder
+
+    songs, stream, _ = build_dataset(song_count)
+    duration = len(stream) // SAMPLE_RATE
+    print(f"합성 노래 {song_count}개, 스트림 {duration / 60:.1f}분 녹화 중...")
+    with contextlib.redirect_stdout(io.StringIO()):
+        references = build_references(songs)
+        settings = {"chunk_size": CHUNK_SIZE, "hop_size": HOP_SIZE, "threshold": 0.001}
+        recorder = WorkloadRecorder(recording_path, references, settings)
+        chunks = recorder.record(
+            read_audio(stream, duration, SAMPLE_RATE, CHUNK_SIZE, HOP_SIZE), AudioGate()
+        )
+        timelines = TimelineDetector.analyze_timeline(
+            TimelineDetector.detect_timeline(chunks, references, HOP_SIZE, 0.001, recorder.gate)
+        )
+        recorder.finish(timelines)
+
+
+def replay_timelines(recording, songs):
+    """녹화한 지문/게이트 판정으로 타임라인 감지 전체 재생"""
+    from src.timeline.timeline_detector import TimelineDetector
+
+    return TimelineDetector.analyze_timeline(
+        TimelineDetector.detect_timeline(
+            recording.chunks(),
+            songs,
+            recording.info["hop_size"],
+            recording.info["threshold"],
+            recording.gate(),
+        )
+    )
+
+
+def best_of(repeat: int, func):
+    """repeat번 실행한 최소 시간과 마지막 결과 (진행 출력 숨김)"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_replay_benchmark(recording_path: Path = None, repeat: int = 3, song_count: int = 10) -> ReplayResult:
+    """녹화한 작업을 방식별로 재생하여 시간과 결과 비교"""
+    from src.timeline.batch_matcher import BatchMatcher
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.timeline.workload_recording import WorkloadRecording
+    from src.utils.worldcup_index import WorldcupIndex
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if recording_path is None:
+            recording_path = Path(temp_dir) / "recording"
+            record_synthetic(recording_path, song_count)
+
+        recording = WorkloadRecording(recording_path)
+        songs = recording.load_songs()
+        song_format = recording.info["songs"]["format"]
+        print(
+            f"녹화: {recording_path} (윈도우 {len(recording)}개, 노래 {len(songs)}개, "
+            f"{song_format}, {recording.info.get('url') or '합성 스트림'})"
+        )
+
+        load_seconds, fingerprints = best_of(
+            repeat,
+            lambda: [
+                recording.fingerprint(i) for i in range(len(recording)) if not recording.is_gated(i)
+            ],
+        )
+        result = ReplayResult(
+            len(recording), len(fingerprints), recording.postings, len(songs), song_format, load_seconds
+        )
+
+        if isinstance(songs, WorldcupIndex):
+            detect = lambda fp: TimelineDetector.detect_best_match_index(fp, songs)
+        else:
+            detect = lambda fp: TimelineDetector.detect_best_match(fp, songs)
+
+        # JIT 컴파일 비용 제외
+        with contextlib.redirect_stdout(io.StringIO()):
+            if fingerprints:
+                detect(fingerprints[0])
+            replay_timelines(recording, songs)
+
+        result.seconds["윈도우별 매칭"], _ = best_of(
+            repeat, lambda: [detect(fp) for fp in fingerprints]
+        )
+        if BatchMatcher.supports(songs):
+            step = TimelineDetector.BATCH_WINDOWS
+            result.seconds["일괄 매칭"], _ = best_of(
+                repeat,
+                lambda: [
+                    BatchMatcher(songs).match(fingerprints[i : i + step])
+                    for i in range(0, len(fingerprints), step)
+                ],
+            )
+        result.seconds["타임라인 감지"], timelines = best_of(
+            repeat, lambda: replay_timelines(recording, songs)
+        )
+
+        expected = {(t.name, t.start_time) for t in recording.timelines}
+        replayed = {(t.name, t.start_time) for t in timelines}
+        result.mismatches = len(expected ^ replayed)
+        result.timelines = len(timelines)
+        del songs, recording
+    return result
+
+
+def print_replay_results(result: ReplayResult):
+    """측정 결과 출력"""
+    print("-" * 80)
+    print(
+        f"윈도우 {result.windows}개 중 매칭 {result.matched_windows}개, "
+        f"(해시, 시간) {result.postings:,}개, 노래 {result.songs}개 ({result.song_format})"
+    )
+    print(f"윈도우 지문 복원: {result.load_seconds:.3f}초")
+    print(f"{'방식':<14} {'시간(초)':>10} {'윈도우당(ms)':>14}")
+    for mode, seconds in result.seconds.items():
+        per_window = seconds / max(result.matched_windows, 1) * 1000
+        print(f"{mode:<14} {seconds:>10.3f} {per_window:>14.2f}")
+    print(f"재생 타임라인 {result.timelines}개, 녹화 결과와 다른 타임라인: {result.mismatches}개")
@@ -0,0 +1,146 @@
+"""
+구간 분할 병렬 디코딩 벤치마크 모듈
+합성 오디오 WAV 파일을 로컬 HTTP 서버(연결당 전송 속도 제한, Range 요청 지원)로 제공하여
+유튜브 스트림을 대신하고, 구간 수별 디코딩 시간과 결과 일치 여부를 측정
+"""
+
+import contextlib
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+SAMPLE_RATE = 44100
+AUDIO_SECONDS = 20 * 60
+RATE_LIMIT = 4 * 1024 * 1024  # 연결당 전송 속도 (바이트/초)
+SEGMENT_COUNTS = (1, 2, 4, 8)
+
+
+@dataclass
+class SegmentedDownloadResult:
+    segment_count: int
+    seconds: float
+    decoded_seconds: float
+    max_error: float  # 원본 PCM과의 최대 샘플 오차
+
+
+class ThrottledRangeHandler(SimpleHTTPRequestHandler):
+    """Range 요청을 지원하고 연결마다 전송 속도를 제한하는 정적 파일 핸들러"""
+
+    rate_limit = RATE_LIMIT
+    send_size = 64 * 1024
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = Path(self.translate_path(self.path))
+        if not path.is_file():
+            self.send_error(404)
+            return
+
+        size = path.stat().st_size
+        start, end = 0, size - 1
+        range_header = self.headers.get("Range")
+        if range_header and range_header.startswith("bytes="):
+            first, _, last = range_header[len("bytes=") :].partition("-")
+            start = int(first) if first else 0
+            end = min(int(last), size - 1) if last else size - 1
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "audio/wav")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+
+        with open(path, "rb") as f, contextlib.suppress(ConnectionError):
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                data = f.read(min(self.send_size, remaining))
+                if not data:
+                    break
+                self.wfile.write(data)
+                remaining -= len(data)
+                time.sleep(len(data) / self.rate_limit)
+
+
+def write_source_wav(file_path: Path, seconds: int) -> np.ndarray:
+    """합성 오디오를 16비트 PCM WAV로 저장하고 기준 float32 샘플을 반환"""
+    from src.benchmark.synthetic import synthetic_audio
+    from src.youtube_download.mapped_audio import MappedAudio
+
+    audio = synthetic_audio(seconds, SAMPLE_RATE) * 0.9
+    pcm = np.round(audio * 32767).astype("<i2")
+    with open(file_path, "wb") as f:
+        header = bytearray(MappedAudio._float_wav_header(len(pcm), SAMPLE_RATE))
+        # float32 헤더를 16비트 PCM 헤더로 수정 (형식, 바이트 속도, 블록 정렬, 비트 수, 크기)
+        header[4:8] = (36 + pcm.nbytes).to_bytes(4, "little")
+        header[20:22] = (1).to_bytes(2, "little")
+        header[28:32] = (SAMPLE_RATE * 2).to_bytes(4, "little")
+        header[32:34] = (2).to_bytes(2, "little")
+        header[34:36] = (16).to_bytes(2, "little")
+        header[40:44] = pcm.nbytes.to_bytes(4, "little")
+        f.write(header)
+        f.write(pcm.tobytes())
+    return MappedAudio(file_path)[:]
+
+
+def run_segmented_download_benchmark(
+    seconds: int = AUDIO_SECONDS, segment_counts=SEGMENT_COUNTS
+) -> List[SegmentedDownloadResult]:
+    """구간 수별로 로컬 HTTP 원본을 디코딩하여 시간과 원본 대비 오차 측정"""
+    from src.youtube_download.segmented_audio import SegmentedAudioLoader
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        reference = write_source_wav(temp_path / "source.wav", seconds)
+
+        handler = partial(ThrottledRangeHandler, directory=temp_dir)
+        with ThreadingHTTPServer(("127.0.0.1", 0), handler) as server:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{server.server_address[1]}/source.wav"
+            print(
+                f"원본 {seconds / 60:.0f}분 WAV, 연결당 {RATE_LIMIT / (1024 * 1024):.0f}MB/s 제한: {url}"
+            )
+
+            original = SegmentedAudioLoader.segment_count
+            try:
+                for segment_count in segment_counts:
+                    SegmentedAudioLoader.set_config(segment_count=segment_count)
+                    start = time.perf_counter()
+                    audio, (_, _, sample_rate) = SegmentedAudioLoader.load_audio(url, 0, seconds)
+                    elapsed = time.perf_counter() - start
+
+                    length = min(len(audio), len(reference))
+                    max_error = float(np.abs(audio[:length] - reference[:length]).max())
+                    results.append(
+                        SegmentedDownloadResult(
+                            segment_count, elapsed, len(audio) / sample_rate, max_error
+                        )
+                    )
+            finally:
+                SegmentedAudioLoader.set_config(segment_count=original)
+                server.shutdown()
+    return results
+
+
+def print_segmented_download_results(results: List[SegmentedDownloadResult]):
+    """구간 수별 측정 결과 출력"""
+    print("-" * 80)
+    print(f"{'구간 수':>8} {'시간(초)':>10} {'속도':>8} {'디코딩(초)':>11} {'최대 오차':>10}")
+    serial = results[0].seconds if results else 0.0
+    for r in results:
+        print(
+            f"{r.segment_count:>8} {r.seconds:>10.2f} {serial / r.seconds:>7.1f}x "
+            f"{r.decoded_seconds:>11.1f} {r.max_error:>10.2e}"
+        )
@@ -0,0 +1,126 @@
+"""
+CLI 시작 시간 벤치마크 모듈
+새 프로세스에서 첫 청크의 지문 생성/매칭이 끝날 때까지 걸린 시간(time-to-first-chunk)을
+numba 캐시 상태와 import 방식별로 측정
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+PROCESS_START = time.perf_counter()
+
+SAMPLE_RATE = 44100
+AUDIO_SECONDS = 90
+CHUNK_SIZE = 60
+HOP_SIZE = 30
+
+
+@dataclass
+class StartupResult:
+    scenario: str
+    import_seconds: float
+    first_chunk_seconds: float
+    process_seconds: float
+
+
+def run_child(song_path: str, eager_imports: bool):
+    """자식 프로세스: main.timeline과 같은 순서로 첫 청크까지 실행하고 시간을 출력"""
+    if eager_imports:
+        # 이전 구조: 시작 시 essentia, yt_dlp를 모두 로드
+        import essentia.standard  # noqa: F401
+        import yt_dlp  # noqa: F401
+
+    import contextlib
+    import io
+
+    import numpy as np
+
+    from src.timeline.read_audio import read_audio
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.utils.compact_audioprint import CompactAudioprint
+    from src.utils.file_db import FileDB  # noqa: F401
+    from src.youtube_download.audio import AudioDownloader  # noqa: F401
+
+    import_seconds = time.perf_counter() - PROCESS_START
+
+    from src.benchmark.synthetic import synthetic_audio
+
+    audio = synthetic_audio(AUDIO_SECONDS, SAMPLE_RATE)
+    songs = {"song": CompactAudioprint.load(Path(song_path), mmap=True)}
+    with contextlib.redirect_stdout(io.StringIO()):
+        chunks = read_audio(audio, AUDIO_SECONDS, SAMPLE_RATE, CHUNK_SIZE, HOP_SIZE)
+        next(TimelineDetector.detect_timeline(chunks, songs, HOP_SIZE), None)
+
+    first_chunk_seconds = time.perf_counter() - PROCESS_START
+    print(json.dumps({"import": import_seconds, "first_chunk": first_chunk_seconds}))
+
+
+def _measure(scenario: str, song_path: Path, cache_dir: Path, eager_imports: bool) -> StartupResult:
+    env = {**os.environ, "NUMBA_CACHE_DIR": str(cache_dir)}
+    command = [sys.executable, "-m", "src.benchmark.startup", "--child", str(song_path)]
+    if eager_imports:
+        command.append("--eager")
+
+    start = time.perf_counter()
+    output = subprocess.run(command, env=env, capture_output=True, text=True, check=True).stdout
+    process_seconds = time.perf_counter() - start
+
+    times = json.loads(output.strip().splitlines()[-1])
+    return StartupResult(scenario, times["import"], times["first_chunk"], process_seconds)
+
+
+def run_startup_benchmark() -> List[StartupResult]:
+    """캐시 없음/캐시 있음 × 즉시 import/지연 import 조합별 시작 시간 측정"""
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.utils.compact_audioprint import CompactAudioprint
+    from src.benchmark.synthetic import synthetic_audio
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+
+        # 비교용 노래 지문 (메모리 매핑 가능한 압축 지문)
+        song_audio = synthetic_audio(30, SAMPLE_RATE, seed=1)
+        hashes, times = AudioprintGenerator.get_spectrogram_hashes(song_audio, SAMPLE_RATE)
+        song_path = temp_path / "song.npz"
+        CompactAudioprint.from_hash_arrays(
+            hashes, times, AudioprintGenerator.hop_size / SAMPLE_RATE
+        ).save(song_path)
+        print()
+
+        cold_cache = temp_path / "cold_cache"
+        results.append(_measure("이전: 즉시 import + JIT 캐시 없음", song_path, cold_cache, True))
+
+        # 워밍업으로 캐시 채우기 (Docker 이미지 빌드 단계와 동일)
+        warm_cache = temp_path / "warm_cache"
+        subprocess.run(
+            [sys.executable, "-m", "main.warmup"],
+            env={**os.environ, "NUMBA_CACHE_DIR": str(warm_cache)},
+            capture_output=True,
+            check=True,
+        )
+        results.append(_measure("즉시 import + JIT 캐시", song_path, warm_cache, True))
+        results.append(_measure("이후: 지연 import + JIT 캐시", song_path, warm_cache, False))
+
+    return results
+
+
+def print_startup_results(results: List[StartupResult]):
+    print("-" * 80)
+    print(f"{'시나리오':<32} {'import(초)':>10} {'첫 청크(초)':>12} {'프로세스(초)':>12}")
+    for r in results:
+        print(
+            f"{r.scenario:<32} {r.import_seconds:>10.2f} {r.first_chunk_seconds:>12.2f} {r.process_seconds:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        run_child(sys.argv[sys.argv.index("--child") + 1], "--eager" in sys.argv)
@@ -0,0 +1,27 @@
+"""
+벤치마크/워밍업용 합성 입력 생성 모듈
+"""
+
+import numpy as np
+
+
+def synthetic_audio(seconds: float, sample_rate: int = 44100, seed: int = 0) -> np.ndarray:
+    """
+    무작위 주파수의 짧은 톤 버스트를 겹쳐 만든 합성 오디오
+
+    일정한 사인파만 쓰면 모든 프레임에서 같은 해시가 나와 실제 음악과 해시 분포가 달라지므로
+    초당 4개의 톤 버스트와 약한 잡음을 섞습니다.
+    """
+    rng = np.random.default_rng(seed)
+    n_samples = int(seconds * sample_rate)
+    t = np.arange(n_samples) / sample_rate
+    audio = rng.normal(0, 0.01, n_samples)
+
+    burst_length = int(0.4 * sample_rate)
+    for _ in range(int(seconds * 4)):
+        frequency = rng.uniform(150, 3500)
+        start = int(rng.uniform(0, seconds) * sample_rate)
+        end = min(start + burst_length, n_samples)
+        audio[start:end] += np.sin(2 * np.pi * frequency * t[start:end]) * rng.uniform(0.1, 0.5)
+
+    return (audio / np.max(np.abs(audio))).astype(np.float32)
@@ -0,0 +1,182 @@
+"""
+무음/비음악 구간 게이트 모듈
+지문 생성 전에 블록별 에너지와 스펙트럼 평탄도로 청크를 무음/말소리/음악으로 분류하여
+음악이 거의 없는 청크는 지문 생성과 매칭을 건너뜁니다.
+"""
+
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+
+from src.timeline.read_audio import AudioChunk
+from src.utils.formatter import TimeFormatter
+
+
+@dataclass
+class GateDecision:
+    """청크 하나의 게이트 판정 결과"""
+
+    start_time: float
+    end_time: float
+    silent_ratio: float
+    speech_ratio: float
+    music_ratio: float
+    skipped: bool
+
+    @property
+    def label(self) -> str:
+        """청크에서 가장 비중이 큰 구간 종류"""
+        ratios = {
+            AudioGate.SILENT: self.silent_ratio,
+            AudioGate.SPEECH: self.speech_ratio,
+            AudioGate.MUSIC: self.music_ratio,
+        }
+        return max(ratios, key=ratios.get)
+
+    def describe(self) -> str:
+        """건너뛴 구간 시간 범위와 구간 종류 비율"""
+        start_str = TimeFormatter.format_time_to_str(self.start_time)
+        end_str = TimeFormatter.format_time_to_str(self.end_time)
+        return (
+            f"{start_str} ~ {end_str}: 무음 {self.silent_ratio:.2f}, "
+            f"말소리 {self.speech_ratio:.2f}, 음악 {self.music_ratio:.2f}"
+        )
+
+
+@dataclass
+class GateMetrics:
+    """게이트 판정 누적 통계"""
+
+    decisions: List[GateDecision] = field(default_factory=list)
+
+    @property
+    def total_chunks(self) -> int:
+        return len(self.decisions)
+
+    @property
+    def skipped_chunks(self) -> int:
+        return sum(d.skipped for d in self.decisions)
+
+    @property
+    def skipped_seconds(self) -> float:
+        return sum(d.end_time - d.start_time for d in self.decisions if d.skipped)
+
+    def print_metrics(self):
+        """게이트 판정 통계 출력"""
+        print("-" * 80)
+        print("무음/비음악 게이트")
+        if not self.decisions:
+            print("\t판정한 청크 없음")
+            return
+
+        total = self.total_chunks
+        print(
+            f"\t건너뛴 청크: {self.skipped_chunks}/{total} "
+            f"({self.skipped_chunks / total * 100:.1f}%, {self.skipped_seconds:.0f}초)"
+        )
+        for label, label_name in AudioGate.LABEL_NAMES.items():
+            count = sum(d.label == label for d in self.decisions)
+            print(f"\t{label_name} 위주 청크: {count}개")
+        for d in self.decisions:
+            if d.skipped:
+                print(f"\t건너뜀 {d.describe()}")
+
+
+class AudioGate:
+    """블록 단위 에너지/스펙트럼 평탄도 기반 무음/비음악 게이트"""
+
+    SILENT, SPEECH, MUSIC = "silent", "speech", "music"
+    LABEL_NAMES = {SILENT: "무음", SPEECH: "말소리", MUSIC: "음악"}
+
+    FRAME_SIZE = 2048  # 특징 계산 프레임 크기 (샘플)
+    BLOCK_SECONDS = 1.0  # 분류 블록 길이 (초)
+    MIN_FREQUENCY = 100  # 지문 생성 주파수 대역과 동일 (Hz)
+    MAX_FREQUENCY = 4095
+
+    SILENCE_DB = -50.0  # 블록 평균 에너지가 이보다 낮으면 무음 (dBFS)
+    NOISE_FLATNESS = 0.4  # 스펙트럼 평탄도가 이보다 높으면 잡음 (박수, 함성 등은 말소리로 분류)
+    SPEECH_LOW_ENERGY_RATIO = 0.5  # 평균 에너지의 절반 미만인 프레임 비율이 이보다 높고
+    SPEECH_GAP_DB = 25.0  # 조용한 프레임이 평균보다 이만큼 낮으면 말소리 (배경 음악이 없는 말 사이 공백)
+    MIN_MUSIC_RATIO = 0.25  # 청크의 음악 블록 비율이 이보다 낮으면 건너뜀
+
+    def __init__(self):
+        self.metrics = GateMetrics()
+
+    @classmethod
+    def compute_block_features(cls, audio: np.ndarray, sample_rate: int):
+        """
+        블록별 에너지(dBFS), 스펙트럼 평탄도, 저에너지 프레임 비율, 공백 깊이(dB)를 계산합니다.
+        """
+        frame_size = cls.FRAME_SIZE
+        frames_per_block = max(int(cls.BLOCK_SECONDS * sample_rate) // frame_size, 1)
+        block_count = len(audio) // (frame_size * frames_per_block)
+        if block_count == 0:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty, empty, empty
+
+        # 블록에 들어가지 않는 끝부분은 버리고 (블록, 프레임, 샘플) 형태로 변환
+        frame_count = block_count * frames_per_block
+        frames = np.asarray(audio[: frame_count * frame_size], dtype=np.float32)
+        frames = frames.reshape(frame_count, frame_size) * np.hanning(frame_size).astype(
+            np.float32
+        )
+
+        # 지문 생성 대역의 파워 스펙트럼
+        spectrum = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+        freqs = np.fft.rfftfreq(frame_size, 1 / sample_rate)
+        band = (freqs >= cls.MIN_FREQUENCY) & (freqs <= cls.MAX_FREQUENCY)
+        power = spectrum[:, band] + 1e-12
+
+        # 프레임별 에너지와 평탄도 (기하평균 / 산술평균)
+        frame_power = power.mean(axis=1)
+        frame_flatness = np.exp(np.log(power).mean(axis=1)) / frame_power
+
+        frame_power = frame_power.reshape(block_count, frames_per_block)
+        frame_flatness = frame_flatness.reshape(block_count, frames_per_block)
+
+        # 윈도우 에너지를 보정하여 풀스케일 사인파가 약 0dB가 되도록 정규화
+        window_energy = (np.hanning(frame_size) ** 2).sum()
+        block_power = frame_power.mean(axis=1)
+        block_db = 10 * np.log10(block_power * band.sum() / (window_energy * frame_size) + 1e-12)
+        block_flatness = frame_flatness.mean(axis=1)
+        low_energy_ratio = (frame_power < 0.5 * block_power[:, None]).mean(axis=1)
+        # 하위 10% 프레임 에너지가 평균보다 얼마나 낮은지 (말 사이 공백은 깊고 음악은 얕음)
+        gap_db = 10 * np.log10(block_power / np.percentile(frame_power, 10, axis=1))
+
+        return block_db, block_flatness, low_energy_ratio, gap_db
+
+    @classmethod
+    def classify_blocks(cls, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """블록별 구간 종류(무음/말소리/음악) 배열을 반환합니다."""
+        block_db, flatness, low_energy_ratio, gap_db = cls.compute_block_features(
+            audio, sample_rate
+        )
+
+        speech = (low_energy_ratio >= cls.SPEECH_LOW_ENERGY_RATIO) & (gap_db >= cls.SPEECH_GAP_DB)
+        noise = flatness >= cls.NOISE_FLATNESS
+
+        labels = np.full(len(block_db), cls.MUSIC, dtype=object)
+        labels[speech | noise] = cls.SPEECH
+        labels[block_db < cls.SILENCE_DB] = cls.SILENT
+        return labels
+
+    def check(self, chunk: AudioChunk) -> GateDecision:
+        """청크를 분류하고 지문 생성을 건너뛸지 판정합니다."""
+        labels = self.classify_blocks(chunk.audio, chunk.samplerate)
+        block_count = max(len(labels), 1)
+
+        silent_ratio = float(np.sum(labels == self.SILENT)) / block_count
+        speech_ratio = float(np.sum(labels == self.SPEECH)) / block_count
+        music_ratio = float(np.sum(labels == self.MUSIC)) / block_count
+
+        decision = GateDecision(
+            chunk.start_time,
+            chunk.end_time,
+            silent_ratio,
+            speech_ratio,
+            music_ratio,
+            skipped=len(labels) > 0 and music_ratio < self.MIN_MUSIC_RATIO,
+        )
+        self.metrics.decisions.append(decision)
+        return decision
@@ -0,0 +1,294 @@
+"""
+윈도우 일괄 매칭 모듈
+여러 윈도우 지문을 한 번에 노래 목록(또는 월드컵 역색인)과 매칭하여
+(윈도우 × 노래) 유사도/시간 오프셋 행렬을 만듭니다.
+
+윈도우마다 노래별로 detect_best_match를 호출할 때의 Python 분기, typed.List 생성, NumPy 변환 없이
+컴파일된 커널이 윈도우 단위로 병렬 처리하며, 결과는 compute_similarity와 같습니다.
+(동률이면 작은 오프셋, 유사도 정규화 동일)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Union
+
+import numba as nb
+import numpy as np
+from numba import typed
+from numpy.typing import NDArray
+
+from src.timeline.similarity_processor import (
+    SIMILARITY_NORMALIZATION_FACTOR,
+    TIME_OFFSET_PRECISION,
+)
+from src.utils.compact_audioprint import CompactAudioprint
+from src.utils.profiler import Profiler
+from src.utils.worldcup_index import IndexSegment, WorldcupIndex
+
+
+@nb.njit(cache=True)
+def pack_windows(windows: typed.List):
+    """
+    윈도우 지문 목록(nb.typed.Dict)을 CSR 배열로 펼칩니다.
+
+    Returns:
+        keys, key_starts: 윈도우 순서대로 이어 붙인 해시와 해시별 시간 시작 위치 (길이 = 해시 수 + 1)
+        times: 해시별 시간
+        window_starts: 윈도우별 keys 시작 위치 (길이 = 윈도우 수 + 1)
+    """
+    n_keys = 0
+    n_times = 0
+    for window in windows:
+        n_keys += len(window)
+        for value in window.values():
+            n_times += len(value)
+
+    keys = np.empty(n_keys, dtype=np.uint32)
+    key_starts = np.empty(n_keys + 1, dtype=np.int64)
+    times = np.empty(n_times, dtype=np.float32)
+    window_starts = np.empty(len(windows) + 1, dtype=np.int64)
+
+    k = 0
+    t = 0
+    for w in range(len(windows)):
+        window_starts[w] = k
+        for key, value in windows[w].items():
+            keys[k] = np.uint32(key)
+            key_starts[k] = t
+            for time_point in value:
+                times[t] = time_point
+                t += 1
+            k += 1
+    window_starts[len(windows)] = k
+    key_starts[n_keys] = t
+    return keys, key_starts, times, window_starts
+
+
+@nb.njit(fastmath=True, parallel=True, cache=True)
+def collect_pairs(
+    keys: NDArray[np.uint32],
+    key_starts: NDArray[np.int64],
+    times: NDArray[np.float32],
+    window_starts: NDArray[np.int64],
+    hashes: NDArray[np.uint32],
+    songs: NDArray[np.int32],
+    frames: NDArray[np.uint16],
+    frame_durations: NDArray[np.float64],
+    live_songs: NDArray[np.bool_],
+    precision=TIME_OFFSET_PRECISION,
+):
+    """
+    윈도우별로 해시 기준 포스팅 세그먼트와의 (노래 ID, 밀리초 오프셋) 쌍을 계산합니다.
+    오프셋은 compute_index_offsets -> compute_index_similarities와 같은 연산 순서로 반올림합니다.
+
+    Returns:
+        pair_starts: 윈도우별 쌍 시작 위치 (길이 = 윈도우 수 + 1)
+        pair_songs, pair_offsets: 노래 ID, 밀리초 오프셋
+    """
+    n_windows = len(window_starts) - 1
+    starts = np.searchsorted(hashes, keys, side="left")
+    ends = np.searchsorted(hashes, keys, side="right")
+
+    counts = np.zeros(n_windows, dtype=np.int64)
+    for w in nb.prange(n_windows):
+        total = 0
+        for k in range(window_starts[w], window_starts[w + 1]):
+            n_times = key_starts[k + 1] - key_starts[k]
+            for pos in range(starts[k], ends[k]):
+                if live_songs[songs[pos]]:
+                    total += n_times
+        counts[w] = total
+
+    pair_starts = np.zeros(n_windows + 1, dtype=np.int64)
+    pair_starts[1:] = np.cumsum(counts)
+    pair_songs = np.empty(pair_starts[n_windows], dtype=np.int32)
+    pair_offsets = np.empty(pair_starts[n_windows], dtype=np.int64)
+
+    for w in nb.prange(n_windows):
+        out = pair_starts[w]
+        for k in range(window_starts[w], window_starts[w + 1]):
+            for i in range(key_starts[k], key_starts[k + 1]):
+                t1 = times[i]
+                for pos in range(starts[k], ends[k]):
+                    song = songs[pos]
+                    if not live_songs[song]:
+                        continue
+                    t2 = np.float32(frames[pos] * frame_durations[song])
+                    round_offset = np.round(t2 - t1, precision)
+                    pair_songs[out] = song
+                    pair_offsets[out] = np.int64(np.round(np.float64(round_offset) * 1000))
+                    out += 1
+    return pair_starts, pair_songs, pair_offsets
+
+
+@nb.njit(parallel=True, cache=True)
+def compute_window_offset_modes(
+    pair_starts: NDArray[np.int64],
+    pair_songs: NDArray[np.int32],
+    pair_offsets: NDArray[np.int64],
+    n_songs: int,
+):
+    """
+    윈도우별 노래별 최빈 밀리초 오프셋과 빈도수를 계산합니다. (동률이면 작은 오프셋 선택)
+
+    Returns:
+        Tuple[NDArray[int64], NDArray[int64]]: (윈도우, 노래) 최빈 빈도수, 최빈 오프셋
+    """
+    n_windows = len(pair_starts) - 1
+    best_counts = np.zeros((n_windows, n_songs), dtype=np.int64)
+    best_offsets = np.zeros((n_windows, n_songs), dtype=np.int64)
+
+    for w in nb.prange(n_windows):
+        lo = pair_starts[w]
+        hi = pair_starts[w + 1]
+        if lo == hi:
+            continue
+        encoded = pair_songs[lo:hi].astype(np.int64) * np.int64(1 << 40) + (
+            pair_offsets[lo:hi] + np.int64(1 << 39)
+        )
+        encoded.sort()
+
+        run_start = 0
+        for i in range(1, len(encoded) + 1):
+            if i == len(encoded) or encoded[i] != encoded[run_start]:
+                song = encoded[run_start] >> 40
+                run_length = i - run_start
+                if run_length > best_counts[w, song]:
+                    best_counts[w, song] = run_length
+                    best_offsets[w, song] = (encoded[run_start] & ((1 << 40) - 1)) - (1 << 39)
+                run_start = i
+    return best_counts, best_offsets
+
+
+@dataclass
+class MatchMatrix:
+    """(윈도우 × 노래) 매칭 결과 행렬 (열 순서 = names)"""
+
+    names: List[str]
+    similarities: np.ndarray  # float64 [윈도우, 노래]
+    offsets: np.ndarray  # float64 [윈도우, 노래], 시간 오프셋 (초)
+    counts: np.ndarray  # int64 [윈도우, 노래], 최빈 오프셋 빈도수
+
+    def __len__(self):
+        return len(self.similarities)
+
+    def best(self, row: int) -> Tuple[float, str, float]:
+        """
+        윈도우 하나의 최고 유사도 (유사도, 노래 이름, 오프셋)
+        (detect_best_match와 같이 노래 순서상 처음 나오는 최고값, 모두 0이면 빈 결과)
+        """
+        col = int(np.argmax(self.similarities[row]))
+        if self.similarities[row, col] <= 0:
+            return 0.0, "", 0.0
+        return float(self.similarities[row, col]), self.names[col], float(self.offsets[row, col])
+
+    def top_k(self, row: int, k: int) -> List[Tuple[float, str, float]]:
+        """윈도우 하나의 유사도 상위 k개 (유사도, 노래 이름, 오프셋)"""
+        order = np.argsort(-self.similarities[row], kind="stable")[:k]
+        return [
+            (float(self.similarities[row, col]), self.names[col], float(self.offsets[row, col]))
+            for col in order
+        ]
+
+    def margins(self) -> np.ndarray:
+        """윈도우별 1위와 2위 유사도 차이 (노래가 하나면 1위 유사도)"""
+        if self.similarities.shape[1] < 2:
+            return self.similarities.max(axis=1, initial=0.0)
+        top2 = -np.partition(-self.similarities, 1, axis=1)[:, :2]
+        return top2[:, 0] - top2[:, 1]
+
+
+class BatchMatcher:
+    """
+    윈도우 지문 여러 개를 한 번에 매칭하는 매처
+    노래 목록은 처음 한 번만 역색인과 같은 해시 기준 포스팅으로 변환하여 해시당 한 번만 탐색합니다.
+    """
+
+    def __init__(self, song_fingerprints: Union[Dict[str, CompactAudioprint], WorldcupIndex]):
+        if isinstance(song_fingerprints, WorldcupIndex):
+            self.names = [song["name"] for song in song_fingerprints.songs.values()]
+            self.song_ids = np.array(list(song_fingerprints.songs.keys()), dtype=np.int64)
+            self.segments = song_fingerprints.segments
+            self.frame_durations = song_fingerprints.frame_durations
+            self.live_songs = song_fingerprints.live_songs
+            self.all_hash_counts = song_fingerprints.hash_counts
+        else:
+            audioprints = list(song_fingerprints.values())
+            self.names = list(song_fingerprints.keys())
+            self.song_ids = np.arange(len(self.names), dtype=np.int64)
+            self.segments = [
+                IndexSegment("songs", *WorldcupIndex.build_postings(list(enumerate(audioprints))))
+            ]
+            self.frame_durations = np.array([fp.frame_duration for fp in audioprints], dtype=np.float64)
+            self.live_songs = np.ones(len(audioprints), dtype=np.bool_)
+            self.all_hash_counts = np.array([len(fp) for fp in audioprints], dtype=np.int64)
+        self.hash_counts = self.all_hash_counts[self.song_ids]
+
+    @staticmethod
+    def supports(song_fingerprints: Union[Dict[str, CompactAudioprint], WorldcupIndex]) -> bool:
+        """일괄 매칭 가능한 노래 지문인지 확인 (압축 지문 목록 또는 역색인)"""
+        if isinstance(song_fingerprints, WorldcupIndex):
+            return True
+        return all(isinstance(fp, CompactAudioprint) for fp in song_fingerprints.values())
+
+    def _collect_pairs(self, keys, key_starts, times, window_starts):
+        """윈도우별 (노래 ID, 밀리초 오프셋) 쌍 (CSR, 세그먼트가 여러 개면 윈도우 순서로 다시 묶음)"""
+        n_windows = len(window_starts) - 1
+        parts = [
+            collect_pairs(
+                keys,
+                key_starts,
+                times,
+                window_starts,
+                segment.hashes,
+                segment.songs,
+                segment.frames,
+                self.frame_durations,
+                self.live_songs,
+            )
+            for segment in self.segments
+        ]
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return np.zeros(n_windows + 1, np.int64), np.empty(0, np.int32), np.empty(0, np.int64)
+
+        window_ids = np.concatenate(
+            [np.repeat(np.arange(n_windows), np.diff(starts)) for starts, _, _ in parts]
+        )
+        order = np.argsort(window_ids, kind="stable")
+        pair_starts = np.zeros(n_windows + 1, dtype=np.int64)
+        pair_starts[1:] = np.cumsum(np.bincount(window_ids, minlength=n_windows))
+        pair_songs = np.concatenate([songs for _, songs, _ in parts])
+        pair_offsets = np.concatenate([offsets for _, _, offsets in parts])
+        return pair_starts, pair_songs[order], pair_offsets[order]
+
+    def match(self, window_fingerprints: List[nb.typed.Dict]) -> MatchMatrix:
+        """윈도우 지문 목록의 (윈도우 × 노래) 유사도/오프셋 행렬 계산"""
+        n_windows = len(window_fingerprints)
+        if n_windows == 0:
+            empty = np.zeros((0, len(self.names)))
+            return MatchMatrix(self.names, empty, empty.copy(), empty.astype(np.int64))
+
+        with Profiler.stage("BatchMatcher.pack_windows"):
+            keys, key_starts, times, window_starts = pack_windows(typed.List(window_fingerprints))
+
+        with Profiler.stage("BatchMatcher.collect_pairs"):
+            pair_starts, pair_songs, pair_offsets = self._collect_pairs(
+                keys, key_starts, times, window_starts
+            )
+
+        with Profiler.stage("BatchMatcher.offset_modes"):
+            best_counts, best_offsets = compute_window_offset_modes(
+                pair_starts, pair_songs, pair_offsets, len(self.all_hash_counts)
+            )
+        best_counts = best_counts[:, self.song_ids]
+        best_offsets = best_offsets[:, self.song_ids]
+
+        # compute_similarity와 같은 정규화 (노래 지문과 윈도우 지문 중 작은 해시 수 기준)
+        window_lengths = np.diff(window_starts).reshape(n_windows, 1)
+        total_hash_counts = np.minimum(window_lengths, self.hash_counts).astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similarities = best_counts / (total_hash_counts * SIMILARITY_NORMALIZATION_FACTOR)
+        similarities = np.minimum(np.nan_to_num(similarities), 1.0)
+
+        return MatchMatrix(self.names, similarities, best_offsets / 1000, best_counts)
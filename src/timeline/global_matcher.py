@@ -0,0 +1,218 @@
+"""
+전체 스트림 전역 오프셋 투표 모듈
+윈도우 없이 영상 전체의 해시 스트림을 블록 순서대로 한 번만 매칭하여 (노래, 절대 시작 프레임) 공간에 투표하고,
+노래별 투표 피크를 비최대 억제(NMS)로 고른 뒤 겹치는 다른 노래 피크를 정리하여 타임라인을 만듭니다.
+
+투표 배열은 아직 투표를 받을 수 있는 시작 프레임 범위(노래 길이 + 블록 길이)만 원형 버퍼로 유지하고,
+더 이상 투표가 들어올 수 없는 시작 프레임은 블록마다 후보 피크로 추출한 뒤 비웁니다.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Union
+
+import numpy as np
+
+from src.timeline.similarity_processor import SIMILARITY_NORMALIZATION_FACTOR
+from src.timeline.stream_matcher import StreamBlock, vote_block_compact, vote_block_index
+from src.utils.compact_audioprint import CompactAudioprint
+from src.utils.profiler import Profiler
+from src.utils.types import TimelineData
+from src.utils.worldcup_index import WorldcupIndex
+
+
+@dataclass
+class VotePeak:
+    """노래 하나의 투표 피크"""
+
+    song_name: str
+    start_frame: int  # 노래 지문 0프레임이 놓이는 스트림 프레임
+    votes: int
+    similarity: float
+
+
+class GlobalVoter:
+    """
+    (노래, 절대 시작 프레임) 투표 누적기
+    노래 지문(CompactAudioprint 목록 또는 월드컵 역색인)의 프레임 길이가 스트림 프레임 길이와 같아야 합니다.
+    """
+
+    SUPPRESSION_SECONDS = 90  # 같은 노래의 피크 사이 최소 간격 (윈도우 방식의 감지 후 건너뛰기와 같은 길이)
+    MAX_PEAKS_PER_SONG = 1  # 노래별 타임라인 수 (analyze_timeline과 같이 노래별 최고 피크)
+
+    def __init__(
+        self,
+        song_fingerprints: Union[Dict[str, CompactAudioprint], WorldcupIndex],
+        hop_size: int,
+        sample_rate: int,
+        block_frames: int,
+        similarity_threshold: float = 0,
+    ):
+        self.song_fingerprints = song_fingerprints
+        self.hop_size = hop_size
+        self.sample_rate = sample_rate
+
+        if isinstance(song_fingerprints, WorldcupIndex):
+            self.names = [song["name"] for song in song_fingerprints.songs.values()]
+            self.song_ids = np.array(list(song_fingerprints.songs.keys()), dtype=np.int64)
+            self.hash_counts = song_fingerprints.hash_counts[self.song_ids]
+            self.max_song_frame = max(
+                (int(segment.frames.max()) for segment in song_fingerprints.segments if len(segment)),
+                default=0,
+            )
+            n_rows = len(song_fingerprints.hash_counts)
+            song_frames = np.zeros(n_rows, dtype=np.int64)
+            for segment in song_fingerprints.segments:
+                np.maximum.at(song_frames, segment.songs, segment.frames.astype(np.int64))
+            self.song_frames = song_frames[self.song_ids]
+        else:
+            self.names = list(song_fingerprints.keys())
+            self.song_ids = np.arange(len(self.names), dtype=np.int64)
+            self.hash_counts = np.array([len(fp) for fp in song_fingerprints.values()], dtype=np.int64)
+            self.max_song_frame = max(
+                (int(fp.frames.max()) for fp in song_fingerprints.values() if len(fp.frames)),
+                default=0,
+            )
+            n_rows = len(self.names)
+            self.song_frames = np.array(
+                [int(fp.frames.max()) if len(fp.frames) else 0 for fp in song_fingerprints.values()],
+                dtype=np.int64,
+            )
+
+        # 원형 버퍼 위치 = (노래 프레임 - 스트림 프레임) % modulus = (-시작 프레임) % modulus
+        self.modulus = self.max_song_frame + block_frames + 1
+        self.counts = np.zeros((n_rows, self.modulus), dtype=np.int32)
+
+        # 유사도 임계값에 해당하는 노래별 최소 투표 수 (윈도우 방식 유사도와 같은 정규화)
+        self.min_votes = np.maximum(
+            np.ceil(similarity_threshold * self.hash_counts * SIMILARITY_NORMALIZATION_FACTOR), 1
+        ).astype(np.int64)
+
+        self.finalized_until = -self.max_song_frame  # 이 시작 프레임 이전은 투표 완료
+        self.candidates: List[VotePeak] = []
+        self.lengths = dict(zip(self.names, self.song_frames.tolist()))
+
+    def similarity(self, row: int, votes: int) -> float:
+        """투표 수를 윈도우 방식과 같은 유사도로 변환 (노래 지문 전체가 윈도우 안에 있을 때와 같음)"""
+        if self.hash_counts[row] == 0:
+            return 0.0
+        return min(votes / (self.hash_counts[row] * SIMILARITY_NORMALIZATION_FACTOR), 1.0)
+
+    def add(self, block: StreamBlock):
+        """블록 지문의 투표 추가"""
+        with Profiler.stage("GlobalVoter.add"):
+            if isinstance(self.song_fingerprints, WorldcupIndex):
+                index = self.song_fingerprints
+                for segment in index.segments:
+                    vote_block_index(
+                        block.keys,
+                        block.key_starts,
+                        block.frames,
+                        segment.hashes,
+                        segment.songs,
+                        segment.frames,
+                        index.live_songs,
+                        self.counts,
+                    )
+            else:
+                for row, song in enumerate(self.song_fingerprints.values()):
+                    vote_block_compact(
+                        block.keys,
+                        block.key_starts,
+                        block.frames,
+                        song.hashes,
+                        song.offsets,
+                        song.frames,
+                        self.counts[row],
+                    )
+
+    @property
+    def suppression_frames(self) -> float:
+        return self.SUPPRESSION_SECONDS * self.sample_rate / self.hop_size
+
+    @staticmethod
+    def suppress(start_frames: np.ndarray, votes: np.ndarray, radius: float, limit: int = None):
+        """
+        투표 수 내림차순(동률이면 이른 시작 프레임)으로 radius 이내의 더 약한 피크를 제거한 인덱스
+        """
+        kept = []
+        for i in np.lexsort((start_frames, -votes)):
+            if limit is not None and len(kept) >= limit:
+                break
+            if all(abs(start_frames[i] - start_frames[j]) > radius for j in kept):
+                kept.append(i)
+        return kept
+
+    def finalize(self, end_frame: int):
+        """
+        end_frame 이전 스트림 프레임까지 투표했을 때, 더 이상 투표가 들어올 수 없는 시작 프레임에서
+        노래별 후보 피크를 추출하고 버퍼에서 비웁니다.
+        """
+        until = end_frame - self.max_song_frame
+        if until <= self.finalized_until:
+            return
+
+        with Profiler.stage("GlobalVoter.finalize"):
+            starts = np.arange(self.finalized_until, until)
+            positions = (-starts) % self.modulus
+            for row, song_id in enumerate(self.song_ids):
+                votes = self.counts[song_id, positions]
+                # 음수 시작 시간은 윈도우 방식과 같이 제외
+                selected = np.flatnonzero((votes >= self.min_votes[row]) & (starts >= 0))
+                if not len(selected):
+                    continue
+                # 후보가 너무 많아지지 않도록 구간 안에서 먼저 비최대 억제
+                for i in self.suppress(starts[selected], votes[selected], self.suppression_frames):
+                    vote = int(votes[selected[i]])
+                    self.candidates.append(
+                        VotePeak(
+                            self.names[row],
+                            int(starts[selected[i]]),
+                            vote,
+                            self.similarity(row, vote),
+                        )
+                    )
+            self.counts[:, positions] = 0
+        self.finalized_until = until
+
+    def peaks(self) -> List[VotePeak]:
+        """노래별로 비최대 억제한 피크 (시작 프레임 순)"""
+        by_song: Dict[str, List[VotePeak]] = {}
+        for peak in self.candidates:
+            by_song.setdefault(peak.song_name, []).append(peak)
+
+        peaks = []
+        for candidates in by_song.values():
+            start_frames = np.array([p.start_frame for p in candidates], dtype=np.int64)
+            votes = np.array([p.votes for p in candidates], dtype=np.int64)
+            kept = self.suppress(
+                start_frames, votes, self.suppression_frames, self.MAX_PEAKS_PER_SONG
+            )
+            peaks.extend(candidates[i] for i in kept)
+
+        # 윈도우 방식처럼 같은 구간에는 한 노래만 남기도록, 유사도가 높은 노래 피크부터
+        # 노래 구간이 절반 넘게 겹치는 다른 노래 피크 제거
+        accepted: List[VotePeak] = []
+        for peak in sorted(peaks, key=lambda p: (-p.similarity, p.start_frame)):
+            if not any(self.overlaps(peak, other) for other in accepted):
+                accepted.append(peak)
+        accepted.sort(key=lambda p: p.start_frame)
+        return accepted
+
+    def overlaps(self, peak: VotePeak, other: VotePeak) -> bool:
+        """두 피크의 노래 구간이 짧은 쪽 길이의 절반 넘게 겹치는지 확인"""
+        peak_end = peak.start_frame + self.lengths[peak.song_name]
+        other_end = other.start_frame + self.lengths[other.song_name]
+        overlap = min(peak_end, other_end) - max(peak.start_frame, other.start_frame)
+        shorter = min(self.lengths[peak.song_name], self.lengths[other.song_name])
+        return overlap > shorter / 2
+
+    def timelines(self) -> List[TimelineData]:
+        """피크를 타임라인으로 변환"""
+        return [
+            TimelineData(
+                peak.song_name,
+                peak.similarity,
+                round(peak.start_frame * self.hop_size / self.sample_rate),
+            )
+            for peak in self.peaks()
+        ]
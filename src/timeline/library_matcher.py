@@ -0,0 +1,240 @@
+"""
+라이브러리 샤드 분산 매칭 모듈
+윈도우 지문의 해시를 라이브러리 역색인의 해시 범위 샤드별로 나누어 작업 프로세스에 보내고(scatter),
+각 프로세스가 메모리 매핑한 샤드에서 (윈도우, 노래, 오프셋)별 빈도수를 세어 돌려주면
+이를 합쳐 노래별 최빈 오프셋을 고릅니다(gather). 결과는 BatchMatcher와 같은 MatchMatrix입니다.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import numba as nb
+import numpy as np
+from numba import typed
+from numpy.typing import NDArray
+
+from src.timeline.batch_matcher import MatchMatrix, collect_pairs, pack_windows
+from src.timeline.similarity_processor import SIMILARITY_NORMALIZATION_FACTOR
+from src.utils.library_index import LibraryIndex
+from src.utils.profiler import Profiler
+
+SONG_SHIFT = 40  # (노래 ID << 40) | (밀리초 오프셋 + 2^39) 인코딩
+OFFSET_BIAS = 1 << 39
+
+
+@nb.njit(parallel=True, cache=True)
+def count_window_offsets(
+    pair_starts: NDArray[np.int64],
+    pair_songs: NDArray[np.int32],
+    pair_offsets: NDArray[np.int64],
+):
+    """
+    윈도우별 (노래, 밀리초 오프셋) 쌍의 빈도수를 셉니다.
+
+    Returns:
+        count_starts: 윈도우별 시작 위치 (길이 = 윈도우 수 + 1)
+        encoded, counts: 윈도우 안에서 정렬된 (노래, 오프셋) 인코딩과 빈도수
+    """
+    n_windows = len(pair_starts) - 1
+    sorted_pairs = np.empty(len(pair_songs), dtype=np.int64)
+    n_unique = np.zeros(n_windows, dtype=np.int64)
+
+    for w in nb.prange(n_windows):
+        lo = pair_starts[w]
+        hi = pair_starts[w + 1]
+        if lo == hi:
+            continue
+        encoded = pair_songs[lo:hi].astype(np.int64) * np.int64(1 << SONG_SHIFT) + (
+            pair_offsets[lo:hi] + np.int64(OFFSET_BIAS)
+        )
+        encoded.sort()
+        sorted_pairs[lo:hi] = encoded
+        unique = 1
+        for i in range(1, hi - lo):
+            if encoded[i] != encoded[i - 1]:
+                unique += 1
+        n_unique[w] = unique
+
+    count_starts = np.zeros(n_windows + 1, dtype=np.int64)
+    count_starts[1:] = np.cumsum(n_unique)
+    out_encoded = np.empty(count_starts[n_windows], dtype=np.int64)
+    out_counts = np.empty(count_starts[n_windows], dtype=np.int64)
+
+    for w in nb.prange(n_windows):
+        lo = pair_starts[w]
+        hi = pair_starts[w + 1]
+        out = count_starts[w] - 1
+        for i in range(lo, hi):
+            if i == lo or sorted_pairs[i] != sorted_pairs[i - 1]:
+                out += 1
+                out_encoded[out] = sorted_pairs[i]
+                out_counts[out] = 0
+            out_counts[out] += 1
+    return count_starts, out_encoded, out_counts
+
+
+@nb.njit(cache=True)
+def merge_offset_modes(
+    window_ids: NDArray[np.int64],
+    encoded: NDArray[np.int64],
+    counts: NDArray[np.int64],
+    n_windows: int,
+    n_songs: int,
+):
+    """
+    (윈도우, 인코딩) 순으로 정렬된 샤드별 빈도수를 합쳐 윈도우별 노래별 최빈 오프셋을 계산합니다.
+    (같은 노래 안에서 오프셋 오름차순이므로 동률이면 작은 오프셋 선택)
+    """
+    best_counts = np.zeros((n_windows, n_songs), dtype=np.int64)
+    best_offsets = np.zeros((n_windows, n_songs), dtype=np.int64)
+
+    i = 0
+    while i < len(encoded):
+        w = window_ids[i]
+        code = encoded[i]
+        total = 0
+        while i < len(encoded) and window_ids[i] == w and encoded[i] == code:
+            total += counts[i]
+            i += 1
+        song = code >> SONG_SHIFT
+        if total > best_counts[w, song]:
+            best_counts[w, song] = total
+            best_offsets[w, song] = (code & ((1 << SONG_SHIFT) - 1)) - OFFSET_BIAS
+    return best_counts, best_offsets
+
+
+# 작업 프로세스별로 한 번만 연 라이브러리 (샤드는 메모리 매핑이라 프로세스 간 페이지 캐시 공유)
+_libraries: Dict[str, LibraryIndex] = {}
+
+
+def query_shard(library_path: str, shard: int, keys, key_starts, times, window_starts):
+    """샤드 하나에서 윈도우별 (노래, 오프셋) 빈도수 계산 (작업 프로세스에서 실행)"""
+    if library_path not in _libraries:
+        _libraries[library_path] = LibraryIndex.open(Path(library_path))
+    library = _libraries[library_path]
+    segment = library.shard(shard)
+    pair_starts, pair_songs, pair_offsets = collect_pairs(
+        keys,
+        key_starts,
+        times,
+        window_starts,
+        segment.hashes,
+        segment.songs,
+        segment.frames,
+        library.frame_durations,
+        library.live_songs,
+    )
+    return count_window_offsets(pair_starts, pair_songs, pair_offsets)
+
+
+class LibraryMatcher:
+    """
+    라이브러리 역색인 샤드 분산 매처 (BatchMatcher와 같은 match 인터페이스)
+    workers가 1 이하이면 작업 프로세스 없이 현재 프로세스에서 샤드를 차례로 조회합니다.
+    """
+
+    workers = None  # 작업 프로세스 수 (기본: CPU 수와 샤드 수 중 작은 값)
+
+    def __init__(self, library: LibraryIndex):
+        self.library = library
+        self.names = library.names
+        self.hash_counts = library.hash_counts
+
+        workers = self.workers or min(os.cpu_count() or 1, library.shard_count)
+        self.executor = None
+        if workers <= 1:
+            _libraries[str(library.library_path)] = library
+        else:
+            # numba 스레드 상태를 물려받지 않도록 spawn으로 시작
+            self.executor = ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+    @classmethod
+    def set_config(cls, workers: int = None):
+        """라이브러리 매칭 관련 설정"""
+        if workers is not None:
+            cls.workers = workers
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _scatter(self, keys, key_starts, times, window_starts) -> List[tuple]:
+        """해시를 샤드별로 나눈 (샤드, 해시, 시간 시작 위치, 시간, 윈도우 시작 위치) 목록"""
+        n_windows = len(window_starts) - 1
+        shard_ids = self.library.shard_of(keys)
+        window_ids = np.repeat(np.arange(n_windows), np.diff(window_starts))
+        lengths = np.diff(key_starts)
+
+        requests = []
+        for shard in np.unique(shard_ids):
+            mask = shard_ids == shard
+            shard_lengths = lengths[mask]
+            shard_key_starts = np.zeros(len(shard_lengths) + 1, dtype=np.int64)
+            shard_key_starts[1:] = np.cumsum(shard_lengths)
+            time_index = np.repeat(
+                key_starts[:-1][mask] - shard_key_starts[:-1], shard_lengths
+            ) + np.arange(shard_key_starts[-1])
+            shard_window_starts = np.zeros(n_windows + 1, dtype=np.int64)
+            shard_window_starts[1:] = np.cumsum(np.bincount(window_ids[mask], minlength=n_windows))
+            requests.append(
+                (int(shard), keys[mask], shard_key_starts, times[time_index], shard_window_starts)
+            )
+        return requests
+
+    def _gather(self, requests: List[tuple]) -> List[tuple]:
+        """샤드별 조회 (작업 프로세스가 있으면 동시에)"""
+        library_path = str(self.library.library_path)
+        if self.executor is None:
+            return [query_shard(library_path, *request) for request in requests]
+        futures = [self.executor.submit(query_shard, library_path, *request) for request in requests]
+        return [future.result() for future in futures]
+
+    def match(self, window_fingerprints: List[nb.typed.Dict]) -> MatchMatrix:
+        """윈도우 지문 목록의 (윈도우 × 라이브러리 노래) 유사도/오프셋 행렬 계산"""
+        n_windows = len(window_fingerprints)
+        n_songs = len(self.names)
+        if n_windows == 0:
+            empty = np.zeros((0, n_songs))
+            return MatchMatrix(self.names, empty, empty.copy(), empty.astype(np.int64))
+
+        with Profiler.stage("LibraryMatcher.pack_windows"):
+            keys, key_starts, times, window_starts = pack_windows(typed.List(window_fingerprints))
+
+        with Profiler.stage("LibraryMatcher.scatter_gather"):
+            results = self._gather(self._scatter(keys, key_starts, times, window_starts))
+
+        with Profiler.stage("LibraryMatcher.merge"):
+            if results:
+                window_ids = np.concatenate(
+                    [np.repeat(np.arange(n_windows), np.diff(starts)) for starts, _, _ in results]
+                )
+                encoded = np.concatenate([codes for _, codes, _ in results])
+                counts = np.concatenate([c for _, _, c in results])
+                order = np.lexsort((encoded, window_ids))
+                best_counts, best_offsets = merge_offset_modes(
+                    window_ids[order], encoded[order], counts[order], n_windows, n_songs
+                )
+            else:
+                best_counts = np.zeros((n_windows, n_songs), dtype=np.int64)
+                best_offsets = np.zeros((n_windows, n_songs), dtype=np.int64)
+
+        # compute_similarity와 같은 정규화 (노래 지문과 윈도우 지문 중 작은 해시 수 기준)
+        window_lengths = np.diff(window_starts).reshape(n_windows, 1)
+        total_hash_counts = np.minimum(window_lengths, self.hash_counts).astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similarities = best_counts / (total_hash_counts * SIMILARITY_NORMALIZATION_FACTOR)
+        similarities = np.minimum(np.nan_to_num(similarities), 1.0)
+
+        return MatchMatrix(self.names, similarities, best_offsets / 1000, best_counts)
@@ -0,0 +1,187 @@
+"""
+라이브 타임라인 감지 모듈
+계속 들어오는 오디오를 지연 시간 상한에 맞춘 짧은 블록으로 나누어 도착하는 대로 한 번만 지문 생성/매칭하고
+전역 오프셋 투표(GlobalVoter)에 누적합니다. 노래 구간을 끝까지 들어 더 이상 투표가 바뀌지 않는
+시작 시간이 생길 때마다 노래를 보고하므로, 블록당 처리량이 일정하고 보관하는 오디오도 블록 하나 분량입니다.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Union
+import time
+
+import numpy as np
+
+from src.audioprint.audioprint_generator import AudioprintGenerator
+from src.timeline.audio_gate import AudioGate
+from src.timeline.global_matcher import GlobalVoter, VotePeak
+from src.timeline.read_audio import AudioChunk
+from src.timeline.timeline_detector import TimelineDetector
+from src.utils.compact_audioprint import CompactAudioprint
+from src.utils.profiler import Profiler
+from src.utils.types import TimelineData
+from src.utils.worldcup_index import WorldcupIndex
+from src.youtube_download.live_source import LiveSource
+
+
+@dataclass
+class LiveReport:
+    """라이브 감지 보고 (같은 노래가 더 높은 투표로 다시 보고되면 updated=True)"""
+
+    timeline: TimelineData
+    updated: bool
+    stream_seconds: float  # 보고 시점까지 처리한 오디오 길이 (초)
+
+
+class LiveTimelineDetector:
+    """
+    라이브 오디오 타임라인 감지기
+    블록 길이는 지연 시간 상한의 1/3이며, 블록이 차면 바로 처리합니다.
+    (블록 대기 + 투표 확정 대기 + 처리 시간이 상한 안에 들도록)
+    """
+
+    MIN_BLOCK_SECONDS = 1.0
+
+    def __init__(
+        self,
+        song_fingerprints: Union[Dict[str, CompactAudioprint], WorldcupIndex],
+        sample_rate: int,
+        latency: float = 15.0,
+        similarity_threshold: float = 0,
+        gate: AudioGate = None,
+    ):
+        self.sample_rate = sample_rate
+        self.latency = latency
+        self.gate = gate
+        self.hop = AudioprintGenerator.hop_size
+        self.block_seconds = max(latency / 3, self.MIN_BLOCK_SECONDS)
+        self.block_frames = max(int(self.block_seconds * sample_rate // self.hop), 1)
+        self.voter = GlobalVoter(
+            song_fingerprints, self.hop, sample_rate, self.block_frames + 1, similarity_threshold
+        )
+
+        # 처리하지 않은 오디오 버퍼 (buffer[0] = 스트림 샘플 buffer_start)
+        self.buffer = np.empty(0, dtype=np.float32)
+        self.buffer_start = 0
+        self.next_frame = 0
+        self.block_index = 0
+
+        self.reported: Dict[str, VotePeak] = {}
+        self.checked_candidates = 0
+        self.block_seconds_used: List[float] = []  # 블록별 처리 시간
+        self.slow_blocks = 0  # 처리 시간이 블록 길이보다 길었던 블록 수
+
+    @property
+    def received_samples(self) -> int:
+        return self.buffer_start + len(self.buffer)
+
+    @property
+    def available_frames(self) -> int:
+        """지금까지 받은 오디오로 만들 수 있는 온전한 프레임 수"""
+        return max((self.received_samples - AudioprintGenerator.frame_size) // self.hop + 1, 0)
+
+    def feed(self, samples: np.ndarray) -> List[LiveReport]:
+        """새 샘플을 추가하고 블록이 찰 때마다 처리하여 새 보고를 반환"""
+        if len(samples):
+            self.buffer = np.concatenate([self.buffer, np.asarray(samples, dtype=np.float32)])
+        reports = []
+        while self.available_frames >= self.next_frame + self.block_frames:
+            reports += self._process_block(self.next_frame + self.block_frames)
+        return reports
+
+    def finish(self) -> List[LiveReport]:
+        """소스가 끝났을 때 남은 프레임을 처리하고 모든 시작 시간의 투표를 확정"""
+        reports = []
+        if self.available_frames > self.next_frame:
+            reports += self._process_block(self.available_frames)
+        self.voter.finalize(self.next_frame + self.voter.max_song_frame + 1)
+        return reports + self._collect_reports()
+
+    def timelines(self) -> List[TimelineData]:
+        """지금까지 확정된 투표 피크의 최종 타임라인 (전역 투표 방식과 같은 비최대 억제)"""
+        return self.voter.timelines()
+
+    def _process_block(self, end_frame: int) -> List[LiveReport]:
+        started = time.perf_counter()
+        start_frame = self.next_frame
+
+        skipped = False
+        if self.gate is not None:
+            start = start_frame * self.hop - self.buffer_start
+            end = end_frame * self.hop - self.buffer_start
+            chunk = AudioChunk(
+                self.buffer[start:end],
+                start_frame * self.hop / self.sample_rate,
+                end_frame * self.hop / self.sample_rate,
+                self.sample_rate,
+            )
+            with Profiler.stage("audio_gate"):
+                decision = self.gate.check(chunk)
+            skipped = decision.skipped
+            if skipped:
+                print(f"비음악 구간 건너뜀 {decision.describe()}")
+
+        if not skipped:
+            with Profiler.stage("fingerprint"):
+                block = TimelineDetector.fingerprint_block(
+                    self.buffer,
+                    self.sample_rate,
+                    self.block_index,
+                    start_frame,
+                    end_frame,
+                    self.buffer_start,
+                )
+            with Profiler.stage("match"):
+                self.voter.add(block)
+        self.voter.finalize(end_frame)
+
+        # 다음 블록 첫 프레임 이전 샘플은 더 이상 필요 없음
+        self.next_frame = end_frame
+        self.block_index += 1
+        drop = self.next_frame * self.hop - self.buffer_start
+        self.buffer = self.buffer[drop:].copy()
+        self.buffer_start += drop
+
+        elapsed = time.perf_counter() - started
+        self.block_seconds_used.append(elapsed)
+        if elapsed > (end_frame - start_frame) * self.hop / self.sample_rate:
+            self.slow_blocks += 1
+        return self._collect_reports()
+
+    def _collect_reports(self) -> List[LiveReport]:
+        """새로 확정된 후보 중 처음 감지했거나 기존 보고보다 투표가 많은 노래를 보고"""
+        reports = []
+        for peak in self.voter.candidates[self.checked_candidates :]:
+            previous = self.reported.get(peak.song_name)
+            if previous is not None and peak.votes <= previous.votes:
+                continue
+            self.reported[peak.song_name] = peak
+            timeline = TimelineData(
+                peak.song_name,
+                peak.similarity,
+                round(peak.start_frame * self.hop / self.sample_rate),
+            )
+            reports.append(
+                LiveReport(timeline, previous is not None, self.next_frame * self.hop / self.sample_rate)
+            )
+        self.checked_candidates = len(self.voter.candidates)
+        return reports
+
+
+def run_live(
+    source: LiveSource,
+    detector: LiveTimelineDetector,
+    on_report: Callable[[LiveReport], None],
+) -> List[TimelineData]:
+    """소스가 끝날 때까지 읽으며 보고를 전달하고 최종 타임라인을 반환"""
+    try:
+        while True:
+            samples = source.read()
+            if samples is None:
+                break
+            for report in detector.feed(samples):
+                on_report(report)
+        for report in detector.finish():
+            on_report(report)
+    finally:
+        source.close()
+    return detector.timelines()
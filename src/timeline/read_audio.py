@@ -1,8 +1,10 @@
 import numpy as np
 from dataclasses import dataclass
-from typing import Iterator
+from typing import Any, Iterator
 
 from src.utils.formatter import TimeFormatter
+from src.utils.memory_manager import MemoryBudget
+from src.youtube_download.mapped_audio import MappedAudio
 
 
 @dataclass
@@ -13,6 +15,7 @@ class AudioChunk:
     start_time: float  # 시작 시간 (초)
     end_time: float  # 종료 시간 (초)
     samplerate: int  # 샘플레이트 (Hz)
+    fingerprint: Any = None  # 미리 만든 윈도우 지문 (있으면 감지에서 지문 생성 생략)
 
 
 def print_audio_info(
@@ -35,15 +38,23 @@ def print_audio_info(
 
 
 def read_audio(
-    full_audio: np.ndarray, duration, sample_rate, chunk_size, hop_size
+    full_audio: np.ndarray,
+    duration,
+    sample_rate,
+    chunk_size,
+    hop_size,
+    budget: MemoryBudget = None,
+    start_chunk: int = 0,
 ) -> Iterator[AudioChunk]:
     """
     오디오 데이터를 청크 단위로 읽어 제너레이터로 반환합니다.
+    budget이 주어지면 메모리 예산에 여유가 생길 때까지 다음 청크 생산을 늦춥니다.
+    start_chunk가 주어지면 그 순서의 청크부터 읽습니다. (체크포인트에서 이어서 실행)
     """
     # 청크 위치 계산
     chunk_positions = np.arange(0, duration - chunk_size + 1, hop_size)
     chunk_count = len(chunk_positions)
-    for idx, chunk_pos in enumerate(chunk_positions):
+    for idx, chunk_pos in enumerate(chunk_positions[start_chunk:], start_chunk):
         chunk_pos = int(chunk_pos)  # numpy type에서 Python float로 변환
 
         # 진행 상황 출력
@@ -61,6 +72,14 @@ def read_audio(
         start_index = chunk_start_time * sample_rate
         end_index = chunk_end_time * sample_rate
 
+        # 메모리 매핑 오디오는 이미 지나간 구간의 페이지 반환
+        if isinstance(full_audio, MappedAudio):
+            full_audio.release(start_index)
+
+        # 메모리 예산에 가까우면 메모리 확보 후 진행 (float32 청크 크기)
+        if budget is not None:
+            budget.wait_for_headroom(chunk_duration * sample_rate * 4)
+
         splited_audio = full_audio[start_index:end_index]
 
         yield AudioChunk(splited_audio, chunk_start_time, chunk_end_time, sample_rate)
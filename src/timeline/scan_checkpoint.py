@@ -0,0 +1,157 @@
+"""
+타임라인 검사 체크포인트 모듈
+긴 영상의 윈도우별 검사 중 주기적으로 검사 위치, 감지 상태(건너뛸 청크 수, 노래별 최고 타임라인),
+캐시한 오디오 파일 위치를 디렉토리에 기록하여 중단된 검사를 다운로드 없이 이어서 실행할 수 있게 합니다.
+
+디렉토리 구성:
+    checkpoint.json: 검사 설정, 오디오 정보, 다음 청크 순서, 건너뛸 청크 수, 노래별 최고 타임라인
+    audio.wav: 다운로드한 오디오 (메모리 매핑 WAV)
+    timelines.txt: 지금까지 확정된 타임라인 (감지될 때마다 갱신)
+"""
+
+from dataclasses import asdict, dataclass, field
+import json
+import logging
+from pathlib import Path
+import shutil
+import time
+from typing import List
+
+from src.utils.formatter import TimeFormatter
+from src.utils.types import TimelineData
+from src.youtube_download.mapped_audio import MappedAudio
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScanState:
+    """체크포인트에 기록하는 검사 상태"""
+
+    settings: dict  # 이어서 실행할 때 같아야 하는 검사 설정
+    name: str
+    duration: int
+    sample_rate: int
+    next_chunk: int = 0  # 다음에 처리할 청크 순서
+    skip_chunks: int = 0  # next_chunk부터 건너뛸 청크 수
+    timelines: List[TimelineData] = field(default_factory=list)  # 노래별 최고 타임라인
+    finished: bool = False
+
+
+class ScanCheckpoint:
+    CHECKPOINT_FILE = "checkpoint.json"
+    AUDIO_FILE = "audio.wav"
+    TIMELINES_FILE = "timelines.txt"
+    interval = 60.0  # 체크포인트 기록 주기 (초)
+    copy_samples = 1 << 22  # 오디오 파일 기록 단위 (샘플)
+
+    @classmethod
+    def set_config(cls, interval: float = None):
+        """체크포인트 관련 설정"""
+        if interval is not None:
+            cls.interval = interval
+
+    def __init__(self, checkpoint_path: Path, state: ScanState):
+        self.checkpoint_path = Path(checkpoint_path)
+        self.state = state
+        self.start_chunk = state.next_chunk  # 이번 실행에서 처음 처리하는 청크 순서
+        self._saved_at = time.monotonic()
+
+    @property
+    def audio_path(self) -> Path:
+        return self.checkpoint_path / self.AUDIO_FILE
+
+    @classmethod
+    def exists(cls, checkpoint_path: Path) -> bool:
+        return (Path(checkpoint_path) / cls.CHECKPOINT_FILE).exists()
+
+    @classmethod
+    def create(
+        cls, checkpoint_path: Path, settings: dict, audio_data, name: str, duration: int, sample_rate: int
+    ) -> "ScanCheckpoint":
+        """
+        새 검사의 체크포인트 디렉토리를 만들고 오디오를 캐시합니다.
+        메모리 매핑 오디오는 파일을 옮기고, 메모리 오디오는 float32 WAV 파일로 기록합니다.
+        """
+        checkpoint_path = Path(checkpoint_path)
+        checkpoint_path.mkdir(parents=True, exist_ok=True)
+        checkpoint = cls(checkpoint_path, ScanState(settings, name, duration, sample_rate))
+
+        if isinstance(audio_data, MappedAudio):
+            shutil.move(audio_data.audio_path, checkpoint.audio_path)
+            audio_data.audio_path = checkpoint.audio_path
+        else:
+            buffer = MappedAudio.allocate(checkpoint.audio_path, len(audio_data), sample_rate)
+            for start in range(0, len(audio_data), cls.copy_samples):
+                buffer[start : start + cls.copy_samples] = audio_data[start : start + cls.copy_samples]
+            buffer.flush()
+            del buffer
+
+        checkpoint.save()
+        checkpoint.write_timelines()
+        return checkpoint
+
+    @classmethod
+    def open(cls, checkpoint_path: Path, settings: dict) -> "ScanCheckpoint":
+        """기록한 체크포인트 열기 (검사 설정이 다르면 ValueError)"""
+        checkpoint_path = Path(checkpoint_path)
+        with open(checkpoint_path / cls.CHECKPOINT_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["timelines"] = [TimelineData(**timeline) for timeline in data["timelines"]]
+        state = ScanState(**data)
+
+        changed = [key for key, value in settings.items() if state.settings.get(key) != value]
+        if changed:
+            raise ValueError(f"체크포인트와 검사 설정이 다릅니다: {', '.join(changed)}")
+        if state.finished:
+            raise ValueError(f"이미 완료된 검사입니다: {checkpoint_path / cls.TIMELINES_FILE}")
+        return cls(checkpoint_path, state)
+
+    def load_audio(self) -> MappedAudio:
+        """캐시한 오디오 (메모리 매핑)"""
+        return MappedAudio(self.audio_path)
+
+    def save(self):
+        """검사 상태를 기록하고 체크포인트 파일을 원자적으로 교체"""
+        temp_path = self.checkpoint_path / f"{self.CHECKPOINT_FILE}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self.state), f, ensure_ascii=False, indent=2, default=float)
+        temp_path.replace(self.checkpoint_path / self.CHECKPOINT_FILE)
+        self._saved_at = time.monotonic()
+
+    def update(self, done_chunks: int, skip_chunks: int):
+        """
+        이번 실행에서 처리를 마친 청크 수와 그 다음부터 건너뛸 청크 수를 갱신하고,
+        마지막 기록 후 interval초가 지났으면 체크포인트를 기록합니다.
+        """
+        self.state.next_chunk = self.start_chunk + done_chunks
+        self.state.skip_chunks = skip_chunks
+        if time.monotonic() - self._saved_at >= self.interval:
+            self.save()
+            logger.info(f"체크포인트 기록: 청크 {self.state.next_chunk}")
+
+    def set_timelines(self, timelines: List[TimelineData]):
+        """노래별 최고 타임라인이 바뀌면 확정된 타임라인 파일 갱신"""
+        timelines = list(timelines)
+        if timelines == self.state.timelines:
+            return
+        self.state.timelines = timelines
+        self.write_timelines()
+
+    def write_timelines(self):
+        """지금까지의 타임라인을 영상 시간순으로 기록 (노래 제목 HH:MM:SS 유사도)"""
+        start_offset = TimeFormatter.format_time_to_int(self.state.settings.get("start_time", "00:00:00"))
+        lines = [
+            f"{t.name} {TimeFormatter.format_time_to_str(start_offset + t.start_time)} {t.similarity:.3f}"
+            for t in sorted(self.state.timelines, key=lambda t: t.start_time)
+        ]
+        temp_path = self.checkpoint_path / f"{self.TIMELINES_FILE}.tmp"
+        temp_path.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+        temp_path.replace(self.checkpoint_path / self.TIMELINES_FILE)
+
+    def finish(self, timelines: List[TimelineData]):
+        """최종 타임라인을 기록하고 캐시한 오디오 삭제"""
+        self.set_timelines(timelines)
+        self.state.finished = True
+        self.save()
+        self.audio_path.unlink(missing_ok=True)
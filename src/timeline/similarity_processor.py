@@ -4,8 +4,11 @@ import numpy as np
 from numpy.typing import NDArray
 from numba import typed, types
 
+from src.utils.profiler import Profiler
+
 TIME_OFFSET_PRECISION = 2  # 시간 오프셋 반올림 정밀도
 SIMILARITY_NORMALIZATION_FACTOR = 0.5  # 유사도 정규화 요소
+MAX_OFFSET_BINS = 1 << 20  # 오프셋 투표 히스토그램 최대 칸 수 (넘으면 범위를 나눠 여러 번 투표)
 
 
 @nb.njit(fastmath=True, cache=True)
@@ -37,7 +40,185 @@ def compute_time_offsets(
     return time_offsets
 
 
-@nb.njit(fastmath=True, parallel=True)
+@nb.njit(fastmath=True, cache=True)
+def compute_time_offsets_compact(
+    fingerprint1: typed.Dict,
+    hashes: NDArray[np.uint32],
+    offsets: NDArray[np.uint32],
+    frames: NDArray[np.uint16],
+    frame_duration: float,
+    precision=TIME_OFFSET_PRECISION,
+):
+    """
+    오디오 지문과 압축 지문(CompactAudioprint) 간의 시간 오프셋을 계산합니다.
+
+    Args:
+        fingerprint1: 첫 번째 오디오 지문
+        hashes, offsets, frames, frame_duration: 두 번째 오디오 지문의 압축 표현
+
+    Returns:
+        List[float]: 계산된 시간 오프셋 목록
+    """
+    time_offsets = typed.List.empty_list(types.float64)
+
+    for hash_key in fingerprint1:
+        # 정렬된 해시 배열에서 이진 탐색
+        idx = np.searchsorted(hashes, np.uint32(hash_key))
+        if idx < len(hashes) and hashes[idx] == hash_key:
+            time_points1 = fingerprint1[hash_key]
+
+            for t1 in time_points1:
+                for pos in range(offsets[idx], offsets[idx + 1]):
+                    t2 = np.float32(frames[pos] * frame_duration)
+                    time_offset = t2 - t1
+                    round_offset = np.round(time_offset, precision)
+                    time_offsets.append(round_offset)
+    return time_offsets
+
+
+@nb.njit(cache=True)
+def matched_time_range(fingerprint1: typed.Dict, fingerprint2: typed.Dict):
+    """공통 해시의 지문별 시간 범위 (t1 최소, t1 최대, t2 최소, t2 최대, 공통 해시가 없으면 t1 최소 > t1 최대)"""
+    t1_min, t1_max, t2_min, t2_max = np.inf, -np.inf, np.inf, -np.inf
+    for hash_key in fingerprint1:
+        if hash_key in fingerprint2:
+            time_points1 = fingerprint1[hash_key]
+            time_points2 = fingerprint2[hash_key]
+            t1_min = min(t1_min, time_points1.min())
+            t1_max = max(t1_max, time_points1.max())
+            t2_min = min(t2_min, time_points2.min())
+            t2_max = max(t2_max, time_points2.max())
+    return t1_min, t1_max, t2_min, t2_max
+
+
+@nb.njit(cache=True)
+def matched_time_range_compact(
+    fingerprint1: typed.Dict,
+    hashes: NDArray[np.uint32],
+    offsets: NDArray[np.uint32],
+    frames: NDArray[np.uint16],
+    frame_duration: float,
+):
+    """공통 해시의 지문별 시간 범위 (압축 지문, matched_time_range와 같은 반환값)"""
+    t1_min, t1_max, t2_min, t2_max = np.inf, -np.inf, np.inf, -np.inf
+    for hash_key in fingerprint1:
+        idx = np.searchsorted(hashes, np.uint32(hash_key))
+        if idx < len(hashes) and hashes[idx] == hash_key:
+            time_points1 = fingerprint1[hash_key]
+            t1_min = min(t1_min, time_points1.min())
+            t1_max = max(t1_max, time_points1.max())
+            for pos in range(offsets[idx], offsets[idx + 1]):
+                t2 = np.float32(frames[pos] * frame_duration)
+                t2_min = min(t2_min, t2)
+                t2_max = max(t2_max, t2)
+    return t1_min, t1_max, t2_min, t2_max
+
+
+@nb.njit(fastmath=True, cache=True)
+def vote_time_offsets(
+    fingerprint1: typed.Dict,
+    fingerprint2: typed.Dict,
+    first_bin: int,
+    n_bins: int,
+    precision=TIME_OFFSET_PRECISION,
+):
+    """
+    compute_time_offsets와 같이 반올림한 시간 오프셋을 목록 대신 고정 크기 히스토그램에 투표합니다.
+    칸은 반올림 단위(10^-precision초)이고, [first_bin, first_bin + n_bins) 밖의 오프셋은 무시합니다.
+
+    Returns:
+        (최빈 칸, 투표 수): 동률이면 작은 오프셋
+    """
+    histogram = np.zeros(n_bins, dtype=np.int32)
+    scale = 10.0**precision
+
+    for hash_key in fingerprint1:
+        if hash_key in fingerprint2:
+            time_points1 = fingerprint1[hash_key]
+            time_points2 = fingerprint2[hash_key]
+
+            for t1 in time_points1:
+                for t2 in time_points2:
+                    round_offset = np.round(t2 - t1, precision)
+                    b = np.int64(np.round(round_offset * scale)) - first_bin
+                    if 0 <= b < n_bins:
+                        histogram[b] += 1
+    best = np.argmax(histogram)
+    return first_bin + best, np.int64(histogram[best])
+
+
+@nb.njit(fastmath=True, cache=True)
+def vote_time_offsets_compact(
+    fingerprint1: typed.Dict,
+    hashes: NDArray[np.uint32],
+    offsets: NDArray[np.uint32],
+    frames: NDArray[np.uint16],
+    frame_duration: float,
+    first_bin: int,
+    n_bins: int,
+    precision=TIME_OFFSET_PRECISION,
+):
+    """압축 지문과의 시간 오프셋 히스토그램 투표 (vote_time_offsets와 같은 반환값)"""
+    histogram = np.zeros(n_bins, dtype=np.int32)
+    scale = 10.0**precision
+
+    for hash_key in fingerprint1:
+        idx = np.searchsorted(hashes, np.uint32(hash_key))
+        if idx < len(hashes) and hashes[idx] == hash_key:
+            time_points1 = fingerprint1[hash_key]
+
+            for t1 in time_points1:
+                for pos in range(offsets[idx], offsets[idx + 1]):
+                    t2 = np.float32(frames[pos] * frame_duration)
+                    round_offset = np.round(t2 - t1, precision)
+                    b = np.int64(np.round(round_offset * scale)) - first_bin
+                    if 0 <= b < n_bins:
+                        histogram[b] += 1
+    best = np.argmax(histogram)
+    return first_bin + best, np.int64(histogram[best])
+
+
+@nb.njit(cache=True)
+def count_key_offsets_index(fingerprint1: typed.Dict, hashes: NDArray[np.uint32]):
+    """지문1의 해시별(순회 순서) 역색인 세그먼트와의 (노래, 시간 오프셋) 쌍 수 상한을 계산합니다."""
+    counts = np.zeros(len(fingerprint1), dtype=np.int64)
+    idx = 0
+    for hash_key in fingerprint1:
+        key = np.uint32(hash_key)
+        start = np.searchsorted(hashes, key, side="left")
+        end = np.searchsorted(hashes, key, side="right")
+        counts[idx] = len(fingerprint1[hash_key]) * (end - start)
+        idx += 1
+    return counts
+
+
+@nb.njit(cache=True)
+def split_fingerprint(fingerprint: typed.Dict, key_counts: NDArray[np.int64], max_offsets: int):
+    """
+    해시별 오프셋 수 합이 max_offsets를 넘지 않도록 지문을 여러 지문으로 나눕니다.
+    (해시 하나의 오프셋 수가 max_offsets보다 크면 그 해시만 따로 나눔)
+    """
+    parts = typed.List()
+    part = typed.Dict.empty(types.int32, types.float32[:])
+    total = 0
+    idx = 0
+    for hash_key in fingerprint:
+        count = key_counts[idx]
+        idx += 1
+        if count == 0:
+            continue
+        if total > 0 and total + count > max_offsets:
+            parts.append(part)
+            part = typed.Dict.empty(types.int32, types.float32[:])
+            total = 0
+        part[hash_key] = fingerprint[hash_key]
+        total += count
+    if total > 0:
+        parts.append(part)
+    return parts
+
+
+@nb.njit(fastmath=True, parallel=True, cache=True)
 def compute_similarity_numpy(
     time_offsets, fp1_length: int, fp2_length: int, normalization_factor: float = 0.5
 ) -> Tuple[float, float]:
@@ -118,7 +299,8 @@ def compute_similarity(
     scaled_offsets = np.round(time_offsets * scale_factor).astype(np.int64)
 
     # 4. NumPy의 고유값 카운팅 기능 사용
-    unique_vals, counts = np.unique(scaled_offsets, return_counts=True)
+    with Profiler.stage("np.unique"):
+        unique_vals, counts = np.unique(scaled_offsets, return_counts=True)
 
     # 5. 최대 발생 횟수와 해당 오프셋 찾기
     max_idx = np.argmax(counts)
@@ -131,3 +313,232 @@ def compute_similarity(
     similarity = min(similarity, 1.0)  # 최대값 1.0으로 제한
 
     return similarity, most_common_offset
+
+
+@nb.njit(fastmath=True, cache=True)
+def compute_index_offsets(
+    fingerprint1: typed.Dict,
+    hashes: NDArray[np.uint32],
+    songs: NDArray[np.int32],
+    frames: NDArray[np.uint16],
+    frame_durations: NDArray[np.float64],
+    live_songs: NDArray[np.bool_],
+    precision=TIME_OFFSET_PRECISION,
+):
+    """
+    오디오 지문과 월드컵 역색인 세그먼트 간의 (노래, 시간 오프셋) 쌍을 계산합니다.
+
+    Args:
+        fingerprint1: 오디오 지문
+        hashes, songs, frames: 해시 기준으로 정렬된 세그먼트 포스팅
+        frame_durations: 노래 ID별 프레임 길이 (초)
+        live_songs: 노래 ID별 유효 여부 (삭제된 노래의 포스팅 제외)
+
+    Returns:
+        Tuple[NDArray[int32], NDArray[float64]]: 노래 ID 배열, 시간 오프셋 배열
+    """
+    # 1. 일치하는 포스팅 범위와 결과 크기 계산
+    keys = np.empty(len(fingerprint1), dtype=np.uint32)
+    idx = 0
+    for hash_key in fingerprint1:
+        keys[idx] = hash_key
+        idx += 1
+    starts = np.searchsorted(hashes, keys, side="left")
+    ends = np.searchsorted(hashes, keys, side="right")
+
+    total = 0
+    idx = 0
+    for hash_key in fingerprint1:
+        total += (ends[idx] - starts[idx]) * len(fingerprint1[hash_key])
+        idx += 1
+
+    # 2. 오프셋 계산
+    out_songs = np.empty(total, dtype=np.int32)
+    out_offsets = np.empty(total, dtype=np.float64)
+    count = 0
+    idx = 0
+    for hash_key in fingerprint1:
+        time_points1 = fingerprint1[hash_key]
+        for t1 in time_points1:
+            for pos in range(starts[idx], ends[idx]):
+                song = songs[pos]
+                if not live_songs[song]:
+                    continue
+                t2 = np.float32(frames[pos] * frame_durations[song])
+                time_offset = t2 - t1
+                out_songs[count] = song
+                out_offsets[count] = np.round(time_offset, precision)
+                count += 1
+        idx += 1
+    return out_songs[:count], out_offsets[:count]
+
+
+@nb.njit(cache=True)
+def compute_song_offset_modes(song_ids: NDArray[np.int32], scaled_offsets: NDArray[np.int64], n_songs: int):
+    """
+    노래별 최빈 시간 오프셋과 빈도수를 계산합니다. (동률이면 작은 오프셋 선택)
+
+    Returns:
+        Tuple[NDArray[int64], NDArray[int64]]: 노래 ID별 최빈 빈도수, 최빈 오프셋
+    """
+    best_counts = np.zeros(n_songs, dtype=np.int64)
+    best_offsets = np.zeros(n_songs, dtype=np.int64)
+
+    # (노래, 오프셋) 기준 정렬 후 같은 값 구간 길이 계산
+    order = np.argsort(song_ids * np.int64(1 << 40) + (scaled_offsets + np.int64(1 << 39)))
+    run_start = 0
+    for i in range(1, len(order) + 1):
+        if (
+            i == len(order)
+            or song_ids[order[i]] != song_ids[order[run_start]]
+            or scaled_offsets[order[i]] != scaled_offsets[order[run_start]]
+        ):
+            song = song_ids[order[run_start]]
+            run_length = i - run_start
+            if run_length > best_counts[song]:
+                best_counts[song] = run_length
+                best_offsets[song] = scaled_offsets[order[run_start]]
+            run_start = i
+    return best_counts, best_offsets
+
+
+def compute_index_similarities(
+    song_ids: np.ndarray,
+    time_offsets: np.ndarray,
+    fp1_length: int,
+    song_hash_counts: np.ndarray,
+    normalization_factor: float = SIMILARITY_NORMALIZATION_FACTOR,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    노래별 유사도와 최빈 시간 오프셋을 계산합니다. (compute_similarity의 노래 일괄 처리 버전)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 노래 ID별 유사도, 시간 오프셋
+    """
+    n_songs = len(song_hash_counts)
+
+    # 부동소수점 오프셋을 정수로 변환 (정밀도 유지)
+    scale_factor = 1000  # 밀리초 단위 정밀도
+    scaled_offsets = np.round(time_offsets * scale_factor).astype(np.int64)
+    best_counts, best_offsets = compute_song_offset_modes(song_ids, scaled_offsets, n_songs)
+
+    # 유사도 계산
+    total_hash_counts = np.minimum(fp1_length, song_hash_counts).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarities = best_counts / (total_hash_counts * normalization_factor)
+    similarities = np.minimum(np.nan_to_num(similarities), 1.0)
+
+    return similarities, best_offsets / scale_factor
+
+
+def offset_bin_range(t1_min: float, t1_max: float, t2_min: float, t2_max: float, precision=TIME_OFFSET_PRECISION):
+    """두 지문의 시간 범위로 가능한 반올림 오프셋 칸 범위 [첫 칸, 끝 칸) (반올림 여유 1칸 포함)"""
+    scale = 10.0**precision
+    first_bin = int(np.floor((t2_min - t1_max) * scale)) - 1
+    last_bin = int(np.ceil((t2_max - t1_min) * scale)) + 1
+    return first_bin, last_bin + 1
+
+
+def compute_similarity_from_votes(
+    vote, time_range, fp1_length: int, fp2_length: int, max_bins: int = MAX_OFFSET_BINS
+) -> Tuple[float, float]:
+    """
+    시간 오프셋 목록 없이 히스토그램 투표로 유사도 계산 (compute_similarity와 같은 결과)
+    vote(first_bin, n_bins)는 (최빈 칸, 투표 수)를 반환하고, 오프셋 범위가 max_bins칸보다 넓으면
+    범위를 나눠 여러 번 투표하므로 비교 하나의 메모리는 max_bins칸으로 고정됩니다.
+    """
+    t1_min, t1_max, t2_min, t2_max = time_range
+    if t1_min > t1_max:
+        return 0.0, 0.0
+
+    first_bin, end_bin = offset_bin_range(t1_min, t1_max, t2_min, t2_max)
+    best_bin, best_count = 0, 0
+    for start in range(first_bin, end_bin, max_bins):
+        bin_index, count = vote(start, min(max_bins, end_bin - start))
+        if count > best_count:
+            best_bin, best_count = bin_index, count
+
+    if best_count == 0:
+        return 0.0, 0.0
+    total_hash_count = min(fp1_length, fp2_length)
+    similarity = best_count / (total_hash_count * SIMILARITY_NORMALIZATION_FACTOR)
+    # compute_similarity와 같은 밀리초 정수 -> 초 변환
+    most_common_offset = round(best_bin * 1000 / 10**TIME_OFFSET_PRECISION) / 1000
+    return min(similarity, 1.0), most_common_offset
+
+
+class OffsetCounter:
+    """
+    배치별 정수 오프셋(밀리초)의 빈도수를 누적합니다.
+    오프셋 버퍼 상한 때문에 지문을 나눠 계산할 때 전체 오프셋 배열 대신 사용합니다.
+    """
+
+    def __init__(self):
+        self.values = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.values)
+
+    def add(self, values: np.ndarray):
+        """오프셋 배열의 빈도수를 누적"""
+        if not len(values):
+            return
+        batch_values, batch_counts = np.unique(values, return_counts=True)
+        merged_values, inverse = np.unique(
+            np.concatenate([self.values, batch_values]), return_inverse=True
+        )
+        self.counts = np.bincount(
+            inverse,
+            weights=np.concatenate([self.counts, batch_counts]),
+            minlength=len(merged_values),
+        ).astype(np.int64)
+        self.values = merged_values
+
+    def most_common(self) -> Tuple[int, int]:
+        """최빈 오프셋과 빈도수 (동률이면 작은 오프셋, np.unique + argmax와 동일)"""
+        if not len(self.values):
+            return 0, 0
+        max_idx = np.argmax(self.counts)
+        return int(self.values[max_idx]), int(self.counts[max_idx])
+
+
+def scale_time_offsets(time_offsets: np.ndarray) -> np.ndarray:
+    """시간 오프셋(초)을 밀리초 정수로 변환"""
+    return np.round(np.asarray(time_offsets) * 1000).astype(np.int64)
+
+
+def encode_song_offsets(song_ids: np.ndarray, scaled_offsets: np.ndarray) -> np.ndarray:
+    """(노래 ID, 밀리초 오프셋) 쌍을 하나의 int64 키로 변환 (노래 -> 오프셋 순으로 정렬됨)"""
+    return song_ids.astype(np.int64) * np.int64(1 << 40) + (scaled_offsets + np.int64(1 << 39))
+
+
+def compute_index_similarities_from_counts(
+    counter: OffsetCounter,
+    fp1_length: int,
+    song_hash_counts: np.ndarray,
+    normalization_factor: float = SIMILARITY_NORMALIZATION_FACTOR,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    누적한 (노래, 오프셋) 키 빈도수로 노래별 유사도와 최빈 시간 오프셋 계산
+    (compute_index_similarities와 같은 결과)
+    """
+    n_songs = len(song_hash_counts)
+    best_counts = np.zeros(n_songs, dtype=np.int64)
+    best_offsets = np.zeros(n_songs, dtype=np.int64)
+
+    if len(counter):
+        song_ids = counter.values >> 40
+        scaled_offsets = (counter.values & ((1 << 40) - 1)) - (1 << 39)
+        # 노래별로 빈도수 내림차순 -> 오프셋 오름차순 첫 항목 선택
+        order = np.lexsort((scaled_offsets, -counter.counts, song_ids))
+        songs, first = np.unique(song_ids[order], return_index=True)
+        best_counts[songs] = counter.counts[order][first]
+        best_offsets[songs] = scaled_offsets[order][first]
+
+    total_hash_counts = np.minimum(fp1_length, song_hash_counts).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarities = best_counts / (total_hash_counts * normalization_factor)
+    similarities = np.minimum(np.nan_to_num(similarities), 1.0)
+
+    return similarities, best_offsets / 1000
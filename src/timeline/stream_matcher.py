@@ -0,0 +1,270 @@
+"""
+증분 슬라이딩 윈도우 매칭 모듈
+스트림을 홉 크기 블록으로 나누어 블록별로 한 번만 지문을 만들고 노래별 시간 오프셋 투표 상태를 유지합니다.
+윈도우가 한 홉 이동하면 들어오는 블록의 투표를 더하고 나가는 블록의 (저장해 둔) 투표를 빼므로
+각 해시는 (청크 / 홉)번이 아니라 한 번만 매칭됩니다.
+
+투표는 정수 프레임 오프셋(노래 프레임 - 스트림 프레임)으로 누적합니다. 프레임 간격(약 14.5ms)이
+오프셋 반올림 단위(10ms)보다 커서 프레임 오프셋과 반올림 오프셋이 일대일로 대응하므로,
+같은 윈도우 지문을 detect_best_match로 계산한 결과(유사도, 노래, 오프셋)와 동일합니다.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Tuple, Union
+
+import numba as nb
+import numpy as np
+from numpy.typing import NDArray
+
+from src.timeline.similarity_processor import (
+    SIMILARITY_NORMALIZATION_FACTOR,
+    TIME_OFFSET_PRECISION,
+)
+from src.utils.compact_audioprint import CompactAudioprint
+from src.utils.profiler import Profiler
+from src.utils.worldcup_index import WorldcupIndex
+
+
+@nb.njit(cache=True)
+def vote_block_compact(
+    keys: NDArray[np.uint32],
+    key_starts: NDArray[np.int64],
+    block_frames: NDArray[np.int64],
+    hashes: NDArray[np.uint32],
+    offsets: NDArray[np.uint32],
+    frames: NDArray[np.uint16],
+    counts: NDArray[np.int32],
+):
+    """
+    블록 지문(해시별로 정렬된 스트림 프레임)과 압축 지문 간의 프레임 오프셋 투표를 누적합니다.
+    counts는 프레임 오프셋을 len(counts)로 나눈 나머지 위치에 누적하는 원형 버퍼입니다.
+    """
+    modulus = len(counts)
+    positions = np.searchsorted(hashes, keys)
+    for i in range(len(keys)):
+        pos = positions[i]
+        if pos >= len(hashes) or hashes[pos] != keys[i]:
+            continue
+        for j in range(key_starts[i], key_starts[i + 1]):
+            stream_frame = block_frames[j]
+            for q in range(offsets[pos], offsets[pos + 1]):
+                counts[(np.int64(frames[q]) - stream_frame) % modulus] += 1
+
+
+@nb.njit(cache=True)
+def vote_block_index(
+    keys: NDArray[np.uint32],
+    key_starts: NDArray[np.int64],
+    block_frames: NDArray[np.int64],
+    hashes: NDArray[np.uint32],
+    songs: NDArray[np.int32],
+    frames: NDArray[np.uint16],
+    live_songs: NDArray[np.bool_],
+    counts: NDArray[np.int32],
+):
+    """블록 지문과 월드컵 역색인 세그먼트 간의 (노래, 프레임 오프셋) 투표를 누적합니다."""
+    modulus = counts.shape[1]
+    starts = np.searchsorted(hashes, keys, side="left")
+    ends = np.searchsorted(hashes, keys, side="right")
+    for i in range(len(keys)):
+        for j in range(key_starts[i], key_starts[i + 1]):
+            stream_frame = block_frames[j]
+            for pos in range(starts[i], ends[i]):
+                song = songs[pos]
+                if not live_songs[song]:
+                    continue
+                counts[song, (np.int64(frames[pos]) - stream_frame) % modulus] += 1
+
+
+@nb.njit(fastmath=True, cache=True)
+def frame_offset_to_millis(
+    frame_offset: int, frame_duration: float, hop_size: int, sample_rate: int
+) -> int:
+    """
+    프레임 오프셋을 지문 생성(프레임 * 홉 / 샘플레이트)과 compute_time_offsets_compact,
+    compute_similarity와 같은 연산 순서로 반올림한 밀리초 오프셋으로 변환합니다.
+    """
+    song_frame = max(frame_offset, 0)
+    stream_frame = song_frame - frame_offset
+    t1 = np.float32(stream_frame * hop_size / sample_rate)
+    t2 = np.float32(song_frame * frame_duration)
+    round_offset = np.float64(np.round(t2 - t1, TIME_OFFSET_PRECISION))
+    return np.int64(np.round(round_offset * 1000))
+
+
+@dataclass
+class StreamBlock:
+    """해시 기준으로 정렬한 블록 지문 (프레임은 스트림 전체 기준)"""
+
+    index: int
+    keys: np.ndarray  # 고유 해시 (uint32)
+    key_starts: np.ndarray  # 해시별 항목 시작 위치 (길이 = 고유 해시 수 + 1)
+    frames: np.ndarray  # 항목별 스트림 프레임 인덱스 (int64)
+    vote_positions: np.ndarray = None  # 투표 상태 배열에서 이 블록이 투표한 위치
+    vote_counts: np.ndarray = None  # 위치별 투표 수
+
+    @classmethod
+    def from_hash_arrays(cls, index: int, hashes: np.ndarray, frames: np.ndarray) -> "StreamBlock":
+        order = np.argsort(hashes, kind="stable")
+        sorted_hashes = np.asarray(hashes)[order].astype(np.uint32)
+        keys, starts = np.unique(sorted_hashes, return_index=True)
+        key_starts = np.append(starts, len(sorted_hashes)).astype(np.int64)
+        return cls(index, keys, key_starts, np.asarray(frames, dtype=np.int64)[order])
+
+
+class StreamMatcher:
+    """
+    노래별 프레임 오프셋 투표 상태를 유지하는 증분 매처
+    노래 지문(CompactAudioprint 목록 또는 월드컵 역색인)의 프레임 길이가 스트림 프레임 길이와 같아야 합니다.
+    """
+
+    def __init__(
+        self,
+        song_fingerprints: Union[Dict[str, CompactAudioprint], WorldcupIndex],
+        hop_size: int,
+        sample_rate: int,
+        window_frames: int,
+    ):
+        self.song_fingerprints = song_fingerprints
+        self.hop_size = hop_size
+        self.sample_rate = sample_rate
+        self.blocks = deque()
+
+        if isinstance(song_fingerprints, WorldcupIndex):
+            self.names = [song["name"] for song in song_fingerprints.songs.values()]
+            self.song_ids = np.array(list(song_fingerprints.songs.keys()), dtype=np.int64)
+            self.hash_counts = song_fingerprints.hash_counts[self.song_ids]
+            self.frame_durations = song_fingerprints.frame_durations[self.song_ids]
+            max_song_frame = max(
+                (int(segment.frames.max()) for segment in song_fingerprints.segments if len(segment)),
+                default=0,
+            )
+            n_rows = len(song_fingerprints.hash_counts)
+        else:
+            self.names = list(song_fingerprints.keys())
+            self.song_ids = np.arange(len(self.names), dtype=np.int64)
+            self.hash_counts = np.array([len(fp) for fp in song_fingerprints.values()], dtype=np.int64)
+            self.frame_durations = np.array(
+                [fp.frame_duration for fp in song_fingerprints.values()], dtype=np.float64
+            )
+            max_song_frame = max(
+                (int(fp.frames.max()) for fp in song_fingerprints.values() if len(fp.frames)),
+                default=0,
+            )
+            n_rows = len(self.names)
+
+        # 윈도우 안의 프레임 오프셋 범위 (노래 길이 + 윈도우 길이)를 담는 원형 버퍼
+        self.modulus = max_song_frame + window_frames + 1
+        self.counts = np.zeros((n_rows, self.modulus), dtype=np.int32)
+        self.scratch = np.zeros_like(self.counts)
+
+        # 윈도우 고유 해시 수 계산용 해시별 블록 참조 수
+        self.key_refs: Dict[int, int] = {}
+
+    @staticmethod
+    def supports(
+        song_fingerprints: Union[Dict[str, CompactAudioprint], WorldcupIndex],
+        frame_duration: float,
+    ) -> bool:
+        """노래 지문의 프레임 길이가 모두 스트림 프레임 길이와 같은지 확인"""
+        if isinstance(song_fingerprints, WorldcupIndex):
+            durations = song_fingerprints.frame_durations[song_fingerprints.live_songs]
+        else:
+            if not all(isinstance(fp, CompactAudioprint) for fp in song_fingerprints.values()):
+                return False
+            durations = np.array([fp.frame_duration for fp in song_fingerprints.values()])
+        return bool(np.all(np.isclose(durations, frame_duration, rtol=0, atol=1e-9)))
+
+    def _collect_votes(self, block: StreamBlock):
+        """블록 하나의 투표를 빈 배열에 계산하여 (위치, 투표 수)로 블록에 저장"""
+        if isinstance(self.song_fingerprints, WorldcupIndex):
+            index = self.song_fingerprints
+            for segment in index.segments:
+                vote_block_index(
+                    block.keys,
+                    block.key_starts,
+                    block.frames,
+                    segment.hashes,
+                    segment.songs,
+                    segment.frames,
+                    index.live_songs,
+                    self.scratch,
+                )
+        else:
+            for row, song in enumerate(self.song_fingerprints.values()):
+                vote_block_compact(
+                    block.keys,
+                    block.key_starts,
+                    block.frames,
+                    song.hashes,
+                    song.offsets,
+                    song.frames,
+                    self.scratch[row],
+                )
+
+        flat = self.scratch.reshape(-1)
+        block.vote_positions = np.flatnonzero(flat)
+        block.vote_counts = flat[block.vote_positions]
+        flat[block.vote_positions] = 0
+
+    def _update_key_refs(self, keys: np.ndarray, sign: int):
+        for key in keys.tolist():
+            refs = self.key_refs.get(key, 0) + sign
+            if refs:
+                self.key_refs[key] = refs
+            else:
+                del self.key_refs[key]
+
+    def push(self, block: StreamBlock):
+        """윈도우에 들어오는 블록의 투표 추가 (블록 지문은 여기서 한 번만 매칭)"""
+        with Profiler.stage("StreamMatcher.push"):
+            self._collect_votes(block)
+            self.counts.reshape(-1)[block.vote_positions] += block.vote_counts
+            self._update_key_refs(block.keys, 1)
+        self.blocks.append(block)
+
+    def pop(self) -> StreamBlock:
+        """윈도우에서 나가는 가장 오래된 블록의 투표 제거 (저장한 투표를 빼므로 다시 매칭하지 않음)"""
+        block = self.blocks.popleft()
+        with Profiler.stage("StreamMatcher.pop"):
+            self.counts.reshape(-1)[block.vote_positions] -= block.vote_counts
+            self._update_key_refs(block.keys, -1)
+        return block
+
+    def score(self, window_start_frame: int, window_frames: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        현재 투표 상태에서 노래별 유사도와 시간 오프셋(초, 윈도우 시작 기준)을 계산합니다.
+        (compute_similarity와 같은 정규화, 동률이면 작은 오프셋 선택)
+        """
+        # 윈도우에서 가능한 가장 작은 프레임 오프셋부터 순서대로 정렬
+        min_offset = -(window_start_frame + window_frames - 1)
+        ordered = np.roll(self.counts[self.song_ids], -(min_offset % self.modulus), axis=1)
+        best = np.argmax(ordered, axis=1)
+        best_counts = ordered[np.arange(len(best)), best].astype(np.int64)
+
+        total_hash_counts = np.minimum(len(self.key_refs), self.hash_counts).astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similarities = best_counts / (total_hash_counts * SIMILARITY_NORMALIZATION_FACTOR)
+        similarities = np.minimum(np.nan_to_num(similarities), 1.0)
+        similarities[best_counts == 0] = 0.0
+
+        # 윈도우 시작 프레임 기준 프레임 오프셋 -> 반올림 시간 오프셋
+        scaled_offsets = np.zeros(len(best), dtype=np.int64)
+        for row in np.flatnonzero(best_counts):
+            scaled_offsets[row] = frame_offset_to_millis(
+                int(min_offset + best[row] + window_start_frame),
+                float(self.frame_durations[row]),
+                self.hop_size,
+                self.sample_rate,
+            )
+        return similarities, scaled_offsets / 1000
+
+    def best_match(self, window_start_frame: int, window_frames: int) -> Tuple[float, str, float]:
+        """노래 순서대로 유사도가 가장 높은 (유사도, 노래 이름, 오프셋)"""
+        similarities, offsets = self.score(window_start_frame, window_frames)
+        best = (0.0, "", 0.0)
+        for row, name in enumerate(self.names):
+            if similarities[row] > best[0]:
+                best = (float(similarities[row]), name, float(offsets[row]))
+        return best
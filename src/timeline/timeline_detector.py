@@ -1,14 +1,40 @@
 from dataclasses import dataclass
-from typing import Any, Dict, Generator, List
+from typing import Any, Dict, Generator, List, Union
 
 import numpy as np
 import numba as nb
 
+from src.timeline.audio_gate import AudioGate
 from src.timeline.read_audio import AudioChunk
+from src.timeline.scan_checkpoint import ScanCheckpoint
+from src.timeline.batch_matcher import BatchMatcher
+from src.timeline.global_matcher import GlobalVoter
+from src.timeline.library_matcher import LibraryMatcher
+from src.timeline.stream_matcher import StreamBlock, StreamMatcher
 from src.audioprint.audioprint_generator import AudioprintGenerator
-from src.timeline.similarity_processor import compute_similarity, compute_time_offsets
+from src.timeline.similarity_processor import (
+    OffsetCounter,
+    compute_index_offsets,
+    compute_index_similarities,
+    compute_index_similarities_from_counts,
+    compute_similarity_from_votes,
+    count_key_offsets_index,
+    encode_song_offsets,
+    matched_time_range,
+    matched_time_range_compact,
+    scale_time_offsets,
+    split_fingerprint,
+    vote_time_offsets,
+    vote_time_offsets_compact,
+)
+from src.utils.compact_audioprint import CompactAudioprint
+from src.utils.library_index import LibraryIndex
+from src.utils.memory_manager import MemoryBudget
+from src.utils.profiler import Profiler
+from src.utils.worldcup_index import WorldcupIndex
 from src.utils.formatter import TimeFormatter
 from src.utils.types import TimelineData
+from src.youtube_download.mapped_audio import MappedAudio
 
 
 class TimelineDetector:
@@ -16,6 +42,19 @@ class TimelineDetector:
 
     # 클래스 변수 정의
     BEST_SIMILARITY_THRESHOLD = 0.009
+    BATCH_WINDOWS = 8  # 윈도우 일괄 매칭에서 한 번에 매칭할 윈도우 수
+    # 노래 목록/역색인에서 윈도우 일괄 매칭 사용 여부
+    # (감지 후 건너뛸 윈도우도 일괄로 지문을 만들므로 노래가 많은 영상에서는 지문 생성이 늘어날 수 있어 기본값은 끔)
+    BATCH_MATCHING = False
+    GLOBAL_BLOCK_SECONDS = 30  # 전역 투표 방식에서 한 번에 지문을 만드는 블록 길이 (초)
+
+    @classmethod
+    def set_config(cls, batch_windows: int = None, batch_matching: bool = None):
+        """타임라인 감지 관련 설정"""
+        if batch_windows is not None:
+            cls.BATCH_WINDOWS = batch_windows
+        if batch_matching is not None:
+            cls.BATCH_MATCHING = batch_matching
 
     @dataclass
     class DetectionResult:
@@ -36,26 +75,49 @@ class TimelineDetector:
         )
         print("============================")
 
+    @staticmethod
+    def compute_song_similarity(audio_fingerprint: nb.typed.Dict, song_fingerprint):
+        """
+        노래 하나와의 유사도와 시간 오프셋을 계산합니다.
+        시간 오프셋 목록을 만들지 않고 공통 해시의 시간 범위로 정한 고정 크기 히스토그램에 투표하므로,
+        반복음이 많은 청크에서도 비교 하나의 메모리가 오프셋 수와 관계없이 일정합니다.
+        """
+        if isinstance(song_fingerprint, CompactAudioprint):
+            song_arrays = (
+                song_fingerprint.hashes,
+                song_fingerprint.offsets,
+                song_fingerprint.frames,
+                song_fingerprint.frame_duration,
+            )
+            with Profiler.stage("matched_time_range"):
+                time_range = matched_time_range_compact(audio_fingerprint, *song_arrays)
+            vote = lambda first_bin, n_bins: vote_time_offsets_compact(
+                audio_fingerprint, *song_arrays, first_bin, n_bins
+            )
+        else:
+            with Profiler.stage("matched_time_range"):
+                time_range = matched_time_range(audio_fingerprint, song_fingerprint)
+            vote = lambda first_bin, n_bins: vote_time_offsets(
+                audio_fingerprint, song_fingerprint, first_bin, n_bins
+            )
+
+        with Profiler.stage("vote_time_offsets"):
+            return compute_similarity_from_votes(
+                vote, time_range, len(audio_fingerprint), len(song_fingerprint)
+            )
+
     @classmethod
     def detect_best_match(
         cls,
         audio_fingerprint: nb.typed.Dict,
-        song_fingerprints: Dict[str, nb.typed.Dict],
+        song_fingerprints: Dict[str, CompactAudioprint],
     ) -> "TimelineDetector.DetectionResult":
-        """
-        노래 목록 중에서 가장 유사도가 높은 노래를 감지합니다.
-        """
+        """노래 목록 중에서 가장 유사도가 높은 노래를 감지합니다."""
         best_result = cls.DetectionResult(similarity=0.0, song_name="", offset=0.0)
 
         # 각 노래 지문을 순회하면서 지문 유사도 비교
         for name, song_fingerprint in song_fingerprints.items():
-            time_offsets = compute_time_offsets(audio_fingerprint, song_fingerprint)
-            numpy_offsets = np.array(time_offsets)
-
-            # 가장 많이 발생하는 시간 오프셋 찾기 (일치하는 부분이 있다면)
-            similarity, offset = compute_similarity(
-                numpy_offsets, len(audio_fingerprint), len(song_fingerprint)
-            )
+            similarity, offset = cls.compute_song_similarity(audio_fingerprint, song_fingerprint)
             print("\033[K", end="\r")
             print(f"{name}: {similarity}, {offset}", end="\r")
 
@@ -67,89 +129,517 @@ class TimelineDetector:
 
         return best_result
 
+    @classmethod
+    def detect_best_match_index(
+        cls,
+        audio_fingerprint: nb.typed.Dict,
+        index: WorldcupIndex,
+        max_offsets: int = 0,
+    ) -> "TimelineDetector.DetectionResult":
+        """
+        월드컵 역색인에서 가장 유사도가 높은 노래를 감지합니다.
+        max_offsets: 한 번에 만들 (노래, 시간 오프셋) 쌍 최대 개수 (0이면 제한 없음)
+        """
+        best_result = cls.DetectionResult(similarity=0.0, song_name="", offset=0.0)
+        if len(index) == 0:
+            return best_result
+
+        # 세그먼트별 해시별 (노래, 시간 오프셋) 쌍 수
+        key_counts = None
+        if max_offsets:
+            key_counts = [
+                count_key_offsets_index(audio_fingerprint, segment.hashes)
+                for segment in index.segments
+            ]
+            if sum(counts.sum() for counts in key_counts) <= max_offsets:
+                key_counts = None
+
+        if key_counts is None:
+            # 세그먼트별 (노래 ID, 시간 오프셋) 쌍 수집
+            song_ids, time_offsets = [], []
+            for segment in index.segments:
+                with Profiler.stage("compute_index_offsets"):
+                    segment_songs, segment_offsets = compute_index_offsets(
+                        audio_fingerprint,
+                        segment.hashes,
+                        segment.songs,
+                        segment.frames,
+                        index.frame_durations,
+                        index.live_songs,
+                    )
+                song_ids.append(segment_songs)
+                time_offsets.append(segment_offsets)
+
+            # 노래별 유사도 계산
+            with Profiler.stage("compute_index_similarities"):
+                similarities, offsets = compute_index_similarities(
+                    np.concatenate(song_ids),
+                    np.concatenate(time_offsets),
+                    len(audio_fingerprint),
+                    index.hash_counts,
+                )
+        else:
+            # 오프셋 버퍼 상한을 넘으면 지문을 나눠 (노래, 오프셋) 빈도수만 누적
+            counter = OffsetCounter()
+            for segment, segment_key_counts in zip(index.segments, key_counts):
+                for part in split_fingerprint(audio_fingerprint, segment_key_counts, max_offsets):
+                    with Profiler.stage("compute_index_offsets"):
+                        segment_songs, segment_offsets = compute_index_offsets(
+                            part,
+                            segment.hashes,
+                            segment.songs,
+                            segment.frames,
+                            index.frame_durations,
+                            index.live_songs,
+                        )
+                    with Profiler.stage("OffsetCounter.add"):
+                        counter.add(
+                            encode_song_offsets(segment_songs, scale_time_offsets(segment_offsets))
+                        )
+            similarities, offsets = compute_index_similarities_from_counts(
+                counter, len(audio_fingerprint), index.hash_counts
+            )
+
+        # 노래 테이블 순서로 최고 유사도 노래 선택
+        for song_id, song in index.songs.items():
+            if similarities[song_id] > best_result.similarity:
+                best_result.similarity = float(similarities[song_id])
+                best_result.song_name = song["name"]
+                best_result.offset = float(offsets[song_id])
+
+        return best_result
+
     @classmethod
     def detect_timeline(
         cls,
         audio_chunks: Generator[AudioChunk, Any, None],
-        song_fingerprints: Dict[str, nb.typed.Dict],
+        song_fingerprints: Union[Dict[str, CompactAudioprint], WorldcupIndex, LibraryIndex],
         hop_size: int,
         similarity_threshold: float = 0,
+        gate: AudioGate = None,
+        budget: MemoryBudget = None,
+        checkpoint: ScanCheckpoint = None,
     ) -> Generator[TimelineData, None, None]:
         """
         오디오 청크에서 노래를 감지하고 타임라인을 생성합니다.
+        gate가 주어지면 음악이 거의 없는 청크는 지문 생성과 매칭을 건너뜁니다.
+        budget이 주어지면 남은 메모리 예산에 맞춰 시간 오프셋 버퍼 크기를 제한합니다.
+        BATCH_MATCHING이 켜져 있고 budget이 없고 노래 지문이 압축 지문 목록 또는 역색인이면 윈도우 여러 개를 한 번에 매칭합니다.
+        라이브러리 역색인은 항상 윈도우 여러 개를 샤드별로 나누어 한 번에 매칭합니다.
+        checkpoint가 주어지면 기록된 건너뛰기 상태에서 시작하고 처리를 마친 청크 위치를 갱신합니다.
+        (audio_chunks는 체크포인트의 다음 청크부터 생성)
         """
-        skip_counts = 0
+        if isinstance(song_fingerprints, LibraryIndex) or (
+            cls.BATCH_MATCHING and budget is None and BatchMatcher.supports(song_fingerprints)
+        ):
+            yield from cls._detect_timeline_batched(
+                audio_chunks, song_fingerprints, hop_size, similarity_threshold, gate, checkpoint
+            )
+            return
+
+        skip_counts = checkpoint.state.skip_chunks if checkpoint is not None else 0
 
-        for chunk in audio_chunks:
+        chunk_index = -1
+        for chunk_index, chunk in enumerate(audio_chunks):
+            if checkpoint is not None:
+                checkpoint.update(chunk_index, skip_counts)
             if skip_counts > 0:
                 skip_counts -= 1
                 continue
 
+            # 무음/비음악 청크 건너뛰기
+            if gate is not None:
+                with Profiler.stage("audio_gate"):
+                    decision = gate.check(chunk)
+                if decision.skipped:
+                    print(f"비음악 구간 건너뜀 {decision.describe()}")
+                    continue
+
             # 현재 윈도우의 지문 생성
-            chunk_fingerprint = AudioprintGenerator.get_spectrogram_fingerprint(
-                chunk.audio, chunk.samplerate
+            with Profiler.stage("fingerprint"):
+                chunk_fingerprint = cls.chunk_fingerprint(chunk)
+
+            # 노래 목록 중 최고 유사도 노래 감지 (노래 목록은 고정 크기 히스토그램 투표라 오프셋 버퍼 상한 불필요)
+            with Profiler.stage("match"):
+                if isinstance(song_fingerprints, WorldcupIndex):
+                    max_offsets = budget.offset_buffer_limit() if budget is not None else 0
+                    detection = cls.detect_best_match_index(
+                        chunk_fingerprint, song_fingerprints, max_offsets
+                    )
+                else:
+                    detection = cls.detect_best_match(chunk_fingerprint, song_fingerprints)
+            timeline, skips = cls._accept_detection(
+                detection, chunk.start_time, hop_size, similarity_threshold
             )
+            skip_counts += skips
+            if timeline is not None:
+                yield timeline
+
+        if checkpoint is not None:
+            checkpoint.update(chunk_index + 1, skip_counts)
+
+    @classmethod
+    def _detect_timeline_batched(
+        cls,
+        audio_chunks: Generator[AudioChunk, Any, None],
+        song_fingerprints: Union[Dict[str, CompactAudioprint], WorldcupIndex, LibraryIndex],
+        hop_size: int,
+        similarity_threshold: float = 0,
+        gate: AudioGate = None,
+        checkpoint: ScanCheckpoint = None,
+    ) -> Generator[TimelineData, None, None]:
+        """
+        BATCH_WINDOWS개 윈도우 지문을 모아 (윈도우 × 노래) 행렬로 한 번에 매칭하고,
+        윈도우 순서대로 detect_timeline과 같은 건너뛰기/임계값 처리를 적용합니다.
+        (감지 후 건너뛸 윈도우가 이미 지문으로 만들어졌으면 결과만 버림)
+        """
+        if isinstance(song_fingerprints, LibraryIndex):
+            matcher = LibraryMatcher(song_fingerprints)
+        else:
+            matcher = BatchMatcher(song_fingerprints)
+        pending = []  # (청크 순서, 윈도우 시작 시간, 지문)
+        skip_until = -1  # 이 청크 순서까지 건너뜀
+        if checkpoint is not None:
+            skip_until = checkpoint.state.skip_chunks - 1
+
+        def flush():
+            nonlocal skip_until
+            with Profiler.stage("match"):
+                matrix = matcher.match([fingerprint for _, _, fingerprint in pending])
+            margins = matrix.margins()
+            for row, (chunk_index, start_time, _) in enumerate(pending):
+                if chunk_index <= skip_until:
+                    continue
+                detection = cls.DetectionResult(*matrix.best(row))
+                if len(matrix.names) > 1 and detection.similarity > 0:
+                    runner_up = matrix.top_k(row, 2)[1]
+                    print(f"2위: {runner_up[1]} ({runner_up[0]:.4f}), 차이: {margins[row]:.4f}")
+                timeline, skips = cls._accept_detection(
+                    detection, start_time, hop_size, similarity_threshold
+                )
+                skip_until = max(skip_until, chunk_index + skips)
+                if timeline is not None:
+                    yield timeline
+            pending.clear()
+
+        chunk_index = -1
+        try:
+            for chunk_index, chunk in enumerate(audio_chunks):
+                # 대기 중인 윈도우가 없으면 이전 청크까지 처리 완료
+                if checkpoint is not None and not pending:
+                    checkpoint.update(chunk_index, max(0, skip_until - chunk_index + 1))
+                if chunk_index <= skip_until:
+                    continue
+
+                # 무음/비음악 청크 건너뛰기
+                if gate is not None:
+                    with Profiler.stage("audio_gate"):
+                        decision = gate.check(chunk)
+                    if decision.skipped:
+                        print(f"비음악 구간 건너뜀 {decision.describe()}")
+                        continue
+
+                with Profiler.stage("fingerprint"):
+                    fingerprint = cls.chunk_fingerprint(chunk)
+                pending.append((chunk_index, chunk.start_time, fingerprint))
+                if len(pending) >= cls.BATCH_WINDOWS:
+                    yield from flush()
+                    if checkpoint is not None:
+                        checkpoint.update(chunk_index + 1, max(0, skip_until - chunk_index))
+
+            if pending:
+                yield from flush()
+            if checkpoint is not None:
+                checkpoint.update(chunk_index + 1, max(0, skip_until - chunk_index))
+        finally:
+            if isinstance(matcher, LibraryMatcher):
+                matcher.close()
+
+    @staticmethod
+    def chunk_fingerprint(chunk: AudioChunk) -> nb.typed.Dict:
+        """청크의 윈도우 지문 (녹화 재생처럼 미리 만든 지문이 있으면 그대로 사용)"""
+        if chunk.fingerprint is not None:
+            return chunk.fingerprint
+        return AudioprintGenerator.get_spectrogram_fingerprint(chunk.audio, chunk.samplerate)
+
+    @classmethod
+    def _accept_detection(
+        cls,
+        detection: "TimelineDetector.DetectionResult",
+        window_start_time: float,
+        hop_size: int,
+        similarity_threshold: float,
+    ):
+        """윈도우 감지 결과를 타임라인으로 변환하고 (타임라인 또는 None, 건너뛸 윈도우 수)를 반환합니다."""
+        print(f"유사도: {detection.similarity:.4f}, {detection.offset} ({detection.song_name})")
+
+        # 예상 시작 시간 계산
+        audio_start_time = window_start_time - detection.offset
+        if audio_start_time < 0:
+            return None, 0
+
+        # 유사도가 임계값을 넘는 경우만 결과에 추가
+        if detection.similarity < similarity_threshold:
+            return None, 0
 
-            # 노래 목록 중 최고 유사도 노래 감지
-            detection = cls.detect_best_match(chunk_fingerprint, song_fingerprints)
-            print(
-                f"유사도: {detection.similarity:.4f}, {detection.offset} ({detection.song_name})"
+        # 유사도 0.01 넘을 시 다음 90초의 청크는 무시
+        skips = 0
+        if detection.similarity > cls.BEST_SIMILARITY_THRESHOLD:
+            cls.print_detection_result(
+                detection.song_name, detection.similarity, audio_start_time
             )
+            skips = 90 // hop_size
 
-            # 예상 시작 시간 계산
-            audio_start_time = chunk.start_time - detection.offset
-            if audio_start_time < 0:
-                continue
+        timeline = TimelineData(
+            name=detection.song_name,
+            similarity=detection.similarity,
+            start_time=round(audio_start_time),
+        )
+        return timeline, skips
+
+    @classmethod
+    def fingerprint_block(
+        cls,
+        audio_data,
+        sample_rate: int,
+        block_index: int,
+        start_frame: int,
+        end_frame: int,
+        buffer_start_sample: int = 0,
+    ) -> StreamBlock:
+        """
+        스트림 프레임 [start_frame, end_frame) 구간의 블록 지문 생성
+        audio_data가 스트림 전체가 아니라 buffer_start_sample부터의 일부 버퍼여도 됩니다.
+        """
+        hop = AudioprintGenerator.hop_size
+        start_sample = start_frame * hop - buffer_start_sample
+        end_sample = min(
+            (end_frame - 1) * hop + AudioprintGenerator.frame_size - buffer_start_sample,
+            len(audio_data),
+        )
+        block_audio = np.asarray(audio_data[start_sample:end_sample], dtype=np.float32)
+
+        hashes, times = AudioprintGenerator.get_spectrogram_hashes(
+            block_audio, sample_rate, full_frames=True
+        )
+        frames = np.round(np.asarray(times, dtype=np.float64) * sample_rate / hop).astype(np.int64)
+        return StreamBlock.from_hash_arrays(block_index, hashes, frames + start_frame)
+
+    @classmethod
+    def detect_timeline_incremental(
+        cls,
+        audio_data,
+        duration: int,
+        sample_rate: int,
+        song_fingerprints: Union[Dict[str, CompactAudioprint], WorldcupIndex],
+        chunk_size: int,
+        hop_size: int,
+        similarity_threshold: float = 0,
+        gate: AudioGate = None,
+        budget: MemoryBudget = None,
+    ) -> Generator[TimelineData, None, None]:
+        """
+        홉 크기 블록별로 한 번만 지문을 만들고 StreamMatcher의 투표 상태를 갱신하며 타임라인을 생성합니다.
+        윈도우는 시작 시간 이후에 시작하는 chunk_size / hop_size개 블록의 프레임이며,
+        건너뛰기/게이트/임계값 처리는 detect_timeline과 같습니다.
+        """
+        if chunk_size % hop_size:
+            raise ValueError(f"청크 크기({chunk_size})가 홉 크기({hop_size})의 배수여야 합니다.")
+
+        hop = AudioprintGenerator.hop_size
+        blocks_per_window = chunk_size // hop_size
+
+        def block_start_frame(block: int) -> int:
+            """블록 시작 시간 이후 첫 프레임 (올림)"""
+            return -(-block * hop_size * sample_rate // hop)
+
+        total_frames = max((len(audio_data) - AudioprintGenerator.frame_size) // hop + 1, 0)
+
+        matcher = StreamMatcher(
+            song_fingerprints,
+            hop,
+            sample_rate,
+            block_start_frame(blocks_per_window) + 1,
+        )
 
-            # 유사도가 임계값을 넘는 경우만 결과에 추가
-            if detection.similarity < similarity_threshold:
+        window_positions = np.arange(0, duration - chunk_size + 1, hop_size)
+        skip_counts = 0
+        for idx, window_pos in enumerate(window_positions):
+            window_pos = int(window_pos)
+            print(f"윈도우: {idx + 1}/{len(window_positions)} ({(idx + 1) / len(window_positions) * 100:.1f}%)")
+            if skip_counts > 0:
+                skip_counts -= 1
                 continue
 
-            # 유사도 0.01 넘을 시 다음 90초의 청크는 무시
-            if detection.similarity > cls.BEST_SIMILARITY_THRESHOLD:
-                cls.print_detection_result(
-                    detection.song_name, detection.similarity, audio_start_time
+            first_block = window_pos // hop_size
+            start_sample = window_pos * sample_rate
+            end_sample = (window_pos + chunk_size) * sample_rate
+            if isinstance(audio_data, MappedAudio):
+                audio_data.release(start_sample)
+            if budget is not None:
+                budget.wait_for_headroom(chunk_size * sample_rate * 4)
+
+            # 무음/비음악 윈도우 건너뛰기 (블록 지문은 필요할 때만 생성)
+            if gate is not None:
+                chunk = AudioChunk(
+                    audio_data[start_sample:end_sample], window_pos, window_pos + chunk_size, sample_rate
                 )
-                skip_counts += 90 // hop_size
-
-            # 값 저장
-            timeline = {
-                "song_name": detection.song_name,
-                "similarity": detection.similarity,
-                "start_time": round(audio_start_time),
-            }
-            yield TimelineData(
-                name=detection.song_name,
-                similarity=detection.similarity,
-                start_time=round(audio_start_time),
+                with Profiler.stage("audio_gate"):
+                    decision = gate.check(chunk)
+                del chunk
+                if decision.skipped:
+                    print(f"비음악 구간 건너뜀 {decision.describe()}")
+                    continue
+
+            # 윈도우에서 나간 블록의 투표 제거, 새로 들어온 블록만 지문 생성 후 투표 추가
+            while matcher.blocks and matcher.blocks[0].index < first_block:
+                matcher.pop()
+            next_block = matcher.blocks[-1].index + 1 if matcher.blocks else first_block
+            for block in range(next_block, first_block + blocks_per_window):
+                start_frame = block_start_frame(block)
+                end_frame = min(block_start_frame(block + 1), total_frames)
+                with Profiler.stage("fingerprint"):
+                    stream_block = cls.fingerprint_block(
+                        audio_data, sample_rate, block, start_frame, end_frame
+                    )
+                with Profiler.stage("match"):
+                    matcher.push(stream_block)
+
+            window_start_frame = block_start_frame(first_block)
+            window_frames = block_start_frame(first_block + blocks_per_window) - window_start_frame
+            with Profiler.stage("match"):
+                similarity, song_name, offset = matcher.best_match(window_start_frame, window_frames)
+            detection = cls.DetectionResult(similarity, song_name, offset)
+
+            timeline, skips = cls._accept_detection(
+                detection, window_start_frame * hop / sample_rate, hop_size, similarity_threshold
             )
+            skip_counts += skips
+            if timeline is not None:
+                yield timeline
+
+    @classmethod
+    def detect_timeline_global(
+        cls,
+        audio_data,
+        duration: int,
+        sample_rate: int,
+        song_fingerprints: Union[Dict[str, CompactAudioprint], WorldcupIndex],
+        similarity_threshold: float = 0,
+        gate: AudioGate = None,
+        budget: MemoryBudget = None,
+    ) -> List[TimelineData]:
+        """
+        윈도우 없이 영상 전체를 블록 순서대로 한 번만 지문 생성/매칭하여 (노래, 시작 프레임) 공간에 투표하고,
+        노래별 투표 피크로 타임라인을 생성합니다. (analyze_timeline까지 마친 결과와 같은 형태)
+        gate가 주어지면 음악이 거의 없는 블록은 지문 생성과 매칭을 건너뜁니다.
+        """
+        hop = AudioprintGenerator.hop_size
+        block_seconds = cls.GLOBAL_BLOCK_SECONDS
+
+        def block_start_frame(block: int) -> int:
+            """블록 시작 시간 이후 첫 프레임 (올림)"""
+            return -(-block * block_seconds * sample_rate // hop)
+
+        total_frames = max((len(audio_data) - AudioprintGenerator.frame_size) // hop + 1, 0)
+        block_count = -(-duration // block_seconds)
+        voter = GlobalVoter(
+            song_fingerprints,
+            hop,
+            sample_rate,
+            block_start_frame(1) + 1,
+            similarity_threshold,
+        )
+
+        for block in range(block_count):
+            print(f"블록: {block + 1}/{block_count} ({(block + 1) / block_count * 100:.1f}%)")
+            start_frame = block_start_frame(block)
+            end_frame = min(block_start_frame(block + 1), total_frames)
+            if start_frame >= end_frame:
+                break
+
+            start_sample = block * block_seconds * sample_rate
+            end_sample = (block + 1) * block_seconds * sample_rate
+            if isinstance(audio_data, MappedAudio):
+                audio_data.release(start_sample)
+            if budget is not None:
+                budget.wait_for_headroom(block_seconds * sample_rate * 4)
+
+            # 무음/비음악 블록 건너뛰기
+            skipped = False
+            if gate is not None:
+                chunk = AudioChunk(
+                    audio_data[start_sample:end_sample],
+                    block * block_seconds,
+                    (block + 1) * block_seconds,
+                    sample_rate,
+                )
+                with Profiler.stage("audio_gate"):
+                    decision = gate.check(chunk)
+                del chunk
+                skipped = decision.skipped
+                if skipped:
+                    print(f"비음악 구간 건너뜀 {decision.describe()}")
+
+            if not skipped:
+                with Profiler.stage("fingerprint"):
+                    stream_block = cls.fingerprint_block(
+                        audio_data, sample_rate, block, start_frame, end_frame
+                    )
+                with Profiler.stage("match"):
+                    voter.add(stream_block)
+
+            # 더 이상 투표가 들어올 수 없는 시작 프레임의 후보 피크 추출
+            voter.finalize(end_frame)
+
+        voter.finalize(total_frames + voter.max_song_frame + 1)
+        timelines = voter.timelines()
+        for timeline in timelines:
+            if timeline.similarity > cls.BEST_SIMILARITY_THRESHOLD:
+                cls.print_detection_result(timeline.name, timeline.similarity, timeline.start_time)
+        return timelines
 
     @classmethod
     def analyze_timeline(
-        cls, timeline_chunks: Generator[TimelineData, None, None]
+        cls,
+        timeline_chunks: Generator[TimelineData, None, None],
+        checkpoint: ScanCheckpoint = None,
     ) -> List[TimelineData]:
-        """정확한 타임라인을 솎아내고 시간순으로 정렬합니다."""
+        """
+        정확한 타임라인을 솎아내고 시간순으로 정렬합니다.
+        checkpoint가 주어지면 기록된 노래별 최고 타임라인에서 시작하고 바뀔 때마다 체크포인트에 반영합니다.
+        """
         best_timelines: Dict[str, TimelineData] = (
             {}
         )  # 각 노래별 최고 유사도의 타임라인만 저장한 변수
+        if checkpoint is not None:
+            best_timelines = {t.name: t for t in checkpoint.state.timelines}
         for timeline in timeline_chunks:
-            best_timeline = best_timelines.get(timeline.name, None)
-
-            # 처음 감지한 노래라면 타임라인 추가
-            if not best_timeline:
-                best_timelines[timeline.name] = timeline
-                continue
-
-            # 이미 타임라인이 유사도가 충분히 높으면 스킵
-            if best_timeline.similarity > cls.BEST_SIMILARITY_THRESHOLD:
-                continue
-
-            # 해당 타임라인의 유사도가 현재 타임라인보다 높으면 업데이트
-            if timeline.similarity > best_timeline.similarity:
-                best_timelines[timeline.name] = timeline
+            cls._keep_best_timeline(best_timelines, timeline)
+            # 다음 청크를 처리하기 전에 반영해야 체크포인트 위치와 타임라인이 맞음
+            if checkpoint is not None:
+                checkpoint.set_timelines(best_timelines.values())
 
         # 리스트로 시간순 정렬하여 반환
         # .sort(key=lambda x: x.start_time)
         result = [t for t in best_timelines.values()]
         result.sort(key=lambda x: x.start_time)
         return result
+
+    @classmethod
+    def _keep_best_timeline(cls, best_timelines: Dict[str, TimelineData], timeline: TimelineData):
+        """노래별 최고 유사도 타임라인 갱신"""
+        best_timeline = best_timelines.get(timeline.name, None)
+
+        # 처음 감지한 노래라면 타임라인 추가
+        if not best_timeline:
+            best_timelines[timeline.name] = timeline
+            return
+
+        # 이미 타임라인이 유사도가 충분히 높으면 스킵
+        if best_timeline.similarity > cls.BEST_SIMILARITY_THRESHOLD:
+            return
+
+        # 해당 타임라인의 유사도가 현재 타임라인보다 높으면 업데이트
+        if timeline.similarity > best_timeline.similarity:
+            best_timelines[timeline.name] = timeline
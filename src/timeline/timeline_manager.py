@@ -18,6 +18,36 @@ def print_timelines(timelines: List[TimelineData], start_offset, if_data=False):
             print(f"{timeline.name} {time_str}")
 
 
+def split_worldcup_timelines(
+    timelines: List[TimelineData], worldcup_songs: Dict[str, Dict[str, str]]
+) -> Dict[str, List[TimelineData]]:
+    """여러 월드컵을 합쳐 감지한 타임라인을 월드컵별 노래 이름의 타임라인으로 나눕니다."""
+    return {
+        worldcup: [
+            TimelineData(songs[t.name], t.similarity, t.start_time) for t in timelines if t.name in songs
+        ]
+        for worldcup, songs in worldcup_songs.items()
+    }
+
+
+def print_worldcup_coverage(
+    worldcup_timelines: Dict[str, List[TimelineData]], worldcup_songs: Dict[str, Dict[str, str]]
+):
+    """월드컵별 감지한 노래 비율(커버리지)과 평균 유사도를 커버리지 순으로 출력합니다."""
+    print("-" * 80)
+    print("월드컵별 커버리지 (감지한 노래 수 / 월드컵 노래 수)")
+    scores = []
+    for worldcup, timelines in worldcup_timelines.items():
+        coverage = len(timelines) / len(worldcup_songs[worldcup])
+        similarity = sum(t.similarity for t in timelines) / len(timelines) if timelines else 0.0
+        scores.append((coverage, similarity, worldcup, len(timelines)))
+    for coverage, similarity, worldcup, detected in sorted(scores, reverse=True):
+        print(
+            f"{worldcup}: {detected}/{len(worldcup_songs[worldcup])}곡 ({coverage:.1%}), "
+            f"평균 유사도 {similarity:.3f}"
+        )
+
+
 def print_not_detected(audioprints: list, timelines: List[TimelineData]):
     # 타인라인 탐지한 오디오 이름 리스트
     detected_audios = [t.name for t in timelines]
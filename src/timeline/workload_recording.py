@@ -0,0 +1,226 @@
+"""
+매칭 작업 녹화/재생 모듈
+타임라인 감지에 쓰인 윈도우 지문(게이트 판정 포함)과 노래 지문 스냅샷을 디렉토리에 바이너리로 저장하고,
+오디오 없이 같은 윈도우를 다시 만들어 매칭 엔진을 실제 해시 분포로 오프라인 측정할 수 있게 합니다.
+
+디렉토리 구성:
+    recording.json: 설정, 윈도우 표(시작/끝 시간, 해시 수, 시간 수, 게이트 판정), 노래 목록, 감지 결과
+    keys.u32 / counts.i32 / times.f32: 윈도우 순서대로 이어 붙인 해시, 해시별 시간 수, 시간 (리틀 엔디언)
+    index/ (월드컵 역색인 스냅샷) 또는 songs/ (노래별 압축 지문)
+"""
+
+from dataclasses import asdict
+import json
+from pathlib import Path
+import shutil
+from typing import Dict, Generator, List, Union
+
+import numba as nb
+import numpy as np
+from numba import typed, types
+
+from src.audioprint.audioprint_generator import AudioprintGenerator
+from src.timeline.audio_gate import AudioGate, GateDecision, GateMetrics
+from src.timeline.batch_matcher import pack_windows
+from src.timeline.read_audio import AudioChunk
+from src.utils.compact_audioprint import CompactAudioprint
+from src.utils.types import TimelineData
+from src.utils.worldcup_index import WorldcupIndex
+
+RECORDING_FILE = "recording.json"
+SONGS_DIR = "songs"
+COLUMNS = {"keys": ("keys.u32", "<u4"), "counts": ("counts.i32", "<i4"), "times": ("times.f32", "<f4")}
+
+
+@nb.njit(cache=True)
+def unpack_window(keys, counts, times, key_start, key_end, time_start):
+    """이어 붙인 해시/시간 배열의 한 윈도우를 지문(nb.typed.Dict)으로 복원 (녹화한 해시 순서 유지)"""
+    window = typed.Dict.empty(key_type=types.int32, value_type=types.float32[:])
+    t = time_start
+    for k in range(key_start, key_end):
+        n = counts[k]
+        window[np.int32(keys[k])] = times[t : t + n].copy()
+        t += n
+    return window
+
+
+class RecordedGate:
+    """녹화한 게이트 판정을 그대로 돌려주는 게이트 (AudioGate.check와 같은 인터페이스)"""
+
+    def __init__(self, decisions: Dict[float, GateDecision] = None):
+        self.decisions = decisions if decisions is not None else {}
+        self.metrics = GateMetrics()
+
+    def check(self, chunk: AudioChunk) -> GateDecision:
+        decision = self.decisions[chunk.start_time]
+        self.metrics.decisions.append(decision)
+        return decision
+
+
+class WorkloadRecorder:
+    """타임라인 감지 중 윈도우 지문과 노래 지문 스냅샷을 녹화"""
+
+    def __init__(
+        self,
+        recording_path: Path,
+        song_fingerprints: Union[Dict[str, CompactAudioprint], WorldcupIndex],
+        settings: dict,
+    ):
+        self.recording_path = Path(recording_path)
+        shutil.rmtree(self.recording_path, ignore_errors=True)
+        self.recording_path.mkdir(parents=True)
+
+        self.settings = settings
+        self.windows: List[dict] = []
+        self.gate = None  # 녹화 중 감지에 넘길 게이트 (record 호출 시 설정)
+        self.songs = self._save_songs(song_fingerprints)
+        self._files = {
+            column: open(self.recording_path / file_name, "wb")
+            for column, (file_name, _) in COLUMNS.items()
+        }
+
+    def _save_songs(self, song_fingerprints) -> dict:
+        """노래 지문 스냅샷 저장 (역색인은 현재 세대, 노래 목록은 노래별 압축 지문)"""
+        if isinstance(song_fingerprints, WorldcupIndex):
+            song_fingerprints.copy_snapshot(self.recording_path)
+            return {"format": "index", "names": song_fingerprints.keys()}
+
+        songs_path = self.recording_path / SONGS_DIR
+        songs_path.mkdir()
+        names = list(song_fingerprints)
+        for song_id, name in enumerate(names):
+            song_fingerprints[name].save(songs_path / f"{song_id:06d}.npz")
+        return {"format": "audioprints", "names": names}
+
+    def _write_window(self, chunk: AudioChunk, fingerprint, decision: GateDecision):
+        entry = {
+            "start_time": chunk.start_time,
+            "end_time": chunk.end_time,
+            "samplerate": chunk.samplerate,
+            "keys": 0,
+            "times": 0,
+            "gate": asdict(decision) if decision is not None else None,
+        }
+        if fingerprint is not None:
+            keys, key_starts, times, _ = pack_windows(typed.List([fingerprint]))
+            self._files["keys"].write(keys.astype("<u4").tobytes())
+            self._files["counts"].write(np.diff(key_starts).astype("<i4").tobytes())
+            self._files["times"].write(times.astype("<f4").tobytes())
+            entry["keys"] = len(keys)
+            entry["times"] = len(times)
+        self.windows.append(entry)
+
+    def record(
+        self, audio_chunks: Generator[AudioChunk, None, None], gate: AudioGate = None
+    ) -> Generator[AudioChunk, None, None]:
+        """
+        청크마다 게이트 판정과 지문 생성을 여기서 한 번 하고 녹화한 뒤 지문을 붙여 넘깁니다.
+        감지 후 건너뛸 윈도우도 재생 시 건너뛰기 규칙을 바꿔 볼 수 있도록 지문을 만들어 녹화합니다.
+        (감지에는 self.gate를 넘겨 같은 게이트 판정 사용)
+        """
+        self.gate = RecordedGate() if gate is not None else None
+        for chunk in audio_chunks:
+            decision = gate.check(chunk) if gate is not None else None
+            fingerprint = None
+            if decision is None or not decision.skipped:
+                fingerprint = AudioprintGenerator.get_spectrogram_fingerprint(
+                    chunk.audio, chunk.samplerate
+                )
+            self._write_window(chunk, fingerprint, decision)
+            if decision is not None:
+                self.gate.decisions[chunk.start_time] = decision
+            yield AudioChunk(
+                chunk.audio, chunk.start_time, chunk.end_time, chunk.samplerate, fingerprint
+            )
+
+    def finish(self, timelines: List[TimelineData]):
+        """바이너리 파일을 닫고 윈도우 표와 감지 결과를 기록"""
+        for f in self._files.values():
+            f.close()
+        recording = {
+            **self.settings,
+            "songs": self.songs,
+            "windows": self.windows,
+            "timelines": [asdict(timeline) for timeline in timelines],
+        }
+        with open(self.recording_path / RECORDING_FILE, "w", encoding="utf-8") as f:
+            json.dump(recording, f, ensure_ascii=False, indent=2)
+
+
+class WorkloadRecording:
+    """녹화한 매칭 작업 (윈도우 지문은 메모리 매핑하여 필요할 때 하나씩 복원)"""
+
+    def __init__(self, recording_path: Path):
+        self.recording_path = Path(recording_path)
+        with open(self.recording_path / RECORDING_FILE, "r", encoding="utf-8") as f:
+            self.info = json.load(f)
+        self.windows = self.info["windows"]
+        self.timelines = [TimelineData(**timeline) for timeline in self.info["timelines"]]
+
+        self._columns = {}
+        for column, (file_name, dtype) in COLUMNS.items():
+            file_path = self.recording_path / file_name
+            if file_path.stat().st_size:
+                self._columns[column] = np.memmap(file_path, dtype=dtype, mode="r")
+            else:
+                self._columns[column] = np.empty(0, dtype=dtype)
+
+        key_counts = np.array([window["keys"] for window in self.windows], dtype=np.int64)
+        time_counts = np.array([window["times"] for window in self.windows], dtype=np.int64)
+        self.key_starts = np.concatenate(([0], np.cumsum(key_counts)))
+        self.time_starts = np.concatenate(([0], np.cumsum(time_counts)))
+
+    def __len__(self):
+        return len(self.windows)
+
+    @property
+    def postings(self) -> int:
+        """녹화한 윈도우 지문의 (해시, 시간) 수 합"""
+        return int(self.time_starts[-1])
+
+    def load_songs(self) -> Union[Dict[str, CompactAudioprint], WorldcupIndex]:
+        """녹화 시점의 노래 지문 (역색인 스냅샷 또는 노래 목록)"""
+        songs = self.info["songs"]
+        if songs["format"] == "index":
+            return WorldcupIndex.open(self.recording_path)
+        songs_path = self.recording_path / SONGS_DIR
+        return {
+            name: CompactAudioprint.load(songs_path / f"{song_id:06d}.npz")
+            for song_id, name in enumerate(songs["names"])
+        }
+
+    def is_gated(self, index: int) -> bool:
+        gate = self.windows[index]["gate"]
+        return gate is not None and gate["skipped"]
+
+    def fingerprint(self, index: int) -> nb.typed.Dict:
+        """index번째 윈도우 지문 (게이트에서 건너뛴 윈도우는 None)"""
+        if self.is_gated(index):
+            return None
+        return unpack_window(
+            self._columns["keys"],
+            self._columns["counts"],
+            self._columns["times"],
+            self.key_starts[index],
+            self.key_starts[index + 1],
+            self.time_starts[index],
+        )
+
+    def chunks(self) -> Generator[AudioChunk, None, None]:
+        """녹화한 윈도우를 지문이 붙은 청크로 생성 (오디오 없음)"""
+        for index, window in enumerate(self.windows):
+            yield AudioChunk(
+                None,
+                window["start_time"],
+                window["end_time"],
+                window["samplerate"],
+                self.fingerprint(index),
+            )
+
+    def gate(self) -> RecordedGate:
+        """녹화한 게이트 판정 (녹화할 때 게이트를 쓰지 않았으면 None)"""
+        if all(window["gate"] is None for window in self.windows):
+            return None
+        return RecordedGate(
+            {window["start_time"]: GateDecision(**window["gate"]) for window in self.windows}
+        )
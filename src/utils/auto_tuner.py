@@ -0,0 +1,232 @@
+"""
+호스트 성능 자동 조정 모듈
+합성 노래/스트림으로 짧은 보정 작업을 실행하여 이 호스트에 맞는 numba 스레드 수, 작업 프로세스 수,
+일괄 매칭 윈도우 수, 타임라인 청크/홉 크기를 고르고 HostProfile로 반환
+"""
+
+import contextlib
+import io
+import os
+import socket
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+import numba as nb
+
+from src.utils.host_profile import HostProfile
+
+TOLERANCE = 0.1  # 최고 기록과 이 비율 안의 차이면 더 작은 후보 선택 (자원 사용/지연 절약)
+REPEATS = 3  # 후보별 반복 측정 횟수 (최소 시간 사용)
+CALIBRATION_SONGS = 4  # 보정용 합성 노래 수
+WINDOW_SECONDS = 30  # 매칭 보정용 윈도우 크기 (초)
+WINDOW_HOP = 5  # 매칭 보정용 윈도우 홉 (초, 병렬 커널에 충분한 윈도우 수를 만들기 위해 작게)
+BATCH_CANDIDATES = (8, 16, 32, 64)
+# 청크/홉 후보 (잘게 나눌수록 시작 시간 해상도가 좋으므로 앞에서부터 목표 속도를 만족하는 첫 후보 선택)
+CHUNK_CANDIDATES = ((30, 20), (45, 30), (60, 30))
+TARGET_SPEED = 30.0  # 청크/홉 선택 목표 처리 속도 (실시간 대비 배속)
+
+
+def candidate_counts(maximum: int) -> List[int]:
+    """1, 2, 4, ... maximum 후보 목록"""
+    counts, count = [], 1
+    while count < maximum:
+        counts.append(count)
+        count *= 2
+    return counts + [maximum]
+
+
+def measure(func: Callable) -> float:
+    """REPEATS번 실행한 최소 시간 (초)"""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def pick_fastest(seconds: Dict[int, float]) -> int:
+    """최고 기록과 TOLERANCE 안의 차이인 가장 작은 후보"""
+    best = min(seconds.values())
+    return min(key for key, value in seconds.items() if value <= best * (1 + TOLERANCE))
+
+
+def calibrate_threads(matcher, windows: Sequence) -> Dict[int, float]:
+    """numba 스레드 수별 윈도우 일괄 매칭 시간"""
+    seconds = {}
+    for threads in candidate_counts(nb.config.NUMBA_NUM_THREADS):
+        nb.set_num_threads(threads)
+        seconds[threads] = measure(lambda: matcher.match(windows))
+    return seconds
+
+
+def calibrate_batch_windows(matcher, windows: Sequence) -> Dict[int, float]:
+    """한 번에 매칭할 윈도우 수별 윈도우당 매칭 시간 (ms)"""
+    seconds = {}
+    for batch in BATCH_CANDIDATES:
+        if batch > len(windows):
+            break
+
+        def match_batches():
+            for start in range(0, len(windows) - batch + 1, batch):
+                matcher.match(windows[start : start + batch])
+
+        per_window = measure(match_batches) / (len(windows) // batch * batch)
+        seconds[batch] = per_window * 1000
+    return seconds
+
+
+def calibrate_process_workers(songs: dict, windows: Sequence, max_workers: int) -> Dict[int, float]:
+    """작업 프로세스 수별 라이브러리 샤드 분산 매칭 시간 (프로세스 시작 비용 제외)"""
+    from src.timeline.library_matcher import LibraryMatcher
+    from src.utils.library_index import LibraryIndex, LibrarySong
+
+    seconds = {}
+    original = LibraryMatcher.workers
+    with tempfile.TemporaryDirectory() as temp_dir:
+        library = LibraryIndex.build(
+            Path(temp_dir),
+            [LibrarySong(name, ["tune"], lambda song=song: song) for name, song in songs.items()],
+            shard_count=max_workers,
+        )
+        try:
+            for workers in candidate_counts(max_workers):
+                LibraryMatcher.set_config(workers=workers)
+                with LibraryMatcher(library) as matcher:
+                    matcher.match(windows[:1])
+                    seconds[workers] = measure(lambda: matcher.match(windows))
+        finally:
+            LibraryMatcher.workers = original
+    return seconds
+
+
+def calibrate_chunks(songs: dict, stream, sample_rate: int) -> Dict[str, float]:
+    """청크/홉 후보별 타임라인 감지 처리 속도 (실시간 대비 배속, 지문 생성 포함)"""
+    from src.timeline.read_audio import read_audio
+    from src.timeline.timeline_detector import TimelineDetector
+
+    duration = len(stream) // sample_rate
+    speeds = {}
+    for chunk_size, hop_size in CHUNK_CANDIDATES:
+
+        def detect():
+            chunks = read_audio(stream, duration, sample_rate, chunk_size, hop_size)
+            list(TimelineDetector.detect_timeline(chunks, songs, hop_size))
+
+        speeds[f"{chunk_size}/{hop_size}"] = duration / measure(detect)
+    return speeds
+
+
+def pick_chunk(speeds: Dict[str, float]) -> tuple:
+    """목표 속도를 만족하는 가장 잘게 나눈 청크/홉 (없으면 가장 빠른 후보)"""
+    for key, speed in speeds.items():
+        if speed >= TARGET_SPEED:
+            break
+    else:
+        key = max(speeds, key=speeds.get)
+    chunk_size, hop_size = key.split("/")
+    return int(chunk_size), int(hop_size)
+
+
+def run_calibration(process_workers: bool = True) -> HostProfile:
+    """
+    보정 작업을 차례로 실행하여 호스트 프로필 생성
+    process_workers가 False면 작업 프로세스 수 측정을 건너뛰고 CPU 수를 사용합니다.
+    """
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.benchmark.peak_picker import CLIP_SECONDS, SAMPLE_RATE, build_dataset
+    from src.timeline.batch_matcher import BatchMatcher
+    from src.timeline.read_audio import read_audio
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.utils.compact_audioprint import CompactAudioprint
+    from src.utils.kernel_warmup import warmup_kernels
+
+    cpu_count = os.cpu_count() or 1
+    original_threads = nb.get_num_threads()
+    print(f"CPU {cpu_count}개, numba 최대 스레드 {nb.config.NUMBA_NUM_THREADS}개")
+
+    print("보정 데이터 준비 중...")
+    warmup_kernels()
+    with contextlib.redirect_stdout(io.StringIO()):
+        song_audios, stream, _ = build_dataset(CALIBRATION_SONGS)
+        frame_duration = AudioprintGenerator.hop_size / SAMPLE_RATE
+        songs = {}
+        for i, song in enumerate(song_audios):
+            hashes, times = AudioprintGenerator.get_spectrogram_hashes(
+                song[: SAMPLE_RATE * CLIP_SECONDS], SAMPLE_RATE
+            )
+            songs[f"song{i}"] = CompactAudioprint.from_hash_arrays(hashes, times, frame_duration)
+        windows = [
+            TimelineDetector.chunk_fingerprint(chunk)
+            for chunk in read_audio(
+                stream, len(stream) // SAMPLE_RATE, SAMPLE_RATE, WINDOW_SECONDS, WINDOW_HOP
+            )
+        ]
+    matcher = BatchMatcher(songs)
+    measurements = {}
+
+    try:
+        print(f"numba 스레드 수 측정 중... (윈도우 {len(windows)}개 일괄 매칭)")
+        measurements["numba_threads"] = calibrate_threads(matcher, windows)
+        numba_threads = pick_fastest(measurements["numba_threads"])
+        nb.set_num_threads(numba_threads)
+
+        print("일괄 매칭 윈도우 수 측정 중...")
+        measurements["batch_windows"] = calibrate_batch_windows(matcher, windows)
+        batch_windows = pick_fastest(measurements["batch_windows"])
+
+        workers = cpu_count
+        if process_workers and cpu_count > 1:
+            print("작업 프로세스 수 측정 중...")
+            with contextlib.redirect_stdout(io.StringIO()):
+                measurements["process_workers"] = calibrate_process_workers(songs, windows, cpu_count)
+            workers = pick_fastest(measurements["process_workers"])
+
+        print("청크/홉 크기별 처리 속도 측정 중...")
+        original_batch = TimelineDetector.BATCH_WINDOWS
+        TimelineDetector.set_config(batch_windows=batch_windows)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                measurements["chunk_speed"] = calibrate_chunks(songs, stream, SAMPLE_RATE)
+        finally:
+            TimelineDetector.set_config(batch_windows=original_batch)
+        chunk_size, hop_size = pick_chunk(measurements["chunk_speed"])
+    finally:
+        nb.set_num_threads(original_threads)
+
+    return HostProfile(
+        socket.gethostname(),
+        cpu_count,
+        numba_threads,
+        workers,
+        batch_windows,
+        chunk_size,
+        hop_size,
+        measurements={
+            name: {str(key): round(value, 4) for key, value in values.items()}
+            for name, values in measurements.items()
+        },
+    )
+
+
+def print_measurements(profile: HostProfile):
+    """항목별 측정 결과 출력 (선택한 후보 표시)"""
+    units = {
+        "numba_threads": "초",
+        "batch_windows": "ms/윈도우",
+        "process_workers": "초",
+        "chunk_speed": "배속",
+    }
+    chosen = {
+        "numba_threads": str(profile.numba_threads),
+        "batch_windows": str(profile.batch_windows),
+        "process_workers": str(profile.process_workers),
+        "chunk_speed": f"{profile.chunk_size}/{profile.hop_size}",
+    }
+    for name, values in profile.measurements.items():
+        print(f"- {name} ({units.get(name, '')})")
+        for key, value in values.items():
+            mark = " *" if key == chosen.get(name) else ""
+            print(f"\t{key:>6}: {value:.4f}{mark}")
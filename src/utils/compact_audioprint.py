@@ -0,0 +1,250 @@
+"""
+압축 오디오 지문 표현 모듈
+해시별 시간 배열 딕셔너리 대신 정렬된 해시 배열과 포스팅 리스트(CSR 형식)로 지문을 표현
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+import struct
+import zipfile
+import numpy as np
+import numba as nb
+
+from src.utils.types import _build_numba_dict
+
+# 프레임 인덱스 최대값 (uint16)
+MAX_FRAME_INDEX = np.iinfo(np.uint16).max
+
+# 레거시 지문의 프레임 길이 추정을 위한 후보 샘플레이트
+CANDIDATE_SAMPLE_RATES = (44100, 48000, 32000, 22050, 16000)
+DEFAULT_HOP_SIZE = 640
+
+
+@nb.njit(cache=True)
+def _flatten_numba_dict(numba_dict):
+    """nb.typed.Dict를 해시 배열과 시간 배열로 펼칩니다."""
+    total = 0
+    for value in numba_dict.values():
+        total += len(value)
+
+    hashes = np.empty(total, dtype=np.int64)
+    times = np.empty(total, dtype=np.float32)
+    pos = 0
+    for key, value in numba_dict.items():
+        for t in value:
+            hashes[pos] = key
+            times[pos] = t
+            pos += 1
+    return hashes, times
+
+
+@dataclass
+class CompactAudioprint:
+    """
+    압축 오디오 지문
+
+    - hashes: 정렬된 고유 해시 (uint32)
+    - offsets: 해시별 포스팅 시작 위치 (uint32, 길이 = 해시 수 + 1)
+    - frames: 포스팅별 프레임 인덱스 (uint16, 메모리에서는 절대값 / 압축 저장 시 델타 인코딩)
+    - frame_duration: 프레임 인덱스 1당 시간 (초)
+    """
+
+    hashes: np.ndarray
+    offsets: np.ndarray
+    frames: np.ndarray
+    frame_duration: float
+
+    def __len__(self):
+        return len(self.hashes)
+
+    @property
+    def nbytes(self) -> int:
+        """지문 배열이 차지하는 메모리 크기 (바이트)"""
+        return self.hashes.nbytes + self.offsets.nbytes + self.frames.nbytes
+
+    @property
+    def times(self) -> np.ndarray:
+        """포스팅별 시간 (초)"""
+        return self.frames.astype(np.float32) * np.float32(self.frame_duration)
+
+    @classmethod
+    def from_hash_arrays(
+        cls, hashes: np.ndarray, times: np.ndarray, frame_duration: float
+    ) -> "CompactAudioprint":
+        """해시/시간 배열로부터 압축 지문 생성"""
+        frames = np.round(np.asarray(times, dtype=np.float64) / frame_duration)
+        if len(frames) and frames.max() > MAX_FRAME_INDEX:
+            raise ValueError(f"프레임 인덱스가 uint16 범위를 넘었습니다: {int(frames.max())}")
+
+        # 해시 -> 프레임 순으로 정렬
+        order = np.lexsort((frames, hashes))
+        sorted_hashes = np.asarray(hashes)[order].astype(np.uint32)
+        sorted_frames = frames[order].astype(np.uint16)
+
+        # 고유 해시와 포스팅 경계 계산
+        unique_hashes, starts = np.unique(sorted_hashes, return_index=True)
+        offsets = np.append(starts, len(sorted_hashes)).astype(np.uint32)
+
+        return cls(unique_hashes, offsets, sorted_frames, float(frame_duration))
+
+    @classmethod
+    def from_numba_dict(
+        cls, numba_dict: nb.typed.Dict, frame_duration: float = None
+    ) -> "CompactAudioprint":
+        """nb.typed.Dict 지문을 압축 지문으로 변환"""
+        hashes, times = _flatten_numba_dict(numba_dict)
+        if frame_duration is None:
+            frame_duration = cls.infer_frame_duration(times)
+        return cls.from_hash_arrays(hashes, times, frame_duration)
+
+    @classmethod
+    def from_python_dict(
+        cls, python_dict: dict, frame_duration: float = None
+    ) -> "CompactAudioprint":
+        """레거시 pickle 지문(해시 -> float16 시간 배열)을 압축 지문으로 변환"""
+        counts = [len(v) for v in python_dict.values()]
+        hashes = np.repeat(np.fromiter(python_dict.keys(), dtype=np.int64), counts)
+        times = (
+            np.concatenate([np.asarray(v, dtype=np.float32) for v in python_dict.values()])
+            if python_dict
+            else np.empty(0, dtype=np.float32)
+        )
+        if frame_duration is None:
+            frame_duration = cls.infer_frame_duration(times)
+        return cls.from_hash_arrays(hashes, times, frame_duration)
+
+    @staticmethod
+    def infer_frame_duration(times: np.ndarray, hop_size: int = DEFAULT_HOP_SIZE) -> float:
+        """시간 배열에 가장 잘 맞는 프레임 길이를 후보 샘플레이트 중에서 추정"""
+        sample = np.unique(np.asarray(times, dtype=np.float64))[:2048]
+        best_duration, best_error = hop_size / CANDIDATE_SAMPLE_RATES[0], np.inf
+        for sample_rate in CANDIDATE_SAMPLE_RATES:
+            duration = hop_size / sample_rate
+            error = np.abs(sample / duration - np.round(sample / duration)).sum()
+            if error < best_error:
+                best_duration, best_error = duration, error
+        return best_duration
+
+    def to_numba_dict(self) -> nb.typed.Dict:
+        """압축 지문을 nb.typed.Dict 지문으로 변환"""
+        counts = np.diff(self.offsets.astype(np.int64))
+        hashes = np.repeat(self.hashes.astype(np.int32), counts)
+        return _build_numba_dict(hashes, self.times)
+
+    def to_python_dict(self) -> dict:
+        """압축 지문을 레거시 pickle 형식(해시 -> float16 시간 배열)으로 변환"""
+        times = self.times.astype(np.float16)
+        return {
+            int(h): times[self.offsets[i] : self.offsets[i + 1]]
+            for i, h in enumerate(self.hashes)
+        }
+
+    def encode(self, delta: bool = True) -> dict:
+        """디스크 저장용 배열 (delta=True면 포스팅 리스트 델타 인코딩)"""
+        arrays = {
+            "hashes": self.hashes,
+            "offsets": self.offsets,
+            "frames": self.frames,
+            "frame_duration": np.float64(self.frame_duration),
+            "delta": np.bool_(delta),
+        }
+        if delta:
+            deltas = np.diff(self.frames.astype(np.int32), prepend=0)
+            # 포스팅 리스트 첫 항목은 절대값으로 저장
+            starts = self.offsets[:-1].astype(np.int64)
+            deltas[starts] = self.frames[starts]
+            arrays["frames"] = deltas.astype(np.uint16)
+        return arrays
+
+    @classmethod
+    def decode(cls, arrays) -> "CompactAudioprint":
+        """디스크 저장용 배열에서 압축 지문 복원"""
+        # np.memmap은 메모리 매핑을 유지한 ndarray 뷰로 변환
+        offsets = np.asarray(arrays["offsets"])
+        frames = np.asarray(arrays["frames"])
+
+        # 델타 플래그가 없는 파일은 델타 인코딩으로 간주
+        if "delta" not in arrays or bool(arrays["delta"]):
+            frames = cls._decode_deltas(offsets, frames)
+
+        return cls(
+            np.asarray(arrays["hashes"]),
+            offsets,
+            frames,
+            float(arrays["frame_duration"]),
+        )
+
+    @staticmethod
+    def _decode_deltas(offsets: np.ndarray, deltas: np.ndarray) -> np.ndarray:
+        """포스팅 리스트별 누적합으로 델타 복원"""
+        cumulative = np.cumsum(deltas, dtype=np.int64)
+        counts = np.diff(offsets.astype(np.int64))
+        starts = offsets[:-1].astype(np.int64)
+        base = np.zeros_like(starts)
+        base[starts > 0] = cumulative[starts[starts > 0] - 1]
+        return (cumulative - np.repeat(base, counts)).astype(np.uint16)
+
+    def save(self, file_path: Path, compress: bool = False):
+        """
+        압축 지문을 .npz 파일로 저장
+
+        zlib 압축 시에만 델타 인코딩을 적용합니다. (비압축 uint16 델타는 크기 이득이 없고,
+        절대값으로 저장해야 메모리 매핑으로 바로 읽을 수 있음)
+        """
+        with open(file_path, "wb") as f:
+            if compress:
+                np.savez_compressed(f, **self.encode(delta=True))
+            else:
+                np.savez(f, **self.encode(delta=False))
+
+    @classmethod
+    def load(cls, file_path: Path, mmap: bool = False) -> "CompactAudioprint":
+        """.npz 파일에서 압축 지문 로드 (mmap=True면 비압축 파일의 배열을 메모리 매핑)"""
+        if mmap:
+            arrays = memmap_npz(file_path)
+            if arrays is not None:
+                return cls.decode(arrays)
+
+        with np.load(file_path) as arrays:
+            return cls.decode({name: arrays[name] for name in arrays.files})
+
+
+def memmap_npz(file_path: Path):
+    """
+    비압축 .npz 파일의 각 배열을 np.memmap으로 엽니다.
+    압축된 항목이 있으면 None을 반환합니다.
+    """
+    arrays = {}
+    with zipfile.ZipFile(file_path) as archive, open(file_path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                return None
+
+            # 로컬 파일 헤더 다음의 .npy 데이터 위치로 이동
+            f.seek(info.header_offset)
+            local_header = f.read(30)
+            name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+
+            # .npy 헤더 파싱
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+            name = info.filename[: -len(".npy")]
+            if shape == () or 0 in shape or dtype.hasobject:
+                # 스칼라 / 빈 배열은 바로 읽기
+                arrays[name] = np.lib.format.read_array(archive.open(info))
+                continue
+
+            arrays[name] = np.memmap(
+                file_path,
+                dtype=dtype,
+                mode="r",
+                shape=shape,
+                order="F" if fortran_order else "C",
+                offset=f.tell(),
+            )
+    return arrays
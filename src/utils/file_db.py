@@ -1,14 +1,24 @@
 """
 파일 시스템 기반 오디오 지문 관리 모듈
-오디오 지문을 .pkl 파일로 저장하고 WorldCup을 폴더로 구현
+오디오 지문을 .pkl / .npz 파일로 저장하고 WorldCup을 폴더로 구현
+WorldCup 폴더의 manifest.json은 전역 노래 저장소(SongStore)의 지문을 참조
 """
 
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import json
+import multiprocessing
+import os
 import pickle
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Tuple, Union
 import numba as nb
 import logging
 
+from src.utils.compact_audioprint import CompactAudioprint
+from src.utils.library_index import LibraryIndex, LibrarySong
+from src.utils.song_store import SongStore
+from src.utils.worldcup_index import WorldcupIndex
 from src.utils.types import TypeConverter
 from src.utils.memory_manager import MemoryMonitor
 
@@ -20,9 +30,43 @@ class FileDB:
 
     base_path = Path("/data/audioprints")
 
+    # 지문 저장 형식: 레거시 pickle / 압축 지문 / zlib 압축 지문
+    ENCODINGS = ("pickle", "compact", "compact_z")
+    default_encoding = "compact"
+
+    # 전역 노래 저장소를 참조하는 월드컵 매니페스트 파일 이름
+    MANIFEST_NAME = "manifest.json"
+
+    # 모든 월드컵 노래의 라이브러리 역색인 디렉토리 (월드컵 폴더로 취급하지 않음)
+    LIBRARY_DIR = ".library"
+
+    # 폴더 지문 파일 로드 작업자 수 (기본: CPU 수, 1이면 순차 로드)
+    load_workers = None
+
     @classmethod
-    def save_audioprint(cls, file_name: str, audioprint: nb.typed.Dict, folder_name: str):
+    def set_config(cls, load_workers: int = None):
+        """지문 파일 로드 관련 설정"""
+        if load_workers is not None:
+            cls.load_workers = load_workers
+
+    @staticmethod
+    def get_suffix(encoding: str) -> str:
+        """저장 형식별 파일 확장자 반환"""
+        if encoding not in FileDB.ENCODINGS:
+            raise ValueError(f"지원하지 않는 지문 저장 형식입니다: {encoding}")
+        return ".pkl" if encoding == "pickle" else ".npz"
+
+    @classmethod
+    def save_audioprint(
+        cls,
+        file_name: str,
+        audioprint: Union[CompactAudioprint, nb.typed.Dict],
+        folder_name: str,
+        encoding: str = None,
+    ):
         """오디오 지문을 파일로 저장"""
+        encoding = encoding or cls.default_encoding
+
         # 데이터베이스 디렉토리 생성
         cls.base_path.mkdir(parents=True, exist_ok=True)
 
@@ -31,24 +75,43 @@ class FileDB:
         worldcup_path.mkdir(parents=True, exist_ok=True)
 
         # 저장 경로 설정
-        save_path = worldcup_path / f"{file_name}.pkl"
-
-        # 오디오 지문을 직렬화 가능한 파이썬 딕셔너리로 변환
-        audioprint_dict = TypeConverter.convert_python_dict(audioprint)
-        with open(save_path, "wb") as f:
-            pickle.dump(audioprint_dict, f)
+        save_path = worldcup_path / f"{file_name}{cls.get_suffix(encoding)}"
+        cls.write_audioprint(save_path, audioprint, encoding)
 
         return str(save_path)
 
+    @staticmethod
+    def write_audioprint(
+        save_path: Path, audioprint: Union[CompactAudioprint, nb.typed.Dict], encoding: str
+    ):
+        """오디오 지문을 지정한 저장 형식으로 파일에 기록"""
+        if encoding == "pickle":
+            # 오디오 지문을 직렬화 가능한 파이썬 딕셔너리로 변환
+            if isinstance(audioprint, CompactAudioprint):
+                audioprint_dict = audioprint.to_python_dict()
+            else:
+                audioprint_dict = TypeConverter.convert_python_dict(audioprint)
+            with open(save_path, "wb") as f:
+                pickle.dump(audioprint_dict, f)
+            return
+
+        if not isinstance(audioprint, CompactAudioprint):
+            audioprint = CompactAudioprint.from_numba_dict(audioprint)
+        audioprint.save(save_path, compress=encoding == "compact_z")
+
+    @staticmethod
+    def read_audioprint(file_path: Path) -> CompactAudioprint:
+        """오디오 지문 파일을 압축 지문으로 읽기 (.pkl은 레거시 형식으로 변환)"""
+        if file_path.suffix == ".pkl":
+            with open(file_path, "rb") as f:
+                return CompactAudioprint.from_python_dict(pickle.load(f))
+        return CompactAudioprint.load(file_path)
+
     @classmethod
-    def load_audioprint(cls, file_path: Path):
+    def load_audioprint(cls, file_path: Path) -> CompactAudioprint:
         """오디오 지문 파일을 로드"""
         # 오디오 지문 파일 로드
-        with open(file_path, "rb") as f:
-            audioprint_data = pickle.load(f)
-
-        # 오디오 지문을 numba 딕셔너리 타입으로 변환
-        audioprint = TypeConverter.convert_numba_dict(audioprint_data)
+        audioprint = cls.read_audioprint(file_path)
 
         # 출력
         logger.info(f"오디오 지문 로드: {file_path.stem}")
@@ -56,8 +119,102 @@ class FileDB:
         return audioprint
 
     @classmethod
-    def load_audioprints(cls, folder_name: str) -> Dict[str, nb.typed.Dict]:
-        """데이터베이스 폴더의 모든 오디오 지문 로드"""
+    def read_audioprints(cls, paths: Dict[str, Path], workers: int = None) -> Dict[str, CompactAudioprint]:
+        """
+        지문 파일들을 작업자 풀로 읽기 (순서 유지)
+        .npz는 압축 해제/파일 읽기 중 GIL을 놓으므로 스레드 풀, 레거시 .pkl 변환은 파이썬 코드라 프로세스 풀 사용
+        """
+        workers = min(workers or cls.load_workers or os.cpu_count() or 1, len(paths))
+        if workers <= 1:
+            return {name: cls.read_audioprint(file_path) for name, file_path in paths.items()}
+
+        if any(file_path.suffix == ".pkl" for file_path in paths.values()):
+            # numba 스레드 상태를 물려받지 않도록 spawn으로 시작
+            executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+            chunksize = max(len(paths) // (workers * 4), 1)
+        else:
+            executor = ThreadPoolExecutor(workers)
+            chunksize = 1
+        with executor:
+            loaded = executor.map(cls.read_audioprint, paths.values(), chunksize=chunksize)
+            return dict(zip(paths, loaded))
+
+    @classmethod
+    def get_worldcup_path(cls, folder_name: str) -> Path:
+        """월드컵 폴더 경로"""
+        return cls.base_path / folder_name
+
+    @classmethod
+    def load_index(cls, folder_name: str, generation: int = None) -> WorldcupIndex:
+        """월드컵 역색인 스냅샷 로드 (역색인이 없으면 None)"""
+        worldcup_path = cls.get_worldcup_path(folder_name)
+        if not WorldcupIndex.exists(worldcup_path):
+            return None
+
+        index = WorldcupIndex.open(worldcup_path, generation)
+        logger.info(f"월드컵 역색인 로드: {folder_name} (세대 {index.generation}, {len(index)}곡)")
+        MemoryMonitor.monitor_system()
+        return index
+
+    @classmethod
+    def sync_index(cls, folder_name: str):
+        """월드컵 역색인이 있으면 매니페스트와 노래 목록을 맞춥니다. (추가/삭제된 노래만 반영)"""
+        worldcup_path = cls.get_worldcup_path(folder_name)
+        manifest = cls.load_manifest(folder_name)
+        if not manifest or not WorldcupIndex.exists(worldcup_path):
+            return None
+
+        indexed = set(WorldcupIndex.open(worldcup_path).keys())
+        songs = manifest["songs"]
+        added = {
+            name: SongStore.load(manifest["version"], video_id)
+            for name, video_id in songs.items()
+            if name not in indexed
+        }
+        # 폴더에 직접 저장된 지문 파일의 노래는 유지
+        known = set(songs) | set(cls.get_audioprint_paths(folder_name))
+        removed = [name for name in indexed if name not in known]
+        if not added and not removed:
+            return None
+
+        generation = WorldcupIndex.update(worldcup_path, added, removed)
+        logger.info(f"월드컵 역색인 갱신: 추가 {len(added)}곡, 삭제 {len(removed)}곡 (세대 {generation})")
+        return generation
+
+    @classmethod
+    def save_manifest(cls, folder_name: str, version: str, songs: Dict[str, str]):
+        """월드컵 매니페스트 저장 (노래 이름 -> 유튜브 영상 ID)"""
+        worldcup_path = cls.base_path / folder_name
+        worldcup_path.mkdir(parents=True, exist_ok=True)
+
+        manifest = {"version": version, "songs": songs}
+        with open(worldcup_path / cls.MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        return str(worldcup_path / cls.MANIFEST_NAME)
+
+    @classmethod
+    def load_manifest(cls, folder_name: str) -> dict:
+        """월드컵 매니페스트 로드 (없으면 None)"""
+        manifest_path = cls.base_path / folder_name / cls.MANIFEST_NAME
+        if not manifest_path.exists():
+            return None
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @classmethod
+    def get_audioprint_paths(cls, folder_name: str):
+        """월드컵 폴더의 오디오 지문 파일 경로 반환 (같은 이름은 압축 지문 우선)"""
+        folder_path = cls.base_path / folder_name
+        paths = {}
+        for file_path in sorted(folder_path.glob("*.pkl")) + sorted(folder_path.glob("*.npz")):
+            paths[file_path.stem] = file_path
+        return paths
+
+    @classmethod
+    def load_audioprints(cls, folder_name: str, workers: int = None) -> Dict[str, CompactAudioprint]:
+        """데이터베이스 폴더의 모든 오디오 지문 로드 (폴더 지문 파일은 workers개 작업자로 읽기)"""
         folder_path = cls.base_path / folder_name
 
         if not folder_path.exists():
@@ -66,10 +223,144 @@ class FileDB:
         # 오디오 지문 리스트 저장 변수
         audioprints = {}
 
-        # 모든 .pkl 파일을 찾아서 로드
-        for file_path in folder_path.glob("*.pkl"):
-            audioprint_name = file_path.stem
-            with open(file_path, "rb") as f:
-                audioprints[audioprint_name] = cls.load_audioprint(file_path)
+        # 매니페스트가 참조하는 저장소 지문 로드 (메모리 매핑으로 월드컵/프로세스 간 공유)
+        manifest = cls.load_manifest(folder_name)
+        if manifest:
+            for audioprint_name, video_id in manifest["songs"].items():
+                audioprints[audioprint_name] = SongStore.load(manifest["version"], video_id)
+                logger.info(f"오디오 지문 로드: {audioprint_name} ({video_id})")
+            MemoryMonitor.monitor_system()
+
+        # 폴더에 직접 저장된 지문 파일 로드
+        paths = cls.get_audioprint_paths(folder_name)
+        if paths:
+            audioprints.update(cls.read_audioprints(paths, workers))
+            logger.info(f"오디오 지문 로드: {folder_name} 폴더 지문 파일 {len(paths)}개")
+            MemoryMonitor.monitor_system()
 
         return audioprints
+
+    @classmethod
+    def load_worldcups(
+        cls, folder_names: List[str], workers: int = None
+    ) -> Tuple[Dict[str, CompactAudioprint], Dict[str, Dict[str, str]]]:
+        """
+        여러 월드컵의 노래를 한 번에 매칭할 노래 목록으로 합칩니다.
+        같은 노래(저장소 지문은 영상 ID 기준)는 한 번만 넣고, 월드컵별 {합친 노래 이름: 월드컵 노래 이름}을 함께 반환합니다.
+        다른 노래가 같은 이름을 쓰면 `노래제목 (월드컵이름)`으로 구분하며, 지문 버전이 다른 월드컵은 함께 쓸 수 없습니다.
+        """
+        versions = {}
+        entries = {}  # 노래 키 -> (첫 월드컵의 노래 이름, 월드컵, 로드 함수 또는 파일 경로)
+        worldcup_keys = {}
+        for folder_name in folder_names:
+            keys = {}
+            manifest = cls.load_manifest(folder_name)
+            if manifest:
+                versions[folder_name] = manifest["version"]
+                for name, video_id in manifest["songs"].items():
+                    load = lambda version=manifest["version"], video_id=video_id: SongStore.load(version, video_id)
+                    keys[("store", video_id)] = name
+                    entries.setdefault(("store", video_id), (name, folder_name, load))
+            for name, file_path in cls.get_audioprint_paths(folder_name).items():
+                keys[("file", folder_name, name)] = name
+                entries.setdefault(("file", folder_name, name), (name, folder_name, file_path))
+            if not keys:
+                raise ValueError(f"해당 worldcup id({folder_name})가 존재하지 않습니다.")
+            worldcup_keys[folder_name] = keys
+
+        if len(set(versions.values())) > 1:
+            found = ", ".join(f"{name}={version}" for name, version in versions.items())
+            raise ValueError(f"지문 버전이 다른 월드컵은 함께 감지할 수 없습니다: {found}")
+
+        name_counts = Counter(name for name, _, _ in entries.values())
+        combined_names = {
+            key: f"{name} ({folder_name})" if name_counts[name] > 1 else name
+            for key, (name, folder_name, _) in entries.items()
+        }
+        file_paths = {
+            combined_names[key]: source for key, (_, _, source) in entries.items() if isinstance(source, Path)
+        }
+        loaded = cls.read_audioprints(file_paths, workers) if file_paths else {}
+        audioprints = {
+            combined_names[key]: loaded[combined_names[key]] if isinstance(source, Path) else source()
+            for key, (_, _, source) in entries.items()
+        }
+        logger.info(f"월드컵 {len(folder_names)}개 노래 로드: {len(audioprints)}곡 (중복 제외)")
+        MemoryMonitor.monitor_system()
+
+        worldcup_songs = {
+            folder_name: {combined_names[key]: name for key, name in keys.items()}
+            for folder_name, keys in worldcup_keys.items()
+        }
+        return audioprints, worldcup_songs
+
+    @classmethod
+    def list_worldcups(cls) -> List[str]:
+        """저장된 월드컵 이름 목록"""
+        if not cls.base_path.exists():
+            return []
+        return sorted(
+            path.name
+            for path in cls.base_path.iterdir()
+            if path.is_dir() and not path.name.startswith(".")
+        )
+
+    @classmethod
+    def get_library_path(cls) -> Path:
+        """라이브러리 역색인 경로"""
+        return cls.base_path / cls.LIBRARY_DIR
+
+    @classmethod
+    def collect_library_songs(cls, version: str = None) -> Tuple[str, List[LibrarySong]]:
+        """
+        모든 월드컵의 노래를 중복 없이 모읍니다. (지문은 로드하지 않음)
+        저장소 지문은 영상 ID, 폴더 지문 파일은 (월드컵, 파일 이름) 기준으로 한 번만 포함하고,
+        지문 파라미터 버전이 다른 월드컵은 제외합니다. (version이 없으면 노래가 가장 많은 버전)
+        """
+        worldcups = {name: cls.load_manifest(name) for name in cls.list_worldcups()}
+        if version is None:
+            counts = Counter()
+            for manifest in worldcups.values():
+                if manifest:
+                    counts[manifest["version"]] += len(manifest["songs"])
+            version = counts.most_common(1)[0][0] if counts else None
+
+        songs: Dict[tuple, LibrarySong] = {}
+        for worldcup, manifest in worldcups.items():
+            if manifest and manifest["version"] != version:
+                logger.warning(f"지문 버전이 달라 라이브러리에서 제외: {worldcup} ({manifest['version']})")
+                continue
+
+            entries = []
+            if manifest:
+                for name, video_id in manifest["songs"].items():
+                    load = lambda video_id=video_id: SongStore.load(version, video_id)
+                    entries.append((("store", video_id), name, load))
+            for name, file_path in cls.get_audioprint_paths(worldcup).items():
+                load = lambda file_path=file_path: cls.read_audioprint(file_path)
+                entries.append((("file", worldcup, name), name, load))
+
+            for key, name, load in entries:
+                if key in songs:
+                    songs[key].worldcups.append(worldcup)
+                else:
+                    songs[key] = LibrarySong(name, [worldcup], load)
+
+        # 다른 노래가 같은 이름을 쓰면 첫 월드컵 이름으로 구분
+        name_counts = Counter(song.name for song in songs.values())
+        for song in songs.values():
+            if name_counts[song.name] > 1:
+                song.name = f"{song.name} ({song.worldcups[0]})"
+        return version, list(songs.values())
+
+    @classmethod
+    def load_library(cls) -> LibraryIndex:
+        """라이브러리 역색인 로드 (없으면 None)"""
+        library_path = cls.get_library_path()
+        if not LibraryIndex.exists(library_path):
+            return None
+
+        library = LibraryIndex.open(library_path)
+        logger.info(f"라이브러리 역색인 로드: {len(library)}곡, 샤드 {library.shard_count}개")
+        MemoryMonitor.monitor_system()
+        return library
@@ -0,0 +1,119 @@
+"""
+호스트 성능 프로필 모듈
+main.tune이 이 호스트에서 측정한 병렬 처리 수, 일괄 매칭 윈도우 수, 청크/홉 크기를 호스트 이름별 JSON 파일로 저장하고
+타임라인/지문 생성 명령이 명시하지 않은 설정의 기본값으로 사용합니다.
+"""
+
+from dataclasses import asdict, dataclass, field
+import json
+import logging
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numba as nb
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HostProfile:
+    host: str
+    cpu_count: int
+    numba_threads: int  # numba 병렬 커널 스레드 수
+    process_workers: int  # 작업 프로세스 풀 크기 (라이브러리 매칭, 레거시 지문 로드)
+    batch_windows: int  # 윈도우 일괄 매칭에서 한 번에 매칭할 윈도우 수
+    chunk_size: int  # 타임라인 청크 크기 (초)
+    hop_size: int  # 타임라인 홉 크기 (초)
+    created_at: str = ""
+    measurements: Dict[str, Dict[str, float]] = field(default_factory=dict)  # 항목별 후보 -> 측정값
+
+    base_path = Path("/data/host_profiles")
+
+    @classmethod
+    def get_path(cls, host: str = None) -> Path:
+        """호스트 프로필 파일 경로"""
+        return cls.base_path / f"{host or socket.gethostname()}.json"
+
+    def save(self, path: Path = None) -> Path:
+        path = Path(path or self.get_path(self.host))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.created_at = self.created_at or time.strftime("%Y-%m-%d %H:%M:%S")
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = None) -> Optional["HostProfile"]:
+        """
+        이 호스트의 프로필 로드 (없거나 CPU 수가 측정 때와 다르면 None)
+        """
+        path = Path(path or cls.get_path())
+        if not path.exists():
+            return None
+
+        with open(path, "r", encoding="utf-8") as f:
+            profile = cls(**json.load(f))
+        if profile.cpu_count != (os.cpu_count() or 1):
+            logger.warning(
+                f"호스트 프로필의 CPU 수({profile.cpu_count})가 현재({os.cpu_count()})와 달라 사용하지 않습니다. "
+                f"python -m main.tune을 다시 실행하세요."
+            )
+            return None
+        return profile
+
+    def apply(self, threads: int = None, workers: int = None):
+        """
+        프로필의 병렬 처리/버퍼 설정 적용 (threads, workers가 주어지면 프로필 값 대신 사용)
+        NUMBA_NUM_THREADS 환경 변수로 스레드 수를 정했으면 프로필의 numba 스레드 수는 적용하지 않습니다.
+        """
+        from src.timeline.library_matcher import LibraryMatcher
+        from src.timeline.timeline_detector import TimelineDetector
+        from src.utils.file_db import FileDB
+        from src.utils.worldcup_index import WorldcupIndex
+
+        apply_threads(threads or self.numba_threads, explicit=threads is not None)
+        WorldcupIndex.set_config(build_workers=threads or self.numba_threads)
+        LibraryMatcher.set_config(workers=workers or self.process_workers)
+        FileDB.set_config(load_workers=workers or self.process_workers)
+        TimelineDetector.set_config(batch_windows=self.batch_windows)
+
+    def print_profile(self):
+        print(f"호스트: {self.host} (CPU {self.cpu_count}개, 측정 {self.created_at})")
+        print(f"\t numba 스레드: {self.numba_threads}")
+        print(f"\t 작업 프로세스: {self.process_workers}")
+        print(f"\t 일괄 매칭 윈도우: {self.batch_windows}")
+        print(f"\t 청크/홉: {self.chunk_size}/{self.hop_size}초")
+
+
+def configure_host(threads: int = None, workers: int = None, use_profile: bool = True) -> Optional[HostProfile]:
+    """
+    이 호스트의 프로필이 있으면 적용하고 반환 (threads, workers는 명시한 값으로 프로필보다 우선)
+    프로필이 없거나 use_profile이 False면 명시한 값만 적용합니다.
+    """
+    profile = HostProfile.load() if use_profile else None
+    if profile is not None:
+        profile.apply(threads, workers)
+        print(f"호스트 프로필 사용: {HostProfile.get_path()}")
+        return profile
+
+    from src.timeline.library_matcher import LibraryMatcher
+    from src.utils.file_db import FileDB
+    from src.utils.worldcup_index import WorldcupIndex
+
+    apply_threads(threads)
+    WorldcupIndex.set_config(build_workers=threads)
+    LibraryMatcher.set_config(workers=workers)
+    FileDB.set_config(load_workers=workers)
+    return None
+
+
+def apply_threads(threads: int, explicit: bool = True):
+    """numba 병렬 커널 스레드 수 설정 (명시하지 않은 값은 NUMBA_NUM_THREADS 환경 변수가 있으면 적용하지 않음)"""
+    if not threads or (not explicit and "NUMBA_NUM_THREADS" in os.environ):
+        return
+    nb.set_num_threads(max(1, min(threads, nb.config.NUMBA_NUM_THREADS)))
@@ -0,0 +1,87 @@
+"""
+numba 커널 워밍업 모듈
+실제 파이프라인과 같은 타입의 작은 합성 입력으로 모든 커널을 한 번씩 실행하여
+디스크 캐시(NUMBA_CACHE_DIR)에 컴파일 결과를 저장
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.benchmark.synthetic import synthetic_audio
+
+WARMUP_SAMPLE_RATE = 44100
+WARMUP_SECONDS = 3
+
+
+def warmup_kernels() -> float:
+    """모든 numba 커널을 실행하여 컴파일/캐시합니다. 걸린 시간(초)을 반환합니다."""
+    from src.audioprint.audioprint_generator import AudioprintGenerator
+    from src.timeline.batch_matcher import BatchMatcher
+    from src.timeline.library_matcher import LibraryMatcher
+    from src.timeline.similarity_processor import compute_similarity_numpy
+    from src.timeline.timeline_detector import TimelineDetector
+    from src.utils.compact_audioprint import CompactAudioprint
+    from src.utils.library_index import LibraryIndex, LibrarySong
+    from src.utils.worldcup_index import WorldcupIndex
+
+    start = time.perf_counter()
+    audio = synthetic_audio(WARMUP_SECONDS, WARMUP_SAMPLE_RATE)
+    frame_duration = AudioprintGenerator.hop_size / WARMUP_SAMPLE_RATE
+
+    with contextlib.redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+
+        # 지문 생성 (피크 쌍 해싱, typed.Dict 변환)
+        fingerprint = AudioprintGenerator.get_spectrogram_fingerprint(audio, WARMUP_SAMPLE_RATE)
+        hashes, times = AudioprintGenerator.get_spectrogram_hashes(audio, WARMUP_SAMPLE_RATE)
+        song = CompactAudioprint.from_hash_arrays(hashes, times, frame_duration)
+        CompactAudioprint.from_numba_dict(song.to_numba_dict(), frame_duration)
+        AudioprintGenerator.get_constellation_hashes(audio, WARMUP_SAMPLE_RATE)
+
+        # 노래 지문: 메모리 매핑(읽기 전용) / 압축 파일(쓰기 가능) 두 가지 배열 타입
+        song.save(temp_path / "mmap.npz")
+        song.save(temp_path / "zlib.npz", compress=True)
+        songs = {
+            "mmap": CompactAudioprint.load(temp_path / "mmap.npz", mmap=True),
+            "zlib": CompactAudioprint.load(temp_path / "zlib.npz"),
+            "dict": song.to_numba_dict(),
+        }
+        TimelineDetector.detect_best_match(fingerprint, songs)
+
+        # 월드컵 역색인 조회
+        WorldcupIndex.build(temp_path, {"mmap": songs["mmap"]})
+        index = WorldcupIndex.open(temp_path)
+        TimelineDetector.detect_best_match_index(fingerprint, index)
+        TimelineDetector.detect_best_match_index(fingerprint, index, max_offsets=1)
+
+        # 윈도우 일괄 매칭 (노래 목록 / 역색인)
+        BatchMatcher({"mmap": songs["mmap"], "zlib": songs["zlib"]}).match([fingerprint])
+        BatchMatcher(index).match([fingerprint, fingerprint])
+
+        # 라이브러리 샤드 분산 매칭 (작업 프로세스도 같은 디스크 캐시 사용)
+        library = LibraryIndex.build(
+            temp_path / "library", [LibrarySong("mmap", ["warmup"], lambda: songs["mmap"])], shard_count=2
+        )
+        with LibraryMatcher(library) as matcher:
+            matcher.match([fingerprint, fingerprint])
+
+        # 증분 슬라이딩 윈도우 매칭, 전역 오프셋 투표 (노래 목록 / 역색인)
+        for song_fingerprints in ({"mmap": songs["mmap"], "zlib": songs["zlib"]}, index):
+            list(
+                TimelineDetector.detect_timeline_incremental(
+                    audio, WARMUP_SECONDS, WARMUP_SAMPLE_RATE, song_fingerprints, 2, 1
+                )
+            )
+            TimelineDetector.detect_timeline_global(
+                audio, WARMUP_SECONDS, WARMUP_SAMPLE_RATE, song_fingerprints
+            )
+
+        # 기타 유사도 커널
+        compute_similarity_numpy(np.array([0.5, 0.5, 1.0]), 3, 3)
+
+    return time.perf_counter() - start
@@ -0,0 +1,196 @@
+"""
+전체 라이브러리 역색인 관리 모듈
+모든 월드컵의 노래 지문을 해시 범위로 나눈 샤드 파일(해시 기준 정렬 포스팅)로 저장합니다.
+구축은 노래를 하나씩 읽어 샤드별 임시 파일에 나누어 쓴 뒤 샤드 하나씩 정렬하므로 메모리 사용량이 샤드 크기로 제한되고,
+조회 시에는 샤드를 메모리 매핑으로 열어 필요한 페이지만 읽습니다.
+"""
+
+from dataclasses import dataclass, field
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from src.utils.compact_audioprint import CompactAudioprint
+from src.utils.worldcup_index import IndexSegment, WorldcupIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LibrarySong:
+    """라이브러리 구축 대상 노래 (지문은 구축 중에 필요할 때만 로드)"""
+
+    name: str
+    worldcups: List[str]
+    load: Callable[[], CompactAudioprint] = field(repr=False)
+
+
+class LibraryIndex:
+    """해시 범위 샤드로 나눈 전체 라이브러리 역색인 (샤드 i = 해시 [bounds[i], bounds[i + 1]))"""
+
+    LIBRARY_FILE = "library.json"
+
+    DEFAULT_SHARDS = 16
+    SAMPLE_SONGS = 2000  # 샤드 경계를 정할 때 해시 분포를 샘플링할 노래 수
+
+    def __init__(self, library_path: Path, state: dict):
+        self.library_path = library_path
+        self.version = state["version"]
+        self.bounds = np.array(state["bounds"], dtype=np.int64)
+        self.shard_names = state["shards"]
+        self.songs = {song_id: song for song_id, song in enumerate(state["songs"])}
+
+        self.names = [song["name"] for song in state["songs"]]
+        self.frame_durations = np.array(
+            [song["frame_duration"] for song in state["songs"]], dtype=np.float64
+        )
+        self.hash_counts = np.array([song["hash_count"] for song in state["songs"]], dtype=np.int64)
+        self.live_songs = np.ones(len(self.names), dtype=np.bool_)
+        self._shards: Dict[int, IndexSegment] = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def keys(self):
+        """노래 이름 목록"""
+        return list(self.names)
+
+    @property
+    def shard_count(self) -> int:
+        return len(self.shard_names)
+
+    def shard(self, index: int) -> IndexSegment:
+        """샤드를 메모리 매핑으로 열기 (처음 접근할 때 한 번)"""
+        if index not in self._shards:
+            self._shards[index] = WorldcupIndex._load_segment(self.library_path, self.shard_names[index])
+        return self._shards[index]
+
+    def shard_of(self, hashes: np.ndarray) -> np.ndarray:
+        """해시별 샤드 번호"""
+        return np.searchsorted(self.bounds, hashes.astype(np.int64), side="right") - 1
+
+    # ------------------------------------------------------------------
+    # 열기 / 구축
+    # ------------------------------------------------------------------
+    @classmethod
+    def exists(cls, library_path: Path) -> bool:
+        return (library_path / cls.LIBRARY_FILE).exists()
+
+    @classmethod
+    def open(cls, library_path: Path) -> "LibraryIndex":
+        """라이브러리 역색인 열기 (샤드는 조회할 때 메모리 매핑)"""
+        with open(library_path / cls.LIBRARY_FILE, "r", encoding="utf-8") as f:
+            return cls(library_path, json.load(f))
+
+    @staticmethod
+    def _song_hashes(audioprint: CompactAudioprint) -> np.ndarray:
+        """포스팅 순서의 해시 (프레임 하나당 해시 하나)"""
+        return np.repeat(audioprint.hashes, np.diff(audioprint.offsets.astype(np.int64)))
+
+    @classmethod
+    def _shard_bounds(cls, songs: List[LibrarySong], shard_count: int) -> np.ndarray:
+        """샘플 노래들의 포스팅 해시 분위수로 포스팅 수가 비슷한 해시 범위 경계 계산"""
+        step = max(len(songs) // cls.SAMPLE_SONGS, 1)
+        sample = [cls._song_hashes(song.load()) for song in songs[::step]]
+        sample = np.concatenate(sample) if sample else np.empty(0, dtype=np.uint32)
+
+        bounds = [0]
+        if len(sample):
+            quantiles = np.quantile(sample, np.arange(1, shard_count) / shard_count, method="lower")
+            bounds += sorted(set(int(q) + 1 for q in quantiles) - {0, 1 << 32})
+        bounds.append(1 << 32)
+        return np.array(bounds, dtype=np.int64)
+
+    @classmethod
+    def build(
+        cls,
+        library_path: Path,
+        songs: List[LibrarySong],
+        version: str = None,
+        shard_count: int = None,
+    ) -> "LibraryIndex":
+        """
+        노래 목록으로 라이브러리 역색인을 새로 구축합니다.
+        노래 지문을 하나씩 읽어 포스팅을 샤드별 임시 파일에 이어 쓰고, 샤드 하나씩 해시 기준으로 정렬하여 저장합니다.
+        """
+        shard_count = shard_count or cls.DEFAULT_SHARDS
+        bounds = cls._shard_bounds(songs, shard_count)
+        shard_count = len(bounds) - 1
+
+        build_path = library_path.with_name(f"{library_path.name}.building")
+        shutil.rmtree(build_path, ignore_errors=True)
+        build_path.mkdir(parents=True)
+
+        # 1단계: 노래별 포스팅을 샤드별 임시 파일로 분배
+        columns = ("hashes", "songs", "frames")
+        files = [
+            {column: open(build_path / f"part-{i:03d}.{column}", "wb") for column in columns}
+            for i in range(shard_count)
+        ]
+        entries = []
+        try:
+            for song_id, song in enumerate(songs):
+                audioprint = song.load()
+                entries.append(
+                    {
+                        "name": song.name,
+                        "worldcups": song.worldcups,
+                        "frame_duration": audioprint.frame_duration,
+                        "hash_count": len(audioprint),
+                    }
+                )
+                hashes = cls._song_hashes(audioprint).astype(np.uint32)
+                frames = np.asarray(audioprint.frames, dtype=np.uint16)
+                shard_ids = np.searchsorted(bounds, hashes.astype(np.int64), side="right") - 1
+                order = np.argsort(shard_ids, kind="stable")
+                splits = np.searchsorted(shard_ids[order], np.arange(1, shard_count))
+                for shard, part in enumerate(np.split(order, splits)):
+                    if not len(part):
+                        continue
+                    files[shard]["hashes"].write(hashes[part].tobytes())
+                    files[shard]["songs"].write(np.full(len(part), song_id, dtype=np.int32).tobytes())
+                    files[shard]["frames"].write(frames[part].tobytes())
+                if (song_id + 1) % 1000 == 0:
+                    logger.info(f"라이브러리 포스팅 분배: {song_id + 1}/{len(songs)}곡")
+        finally:
+            for shard_files in files:
+                for f in shard_files.values():
+                    f.close()
+
+        # 2단계: 샤드 하나씩 정렬하여 메모리 매핑 가능한 세그먼트로 저장
+        shard_names = []
+        for shard in range(shard_count):
+            part = build_path / f"part-{shard:03d}"
+            hashes = np.fromfile(f"{part}.hashes", dtype=np.uint32)
+            song_ids = np.fromfile(f"{part}.songs", dtype=np.int32)
+            frames = np.fromfile(f"{part}.frames", dtype=np.uint16)
+            order = WorldcupIndex.sort_order(hashes)
+
+            name = f"shard-{shard:03d}"
+            WorldcupIndex._write_segment(build_path, name, hashes[order], song_ids[order], frames[order])
+            shard_names.append(name)
+            for column in columns:
+                Path(f"{part}.{column}").unlink()
+            logger.info(f"라이브러리 샤드 저장: {name} (포스팅 {len(hashes)}개)")
+
+        state = {
+            "version": version,
+            "bounds": bounds.tolist(),
+            "shards": shard_names,
+            "songs": entries,
+        }
+        with open(build_path / cls.LIBRARY_FILE, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+
+        # 완성된 디렉토리로 교체 (구축 중에는 이전 라이브러리로 조회 가능)
+        old_path = library_path.with_name(f"{library_path.name}.old")
+        shutil.rmtree(old_path, ignore_errors=True)
+        if library_path.exists():
+            library_path.replace(old_path)
+        build_path.replace(library_path)
+        shutil.rmtree(old_path, ignore_errors=True)
+        return cls.open(library_path)
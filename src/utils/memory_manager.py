@@ -1,3 +1,8 @@
+import ctypes
+import gc
+import re
+import time
+
 import psutil
 
 
@@ -26,3 +31,103 @@ class MemoryMonitor:
         print(
             f"[system memory: {total_memory:.2f}MB - {used_memory:.0f}MB = {available_memory:.0f}MB ({percent_used:.1f}%)]"
         )
+
+
+class MemoryBudget:
+    """
+    프로세스 메모리(RSS) 예산 관리
+    남은 예산에 맞춰 디코딩/오프셋 버퍼 크기를 정하고, 예산에 가까우면 오디오 생산을 늦춥니다.
+    """
+
+    HIGH_WATERMARK = 0.9  # 예산의 이 비율을 넘으면 다음 청크 생산 전에 메모리 확보
+    DECODE_BUDGET_FRACTION = 0.25  # 전체 오디오 디코딩 버퍼에 쓸 수 있는 예산 비율
+    OFFSET_BUDGET_FRACTION = 0.25  # 남은 예산 중 시간 오프셋 버퍼에 쓸 비율
+    OFFSET_BYTES = 32  # 오프셋 하나당 최대 메모리 (typed.List 증가 + ndarray 변환 + 정렬)
+    MIN_OFFSETS = 1 << 16  # 예산이 부족해도 보장하는 오프셋 버퍼 크기
+    MAX_WAIT_ROUNDS = 5  # 메모리 확보 재시도 횟수
+    WAIT_SECONDS = 0.05  # 첫 재시도 대기 시간 (재시도마다 2배)
+
+    SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self.process = psutil.Process()
+        self.peak_rss = 0
+        self.rss()
+        self.pressure_count = 0  # 워터마크를 넘은 횟수
+        self.over_budget_count = 0  # 메모리 확보 후에도 워터마크를 넘은 횟수
+        self.waited_seconds = 0.0
+
+    @classmethod
+    def parse_size(cls, text: str) -> int:
+        """'2G', '1500M', '512MB' 같은 크기 문자열을 바이트로 변환"""
+        match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*", text.upper())
+        if match is None:
+            raise ValueError(f"메모리 크기 형식이 잘못되었습니다: {text} (예: 2G, 1500M)")
+        return int(float(match.group(1)) * cls.SIZE_UNITS[match.group(2)])
+
+    def rss(self) -> int:
+        """현재 프로세스 RSS (바이트)"""
+        rss = self.process.memory_info().rss
+        self.peak_rss = max(self.peak_rss, rss)
+        return rss
+
+    def available(self) -> int:
+        """예산에서 남은 메모리 (바이트)"""
+        return max(self.budget_bytes - self.rss(), 0)
+
+    def decode_buffer_limit(self) -> int:
+        """오디오 전체를 메모리에 디코딩해도 되는 최대 크기 (바이트)"""
+        return int(self.budget_bytes * self.DECODE_BUDGET_FRACTION)
+
+    def offset_buffer_limit(self) -> int:
+        """지문 비교 한 번에 만들 수 있는 시간 오프셋 최대 개수"""
+        limit = int(self.available() * self.OFFSET_BUDGET_FRACTION) // self.OFFSET_BYTES
+        return max(limit, self.MIN_OFFSETS)
+
+    @staticmethod
+    def trim_heap():
+        """해제된 힙 메모리를 운영체제에 반환 (glibc가 아니면 무시)"""
+        try:
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+    def wait_for_headroom(self, required_bytes: int = 0):
+        """
+        RSS + required_bytes가 워터마크 아래로 내려갈 때까지 메모리를 확보하며 대기합니다.
+        끝내 확보하지 못해도 중단하지 않고 진행합니다. (이후 버퍼는 최소 크기로 줄어듦)
+        """
+        limit = self.budget_bytes * self.HIGH_WATERMARK
+        if self.rss() + required_bytes <= limit:
+            return
+
+        self.pressure_count += 1
+        start = time.perf_counter()
+        previous_rss = self.rss()
+        for round_idx in range(self.MAX_WAIT_ROUNDS):
+            gc.collect()
+            self.trim_heap()
+            rss = self.rss()
+            if rss + required_bytes <= limit:
+                break
+            # 더 이상 줄어들지 않으면 대기하지 않고 진행
+            if round_idx > 0 and rss >= previous_rss:
+                self.over_budget_count += 1
+                break
+            previous_rss = rss
+            time.sleep(self.WAIT_SECONDS * (2**round_idx))
+        else:
+            self.over_budget_count += 1
+        self.waited_seconds += time.perf_counter() - start
+
+    def print_metrics(self):
+        """메모리 예산 통계 출력"""
+        mb = 1024 * 1024
+        print("-" * 80)
+        print("메모리 예산")
+        print(f"\t예산: {self.budget_bytes / mb:.0f}MB, 최대 RSS: {self.peak_rss / mb:.0f}MB")
+        print(
+            f"\t메모리 확보 대기: {self.pressure_count}회 ({self.waited_seconds:.2f}초), "
+            f"확보 실패: {self.over_budget_count}회"
+        )
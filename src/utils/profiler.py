@@ -0,0 +1,221 @@
+"""
+파이프라인 프로파일링 모듈
+--profile 사용 시 단계/커널별 시간을 측정하고 pstats 파일, flamegraph용 folded 스택 파일,
+자기 시간 기준 함수별 요약을 출력합니다.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+import marshal
+import os
+import sys
+import threading
+import time
+
+
+@dataclass
+class StageStat:
+    """호출 경로 하나의 측정값"""
+
+    calls: int = 0
+    total: float = 0.0  # 하위 단계 포함 시간 (초)
+    children: float = 0.0  # 하위 단계 시간 (초)
+
+    @property
+    def own(self) -> float:
+        """자기 시간 (하위 단계 제외)"""
+        return max(self.total - self.children, 0.0)
+
+
+class StackSampler(threading.Thread):
+    """
+    메인 스레드의 Python 스택을 주기적으로 샘플링하는 스레드
+    (numba 커널은 GIL을 잡고 실행되므로 커널 시간은 단계 타이머로 확인)
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.target_id = threading.main_thread().ident
+        self.counts: Dict[str, int] = defaultdict(int)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class Profiler:
+    """
+    단계/커널 타이머 (클래스 변수로 전역 상태 관리)
+    enable()을 호출하지 않으면 stage()는 빈 컨텍스트를 반환하여 비용이 거의 없습니다.
+    """
+
+    enabled = False
+    stats: Dict[Tuple[str, ...], StageStat] = {}
+    _stack: List[str] = []
+    sampler: StackSampler = None
+    started_at = 0.0
+
+    SAMPLE_INTERVAL = 0.005  # 샘플링 주기 (초)
+    SUMMARY_TOP = 25  # 요약에 출력할 함수 수
+
+    _null_context = nullcontext()
+
+    @staticmethod
+    def add_arguments(parser):
+        """--profile 관련 명령줄 인수 추가 (main.timeline, main.audioprint 공용)"""
+        parser.add_argument(
+            "--profile", action="store_true", help="단계/커널별 실행 시간 측정 및 요약 출력"
+        )
+        parser.add_argument(
+            "--profile-sample",
+            action="store_true",
+            help="Python 스택 샘플링 결과를 flamegraph 파일로 저장 (--profile과 함께 사용)",
+        )
+        parser.add_argument(
+            "--profile-output",
+            default="profile",
+            help="프로파일 파일 경로 접두사 (<접두사>.pstats, <접두사>.folded)",
+        )
+
+    @classmethod
+    def enable(cls, sample: bool = False):
+        """측정 시작 (sample=True면 스택 샘플링도 실행)"""
+        cls.enabled = True
+        cls.stats = {}
+        cls._stack = []
+        cls.started_at = time.perf_counter()
+        if sample:
+            cls.sampler = StackSampler(cls.SAMPLE_INTERVAL)
+            cls.sampler.start()
+
+    @classmethod
+    def stage(cls, name: str):
+        """단계 측정 컨텍스트 (with Profiler.stage("이름"): ...)"""
+        if not cls.enabled:
+            return cls._null_context
+        return cls._measure(name)
+
+    @classmethod
+    @contextmanager
+    def _measure(cls, name: str):
+        cls._stack.append(name)
+        path = tuple(cls._stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            cls._stack.pop()
+
+            stat = cls.stats.get(path)
+            if stat is None:
+                stat = cls.stats[path] = StageStat()
+            stat.calls += 1
+            stat.total += elapsed
+
+            parent = cls.stats.get(path[:-1]) if len(path) > 1 else None
+            if parent is None and len(path) > 1:
+                parent = cls.stats[path[:-1]] = StageStat()
+            if parent is not None:
+                parent.children += elapsed
+
+    @classmethod
+    def summarize(cls) -> List[Tuple[str, int, float, float]]:
+        """이름별 (이름, 호출 수, 누적 시간, 자기 시간) 목록 (자기 시간 내림차순)"""
+        calls, total, own = defaultdict(int), defaultdict(float), defaultdict(float)
+        for path, stat in cls.stats.items():
+            name = path[-1]
+            calls[name] += stat.calls
+            own[name] += stat.own
+            # 재귀 호출은 가장 바깥 호출만 누적 시간에 포함
+            if name not in path[:-1]:
+                total[name] += stat.total
+        rows = [(name, calls[name], total[name], own[name]) for name in calls]
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows
+
+    @classmethod
+    def write_pstats(cls, file_path: Path):
+        """
+        단계 측정값을 pstats 형식으로 저장 (pstats.Stats, snakeviz, gprof2dot 등에서 열 수 있음)
+        단계 이름은 ("<stage>", 0, 이름) 함수로 기록합니다.
+        """
+        entries = {}
+        for path, stat in cls.stats.items():
+            key = ("<stage>", 0, path[-1])
+            cc, nc, tt, ct, callers = entries.get(key, (0, 0, 0.0, 0.0, {}))
+            entries[key] = (cc + stat.calls, nc + stat.calls, tt + stat.own, ct + stat.total, callers)
+            if len(path) > 1:
+                caller = ("<stage>", 0, path[-2])
+                c_cc, c_nc, c_tt, c_ct = callers.get(caller, (0, 0, 0.0, 0.0))
+                callers[caller] = (
+                    c_cc + stat.calls,
+                    c_nc + stat.calls,
+                    c_tt + stat.own,
+                    c_ct + stat.total,
+                )
+
+        with open(file_path, "wb") as f:
+            marshal.dump(entries, f)
+
+    @classmethod
+    def write_folded(cls, file_path: Path):
+        """
+        flamegraph.pl / speedscope용 folded 스택 파일 저장
+        스택 샘플링을 사용했으면 샘플 수, 아니면 단계별 자기 시간(마이크로초)을 기록합니다.
+        """
+        with open(file_path, "w") as f:
+            if cls.sampler is not None:
+                for stack, count in sorted(cls.sampler.counts.items()):
+                    f.write(f"{stack} {count}\n")
+            else:
+                for path, stat in sorted(cls.stats.items()):
+                    own_us = int(stat.own * 1e6)
+                    if own_us > 0:
+                        f.write(f"{';'.join(path)} {own_us}\n")
+
+    @classmethod
+    def print_summary(cls):
+        """자기 시간 기준 단계/커널 순위 출력"""
+        wall = time.perf_counter() - cls.started_at
+        rows = cls.summarize()
+
+        print("-" * 80)
+        print(f"프로파일 요약 (전체 {wall:.2f}초, 자기 시간 순)")
+        print(f"{'단계/커널':<36} {'호출 수':>8} {'누적(초)':>10} {'자기(초)':>10} {'비율':>7}")
+        for name, calls, total, own in rows[: cls.SUMMARY_TOP]:
+            ratio = own / wall * 100 if wall > 0 else 0.0
+            print(f"{name:<36} {calls:>8} {total:>10.3f} {own:>10.3f} {ratio:>6.1f}%")
+
+    @classmethod
+    def report(cls, output_prefix: str):
+        """측정 종료 후 요약 출력 및 pstats/folded 파일 저장"""
+        if not cls.enabled:
+            return
+        if cls.sampler is not None:
+            cls.sampler.stop()
+        cls.enabled = False
+
+        cls.print_summary()
+        pstats_path = Path(f"{output_prefix}.pstats")
+        folded_path = Path(f"{output_prefix}.folded")
+        cls.write_pstats(pstats_path)
+        cls.write_folded(folded_path)
+        print(f"pstats 파일: {pstats_path}")
+        print(f"flamegraph 스택 파일: {folded_path}")
@@ -0,0 +1,88 @@
+"""
+월드컵 간에 공유하는 전역 노래 지문 저장소 모듈
+노래 지문을 (지문 파라미터 버전, 유튜브 영상 ID) 기준으로 한 번만 저장
+"""
+
+import hashlib
+import json
+from pathlib import Path
+import logging
+
+from src.utils.compact_audioprint import CompactAudioprint
+
+logger = logging.getLogger(__name__)
+
+
+class SongStore:
+    """유튜브 영상 ID 기준 노래 지문 저장소"""
+
+    base_path = Path("/data/songs")
+
+    # 저장소 지문 저장 형식 (compact: 메모리 매핑 가능, compact_z: zlib 압축)
+    ENCODINGS = ("compact", "compact_z")
+    default_encoding = "compact"
+
+    @staticmethod
+    def get_version(params: dict) -> str:
+        """지문 파라미터로부터 저장소 버전 문자열 생성"""
+        params_json = json.dumps(params, sort_keys=True)
+        return hashlib.sha1(params_json.encode("utf-8")).hexdigest()[:10]
+
+    @classmethod
+    def get_version_path(cls, version: str) -> Path:
+        """버전별 저장소 디렉토리 경로"""
+        return cls.base_path / version
+
+    @classmethod
+    def get_path(cls, version: str, video_id: str) -> Path:
+        """노래 지문 파일 경로"""
+        return cls.get_version_path(version) / f"{video_id}.npz"
+
+    @classmethod
+    def contains(cls, version: str, video_id: str) -> bool:
+        """저장소에 노래 지문이 있는지 확인"""
+        return cls.get_path(version, video_id).exists()
+
+    @classmethod
+    def register_version(cls, version: str, params: dict):
+        """버전 디렉토리 생성 및 지문 파라미터 기록"""
+        version_path = cls.get_version_path(version)
+        version_path.mkdir(parents=True, exist_ok=True)
+
+        params_path = version_path / "params.json"
+        if not params_path.exists():
+            with open(params_path, "w", encoding="utf-8") as f:
+                json.dump(params, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    @classmethod
+    def load_params(cls, version: str) -> dict:
+        """버전의 지문 파라미터 (기록되지 않았으면 None)"""
+        params_path = cls.get_version_path(version) / "params.json"
+        if not params_path.exists():
+            return None
+        with open(params_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @classmethod
+    def save(
+        cls, version: str, video_id: str, audioprint: CompactAudioprint, encoding: str = None
+    ) -> Path:
+        """노래 지문을 저장소에 저장"""
+        encoding = encoding or cls.default_encoding
+        if encoding not in cls.ENCODINGS:
+            raise ValueError(f"저장소에서 지원하지 않는 지문 저장 형식입니다: {encoding}")
+
+        save_path = cls.get_path(version, video_id)
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 부분 저장된 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+        temp_path = save_path.with_suffix(".tmp")
+        audioprint.save(temp_path, compress=encoding == "compact_z")
+        temp_path.replace(save_path)
+
+        return save_path
+
+    @classmethod
+    def load(cls, version: str, video_id: str) -> CompactAudioprint:
+        """저장소에서 노래 지문 로드 (비압축 지문은 메모리 매핑으로 공유)"""
+        return CompactAudioprint.load(cls.get_path(version, video_id), mmap=True)
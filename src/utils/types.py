@@ -13,6 +13,18 @@ class TimelineData:
     start_time: int
 
 
+@nb.njit(cache=True, nogil=True)
+def _build_numba_dict(sorted_hashes, sorted_times):
+    """해시 기준으로 정렬된 배열을 해시별 시간 배열 딕셔너리로 묶습니다."""
+    numba_dict = nb.typed.Dict.empty(key_type=types.int32, value_type=types.float32[:])
+    start = 0
+    for idx in range(1, len(sorted_hashes) + 1):
+        if idx == len(sorted_hashes) or sorted_hashes[idx] != sorted_hashes[start]:
+            numba_dict[sorted_hashes[start]] = sorted_times[start:idx].copy()
+            start = idx
+    return numba_dict
+
+
 class TypeConverter:
 
     @staticmethod
@@ -44,3 +56,14 @@ class TypeConverter:
             )
 
         return numba_dict
+
+    @staticmethod
+    def group_hash_arrays(hashes: np.ndarray, times: np.ndarray) -> nb.typed.Dict:
+        """
+        해시/시간 배열을 해시별 시간 배열의 nb.typed.Dict로 묶습니다.
+        """
+        # 안정 정렬로 같은 해시 안에서 시간 순서 유지
+        order = np.argsort(hashes, kind="stable")
+        sorted_hashes = np.ascontiguousarray(hashes[order], dtype=np.int32)
+        sorted_times = np.ascontiguousarray(times[order], dtype=np.float32)
+        return _build_numba_dict(sorted_hashes, sorted_times)
@@ -0,0 +1,616 @@
+"""
+월드컵 역색인 관리 모듈
+월드컵 노래 지문의 포스팅을 해시 기준으로 정렬한 세그먼트 파일로 저장하고,
+세대(generation) 번호가 붙은 스냅샷으로 노래 추가/삭제/교체를 전체 재구축 없이 반영
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+import fcntl
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numba as nb
+import numpy as np
+
+from src.utils.compact_audioprint import CompactAudioprint, memmap_npz
+
+logger = logging.getLogger(__name__)
+
+PARTITIONS_PER_WORKER = 4  # 병렬 정렬에서 작업자당 해시 범위 수 (범위 크기 편차 흡수)
+PARTITION_SAMPLE = 1 << 16  # 해시 범위 경계를 정할 포스팅 표본 수
+
+
+@nb.njit(cache=True)
+def _partition_postings(hashes, bounds):
+    """
+    포스팅을 해시 범위별로 모은 순서와 범위 시작 위치
+    (범위 안에서는 원래 순서를 유지하므로 범위별 안정 정렬 결과가 전체 안정 정렬과 같음)
+    """
+    n_parts = len(bounds) - 1
+    part_starts = np.zeros(n_parts + 1, dtype=np.int64)
+    for i in range(len(hashes)):
+        part_starts[np.searchsorted(bounds, hashes[i], side="right")] += 1
+    part_starts = np.cumsum(part_starts)
+
+    fill = part_starts[:-1].copy()
+    order = np.empty(len(hashes), dtype=np.int64)
+    for i in range(len(hashes)):
+        part = np.searchsorted(bounds, hashes[i], side="right") - 1
+        order[fill[part]] = i
+        fill[part] += 1
+    return order, part_starts
+
+
+@nb.njit(cache=True, parallel=True)
+def _sort_partitions(hashes, order, part_starts):
+    """해시 범위마다 병렬로 해시 기준 안정 정렬 (order를 제자리에서 갱신)"""
+    for p in nb.prange(len(part_starts) - 1):
+        start, end = part_starts[p], part_starts[p + 1]
+        part = order[start:end].copy()
+        order[start:end] = part[np.argsort(hashes[part], kind="mergesort")]
+    return order
+
+
+@dataclass
+class IndexSegment:
+    """해시 기준으로 정렬된 포스팅 세그먼트"""
+
+    name: str
+    hashes: np.ndarray  # uint32
+    songs: np.ndarray  # int32, 노래 ID
+    frames: np.ndarray  # uint16, 프레임 인덱스
+
+    def __len__(self):
+        return len(self.hashes)
+
+
+class WorldcupIndex:
+    """월드컵 역색인 스냅샷 (특정 세대의 세그먼트 목록 + 노래 테이블)"""
+
+    INDEX_DIR = "index"
+    CURRENT_FILE = "CURRENT"
+    LOCK_FILE = "LOCK"
+    MERGE_LOCK_FILE = "MERGE_LOCK"
+
+    MAX_DELTA_SEGMENTS = 4  # 델타 세그먼트가 이보다 많으면 병합
+    MERGE_RETRIES = 3  # 병합하는 동안 병합 대상 세그먼트가 바뀌었을 때 다시 시도할 횟수
+    KEEP_GENERATIONS = 3  # 실행 중인 작업을 위해 남겨둘 이전 세대 수
+    build_workers = None  # 포스팅 정렬 작업 스레드 수 (기본: CPU 수, 1이면 전체 한 번에 정렬)
+
+    def __init__(
+        self,
+        index_path: Path,
+        generation: int,
+        songs: Dict[int, dict],
+        segments: List[IndexSegment],
+        next_song_id: int,
+        max_hash_postings: int = None,
+        capped_hashes: np.ndarray = None,
+    ):
+        self.index_path = index_path
+        self.generation = generation
+        self.songs = songs
+        self.max_hash_postings = max_hash_postings
+        # 역색인 전체 포스팅 수가 상한을 넘은 해시 (정렬됨)
+        self.capped_hashes = np.empty(0, dtype=np.uint32) if capped_hashes is None else capped_hashes
+
+        # 델타 세그먼트가 상한을 넘긴 해시의 포스팅이 이전 세그먼트에 남아 있으면 메모리에서 제외 (병합 전까지)
+        self.segments = [self.drop_hashes(segment, self.capped_hashes) for segment in segments]
+        self.stale_segment_count = sum(
+            len(filtered) != len(segment) for filtered, segment in zip(self.segments, segments)
+        )
+
+        # 노래 ID별 메타데이터 배열 (삭제된 노래 ID 포함)
+        n_songs = next_song_id
+        self.names = [""] * n_songs
+        self.frame_durations = np.zeros(n_songs, dtype=np.float64)
+        self.hash_counts = np.zeros(n_songs, dtype=np.int64)
+        self.live_songs = np.zeros(n_songs, dtype=np.bool_)
+        for song_id, song in songs.items():
+            self.names[song_id] = song["name"]
+            self.frame_durations[song_id] = song["frame_duration"]
+            self.hash_counts[song_id] = song["hash_count"]
+            self.live_songs[song_id] = True
+
+    def __len__(self):
+        return len(self.songs)
+
+    @classmethod
+    def set_config(cls, build_workers: int = None):
+        """역색인 구축 관련 설정"""
+        if build_workers is not None:
+            cls.build_workers = build_workers
+
+    def keys(self):
+        """노래 이름 목록"""
+        return [song["name"] for song in self.songs.values()]
+
+    @property
+    def delta_segment_count(self) -> int:
+        """기본 세그먼트를 제외한 델타 세그먼트 수"""
+        return max(len(self.segments) - 1, 0)
+
+    @property
+    def needs_merge(self) -> bool:
+        """델타 세그먼트가 많거나 상한을 넘은 해시의 포스팅이 남은 세그먼트가 있으면 병합 필요"""
+        return self.delta_segment_count > self.MAX_DELTA_SEGMENTS or self.stale_segment_count > 0
+
+    # ------------------------------------------------------------------
+    # 경로 / 세대 관리
+    # ------------------------------------------------------------------
+    @classmethod
+    def get_index_path(cls, worldcup_path: Path) -> Path:
+        """월드컵 폴더의 역색인 디렉토리 경로"""
+        return worldcup_path / cls.INDEX_DIR
+
+    @classmethod
+    def exists(cls, worldcup_path: Path) -> bool:
+        """역색인이 생성되어 있는지 확인"""
+        return (cls.get_index_path(worldcup_path) / cls.CURRENT_FILE).exists()
+
+    @staticmethod
+    def _generation_path(index_path: Path, generation: int) -> Path:
+        return index_path / f"gen-{generation:06d}.json"
+
+    @classmethod
+    def _read_current(cls, index_path: Path) -> int:
+        current_path = index_path / cls.CURRENT_FILE
+        if not current_path.exists():
+            return 0
+        return int(current_path.read_text().strip())
+
+    @classmethod
+    def _read_generation(cls, index_path: Path, generation: int = None) -> dict:
+        """세대 정보 읽기 (없으면 빈 세대)"""
+        if generation is None:
+            generation = cls._read_current(index_path)
+        if generation == 0:
+            return {"generation": 0, "next_song_id": 0, "segments": [], "songs": {}}
+
+        with open(cls._generation_path(index_path, generation), "r", encoding="utf-8") as f:
+            state = json.load(f)
+        state["songs"] = {int(k): v for k, v in state["songs"].items()}
+        return state
+
+    @classmethod
+    def _commit_generation(cls, index_path: Path, state: dict) -> int:
+        """새 세대 정보를 기록하고 CURRENT를 원자적으로 교체"""
+        generation = cls._read_current(index_path) + 1
+        state = {**state, "generation": generation}
+
+        generation_path = cls._generation_path(index_path, generation)
+        with open(generation_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+
+        temp_path = index_path / f"{cls.CURRENT_FILE}.tmp"
+        temp_path.write_text(str(generation))
+        temp_path.replace(index_path / cls.CURRENT_FILE)
+
+        cls._cleanup(index_path, generation)
+        return generation
+
+    @classmethod
+    def _cleanup(cls, index_path: Path, generation: int):
+        """오래된 세대 정보와 참조되지 않는 세그먼트 삭제"""
+        kept_segments = set()
+        for path in index_path.glob("gen-*.json"):
+            gen = int(path.stem.split("-")[1])
+            if gen <= generation - cls.KEEP_GENERATIONS:
+                path.unlink()
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            kept_segments.update(state["segments"])
+            if state.get("capped"):
+                kept_segments.add(state["capped"])
+
+        for path in [*index_path.glob("seg-*.npz"), *index_path.glob("capped-*.npy")]:
+            if path.stem not in kept_segments:
+                path.unlink()
+
+    @classmethod
+    @contextmanager
+    def _lock(cls, index_path: Path):
+        """역색인 쓰기 잠금 (프로세스 간)"""
+        index_path.mkdir(parents=True, exist_ok=True)
+        with open(index_path / cls.LOCK_FILE, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @classmethod
+    @contextmanager
+    def _merge_lock(cls, index_path: Path, wait: bool = True):
+        """
+        병합 잠금 (프로세스 간, 한 번에 병합 하나만 실행)
+        wait가 False면 다른 병합이 잡고 있을 때 기다리지 않고 False를 넘깁니다.
+        """
+        index_path.mkdir(parents=True, exist_ok=True)
+        with open(index_path / cls.MERGE_LOCK_FILE, "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @classmethod
+    def is_merging(cls, worldcup_path: Path) -> bool:
+        """다른 프로세스/스레드가 병합 중인지 확인"""
+        with cls._merge_lock(cls.get_index_path(worldcup_path), wait=False) as acquired:
+            return not acquired
+
+    # ------------------------------------------------------------------
+    # 세그먼트 입출력
+    # ------------------------------------------------------------------
+    @classmethod
+    def sort_order(cls, hashes: np.ndarray, workers: int = None) -> np.ndarray:
+        """
+        포스팅을 해시 기준으로 안정 정렬하는 순서 (np.argsort(kind="stable")와 같은 결과)
+        작업자가 여러 개면 표본 분위수로 포스팅 수가 비슷한 해시 범위로 나누고 범위마다 병렬 정렬합니다.
+        """
+        workers = workers or cls.build_workers or os.cpu_count() or 1
+        workers = min(workers, nb.config.NUMBA_NUM_THREADS)
+        if workers <= 1 or len(hashes) < PARTITION_SAMPLE:
+            return np.argsort(hashes, kind="stable")
+
+        step = max(len(hashes) // PARTITION_SAMPLE, 1)
+        quantiles = np.arange(1, workers * PARTITIONS_PER_WORKER) / (workers * PARTITIONS_PER_WORKER)
+        inner = np.unique(np.quantile(hashes[::step], quantiles, method="lower").astype(np.int64) + 1)
+        bounds = np.concatenate(([0], inner[(inner > 0) & (inner < 1 << 32)], [1 << 32]))
+
+        hashes = hashes.astype(np.int64)
+        order, part_starts = _partition_postings(hashes, bounds)
+        threads = nb.get_num_threads()
+        nb.set_num_threads(workers)
+        try:
+            return _sort_partitions(hashes, order, part_starts)
+        finally:
+            nb.set_num_threads(threads)
+
+    @classmethod
+    def build_postings(cls, audioprints: List[Tuple[int, CompactAudioprint]], workers: int = None):
+        """노래 지문들을 해시 기준으로 정렬된 (해시, 노래 ID, 프레임) 포스팅으로 변환"""
+        if not audioprints:
+            return (
+                np.empty(0, dtype=np.uint32),
+                np.empty(0, dtype=np.int32),
+                np.empty(0, dtype=np.uint16),
+            )
+
+        hashes = np.concatenate(
+            [np.repeat(ap.hashes, np.diff(ap.offsets.astype(np.int64))) for _, ap in audioprints]
+        ).astype(np.uint32)
+        songs = np.concatenate(
+            [np.full(len(ap.frames), song_id, dtype=np.int32) for song_id, ap in audioprints]
+        )
+        frames = np.concatenate([ap.frames for _, ap in audioprints]).astype(np.uint16)
+
+        order = cls.sort_order(hashes, workers)
+        return hashes[order], songs[order], frames[order]
+
+    @staticmethod
+    def drop_frequent_hashes(
+        hashes, songs, frames, max_postings: int = None, capped=None, segments: List[IndexSegment] = ()
+    ):
+        """
+        해시 기준으로 정렬된 포스팅에서 역색인 전체 포스팅 수가 max_postings보다 많은 해시(여러 노래/반복 구간에 흔한 해시)를 제거
+        포스팅 수는 이 포스팅과 이미 있는 세그먼트(segments)의 포스팅을 합친 수이고, 이전에 상한을 넘은 해시(capped)도 제거합니다.
+        조회 해시 하나가 만드는 (노래, 시간 오프셋) 쌍 수가 max_postings 이하로 제한되어,
+        노래 전체 길이 지문처럼 포스팅이 많아도 매칭 비용이 흔한 해시에 몰리지 않습니다.
+
+        Returns:
+            (해시, 노래, 프레임, 상한을 넘은 해시 전체) - 상한이 없으면 capped를 그대로 반환
+        """
+        capped = np.empty(0, dtype=np.uint32) if capped is None else capped
+        if not max_postings or not len(hashes):
+            return hashes, songs, frames, capped
+
+        starts = np.flatnonzero(np.concatenate(([True], hashes[1:] != hashes[:-1])))
+        unique_hashes = hashes[starts]
+        counts = np.diff(np.append(starts, len(hashes))).astype(np.int64)
+        for segment in segments:
+            counts += np.searchsorted(segment.hashes, unique_hashes, side="right")
+            counts -= np.searchsorted(segment.hashes, unique_hashes, side="left")
+
+        posting_counts = np.diff(np.append(starts, len(hashes)))
+        capped = np.union1d(capped, unique_hashes[counts > max_postings]).astype(np.uint32)
+        keep = np.repeat(~np.isin(unique_hashes, capped, assume_unique=True), posting_counts)
+        return hashes[keep], songs[keep], frames[keep], capped
+
+    @staticmethod
+    def drop_hashes(segment: IndexSegment, dropped: np.ndarray) -> IndexSegment:
+        """세그먼트에서 해시 목록(정렬됨)의 포스팅을 제거한 세그먼트 (제거할 포스팅이 없으면 그대로)"""
+        if not len(dropped) or not len(segment):
+            return segment
+        lo = np.searchsorted(segment.hashes, dropped, side="left")
+        hi = np.searchsorted(segment.hashes, dropped, side="right")
+        present = hi > lo
+        if not present.any():
+            return segment
+
+        # 제거 구간 [lo, hi)마다 +1/-1을 누적하여 구간 밖 포스팅만 유지
+        marks = np.zeros(len(segment) + 1, dtype=np.int64)
+        np.add.at(marks, lo[present], 1)
+        np.add.at(marks, hi[present], -1)
+        keep = np.cumsum(marks[:-1]) == 0
+        return IndexSegment(segment.name, segment.hashes[keep], segment.songs[keep], segment.frames[keep])
+
+    @staticmethod
+    def _write_segment(index_path: Path, name: str, hashes, songs, frames):
+        """세그먼트를 비압축 .npz 파일로 저장 (메모리 매핑 가능)"""
+        temp_path = index_path / f"{name}.tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(f, hashes=hashes, songs=songs, frames=frames)
+        temp_path.replace(index_path / f"{name}.npz")
+
+    @staticmethod
+    def _write_capped(index_path: Path, name: str, capped: np.ndarray) -> str:
+        """상한을 넘은 해시 목록 저장 (없으면 저장하지 않고 None)"""
+        if not len(capped):
+            return None
+        temp_path = index_path / f"{name}.tmp"
+        with open(temp_path, "wb") as f:
+            np.save(f, capped)
+        temp_path.replace(index_path / f"{name}.npy")
+        return name
+
+    @staticmethod
+    def _load_capped(index_path: Path, state: dict) -> np.ndarray:
+        if not state.get("capped"):
+            return np.empty(0, dtype=np.uint32)
+        return np.load(index_path / f"{state['capped']}.npy")
+
+    @staticmethod
+    def _load_segment(index_path: Path, name: str) -> IndexSegment:
+        """세그먼트를 메모리 매핑으로 로드"""
+        arrays = memmap_npz(index_path / f"{name}.npz")
+        return IndexSegment(
+            name,
+            np.asarray(arrays["hashes"]),
+            np.asarray(arrays["songs"]),
+            np.asarray(arrays["frames"]),
+        )
+
+    @staticmethod
+    def _song_entry(name: str, audioprint: CompactAudioprint) -> dict:
+        return {
+            "name": name,
+            "frame_duration": audioprint.frame_duration,
+            "hash_count": len(audioprint),
+        }
+
+    # ------------------------------------------------------------------
+    # 스냅샷 열기
+    # ------------------------------------------------------------------
+    @classmethod
+    def open(cls, worldcup_path: Path, generation: int = None) -> "WorldcupIndex":
+        """특정 세대(기본: 최신)의 역색인 스냅샷 열기"""
+        index_path = cls.get_index_path(worldcup_path)
+        state = cls._read_generation(index_path, generation)
+        segments = [cls._load_segment(index_path, name) for name in state["segments"]]
+        return cls(
+            index_path,
+            state["generation"],
+            state["songs"],
+            segments,
+            state["next_song_id"],
+            state.get("max_hash_postings"),
+            cls._load_capped(index_path, state),
+        )
+
+    def copy_snapshot(self, worldcup_path: Path):
+        """이 세대 스냅샷(세대 정보와 세그먼트)만 다른 폴더의 역색인으로 복사 (세대 번호 유지)"""
+        index_path = self.get_index_path(worldcup_path)
+        index_path.mkdir(parents=True, exist_ok=True)
+        for segment in self.segments:
+            shutil.copyfile(
+                self.index_path / f"{segment.name}.npz", index_path / f"{segment.name}.npz"
+            )
+        capped_name = self._read_generation(self.index_path, self.generation).get("capped")
+        if capped_name:
+            shutil.copyfile(self.index_path / f"{capped_name}.npy", index_path / f"{capped_name}.npy")
+        shutil.copyfile(
+            self._generation_path(self.index_path, self.generation),
+            self._generation_path(index_path, self.generation),
+        )
+        (index_path / self.CURRENT_FILE).write_text(str(self.generation))
+
+    # ------------------------------------------------------------------
+    # 구축 / 갱신 / 병합
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(
+        cls,
+        worldcup_path: Path,
+        audioprints: Dict[str, CompactAudioprint],
+        workers: int = None,
+        max_hash_postings: int = None,
+    ) -> int:
+        """
+        월드컵 전체 지문으로 역색인을 새로 구축 (기본 세그먼트 1개, 포스팅은 workers개 스레드로 정렬)
+        max_hash_postings가 주어지면 포스팅이 그보다 많은 해시를 제외하고, 이후 갱신/병합에도 역색인 전체 포스팅 수 기준으로
+        같은 상한을 적용합니다. (노래 삭제로 포스팅 수가 줄어도 한 번 제외한 해시는 다시 구축할 때까지 제외)
+        """
+        index_path = cls.get_index_path(worldcup_path)
+        with cls._lock(index_path):
+            generation = cls._read_current(index_path) + 1
+            songs = {}
+            numbered = []
+            for song_id, (name, audioprint) in enumerate(audioprints.items()):
+                songs[song_id] = cls._song_entry(name, audioprint)
+                numbered.append((song_id, audioprint))
+
+            segment_name = f"seg-{generation:06d}"
+            *postings, capped = cls.drop_frequent_hashes(
+                *cls.build_postings(numbered, workers), max_hash_postings
+            )
+            cls._write_segment(index_path, segment_name, *postings)
+            return cls._commit_generation(
+                index_path,
+                {
+                    "next_song_id": len(songs),
+                    "segments": [segment_name],
+                    "songs": songs,
+                    "max_hash_postings": max_hash_postings,
+                    "capped": cls._write_capped(index_path, f"capped-{generation:06d}", capped),
+                },
+            )
+
+    @classmethod
+    def update(
+        cls,
+        worldcup_path: Path,
+        added: Dict[str, CompactAudioprint] = None,
+        removed: List[str] = None,
+    ) -> int:
+        """
+        노래 추가/삭제를 델타 세그먼트로 반영한 새 세대를 만듭니다.
+        같은 이름을 삭제와 추가에 함께 넣으면 교체가 됩니다.
+        """
+        added = added or {}
+        removed = set(removed or [])
+        index_path = cls.get_index_path(worldcup_path)
+
+        with cls._lock(index_path):
+            state = cls._read_generation(index_path)
+            songs = dict(state["songs"])
+            next_song_id = state["next_song_id"]
+
+            # 삭제: 노래 테이블에서만 제거 (포스팅은 병합 시 정리)
+            names = {song["name"]: song_id for song_id, song in songs.items()}
+            for name in removed:
+                if name not in names:
+                    raise ValueError(f"역색인에 없는 노래입니다: {name}")
+                del songs[names.pop(name)]
+
+            # 추가: 새 노래 ID로 델타 세그먼트 작성
+            numbered = []
+            for name, audioprint in added.items():
+                if name in names:
+                    raise ValueError(f"역색인에 이미 있는 노래입니다: {name}")
+                songs[next_song_id] = cls._song_entry(name, audioprint)
+                numbered.append((next_song_id, audioprint))
+                next_song_id += 1
+
+            segments = list(state["segments"])
+            capped_name = state.get("capped")
+            if numbered:
+                generation = cls._read_current(index_path) + 1
+                segment_name = f"seg-{generation:06d}"
+                # 상한은 기존 세그먼트 포스팅(삭제된 노래 포함, 병합 전까지)을 더한 역색인 전체 포스팅 수 기준
+                capped = cls._load_capped(index_path, state)
+                *postings, new_capped = cls.drop_frequent_hashes(
+                    *cls.build_postings(numbered),
+                    state.get("max_hash_postings"),
+                    capped,
+                    [cls._load_segment(index_path, name) for name in segments],
+                )
+                cls._write_segment(index_path, segment_name, *postings)
+                segments.append(segment_name)
+                if len(new_capped) != len(capped):
+                    capped_name = cls._write_capped(index_path, f"capped-{generation:06d}", new_capped)
+
+            return cls._commit_generation(
+                index_path,
+                {
+                    **state,
+                    "next_song_id": next_song_id,
+                    "segments": segments,
+                    "songs": songs,
+                    "capped": capped_name,
+                },
+            )
+
+    @classmethod
+    def merge(cls, worldcup_path: Path, wait: bool = True) -> int:
+        """
+        현재 세대의 세그먼트를 하나로 병합하고 삭제된 노래의 포스팅과 상한을 넘은 해시의 포스팅을 제거합니다.
+        병합 중에도 다른 갱신과 조회는 계속 가능하며, 병합 결과는 새 세대로 반영됩니다.
+        병합은 병합 잠금으로 하나씩 실행하고, wait가 False면 다른 병합이 진행 중일 때 바로 현재 세대를 반환합니다.
+        """
+        index_path = cls.get_index_path(worldcup_path)
+        with cls._merge_lock(index_path, wait) as acquired:
+            if not acquired:
+                logger.info("다른 병합이 진행 중이라 병합하지 않습니다.")
+                return cls._read_current(index_path)
+
+            for _ in range(cls.MERGE_RETRIES):
+                generation = cls._merge_segments(worldcup_path)
+                if generation is not None:
+                    return generation
+                logger.warning("병합하는 동안 병합 대상 세그먼트가 바뀌어 다시 병합합니다.")
+        raise RuntimeError(f"역색인 병합 실패: 병합 대상 세그먼트가 계속 바뀝니다 ({index_path})")
+
+    @classmethod
+    def _merge_segments(cls, worldcup_path: Path) -> int:
+        """
+        병합 한 번 실행 (병합 대상 세그먼트가 잠금 전에 다른 병합으로 바뀌었으면 반영하지 않고 None)
+        """
+        index_path = cls.get_index_path(worldcup_path)
+        snapshot = cls.open(worldcup_path)
+        merged_names = [segment.name for segment in snapshot.segments]
+        has_removed = any(not snapshot.live_songs[s.songs].all() for s in snapshot.segments)
+        if len(merged_names) <= 1 and not has_removed and not snapshot.stale_segment_count:
+            return snapshot.generation
+
+        # 유효한 노래의 포스팅만 모아서 해시 기준 정렬 (잠금 없이 수행)
+        hashes, songs, frames = [], [], []
+        for segment in snapshot.segments:
+            live = snapshot.live_songs[segment.songs]
+            hashes.append(segment.hashes[live])
+            songs.append(segment.songs[live])
+            frames.append(segment.frames[live])
+        hashes = np.concatenate(hashes) if hashes else np.empty(0, dtype=np.uint32)
+        songs = np.concatenate(songs) if songs else np.empty(0, dtype=np.int32)
+        frames = np.concatenate(frames) if frames else np.empty(0, dtype=np.uint16)
+        order = cls.sort_order(hashes)
+
+        with cls._lock(index_path):
+            # 병합하는 동안 추가된 세그먼트와 노래 테이블 변경은 그대로 유지
+            state = cls._read_generation(index_path)
+            if not set(merged_names) <= set(state["segments"]):
+                # 다른 병합이 이미 대상 세그먼트를 합쳤으므로 그대로 반영하면 포스팅이 중복됨
+                return None
+            generation = cls._read_current(index_path) + 1
+            segment_name = f"seg-{generation:06d}"
+            added_names = [s for s in state["segments"] if s not in merged_names]
+            # 스냅샷 세그먼트는 열 때 이미 걸러졌고, 병합 중 갱신으로 늘어난 상한 초과 해시는 여기서 제외
+            capped = cls._load_capped(index_path, state)
+            *postings, new_capped = cls.drop_frequent_hashes(
+                hashes[order],
+                songs[order],
+                frames[order],
+                state.get("max_hash_postings"),
+                capped,
+                [cls._load_segment(index_path, name) for name in added_names],
+            )
+            cls._write_segment(index_path, segment_name, *postings)
+            capped_name = state.get("capped")
+            if len(new_capped) != len(capped):
+                capped_name = cls._write_capped(index_path, f"capped-{generation:06d}", new_capped)
+
+            generation = cls._commit_generation(
+                index_path,
+                {**state, "segments": [segment_name] + added_names, "capped": capped_name},
+            )
+        logger.info(f"역색인 병합 완료: 세그먼트 {len(merged_names)}개 -> 1개 (세대 {generation})")
+        return generation
+
+    @classmethod
+    def merge_in_background(cls, worldcup_path: Path) -> threading.Thread:
+        """역색인 병합을 백그라운드 스레드에서 실행"""
+        thread = threading.Thread(target=cls.merge, args=(worldcup_path,), name="index-merge")
+        thread.start()
+        return thread
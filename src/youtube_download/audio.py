@@ -5,8 +5,10 @@ from pathlib import Path
 import logging
 from typing import List, Tuple
 import numpy as np
-import yt_dlp
-import essentia.standard as es
+
+from src.utils.formatter import TimeFormatter
+from src.youtube_download.mapped_audio import MappedAudio
+from src.youtube_download.segmented_audio import SegmentedAudioLoader
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +74,8 @@ class AudioDownloader:
     @classmethod
     def _download(cls, urls: list, opts: dict):
         """유튜브 오디오 다운로드"""
+        import yt_dlp
+
         with yt_dlp.YoutubeDL(opts) as ydl:
             ydl.download(urls)
         return True
@@ -113,15 +117,33 @@ class AudioDownloader:
         return download_counts
 
     @classmethod
-    def load_audio(cls, youtube_url: str) -> Tuple[np.ndarray, Path]:
-        """하나의 유튜브 오디오 다운로드"""
+    def load_audio(
+        cls, youtube_url: str, max_decoded_bytes: int = None
+    ) -> Tuple[np.ndarray, Path]:
+        """
+        하나의 유튜브 오디오 다운로드
+        디코딩한 오디오가 max_decoded_bytes보다 크면 WAV 파일을 메모리 매핑하여 구간별로 읽습니다.
+        """
+        import essentia.standard as es
+
         try:
             # 오디오 다운로드
             ydl_opts = cls._get_ydl_opts()
             cls._download([youtube_url], ydl_opts)
 
             audio_path = next(cls.get_downloads_path())
-            _, _, sample_rate = cls.get_audio_metadata(audio_path)
+            _, duration, sample_rate = cls.get_audio_metadata(audio_path)
+
+            # float32 모노 디코딩 크기가 한도를 넘으면 메모리 매핑
+            decoded_bytes = duration * sample_rate * np.dtype(np.float32).itemsize
+            if max_decoded_bytes is not None and decoded_bytes > max_decoded_bytes:
+                try:
+                    logger.info(
+                        f"디코딩 크기({decoded_bytes / (1024 * 1024):.0f}MB)가 한도를 넘어 메모리 매핑으로 읽습니다."
+                    )
+                    return MappedAudio(audio_path), audio_path
+                except ValueError as e:
+                    logger.warning(f"메모리 매핑 실패, 전체 디코딩: {e}")
 
             audio_data = es.MonoLoader(filename=str(audio_path), sampleRate=sample_rate)()
 
@@ -130,9 +152,34 @@ class AudioDownloader:
             logger.error(f"유튜브 다운로드 실패: {e}")
             return None
 
+    @classmethod
+    def decode_audio(
+        cls, youtube_url: str, max_decoded_bytes: int = None, sample_rate: int = None
+    ) -> Tuple[object, Tuple[str, int, int]]:
+        """
+        요청 구간(download_start ~ download_end)을 WAV 파일로 받아 다시 디코딩하지 않고
+        가장 작은 충분한 오디오 형식의 스트림에서 float32 모노 PCM으로 한 번만 디코딩합니다.
+        디코딩 크기가 max_decoded_bytes보다 크면 download_dir의 float32 WAV 파일에 기록하고 메모리 매핑합니다.
+
+        Returns:
+            (오디오, (이름, 길이, 샘플레이트)) - 메타데이터는 같은 디코딩 결과에서 계산
+        """
+        cls.download_dir.mkdir(parents=True, exist_ok=True)
+        return SegmentedAudioLoader.load_audio(
+            youtube_url,
+            TimeFormatter.format_time_to_int(cls.download_start),
+            TimeFormatter.format_time_to_int(cls.download_end),
+            max_decoded_bytes,
+            cls.download_dir,
+            segment_count=1,
+            sample_rate=sample_rate,
+        )
+
     @classmethod
     def get_audio_metadata(cls, audio_path: Path):
         """오디오 메타데이터 추출"""
+        import essentia.standard as es
+
         metadata = es.MetadataReader(filename=str(audio_path))()
         duration = int(metadata[-4])
         sample_rate = int(metadata[-2])
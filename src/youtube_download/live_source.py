@@ -0,0 +1,238 @@
+"""
+라이브 오디오 소스 모듈
+계속 길어지는 오디오(파이프, 기록 중인 파일, 세그먼트 디렉토리, 라이브 스트림 URL)를
+float32 모노 샘플 조각으로 읽습니다. 아직 데이터가 없으면 빈 배열, 끝나면 None을 반환합니다.
+"""
+
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+import logging
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from src.youtube_download.mapped_audio import (
+    WAVE_FORMAT_IEEE_FLOAT,
+    WAVE_FORMAT_PCM,
+    MappedAudio,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LiveSource:
+    """라이브 오디오 소스 공통 인터페이스"""
+
+    poll_interval = 0.2  # 새 데이터 확인 간격 (초)
+    idle_timeout = 30.0  # 이 시간 동안 새 데이터가 없으면 끝난 것으로 판단 (초)
+    read_size = 1 << 16  # 한 번에 읽을 최대 샘플 수
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def set_config(cls, poll_interval: float = None, idle_timeout: float = None):
+        """라이브 소스 관련 설정"""
+        if poll_interval:
+            cls.poll_interval = poll_interval
+        if idle_timeout:
+            cls.idle_timeout = idle_timeout
+
+    @staticmethod
+    def open(spec: str, sample_rate: int = 44100) -> "LiveSource":
+        """
+        소스 문자열로 라이브 소스 생성
+        "-": 표준 입력 (float32 모노 PCM), 디렉토리: 세그먼트 디렉토리, 파일: 기록 중인 WAV/raw 파일,
+        그 외: ffmpeg로 읽는 라이브 스트림 URL
+        """
+        if spec == "-":
+            return PipeSource(sys.stdin.buffer, sample_rate)
+        path = Path(spec)
+        if path.is_dir():
+            return SegmentDirectorySource(path, sample_rate)
+        if path.is_file():
+            return GrowingFileSource(path, sample_rate)
+        return FfmpegSource(spec, sample_rate)
+
+    def read(self) -> Optional[np.ndarray]:
+        """새 샘플 (없으면 빈 배열, 소스가 끝났으면 None)"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PipeSource(LiveSource):
+    """float32 모노 PCM 바이트 스트림 (읽기 스레드가 블로킹 읽기를 대신 수행)"""
+
+    def __init__(self, stream: BinaryIO, sample_rate: int):
+        super().__init__(sample_rate)
+        self.stream = stream
+        self.queue: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self.remainder = b""
+        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.thread.start()
+
+    def _read_loop(self):
+        # read1은 요청 크기를 다 채울 때까지 기다리지 않고 도착한 만큼 반환
+        read = getattr(self.stream, "read1", self.stream.read)
+        try:
+            while True:
+                data = read(self.read_size * 4)
+                if not data:
+                    break
+                self.queue.put(data)
+        finally:
+            self.queue.put(None)
+
+    def read(self) -> Optional[np.ndarray]:
+        try:
+            data = self.queue.get(timeout=self.poll_interval)
+        except queue.Empty:
+            return np.empty(0, dtype=np.float32)
+        if data is None:
+            self.queue.put(None)
+            return None
+
+        # 샘플 경계에 맞지 않는 나머지 바이트는 다음 읽기에 이어 붙임
+        data = self.remainder + data
+        usable = len(data) - len(data) % 4
+        self.remainder = data[usable:]
+        return np.frombuffer(data[:usable], dtype="<f4").astype(np.float32)
+
+
+class FfmpegSource(PipeSource):
+    """ffmpeg가 URL(라이브 스트림 포함)을 float32 모노 PCM으로 디코딩한 출력을 읽는 소스"""
+
+    def __init__(self, url: str, sample_rate: int):
+        from src.youtube_download.segmented_audio import SegmentedAudioLoader
+
+        source = SegmentedAudioLoader.resolve_source(url)
+        command = ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error"]
+        if source.http_headers:
+            headers = "".join(f"{k}: {v}\r\n" for k, v in source.http_headers.items())
+            command += ["-headers", headers]
+        command += ["-i", source.url, "-vn", "-ac", "1", "-ar", str(sample_rate), "-f", "f32le", "-"]
+        logger.info(f"라이브 스트림 디코딩 시작: {source.name}")
+
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE)
+        super().__init__(self.process.stdout, sample_rate)
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+        self.process.wait()
+
+
+class GrowingFileSource(LiveSource):
+    """
+    기록 중인 오디오 파일 (WAV PCM 16비트 / float 32비트, 그 외 확장자는 float32 모노 raw)
+    마지막으로 읽은 위치 뒤에 추가된 부분만 읽습니다.
+    """
+
+    def __init__(self, path: Path, sample_rate: int):
+        super().__init__(sample_rate)
+        self.path = Path(path)
+        self.file = open(self.path, "rb")
+        self.channels = 1
+        self.dtype = np.dtype("<f4")
+        self.scale = 1.0
+        self.position = 0
+        self.last_growth = time.monotonic()
+
+        if self.path.suffix.lower() == ".wav":
+            self._wait_for_header()
+
+    def _wait_for_header(self):
+        """WAV 헤더(data 청크 시작)가 기록될 때까지 대기"""
+        while True:
+            try:
+                format_tag, channels, sample_rate, bits, data_offset, _ = MappedAudio._read_header(
+                    self.path
+                )
+                break
+            except (ValueError, OSError, struct.error) as e:
+                if time.monotonic() - self.last_growth > self.idle_timeout:
+                    raise ValueError(f"WAV 헤더를 읽을 수 없습니다: {self.path} ({e})")
+                time.sleep(self.poll_interval)
+
+        if format_tag == WAVE_FORMAT_PCM and bits == 16:
+            self.dtype, self.scale = np.dtype("<i2"), 1 / 32768
+        elif format_tag != WAVE_FORMAT_IEEE_FLOAT or bits != 32:
+            raise ValueError(f"지원하지 않는 WAV 형식입니다: format={format_tag}, bits={bits}")
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.position = data_offset
+
+    def read(self) -> Optional[np.ndarray]:
+        frame_bytes = self.dtype.itemsize * self.channels
+        self.file.seek(self.position)
+        data = self.file.read(self.read_size * frame_bytes)
+        usable = len(data) - len(data) % frame_bytes
+        if usable == 0:
+            if time.monotonic() - self.last_growth > self.idle_timeout:
+                return None
+            time.sleep(self.poll_interval)
+            return np.empty(0, dtype=np.float32)
+
+        self.position += usable
+        self.last_growth = time.monotonic()
+        samples = np.frombuffer(data[:usable], dtype=self.dtype).reshape(-1, self.channels)
+        return (samples.astype(np.float32).mean(axis=1) * np.float32(self.scale)).astype(np.float32)
+
+    def close(self):
+        self.file.close()
+
+
+class SegmentDirectorySource(LiveSource):
+    """
+    세그먼트 파일이 이름 순서대로 추가되는 디렉토리 (HLS 세그먼트 저장 등)
+    더 새로운 세그먼트가 생기거나 idle_timeout 동안 바뀌지 않은 세그먼트를 완성된 것으로 보고 디코딩합니다.
+    """
+
+    SUFFIXES = (".wav", ".ts", ".aac", ".m4a", ".mp3", ".opus", ".webm", ".mp4")
+
+    def __init__(self, directory: Path, sample_rate: int):
+        super().__init__(sample_rate)
+        self.directory = Path(directory)
+        self.done: set = set()
+        self.last_growth = time.monotonic()
+
+    def _segments(self) -> List[Path]:
+        return sorted(
+            p
+            for p in self.directory.iterdir()
+            if p.is_file() and p.suffix.lower() in self.SUFFIXES and p.name not in self.done
+        )
+
+    def _decode(self, path: Path) -> np.ndarray:
+        """세그먼트 하나를 float32 모노로 디코딩 (샘플레이트가 같은 WAV는 직접 읽음)"""
+        if path.suffix.lower() == ".wav":
+            audio = MappedAudio(path)
+            if audio.sample_rate == self.sample_rate:
+                return audio[:]
+        command = ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-i", str(path)]
+        command += ["-vn", "-ac", "1", "-ar", str(self.sample_rate), "-f", "f32le", "-"]
+        output = subprocess.run(command, capture_output=True, check=True).stdout
+        return np.frombuffer(output, dtype="<f4").astype(np.float32)
+
+    def read(self) -> Optional[np.ndarray]:
+        segments = self._segments()
+        if segments:
+            segment = segments[0]
+            # 마지막 세그먼트는 기록 중일 수 있으므로 더 새로운 세그먼트가 생기거나 오래 바뀌지 않을 때만 읽음
+            settled = time.time() - segment.stat().st_mtime > self.idle_timeout
+            if len(segments) > 1 or settled:
+                self.done.add(segment.name)
+                self.last_growth = time.monotonic()
+                return self._decode(segment)
+        elif time.monotonic() - self.last_growth > self.idle_timeout:
+            return None
+
+        time.sleep(self.poll_interval)
+        return np.empty(0, dtype=np.float32)
@@ -0,0 +1,150 @@
+"""
+메모리 매핑 WAV 오디오 모듈
+긴 오디오를 전체 디코딩하지 않고 필요한 구간만 float32 모노로 변환하여 읽습니다.
+"""
+
+import mmap
+import struct
+from pathlib import Path
+
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class MappedAudio:
+    """
+    메모리 매핑한 WAV 파일 (PCM 16비트 / float 32비트)
+
+    audio[start:end]로 읽으면 해당 구간만 float32 모노로 변환하여 반환합니다.
+    (essentia MonoLoader와 같은 채널 평균 다운믹스, 16비트는 1/32768 스케일)
+    """
+
+    def __init__(self, audio_path: Path):
+        self.audio_path = Path(audio_path)
+        format_tag, self.channels, self.sample_rate, bits, data_offset, data_size = (
+            self._read_header(self.audio_path)
+        )
+
+        if format_tag == WAVE_FORMAT_PCM and bits == 16:
+            dtype, self.scale = np.dtype("<i2"), 1 / 32768
+        elif format_tag == WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+            dtype, self.scale = np.dtype("<f4"), 1.0
+        else:
+            raise ValueError(f"지원하지 않는 WAV 형식입니다: format={format_tag}, bits={bits}")
+
+        frame_count = data_size // (dtype.itemsize * self.channels)
+        with open(self.audio_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data_offset = data_offset
+        self.samples = np.frombuffer(
+            self._mmap, dtype=dtype, count=frame_count * self.channels, offset=data_offset
+        ).reshape(frame_count, self.channels)
+
+    @staticmethod
+    def _float_wav_header(frame_count: int, sample_rate: int) -> bytes:
+        """float32 모노 WAV 헤더 (44바이트)"""
+        data_size = frame_count * 4
+        return struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF",
+            36 + data_size,
+            b"WAVE",
+            b"fmt ",
+            16,
+            WAVE_FORMAT_IEEE_FLOAT,
+            1,
+            sample_rate,
+            sample_rate * 4,
+            4,
+            32,
+            b"data",
+            data_size,
+        )
+
+    @classmethod
+    def allocate(cls, audio_path: Path, frame_count: int, sample_rate: int) -> np.memmap:
+        """
+        float32 모노 WAV 파일을 만들고 데이터 구간을 쓰기 가능한 np.memmap으로 반환합니다.
+        (디코딩 결과를 파일에 바로 기록한 뒤 MappedAudio로 다시 열어 사용)
+        """
+        header = cls._float_wav_header(frame_count, sample_rate)
+        with open(audio_path, "wb") as f:
+            f.write(header)
+            f.truncate(len(header) + frame_count * 4)
+        return np.memmap(
+            audio_path, dtype="<f4", mode="r+", offset=len(header), shape=(frame_count,)
+        )
+
+    @classmethod
+    def truncate(cls, audio_path: Path, frame_count: int):
+        """allocate로 만든 WAV 파일을 frame_count 샘플 길이로 줄입니다."""
+        with open(audio_path, "r+b") as f:
+            sample_rate = struct.unpack_from("<I", f.read(28), 24)[0]
+            header = cls._float_wav_header(frame_count, sample_rate)
+            f.seek(0)
+            f.write(header)
+            f.truncate(len(header) + frame_count * 4)
+
+    @staticmethod
+    def _read_header(audio_path: Path):
+        """RIFF 청크를 순회하여 fmt/data 청크 정보를 읽습니다."""
+        with open(audio_path, "rb") as f:
+            riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+            if riff != b"RIFF" or wave != b"WAVE":
+                raise ValueError(f"WAV 파일이 아닙니다: {audio_path}")
+
+            fmt = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    raise ValueError(f"WAV data 청크가 없습니다: {audio_path}")
+                chunk_id, chunk_size = struct.unpack("<4sI", header)
+
+                if chunk_id == b"fmt ":
+                    body = f.read(chunk_size)
+                    format_tag, channels, sample_rate = struct.unpack("<HHI", body[:8])
+                    bits = struct.unpack("<H", body[14:16])[0]
+                    if format_tag == WAVE_FORMAT_EXTENSIBLE:
+                        # 서브포맷 GUID의 앞 2바이트가 실제 형식
+                        format_tag = struct.unpack("<H", body[24:26])[0]
+                    fmt = (format_tag, channels, sample_rate, bits)
+                elif chunk_id == b"data":
+                    if fmt is None:
+                        raise ValueError(f"WAV fmt 청크가 없습니다: {audio_path}")
+                    # 스트리밍으로 쓴 WAV는 data 크기가 비어있을 수 있으므로 파일 크기로 보정
+                    data_offset = f.tell()
+                    file_size = audio_path.stat().st_size
+                    data_size = min(chunk_size, file_size - data_offset) or file_size - data_offset
+                    return (*fmt, data_offset, data_size)
+                else:
+                    f.seek(chunk_size + (chunk_size & 1), 1)
+
+    def __len__(self):
+        return len(self.samples)
+
+    @property
+    def size(self) -> int:
+        """모노 샘플 수 (np.ndarray.size와 호환)"""
+        return len(self.samples)
+
+    @property
+    def duration(self) -> int:
+        """오디오 길이 (초)"""
+        return len(self.samples) // self.sample_rate
+
+    def __getitem__(self, index: slice) -> np.ndarray:
+        """구간을 float32 모노로 변환하여 반환"""
+        if not isinstance(index, slice):
+            raise TypeError("MappedAudio는 구간(slice) 읽기만 지원합니다.")
+        samples = np.asarray(self.samples[index], dtype=np.float32)
+        return (samples.mean(axis=1) * np.float32(self.scale)).astype(np.float32)
+
+    def release(self, end: int):
+        """end 샘플 이전 구간의 페이지 캐시를 반환 (이미 처리한 구간)"""
+        end_byte = self.data_offset + min(end, len(self.samples)) * self.samples.strides[0]
+        end_byte -= end_byte % mmap.PAGESIZE
+        if end_byte > 0:
+            self._mmap.madvise(mmap.MADV_DONTNEED, 0, end_byte)
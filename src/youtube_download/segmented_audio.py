@@ -0,0 +1,234 @@
+"""
+구간 분할 병렬 오디오 디코딩 모듈
+긴 영상의 요청 구간을 N개 구간으로 나누어 ffmpeg 프로세스들이 원본 스트림에서 동시에 가져와
+float32 모노 PCM으로 바로 디코딩하고, 하나의 연속 버퍼(또는 메모리 매핑 WAV 파일)에 이어 붙입니다.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+import logging
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+from src.youtube_download.mapped_audio import MappedAudio
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AudioSource:
+    """디코딩할 원본 (유튜브 스트림 URL, 일반 미디어 URL, 로컬 파일)"""
+
+    name: str
+    url: str
+    duration: float  # 원본 길이 (초, 알 수 없으면 0)
+    sample_rate: int
+    http_headers: Dict[str, str]
+
+
+@dataclass
+class Segment:
+    """연속 버퍼에서 구간 하나의 위치 (샘플)"""
+
+    index: int
+    start: int
+    end: int
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+class SegmentedAudioLoader:
+    segment_count = 4  # 동시에 디코딩할 구간 수
+    preroll = 1.0  # 구간 시작 전에 디코딩 후 버리는 길이 (초, 디코더 워밍업으로 경계 손실 방지)
+    default_sample_rate = 44100
+    read_size = 1 << 20  # ffmpeg 출력 읽기 단위 (바이트)
+    min_audio_bitrate = 48  # 지문 생성에 충분한 최소 오디오 비트레이트 (kbps, 이 이상 중 가장 작은 형식 선택)
+
+    @classmethod
+    def set_config(
+        cls, segment_count: int = None, preroll: float = None, min_audio_bitrate: int = None
+    ):
+        """구간 분할 관련 설정"""
+        if segment_count:
+            cls.segment_count = segment_count
+        if preroll is not None:
+            cls.preroll = preroll
+        if min_audio_bitrate is not None:
+            cls.min_audio_bitrate = min_audio_bitrate
+
+    @classmethod
+    def _format_options(cls) -> dict:
+        """
+        yt-dlp 형식 선택 옵션
+        지문은 5kHz 이하 피크만 사용하므로 최소 비트레이트 이상인 오디오 형식 중 가장 작은 것을 고릅니다.
+        (비트레이트를 알 수 없는 형식도 허용, 오디오 전용 형식이 없으면 가장 작은 형식)
+        """
+        return {
+            "format": f"bestaudio[abr>=?{cls.min_audio_bitrate}]/bestaudio/best",
+            "format_sort": ["+abr", "+size", "+br"],
+        }
+
+    @classmethod
+    def resolve_source(cls, url: str) -> AudioSource:
+        """
+        디코딩할 원본 스트림 정보 확인
+        로컬 파일은 그대로, 그 외 URL은 yt-dlp로 오디오 스트림 URL만 추출합니다. (다운로드 없음)
+        """
+        local_path = Path(url)
+        if local_path.exists():
+            return AudioSource(
+                local_path.stem, str(local_path), 0.0, cls.default_sample_rate, {}
+            )
+
+        import yt_dlp
+
+        opts = {**cls._format_options(), "quiet": True, "no_warnings": True}
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+
+        return AudioSource(
+            info.get("title") or info.get("id") or "audio",
+            info["url"],
+            float(info.get("duration") or 0.0),
+            int(info.get("asr") or cls.default_sample_rate),
+            dict(info.get("http_headers") or {}),
+        )
+
+    @staticmethod
+    def plan_segments(total_samples: int, segment_count: int) -> List[Segment]:
+        """연속 버퍼를 같은 크기의 구간으로 분할"""
+        segment_count = max(1, min(segment_count, total_samples))
+        bounds = np.linspace(0, total_samples, segment_count + 1).astype(np.int64)
+        return [
+            Segment(i, int(bounds[i]), int(bounds[i + 1])) for i in range(segment_count)
+        ]
+
+    @classmethod
+    def _ffmpeg_command(
+        cls, source: AudioSource, start: float, sample_count: int
+    ) -> List[str]:
+        """
+        원본의 start초부터 sample_count개 샘플을 float32 모노 PCM으로 출력하는 ffmpeg 명령
+        입력 탐색(-ss)은 preroll만큼 앞에서 시작하고, 출력 탐색으로 preroll 구간을 버립니다.
+        """
+        preroll = min(cls.preroll, start)
+        command = ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error"]
+        if source.url.startswith(("http://", "https://")):
+            command += ["-reconnect", "1", "-reconnect_streamed", "1", "-reconnect_delay_max", "5"]
+            if source.http_headers:
+                headers = "".join(f"{k}: {v}\r\n" for k, v in source.http_headers.items())
+                command += ["-headers", headers]
+        command += ["-ss", f"{start - preroll:.6f}", "-i", source.url]
+        command += ["-ss", f"{preroll:.6f}", "-vn", "-ac", "1", "-ar", str(source.sample_rate)]
+        command += ["-t", f"{sample_count / source.sample_rate:.6f}", "-f", "f32le", "-"]
+        return command
+
+    @classmethod
+    def _decode_segment(
+        cls, source: AudioSource, start_time: float, segment: Segment, buffer: np.ndarray
+    ) -> int:
+        """
+        구간 하나를 디코딩하여 버퍼의 해당 위치에 바로 기록하고 기록한 샘플 수를 반환합니다.
+        (ffmpeg 출력 파이프를 읽는 동안 GIL이 풀리므로 스레드로 병렬 실행)
+        """
+        target = memoryview(buffer[segment.start : segment.end]).cast("B")
+        command = cls._ffmpeg_command(
+            source, start_time + segment.start / source.sample_rate, segment.size
+        )
+
+        written = 0
+        with subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        ) as process:
+            while written < len(target):
+                count = process.stdout.readinto(target[written : written + cls.read_size])
+                if not count:
+                    break
+                written += count
+            # 요청한 길이를 다 읽었으면 남은 출력은 버림
+            process.stdout.close()
+            stderr = process.stderr.read().decode(errors="replace").strip()
+            return_code = process.wait()
+
+        if return_code != 0 and written < len(target):
+            raise RuntimeError(f"구간 {segment.index} 디코딩 실패 (ffmpeg {return_code}): {stderr}")
+        return written // buffer.itemsize
+
+    @classmethod
+    def load_audio(
+        cls,
+        url: str,
+        start_time: float,
+        end_time: float,
+        max_decoded_bytes: int = None,
+        work_dir: Path = None,
+        segment_count: int = None,
+        sample_rate: int = None,
+    ) -> Tuple[object, Tuple[str, int, int]]:
+        """
+        요청 구간을 구간별로 병렬 디코딩하여 (오디오, (이름, 길이, 샘플레이트))를 반환합니다.
+        디코딩 크기가 max_decoded_bytes보다 크면 float32 WAV 파일에 기록하고 메모리 매핑하여 반환합니다.
+        segment_count, sample_rate가 없으면 설정된 구간 수와 원본 샘플레이트를 사용합니다.
+        """
+        source = cls.resolve_source(url)
+        if sample_rate:
+            source.sample_rate = sample_rate
+        if source.duration > 0:
+            end_time = min(end_time, source.duration)
+        if end_time <= start_time:
+            raise ValueError(f"디코딩할 구간이 없습니다: {start_time} ~ {end_time}")
+
+        sample_rate = source.sample_rate
+        total_samples = int(round((end_time - start_time) * sample_rate))
+        decoded_bytes = total_samples * np.dtype(np.float32).itemsize
+
+        # 디코딩 대상 버퍼 (메모리 또는 메모리 매핑 WAV 파일)
+        wav_path = None
+        if max_decoded_bytes is not None and decoded_bytes > max_decoded_bytes:
+            logger.info(
+                f"디코딩 크기({decoded_bytes / (1024 * 1024):.0f}MB)가 한도를 넘어 WAV 파일에 기록합니다."
+            )
+            with tempfile.NamedTemporaryFile(dir=work_dir, suffix=".wav", delete=False) as f:
+                wav_path = Path(f.name)
+            buffer = MappedAudio.allocate(wav_path, total_samples, sample_rate)
+        else:
+            buffer = np.zeros(total_samples, dtype=np.float32)
+
+        segments = cls.plan_segments(total_samples, segment_count or cls.segment_count)
+        logger.info(
+            f"구간 {len(segments)}개 병렬 디코딩: {start_time:.0f}초 ~ {end_time:.0f}초 ({source.name})"
+        )
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+            decoded = list(
+                executor.map(
+                    lambda segment: cls._decode_segment(source, start_time, segment, buffer),
+                    segments,
+                )
+            )
+
+        # 원본이 예상보다 짧으면 마지막으로 끊김 없이 이어진 위치까지만 사용
+        length = total_samples
+        for segment, count in zip(segments, decoded):
+            if count < segment.size:
+                length = segment.start + count
+                logger.warning(
+                    f"구간 {segment.index}이 예상보다 짧습니다: {count}/{segment.size} 샘플"
+                )
+                break
+        logger.info(f"디코딩 완료: {length / sample_rate:.0f}초 ({time.perf_counter() - started:.2f}초)")
+
+        duration = length // sample_rate
+        if wav_path is not None:
+            buffer.flush()
+            del buffer
+            MappedAudio.truncate(wav_path, length)
+            return MappedAudio(wav_path), (source.name, duration, sample_rate)
+        return buffer[:length], (source.name, duration, sample_rate)
@@ -0,0 +1,34 @@
+import re
+from urllib.parse import parse_qs, urlparse
+
+# 유튜브 영상 ID 형식 (11자리)
+VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+
+def normalize_video_id(url: str) -> str:
+    """
+    유튜브 URL에서 정규화된 영상 ID를 추출합니다.
+
+    watch?v=, youtu.be/, shorts/, embed/ 형식과 추가 쿼리 파라미터(list, t, si 등)를 처리합니다.
+    """
+    url = url.strip()
+    if VIDEO_ID_PATTERN.match(url):
+        return url
+
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    path_parts = [part for part in parsed.path.split("/") if part]
+
+    video_id = None
+    if host.endswith("youtu.be") and path_parts:
+        video_id = path_parts[0]
+    elif host.endswith("youtube.com"):
+        if parsed.path == "/watch":
+            video_id = parse_qs(parsed.query).get("v", [None])[0]
+        elif len(path_parts) >= 2 and path_parts[0] in ("shorts", "embed", "live", "v"):
+            video_id = path_parts[1]
+
+    if not video_id or not VIDEO_ID_PATTERN.match(video_id):
+        raise ValueError(f"유튜브 영상 ID를 추출할 수 없습니다: {url}")
+
+    return video_id
@@ -0,0 +1,99 @@
+"""
+라이브 모드 테스트
+짧은 합성 스트림을 기록 중인 WAV 파일에 실시간에 가까운 속도(SPEED배속)로 이어 쓰면서 LiveSource로 읽어 감지하고,
+보고한 노래/시작 시간과 노래 지문 구간이 파일에 기록된 벽시계 시각부터 보고까지의 지연이 지연 상한 안인지 확인
+"""
+
+import contextlib
+import io
+import time
+
+import numpy as np
+import pytest
+
+from src.benchmark.incremental import build_references
+from src.benchmark.live import RealtimeWavWriter
+from src.benchmark.peak_picker import CLIP_SECONDS, NOISE_LEVEL, SAMPLE_RATE, START_TOLERANCE
+from src.benchmark.synthetic import synthetic_audio
+from src.timeline.live_detector import LiveTimelineDetector, run_live
+from src.youtube_download.live_source import LiveSource
+
+pytest.importorskip("essentia")
+
+# 스트림 구성: (다른 오디오 FILLER_SECONDS + 노래 SONG_SECONDS) × SONG_COUNT + 끝 TAIL_SECONDS
+SONG_COUNT = 2
+SONG_SECONDS = 40
+FILLER_SECONDS = 10
+LATENCY = 15.0  # main.timeline --latency 기본값
+TAIL_SECONDS = 15  # 마지막 노래도 소스가 끝나기 전에 보고되도록 지연 상한만큼 더 재생
+# 재생 배속 (스트림 115초를 약 1분에 재생, 지연은 벽시계 시간 × 배속으로 스트림 초로 환산하므로 실시간보다 엄격)
+SPEED = 2.0
+THRESHOLD = 0.001  # main.timeline 기본 유사도 임계값
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    """노래 지문, 스트림, 노래별 실제 시작 시간"""
+    rng = np.random.default_rng(0)
+    songs = [synthetic_audio(SONG_SECONDS, SAMPLE_RATE, seed=100 + i) for i in range(SONG_COUNT)]
+    parts, starts, position = [], [], 0
+    for i, song in enumerate(songs):
+        parts += [synthetic_audio(FILLER_SECONDS, SAMPLE_RATE, seed=1000 + i), song]
+        starts.append(position + FILLER_SECONDS)
+        position += FILLER_SECONDS + SONG_SECONDS
+    parts.append(synthetic_audio(TAIL_SECONDS, SAMPLE_RATE, seed=2000))
+
+    stream = np.concatenate(parts) * 0.7
+    stream = (stream + rng.normal(0, NOISE_LEVEL, len(stream))).astype(np.float32)
+    with contextlib.redirect_stdout(io.StringIO()):
+        references = build_references(songs)
+    return references, stream, starts
+
+
+@pytest.fixture
+def short_idle_timeout():
+    """기록이 끝나면 바로 소스를 끝내도록 (폴링 간격은 기본값 유지)"""
+    original = LiveSource.idle_timeout
+    LiveSource.set_config(idle_timeout=1.0)
+    yield
+    LiveSource.idle_timeout = original
+
+
+def test_live_replay_reports_songs_within_latency(dataset, short_idle_timeout, tmp_path):
+    references, stream, starts = dataset
+    detector = LiveTimelineDetector(references, SAMPLE_RATE, LATENCY, THRESHOLD)
+    path = tmp_path / "live.wav"
+    writer = RealtimeWavWriter(path, stream, SAMPLE_RATE, SPEED)
+    source = LiveSource.open(str(path), SAMPLE_RATE)
+
+    # (보고, 보고 시각) - 시각은 기록 스레드와 같은 perf_counter 기준
+    reports = []
+    writer.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        timelines = run_live(source, detector, lambda report: reports.append((report, time.perf_counter())))
+    writer.join()
+
+    first_reports = {}
+    for report, reported_at in reports:
+        first_reports.setdefault(report.timeline.name, (report, reported_at))
+    assert set(first_reports) == {f"song{i}" for i in range(SONG_COUNT)}
+
+    for i, start in enumerate(starts):
+        report, reported_at = first_reports[f"song{i}"]
+        assert abs(report.timeline.start_time - start) <= START_TOLERANCE
+        # 소스가 끝나서 확정된 보고가 아니라 재생 중에 보고되어야 함
+        assert reported_at < writer.written_at(len(stream))
+
+        # 노래 지문 구간 끝이 파일에 기록된 시각부터 보고까지의 벽시계 지연 (스트림 초)
+        clip_end = (start + CLIP_SECONDS) * SAMPLE_RATE
+        latency = (reported_at - writer.written_at(clip_end)) * SPEED
+        assert latency <= LATENCY, f"song{i} 보고 지연 {latency:.1f}초"
+
+    # 최종 타임라인도 같은 노래/시작 시간
+    final = {t.name: t.start_time for t in timelines}
+    assert set(final) == set(first_reports)
+    for i, start in enumerate(starts):
+        assert abs(final[f"song{i}"] - start) <= START_TOLERANCE
+
+    # 실시간보다 느린 블록이 없어야 지연이 쌓이지 않음
+    assert detector.slow_blocks == 0
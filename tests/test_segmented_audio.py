@@ -0,0 +1,93 @@
+"""
+구간 분할/직접 PCM 디코딩 테스트
+로컬 HTTP 서버(Range 요청 지원)로 제공한 WAV 파일을 구간 분할, 메모리 매핑, 직접 디코딩 경로로 읽어
+한 번에 디코딩한 결과와 샘플 수, 샘플 값이 같은지 확인
+"""
+
+from functools import partial
+from http.server import ThreadingHTTPServer
+import shutil
+import threading
+
+import numpy as np
+import pytest
+
+from src.benchmark.segmented_download import SAMPLE_RATE, ThrottledRangeHandler, write_source_wav
+from src.youtube_download.audio import AudioDownloader
+from src.youtube_download.segmented_audio import SegmentedAudioLoader
+
+pytest.importorskip("yt_dlp")
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg가 필요합니다")
+
+SOURCE_SECONDS = 40
+TOLERANCE = 1e-4  # 샘플 허용 오차 (16비트 PCM 한 단계보다 작게)
+
+
+class FastRangeHandler(ThrottledRangeHandler):
+    rate_limit = 1 << 30
+
+
+@pytest.fixture(scope="module")
+def source(tmp_path_factory):
+    """(WAV URL, 원본 샘플)"""
+    directory = tmp_path_factory.mktemp("source")
+    reference = write_source_wav(directory / "source.wav", SOURCE_SECONDS)
+
+    handler = partial(FastRangeHandler, directory=str(directory))
+    with ThreadingHTTPServer(("127.0.0.1", 0), handler) as server:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield f"http://127.0.0.1:{server.server_address[1]}/source.wav", reference
+        server.shutdown()
+
+
+@pytest.fixture(scope="module")
+def single_pass(source):
+    """구간 하나로 한 번에 디코딩한 결과"""
+    url, _ = source
+    audio, (_, duration, sample_rate) = SegmentedAudioLoader.load_audio(
+        url, 5, 35, segment_count=1, sample_rate=SAMPLE_RATE
+    )
+    assert (duration, sample_rate) == (30, SAMPLE_RATE)
+    return np.asarray(audio)
+
+
+def assert_same_pcm(audio, expected):
+    audio = np.asarray(audio)
+    assert len(audio) == len(expected)
+    assert np.abs(audio - expected).max() <= TOLERANCE
+
+
+def test_single_pass_matches_source(source, single_pass):
+    _, reference = source
+    assert_same_pcm(single_pass, reference[5 * SAMPLE_RATE : 35 * SAMPLE_RATE])
+
+
+@pytest.mark.parametrize("segment_count", [2, 4, 7])
+def test_segmented_decode_matches_single_pass(source, single_pass, segment_count):
+    url, _ = source
+    audio, _ = SegmentedAudioLoader.load_audio(
+        url, 5, 35, segment_count=segment_count, sample_rate=SAMPLE_RATE
+    )
+    assert_same_pcm(audio, single_pass)
+
+
+def test_segmented_decode_to_mapped_file(source, single_pass, tmp_path):
+    url, _ = source
+    audio, (_, duration, _) = SegmentedAudioLoader.load_audio(
+        url, 5, 35, max_decoded_bytes=0, work_dir=tmp_path, segment_count=4, sample_rate=SAMPLE_RATE
+    )
+    assert duration == 30
+    assert_same_pcm(audio[:], single_pass)
+
+
+def test_direct_decode_matches_single_pass(source, single_pass, tmp_path):
+    url, _ = source
+    original = (AudioDownloader.download_start, AudioDownloader.download_end, AudioDownloader.download_dir)
+    AudioDownloader.set_config(start="00:00:05", end="00:00:35", download_dir=tmp_path)
+    try:
+        audio, (_, duration, sample_rate) = AudioDownloader.decode_audio(url, sample_rate=SAMPLE_RATE)
+    finally:
+        AudioDownloader.download_start, AudioDownloader.download_end, AudioDownloader.download_dir = original
+    assert (duration, sample_rate) == (30, SAMPLE_RATE)
+    assert_same_pcm(audio, single_pass)
+
@@ -0,0 +1,111 @@
+"""
+월드컵 역색인 병합 테스트
+병합이 겹쳐 실행되어도 포스팅이 중복되지 않고 전체 구축과 같은 역색인이 되는지 확인
+"""
+
+import numpy as np
+import pytest
+
+from src.utils.compact_audioprint import CompactAudioprint
+from src.utils.worldcup_index import WorldcupIndex
+
+SONG_COUNT = 6
+
+
+def synthetic_audioprint(seed: int) -> CompactAudioprint:
+    rng = np.random.default_rng(seed)
+    hashes = rng.integers(0, 5000, 2000)
+    times = rng.integers(0, 1500, 2000) * 0.02
+    return CompactAudioprint.from_hash_arrays(hashes, times, 0.02)
+
+
+def postings(worldcup_path) -> list:
+    """(해시, 노래 이름, 프레임) 포스팅 목록 (세그먼트 구성과 무관하게 정렬)"""
+    index = WorldcupIndex.open(worldcup_path)
+    rows = []
+    for segment in index.segments:
+        live = index.live_songs[segment.songs]
+        rows += [
+            (int(h), index.names[s], int(f))
+            for h, s, f in zip(segment.hashes[live], segment.songs[live], segment.frames[live])
+        ]
+    return sorted(rows)
+
+
+@pytest.fixture
+def audioprints():
+    return {f"song{i}": synthetic_audioprint(i) for i in range(SONG_COUNT)}
+
+
+@pytest.fixture
+def delta_index(tmp_path, audioprints):
+    """기본 세그먼트 1개 + 노래마다 델타 세그먼트가 있는 역색인과 전체 구축 결과"""
+    names = list(audioprints)
+    WorldcupIndex.build(tmp_path / "full", audioprints)
+    WorldcupIndex.build(tmp_path / "delta", {names[0]: audioprints[names[0]]})
+    for name in names[1:]:
+        WorldcupIndex.update(tmp_path / "delta", added={name: audioprints[name]})
+    return tmp_path / "delta", postings(tmp_path / "full")
+
+
+def interleave(monkeypatch, during_sort):
+    """첫 번째 병합이 포스팅을 정렬한 뒤(잠금 전) during_sort를 한 번 실행"""
+    original = WorldcupIndex.sort_order
+    calls = []
+
+    def sort_order(cls, hashes, workers=None):
+        order = original(hashes, workers)
+        if not calls:
+            calls.append(True)
+            during_sort()
+        return order
+
+    monkeypatch.setattr(WorldcupIndex, "sort_order", classmethod(sort_order))
+
+
+def test_interleaved_merges_do_not_duplicate_postings(monkeypatch, delta_index):
+    worldcup_path, expected = delta_index
+    # 병합 잠금을 거치지 않는 두 번째 병합이 첫 번째 병합의 스냅샷과 잠금 사이에 끝남
+    interleave(monkeypatch, lambda: WorldcupIndex._merge_segments(worldcup_path))
+
+    WorldcupIndex.merge(worldcup_path)
+
+    index = WorldcupIndex.open(worldcup_path)
+    assert len(index.segments) == 1
+    assert postings(worldcup_path) == expected
+
+
+def test_merge_while_merging_is_skipped(monkeypatch, delta_index):
+    worldcup_path, expected = delta_index
+    skipped = []
+
+    def nested_merge():
+        assert WorldcupIndex.is_merging(worldcup_path)
+        generation = WorldcupIndex._read_current(WorldcupIndex.get_index_path(worldcup_path))
+        skipped.append(WorldcupIndex.merge(worldcup_path, wait=False) == generation)
+
+    interleave(monkeypatch, nested_merge)
+    WorldcupIndex.merge(worldcup_path)
+
+    assert skipped == [True]
+    assert not WorldcupIndex.is_merging(worldcup_path)
+    assert len(WorldcupIndex.open(worldcup_path).segments) == 1
+    assert postings(worldcup_path) == expected
+
+
+def test_update_during_merge_is_kept(monkeypatch, tmp_path, audioprints):
+    names = list(audioprints)
+    worldcup_path = tmp_path / "delta"
+    WorldcupIndex.build(worldcup_path, {names[0]: audioprints[names[0]]})
+    for name in names[1:-1]:
+        WorldcupIndex.update(worldcup_path, added={name: audioprints[name]})
+    WorldcupIndex.build(tmp_path / "full", audioprints)
+
+    interleave(
+        monkeypatch,
+        lambda: WorldcupIndex.update(worldcup_path, added={names[-1]: audioprints[names[-1]]}),
+    )
+    WorldcupIndex.merge(worldcup_path)
+
+    assert len(WorldcupIndex.open(worldcup_path).segments) == 2
+    assert postings(worldcup_path) == postings(tmp_path / "full")